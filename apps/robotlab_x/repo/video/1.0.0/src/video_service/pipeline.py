@@ -0,0 +1,194 @@
+"""Pipelined frame processing for VideoService.
+
+The inline capture loop runs filters + JPEG encode on the service's
+event loop, so a heavy stage (YOLO, optical flow, a 1080p imencode)
+blocks control handling and heartbeats for the whole frame. In
+pipelined mode the stages run on worker threads instead, connected by
+small drop-oldest hand-off queues::
+
+    loop     cap.read (pool) ─▶ [filter q]
+    thread                          filter stage ─▶ [encode q]
+    thread                                            encode stage ─▶ [results]
+    loop                                                                push + publish
+
+Capture of frame N+2, filtering of N+1 and encoding of N overlap. Each
+stage is a single thread, so stateful filters (motion, optical flow,
+trackers) still see frames strictly in order. When a downstream stage
+falls behind, the hand-off queue in front of it overwrites its oldest
+frame — latency stays bounded and the freshest frame wins, same policy
+as ``rlx_bus.Stream``. ``dropped`` counts those overwrites.
+
+Pure threading + asyncio — the stage callables are injected, so this
+module has no cv2 dependency of its own.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Deque, Optional
+
+
+logger = logging.getLogger(__name__)
+
+
+# Sentinel a closed hand-off queue returns to its consumer.
+_CLOSED = object()
+
+
+class DropOldestQueue:
+    """Thread-safe bounded hand-off: ``put`` never blocks; a full queue
+    discards its oldest item."""
+
+    def __init__(self, maxsize: int) -> None:
+        self._items: Deque[Any] = deque()
+        self._maxsize = max(1, maxsize)
+        self._cond = threading.Condition()
+        self._closed = False
+        self.dropped = 0
+
+    def put(self, item: Any) -> None:
+        with self._cond:
+            if self._closed:
+                return
+            if len(self._items) >= self._maxsize:
+                self._items.popleft()
+                self.dropped += 1
+            self._items.append(item)
+            self._cond.notify()
+
+    def get(self) -> Any:
+        """Block until an item is available; ``_CLOSED`` after close()."""
+        with self._cond:
+            while not self._items and not self._closed:
+                self._cond.wait()
+            if self._closed:
+                return _CLOSED
+            return self._items.popleft()
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._items.clear()
+            self._cond.notify_all()
+
+
+class FramePipeline:
+    """Filter + encode stages on dedicated threads, results back on the
+    loop.
+
+    ``process(frame) -> (frame, telemetry)`` runs on the filter thread,
+    ``encode(frame) -> Optional[buf]`` on the encode thread. Results come
+    out of ``results()`` on the event loop as ``(buf, telemetry)``. The
+    service also routes its blocking ``cap.read`` through ``read()`` so
+    capture shares the same bounded pool instead of the default one.
+    """
+
+    def __init__(
+        self,
+        process: Callable[[Any], Any],
+        encode: Callable[[Any], Any],
+        *,
+        depth: int = 2,
+        name: str = "video",
+    ) -> None:
+        self._process = process
+        self._encode = encode
+        self._depth = max(1, depth)
+        # Three workers: filter stage, encode stage, capture reads.
+        self._pool = ThreadPoolExecutor(max_workers=3, thread_name_prefix=f"{name}.pipeline")
+        self._to_filter = DropOldestQueue(self._depth)
+        self._to_encode = DropOldestQueue(self._depth)
+        self._results: Deque[Any] = deque()
+        self._results_dropped = 0
+        self._ready = asyncio.Event()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stages: list = []
+        self._closed = False
+
+    # ─── lifecycle ─────────────────────────────────────────────────────
+
+    def start(self) -> None:
+        """Spawn the stage threads. Call from the event loop."""
+        self._loop = asyncio.get_running_loop()
+        self._stages = [
+            self._pool.submit(self._stage, self._to_filter, self._process, self._to_encode.put),
+            self._pool.submit(self._stage, self._to_encode, self._run_encode, self._deliver),
+        ]
+
+    async def close(self) -> None:
+        """Stop the stages and wait for the threads to exit. A stage in
+        the middle of a frame finishes that frame first."""
+        self._closed = True
+        self._to_filter.close()
+        self._to_encode.close()
+        self._ready.set()
+        await asyncio.get_running_loop().run_in_executor(
+            None, lambda: self._pool.shutdown(wait=True),
+        )
+
+    # ─── loop-side API ─────────────────────────────────────────────────
+
+    async def read(self, cap: Any) -> Any:
+        """``cap.read()`` on the pipeline's pool."""
+        return await asyncio.get_running_loop().run_in_executor(self._pool, cap.read)
+
+    def submit(self, frame: Any) -> None:
+        """Hand a captured frame to the filter stage. Never blocks."""
+        self._to_filter.put(frame)
+
+    async def results(self):
+        """Yield ``(buf, telemetry)`` for each encoded frame until close()."""
+        while not self._closed:
+            if not self._results:
+                self._ready.clear()
+                await self._ready.wait()
+                continue
+            yield self._results.popleft()
+
+    @property
+    def dropped(self) -> int:
+        """Frames overwritten at any hand-off because the next stage
+        was still busy."""
+        return self._to_filter.dropped + self._to_encode.dropped + self._results_dropped
+
+    # ─── worker side ───────────────────────────────────────────────────
+
+    def _stage(self, inbox: DropOldestQueue, work: Callable[[Any], Any], emit: Callable[[Any], None]) -> None:
+        while True:
+            item = inbox.get()
+            if item is _CLOSED:
+                return
+            try:
+                out = work(item)
+            except Exception:  # noqa: BLE001 — one bad frame mustn't kill the stage
+                logger.exception("pipeline stage raised — frame skipped")
+                continue
+            if out is not None:
+                emit(out)
+
+    def _run_encode(self, item: Any) -> Any:
+        frame, telemetry = item
+        buf = self._encode(frame)
+        if buf is None:
+            return None
+        return (buf, telemetry)
+
+    def _deliver(self, result: Any) -> None:
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        try:
+            loop.call_soon_threadsafe(self._accept, result)
+        except RuntimeError:  # loop closed between the check and the call
+            pass
+
+    def _accept(self, result: Any) -> None:
+        # Loop side of the last hand-off — same drop-oldest bound.
+        if len(self._results) >= self._depth:
+            self._results.popleft()
+            self._results_dropped += 1
+        self._results.append(result)
+        self._ready.set()
@@ -5,10 +5,12 @@ Lifecycle:
     file path, RTSP URL — anything cv2 accepts).
   * register_stream announces the stream on the bus + opens the upload
     WS to the runtime.
-  * capture loop reads frames in a worker thread (cv2 blocks), encodes
-    to JPEG, pushes through the Stream object. Async-thread bridge keeps
-    asyncio happy without polluting the hot path.
-  * /state retained: connected, resolution, observed_fps, dropped frames.
+  * capture loop reads frames in a worker thread (cv2 blocks); filters
+    + JPEG encode run on pipeline worker threads (or inline on the loop
+    with ``pipelined: false``) and the result is pushed through the
+    Stream object. The event loop only publishes.
+  * /state retained: connected, resolution, observed_fps, dropped frames,
+    upload send latency + bytes/s.
   * /control accepts connect/disconnect/snapshot/set_resolution.
 
 Subprocess service so cv2's background threads + the V4L2 device handle
@@ -29,6 +31,7 @@ import numpy as np
 from rlx_bus import ServiceConfig, Stream, SubprocessService, service_method
 
 from .filters import Filter, build_filter, catalog as filter_catalog
+from .pipeline import FramePipeline
 
 
 logger = logging.getLogger(__name__)
@@ -46,12 +49,18 @@ class VideoConfig(ServiceConfig):
                        supported. Null leaves cv2 default.
       * fps          — target capture fps. Null leaves cv2 default.
       * jpeg_quality — JPEG encode quality (0-100). 75 is a good balance.
+      * pipelined    — run filters + JPEG encode on worker threads with
+                       drop-oldest hand-offs instead of on the event loop.
+      * pipeline_depth — frames each hand-off queue holds before dropping
+                       the oldest. Higher smooths jitter, adds latency.
     """
     source: str = "0"
     width: Optional[int] = None
     height: Optional[int] = None
     fps: Optional[float] = None
     jpeg_quality: int = 75
+    pipelined: bool = True
+    pipeline_depth: int = 2
     # Ordered list of filter specs. Each: {id, type, enabled, params}.
     # Persists across restarts via the standard config flow. Empty list
     # = no pipeline; capture loop sends raw camera frames.
@@ -108,8 +117,16 @@ class VideoService(SubprocessService):
             "declared_fps": None,
             "observed_fps": 0.0,
             "dropped": 0,
+            "send_latency_ms": 0.0,
+            "upload_bytes_per_s": 0,
+            "pipeline_dropped": 0,
             "error": None,
         }
+        # Per-capture-loop bookkeeping shared by the inline and
+        # pipelined paths (see _emit_frame).
+        self._pipeline: Optional[FramePipeline] = None
+        self._frame_count = 0
+        self._last_state_publish = 0.0
 
     # ─── lifecycle ────────────────────────────────────────────────────
 
@@ -278,11 +295,20 @@ class VideoService(SubprocessService):
     _MAX_REOPEN_ATTEMPTS = 5
 
     async def _capture_loop(self) -> None:
-        """Read → encode → push. cv2.read blocks, so it runs in a worker
-        thread; the encode + push happen on the main loop where the
-        Stream lives. State updates fire every second so the UI's
+        """Read → filter → encode → push. cv2.read blocks, so it runs in
+        a worker thread. State updates fire every second so the UI's
         observed_fps stays current without flooding the bus.
 
+        Two execution modes (``config.pipelined``):
+
+          * pipelined (default) — filters and JPEG encode run on their
+            own worker threads behind drop-oldest hand-off queues (see
+            ``pipeline.FramePipeline``); this loop only reads, hands
+            frames off, and a sibling task pushes + publishes results.
+            A slow YOLO stage costs frame rate, never loop latency.
+          * inline — filters + encode run right here on the event loop,
+            one frame at a time. Simplest; fine for light pipelines.
+
         Auto-recovery: a run of ``_MAX_CONSECUTIVE_READ_FAILS`` failed
         reads triggers a re-open of the cv2 device — same path the
         ``connect`` action uses. Catches device wedges that don't raise
@@ -294,17 +320,34 @@ class VideoService(SubprocessService):
         """
         assert self._cap is not None
         encode_param = [int(cv2.IMWRITE_JPEG_QUALITY), int(self.config.jpeg_quality)]
-        last_state_publish = time.monotonic()
-        frame_count = 0
+        self._frame_count = 0
+        self._last_state_publish = time.monotonic()
         consecutive_fails = 0
         reopens = 0
+        pipeline: Optional[FramePipeline] = None
+        drain: Optional[asyncio.Task[None]] = None
+        if self.config.pipelined:
+            pipeline = FramePipeline(
+                self._filter_frame,
+                lambda frame: self._encode_frame(frame, encode_param),
+                depth=self.config.pipeline_depth,
+                name=self.proxy_id,
+            )
+            pipeline.start()
+            self._pipeline = pipeline
+            drain = asyncio.create_task(
+                self._drain_pipeline(pipeline), name=f"video.emit:{self.proxy_id}",
+            )
         try:
             while not self.is_stopping():
                 if self._cap is None:
                     # _reopen_inplace cleared us — bail out so on_stop /
                     # the next on_start cycle can take over.
                     return
-                ok, frame = await asyncio.to_thread(self._cap.read)
+                if pipeline is not None:
+                    ok, frame = await pipeline.read(self._cap)
+                else:
+                    ok, frame = await asyncio.to_thread(self._cap.read)
                 if not ok or frame is None:
                     consecutive_fails += 1
                     if consecutive_fails >= self._MAX_CONSECUTIVE_READ_FAILS:
@@ -346,58 +389,99 @@ class VideoService(SubprocessService):
                 self._latest_frame = frame
                 self._latest_frame_ts = time.time()
 
-                # Run the filter pipeline. Each filter takes BGR uint8
-                # in and returns BGR uint8 of the same H×W; a raising
-                # filter is logged + skipped so a buggy stage doesn't
-                # kill the loop.
-                for f in self._filters:
-                    try:
-                        frame = f.process(frame)
-                    except Exception:  # noqa: BLE001
-                        logger.exception(
-                            "%s: filter %s/%s.process raised — skipping",
-                            self.proxy_id, f.type_name, f.id,
-                        )
-                # Per-filter telemetry publish. Retained so a late
-                # subscriber (e.g. a fresh UI tab) sees the latest value
-                # without waiting for the next motion event.
-                for f in self._filters:
-                    if not f.publishes_telemetry:
-                        continue
-                    try:
-                        tel = f.telemetry()
-                    except Exception:  # noqa: BLE001
-                        logger.exception(
-                            "%s: filter %s/%s.telemetry raised", self.proxy_id, f.type_name, f.id,
-                        )
-                        continue
-                    if tel is None:
-                        continue
-                    await self.publish(f"filter/{f.id}", tel, retained=True)
-                # JPEG encode happens on the main loop. cv2.imencode is
-                # CPU-bound; for high-res streams move to to_thread.
-                ok2, buf = cv2.imencode(".jpg", frame, encode_param)
-                if not ok2:
+                if pipeline is not None:
+                    # Filter + encode happen on the pipeline threads;
+                    # _drain_pipeline pushes the result.
+                    pipeline.submit(frame)
                     continue
-                if self._stream is not None:
-                    self._stream.push(buf.tobytes())
-                frame_count += 1
-                now = time.monotonic()
-                if now - last_state_publish >= 1.0:
-                    self._state["observed_fps"] = round(
-                        frame_count / (now - last_state_publish), 2
-                    )
-                    if self._stream is not None:
-                        self._state["dropped"] = self._stream.drop_count
-                    await self._publish_state()
-                    frame_count = 0
-                    last_state_publish = now
+                frame, telemetry = self._filter_frame(frame)
+                buf = self._encode_frame(frame, encode_param)
+                if buf is not None:
+                    await self._emit_frame(buf, telemetry)
         except asyncio.CancelledError:
             raise
         except Exception:  # noqa: BLE001
             logger.exception("%s: capture loop crashed", self.proxy_id)
             self._state["error"] = "capture loop crashed"
             await self._publish_state()
+        finally:
+            if drain is not None:
+                drain.cancel()
+                await asyncio.gather(drain, return_exceptions=True)
+            if pipeline is not None:
+                self._pipeline = None
+                await pipeline.close()
+
+    def _filter_frame(self, frame: np.ndarray) -> tuple:
+        """Run the filter pipeline + collect per-filter telemetry.
+        Returns ``(frame, [(filter_id, telemetry), ...])``.
+
+        Each filter takes BGR uint8 in and returns BGR uint8 of the
+        same H×W; a raising filter is logged + skipped so a buggy stage
+        doesn't kill the loop. Sync — runs on the filter thread in
+        pipelined mode, on the loop inline. ``self._filters`` is swapped
+        wholesale on config changes, so one frame always sees one list.
+        """
+        filters = self._filters
+        for f in filters:
+            try:
+                frame = f.process(frame)
+            except Exception:  # noqa: BLE001
+                logger.exception(
+                    "%s: filter %s/%s.process raised — skipping",
+                    self.proxy_id, f.type_name, f.id,
+                )
+        telemetry = []
+        for f in filters:
+            if not f.publishes_telemetry:
+                continue
+            try:
+                tel = f.telemetry()
+            except Exception:  # noqa: BLE001
+                logger.exception(
+                    "%s: filter %s/%s.telemetry raised", self.proxy_id, f.type_name, f.id,
+                )
+                continue
+            if tel is not None:
+                telemetry.append((f.id, tel))
+        return frame, telemetry
+
+    @staticmethod
+    def _encode_frame(frame: np.ndarray, encode_param: List[int]) -> Optional[np.ndarray]:
+        ok, buf = cv2.imencode(".jpg", frame, encode_param)
+        return buf if ok else None
+
+    async def _drain_pipeline(self, pipeline: FramePipeline) -> None:
+        async for buf, telemetry in pipeline.results():
+            await self._emit_frame(buf, telemetry)
+
+    async def _emit_frame(self, buf: np.ndarray, telemetry: list) -> None:
+        """Loop-side tail of both modes: telemetry, push, 1 Hz state."""
+        # Per-filter telemetry publish. Retained so a late subscriber
+        # (e.g. a fresh UI tab) sees the latest value without waiting
+        # for the next motion event.
+        for filter_id, tel in telemetry:
+            await self.publish(f"filter/{filter_id}", tel, retained=True)
+        if self._stream is not None:
+            # imencode returns a fresh array per frame — hand it over by
+            # reference instead of copying via tobytes().
+            self._stream.push(buf)
+        self._frame_count += 1
+        now = time.monotonic()
+        if now - self._last_state_publish >= 1.0:
+            self._state["observed_fps"] = round(
+                self._frame_count / (now - self._last_state_publish), 2
+            )
+            if self._stream is not None:
+                stats = self._stream.stats()
+                self._state["dropped"] = stats["dropped"]
+                self._state["send_latency_ms"] = stats["send_latency_ms"]
+                self._state["upload_bytes_per_s"] = stats["bytes_per_s"]
+            if self._pipeline is not None:
+                self._state["pipeline_dropped"] = self._pipeline.dropped
+            await self._publish_state()
+            self._frame_count = 0
+            self._last_state_publish = now
 
     async def _reopen_inplace(self) -> bool:
         """Release + reopen ``self._cap`` from inside the capture loop.
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""Microbenchmark: Bus.publish_sync latency vs. number of wildcard patterns.
+
+Registers N wildcard subscriptions shaped like the ones a loaded robot
+carries (``/+/+/meta``-style UI watchers, ``/service_proxy/<id>/log``
+tails, per-service ``/<type>/<id>/#``), then times ``publish_sync`` on a
+60 Hz-style telemetry topic that only a couple of them match.
+
+Two columns are printed per N:
+
+  * ``trie``   — the Bus as shipped (segment trie + per-topic cache)
+  * ``linear`` — the previous algorithm, ``topic_matches_pattern`` over
+    every registered pattern, timed on the same pattern set for reference
+
+Usage:
+    python scripts/bench_bus_wildcards.py [--counts 1,10,100,1000] [--iters 20000]
+
+No runtime needed — the bus is constructed in-process.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import time
+
+from robotlab_x.runtime.bus import Bus, topic_matches_pattern
+
+TOPIC = "/joystick/js1/input"
+
+
+def _patterns(n: int) -> list[str]:
+    shapes = (
+        "/service_proxy/svc-{i}/log",
+        "/svc{i}/+/meta",
+        "/type{i}/+/state",
+        "/type{i}/inst-{i}/#",
+    )
+    out = ["/+/+/input", "/joystick/#"]  # the two that actually match
+    i = 0
+    while len(out) < n:
+        out.append(shapes[i % len(shapes)].format(i=i))
+        i += 1
+    return out[:n]
+
+
+async def _bench_one(n: int, iters: int) -> tuple[float, float]:
+    bus = Bus(queue_depth=1)  # deliveries drop-oldest; we time routing
+    patterns = _patterns(n)
+    iterators = [bus.subscribe(p, subscriber_id=f"bench-{i}")
+                 for i, p in enumerate(patterns)]
+    # Advance each generator to its first await so the subscription is
+    # registered; the pending __anext__ tasks are cancelled at the end.
+    tasks = [asyncio.ensure_future(it.__anext__()) for it in iterators]
+    await asyncio.sleep(0)
+
+    start = time.perf_counter()
+    for _ in range(iters):
+        bus.publish_sync(TOPIC, 0)
+    trie_us = (time.perf_counter() - start) / iters * 1e6
+
+    start = time.perf_counter()
+    for _ in range(iters):
+        [p for p in patterns if topic_matches_pattern(TOPIC, p)]
+    linear_us = (time.perf_counter() - start) / iters * 1e6
+
+    for t in tasks:
+        t.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    for it in iterators:
+        await it.aclose()
+    return trie_us, linear_us
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--counts", default="1,10,50,100,500,1000")
+    ap.add_argument("--iters", type=int, default=20000)
+    args = ap.parse_args()
+    # queue_depth=1 makes every subscriber "slow" by design; mute the
+    # throttled slow_consumer warnings so they don't interleave the table.
+    logging.getLogger("robotlab_x.runtime.bus").setLevel(logging.ERROR)
+
+    print(f"{'patterns':>8}  {'trie µs/pub':>12}  {'linear µs/match':>16}")
+    for n in (int(c) for c in args.counts.split(",")):
+        trie_us, linear_us = asyncio.run(_bench_one(n, args.iters))
+        print(f"{n:>8}  {trie_us:>12.2f}  {linear_us:>16.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,7 +2,13 @@
 """GET /v1/admin/state — structured snapshot of robotlab_x state.
 
 Backs the in-UI ``/admin/state`` page. Returns the same dict the CLI
-``python -m robotlab_x.tools.state --json`` produces. Admin-gated.
+``python -m robotlab_x.tools.state --json`` produces, plus — when the
+live database client is a ``CachingDatabase`` — its hit/miss counters
+under ``db_cache``. Admin-gated.
+
+POST /v1/admin/reconcile/sweep asks the reconciler for an immediate
+full ``/proc`` orphan sweep (steady-state ticks only check the pid
+registry).
 """
 from __future__ import annotations
 
@@ -11,9 +17,12 @@ from typing import Any, Dict
 
 from auth import create_auth_dependencies
 from config import create_app_settings
+from database.caching_database import CachingDatabase
+from database.factory import get_database_client
 from fastapi import APIRouter, Depends
 
 from robotlab_x.models.config import Config
+from robotlab_x.runtime import reconciler
 from robotlab_x.tools.state import gather_state
 
 
@@ -27,4 +36,15 @@ router = APIRouter()
 @router.get("/admin/state", response_model=Dict[str, Any])
 def get_state(_: Any = Depends(auth_deps.require_role(["Admin"]))) -> Dict[str, Any]:
     """Returns the same structure as the CLI tool. Cheap — milliseconds."""
-    return gather_state()
+    state = gather_state()
+    db = get_database_client()
+    if isinstance(db, CachingDatabase):
+        state["db_cache"] = db.stats()
+    return state
+
+
+@router.post("/admin/reconcile/sweep", response_model=Dict[str, Any])
+def request_reconcile_sweep(_: Any = Depends(auth_deps.require_role(["Admin"]))) -> Dict[str, Any]:
+    """Run a full /proc orphan sweep now instead of waiting for a reboot."""
+    reconciler.request_full_sweep()
+    return {"requested": True}
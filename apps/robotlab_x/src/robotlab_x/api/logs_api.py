@@ -1,16 +1,24 @@
 # unmanaged
-"""GET /v1/logs — recent runtime log lines from the in-memory ring buffer
-(runtime/log_bus.py). Lets the UI Logs page show backend activity with
-history; it still live-tails per-service logs over the bus separately.
+"""GET /v1/logs — log history for the UI Logs page.
+
+Without ``proxy_id``: recent runtime log lines from the in-memory ring
+buffer (runtime/log_bus.py), so the page shows backend activity with
+history. With ``proxy_id``: that service's stored output from the
+persistent per-service store (runtime/service_logs.py), each line
+carrying its ``seq``. Live per-service lines still arrive over the bus
+(``/service_proxy/{id}/log``); ``after_seq`` pages forward from the
+last line a client has.
+
+``since`` / ``until`` (epoch seconds) and ``q`` (substring) filter both.
 """
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 from auth import create_auth_dependencies
 from config import create_app_settings
 from fastapi import APIRouter, Depends, Query
 
 from robotlab_x.models.config import Config
-from robotlab_x.runtime import log_bus
+from robotlab_x.runtime import log_bus, service_logs
 
 settings, config_provider = create_app_settings("robotlab_x", Config)
 auth_deps = create_auth_dependencies(config_provider)
@@ -20,7 +28,16 @@ router = APIRouter()
 
 @router.get("/logs")
 def get_logs(
-    limit: int = Query(300, ge=1, le=1000),
+    limit: int = Query(300, ge=1, le=5000),
+    proxy_id: Optional[str] = Query(None, description="Service proxy whose stored output to return; omit for the runtime log"),
+    since: Optional[float] = Query(None, description="Only lines at or after this epoch-seconds time"),
+    until: Optional[float] = Query(None, description="Only lines at or before this epoch-seconds time"),
+    q: Optional[str] = Query(None, description="Case-insensitive substring the line must contain"),
+    after_seq: Optional[int] = Query(None, ge=0, description="Service logs only: the first `limit` lines after this seq"),
     _: Any = Depends(auth_deps.require_role(["Admin"])),
 ) -> List[Dict[str, Any]]:
-    return log_bus.recent(limit)
+    if proxy_id:
+        return service_logs.query(
+            proxy_id, since=since, until=until, q=q, after_seq=after_seq, limit=limit,
+        )
+    return log_bus.recent(min(limit, 1000), since=since, until=until, q=q)
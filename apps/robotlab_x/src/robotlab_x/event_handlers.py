@@ -23,19 +23,95 @@ from robotlab_x.runtime.workspaces import (
 )
 from robotlab_x.runtime import discovery as _discovery
 from robotlab_x.runtime import bus_stats as _bus_stats
+from robotlab_x.runtime import pid_registry as _pid_registry
 from robotlab_x.runtime import reconciler as _reconciler
+from robotlab_x.runtime import service_logs as _service_logs
+from robotlab_x.runtime import warm_pool as _warm_pool
 from robotlab_x.runtime import identity as _identity
 from robotlab_x.runtime import peer_manager as _peer_manager
 from robotlab_x.runtime import mdns as _mdns
 from robotlab_x.runtime.bus import get_bus
 import asyncio
+import json
+import os
 from pathlib import Path
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Any, Optional
 import logging
 
 logger = logging.getLogger(__name__)
 
+# ─── runtime tuning knobs ────────────────────────────────────────────
+# Defaults for knobs that are not fields of the generated Config model
+# (models/config.py, sql/config.sql and the UI's Config.ts are
+# regenerated upstream and must not be hand-edited). See ``_tuning``.
+# Override one by exporting ROBOTLAB_X_<NAME> (JSON) in the process
+# environment, e.g. ``ROBOTLAB_X_BOOT_START_CONCURRENCY=1 uv run ...``.
+# Never put them in .env or .env.example: the model rejects unknown
+# ROBOTLAB_X_* keys there and the app would not boot.
+
+# Tables served from the write-through in-memory cache
+# (database.caching_database) — re-read by the reconciler every tick
+# and by most lifecycle/link requests. [] disables the cache.
+DB_CACHE_TABLES = ["service_proxy", "workspace", "service_meta"]
+# Seconds a cached table is trusted before it is re-read — the bound on
+# staleness if something outside this process edits the database files.
+# 0 turns the cache off (always re-read); null never expires it.
+DB_CACHE_TTL_S = 30.0
+# Scan all of /proc for orphaned service subprocesses on every reconciler
+# tick, not just the pids in <data_dir>/service_pids.json. The full sweep
+# always runs at boot and on POST /v1/admin/reconcile/sweep; turn this on
+# if services are launched outside process_manager.
+RECONCILE_PROC_SWEEP = False
+# How many services boot restarts at once, along the depends_on /
+# capability graph (runtime/start_graph.py). 1 restores the serial boot.
+BOOT_START_CONCURRENCY = 4
+# Keep one pre-warmed interpreter parked per subprocess type that
+# declares entry.preload (runtime/warm_pool.py). Costs an idle
+# interpreter per such type, so off by default.
+SUBPROCESS_WARM_POOL = False
+# Disk budget in bytes for each service's persistent log history
+# (runtime/service_logs.py); 0 disables storage.
+SERVICE_LOG_MAX_BYTES = _service_logs.DEFAULT_MAX_BYTES
+
+
+def _tuning(settings: Any, name: str, default: Any) -> Any:
+    """Value of the tuning knob ``name``: a ``settings`` field of that
+    name if the model has one, else the ``ROBOTLAB_X_<NAME>`` process
+    environment variable parsed as JSON (``["a","b"]``, ``8``, ``true``),
+    else ``default``.
+
+    Only the process environment is consulted: the generated model
+    forbids unknown ``ROBOTLAB_X_*`` keys in ``.env``.
+    """
+    value = getattr(settings, name, None)
+    if value is not None:
+        return value
+    env = "ROBOTLAB_X_" + name.upper()
+    raw = os.environ.get(env)
+    if raw is None:
+        return default
+    try:
+        return json.loads(raw)
+    except ValueError:
+        logger.warning("ignoring unparseable %s=%r", env, raw)
+        return default
+
+
+def _topic_list(cfg: dict, key: str) -> list:
+    """``cfg[key]`` as a list of topic strings. A single string is taken
+    as a one-topic list (``"/+/+/telemetry"``); anything else that isn't
+    a list of strings is ignored with a warning."""
+    value = cfg.get(key)
+    if not value:
+        return []
+    if isinstance(value, str):
+        return [value]
+    if isinstance(value, list) and all(isinstance(t, str) for t in value):
+        return value
+    logger.warning("ignoring runtime.service_config.%s=%r — expected a list of topics", key, value)
+    return []
+
 
 def _bridge_jwt_secret() -> None:
     """Bridge ``ROBOTLAB_X_JWT_SECRET`` from .env to ``JWT_SECRET_KEY``
@@ -105,16 +181,24 @@ def on_startup():
     # working file isolated. (robotlab_x onboards via first_user_claim, so
     # there is no admin_password.txt.)
     _databases_dir = str(Path(settings.data_dir or "data") / "databases")
-    create_database_client(DatabaseTinydbConfig(
-        name="default",
-        data_dir=_databases_dir,
-    ))
+    create_database_client(
+        DatabaseTinydbConfig(
+            name="default",
+            data_dir=_databases_dir,
+        ),
+        # Hot tables (service_proxy, workspace, service_meta) are re-read
+        # by the reconciler every tick; keep them in memory, write-through.
+        cache_tables=_tuning(settings, "db_cache_tables", DB_CACHE_TABLES),
+        cache_ttl_s=_tuning(settings, "db_cache_ttl_s", DB_CACHE_TTL_S),
+    )
     db: DatabaseAdapter = get_database_client()
     if not db:
         logger.error("Database client not created.")
         raise Exception("Database client not created.")
 
-    db.ensure_table(model=AuthSession)
+    # auth_session is looked up by user and by refresh-token hash on
+    # every login/refresh; SQL backends index those columns.
+    db.ensure_table(model=AuthSession, indexes=[("user_id", "status"), "refresh_token_hash"])
     db.ensure_table(model=Registration)
     db.ensure_table(model=User)
     db.ensure_table(model=ServiceMeta)
@@ -183,6 +267,16 @@ def on_startup():
     data_dir_path = Path(settings.data_dir or "data")
     if not data_dir_path.is_absolute():
         data_dir_path = Path.cwd() / data_dir_path
+    # Persist spawned-child pids before anything is spawned, and pick up
+    # whatever a previous runtime on this data dir left running — the
+    # reconciler reaps those from the registry instead of scanning /proc.
+    _pid_registry.configure(data_dir_path)
+    _warm_pool.configure(bool(_tuning(settings, "subprocess_warm_pool", SUBPROCESS_WARM_POOL)))
+    # Per-service log history, before anything starts printing.
+    _service_logs.configure(
+        data_dir_path,
+        _tuning(settings, "service_log_max_bytes", SERVICE_LOG_MAX_BYTES),
+    )
     # Pin the active set for the life of this process BEFORE any provisioning
     # or runtime config-set I/O — a later UI "switch" rewrites the marker for
     # the next boot only and must not retarget the live process's writes.
@@ -194,16 +288,23 @@ def on_startup():
 
     # Bring back every service that was running when we shut down. Their
     # service_proxy rows still say 'running' but the processes are gone;
-    # this resets them to 'stopped' and fires start_service. After this,
-    # workspace.activated_at gets re-stamped where applicable.
-    reconcile_running_proxies(db)
+    # this resets them to 'stopped' and fires start_service — independent
+    # services concurrently, dependents after what they depend on (see
+    # runtime/start_graph.py). After this, workspace.activated_at gets
+    # re-stamped where applicable.
+    reconcile_running_proxies(
+        db,
+        start_order=boot_report.get("start_order"),
+        depends_on=boot_report.get("depends_on"),
+        max_concurrency=_tuning(settings, "boot_start_concurrency", BOOT_START_CONCURRENCY) or 1,
+    )
     restore_active_workspaces(db)
 
     # Periodic reconciler — converges drift unconditionally. Without it
     # we depend on every lifecycle event reaching every consumer, which
     # has historically been brittle (UI tab caches, dropped frames mid-
     # restart, orphan subprocesses surviving a crash, etc.).
-    _reconciler.start()
+    _reconciler.start(proc_sweep=bool(_tuning(settings, "reconcile_proc_sweep", RECONCILE_PROC_SWEEP)))
 
     # ─── Runtime identity (multi-runtime federation, step 1) ──────────
     # Resolve once and persist; this id is the future ``@<id>`` topic
@@ -243,6 +344,10 @@ def on_startup():
     # background.
     runtime_row = db.get_item("service_proxy", "runtime") or {}
     runtime_cfg = runtime_row.get("service_config") or {}
+    # Topics whose publishes to peers are latest-value-wins in each
+    # peer's send queue (runtime.service_config.peer_coalesce_topics,
+    # e.g. ["/+/+/telemetry"]); retained publishes always are.
+    _peer_manager.coalesce_topics(*_topic_list(runtime_cfg, "peer_coalesce_topics"))
     peer_urls = runtime_cfg.get("peers") or []
     for url in peer_urls:
         try:
@@ -312,11 +417,15 @@ def _publish_runtime_info(db: DatabaseAdapter, runtime_id: str, settings: Robotl
     import os
     from datetime import datetime, timezone
 
+    from robotlab_x.runtime import ws_endpoint
+
     info = {
         "id": runtime_id,
         "version": _read_version(),
         "started_at": datetime.now(timezone.utc).isoformat(),
         "pid": os.getpid(),
+        # Optional /v1/ws methods — peers batch publishes only if listed.
+        "ws_features": list(ws_endpoint.FEATURES),
     }
     try:
         get_bus().publish_sync("/runtime/info", info, retained=True)
@@ -361,6 +470,8 @@ def on_shutdown():
             loop.close()
     except Exception:  # noqa: BLE001
         logger.exception("runtime.system_state: shutdown failed")
+    # Parked interpreters would exit on stdin EOF anyway; retire them now.
+    _warm_pool.shutdown()
 
 
 def on_new_registration(registration, request: Optional[Request] = None):
@@ -23,6 +23,7 @@ import time
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Type
 
+from robotlab_x.runtime import service_logs
 from robotlab_x.runtime.bus import get_bus
 
 from ..adapter import ServiceAdapter, ServiceHandle
@@ -32,6 +33,11 @@ from ..service import Service, ServiceMetadata
 
 logger = logging.getLogger(__name__)
 
+# Serialises _load_service_class: it mutates sys.path / sys.modules and
+# exec's module code outside the import lock, and boot starts services
+# from several threads at once (runtime/start_graph.py).
+_LOAD_LOCK = threading.RLock()
+
 
 def _log_topic(proxy_id: str) -> str:
     return f"/service_proxy/{proxy_id}/log"
@@ -41,12 +47,12 @@ def emit_log(proxy_id: str, line: str, stream: str = "stdout") -> None:
     """Publish a log line to the service's per-proxy log topic.
 
     Kept as a free function (not a method) so service code can import it
-    without holding a reference to the adapter.
+    without holding a reference to the adapter. The line is stored in
+    ``service_logs`` first, so the payload carries its ``seq``.
     """
-    get_bus().publish_sync(
-        _log_topic(proxy_id),
-        {"stream": stream, "line": line, "ts": time.time()},
-    )
+    entry = {"stream": stream, "line": line, "ts": time.time()}
+    service_logs.append(proxy_id, [entry])
+    get_bus().publish_sync(_log_topic(proxy_id), entry)
 
 
 def _load_service_class(
@@ -177,7 +183,8 @@ class InProcessAdapter(ServiceAdapter):
 
         repo_dir = _resolve_type_root(type_name, type_version)
         try:
-            cls = _load_service_class(repo_dir, type_name, type_version, module_name, class_name)
+            with _LOAD_LOCK:
+                cls = _load_service_class(repo_dir, type_name, type_version, module_name, class_name)
         except Exception as exc:
             emit_log(proxy_id, f"[framework] failed to load {type_name}: {exc}", "stderr")
             raise
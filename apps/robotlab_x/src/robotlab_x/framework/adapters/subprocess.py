@@ -44,6 +44,17 @@ def _type_dir(meta: Dict[str, Any]) -> Path:
     return found if found is not None else _resolve_repo_dir() / name / version
 
 
+def _preload(type_dir: Path, meta: Dict[str, Any]) -> List[str]:
+    """The type's ``entry.preload`` from its package.yml (manifest-index
+    cached), for process_manager's warm pool. Not part of the
+    service_meta row."""
+    from robotlab_x.runtime.repo import PACKAGE_MANIFEST_FILE, load_manifest
+
+    name, _, version = (meta.get("id") or "").partition("@")
+    manifest = load_manifest(type_dir / PACKAGE_MANIFEST_FILE, name, version)
+    return list(manifest.entry.preload) if manifest is not None else []
+
+
 class SubprocessAdapter(ServiceAdapter):
     """Runs the service via subprocess.Popen, supervised by process_manager."""
 
@@ -68,6 +79,7 @@ class SubprocessAdapter(ServiceAdapter):
             venv_bin,
             cwd=type_dir,
             service_meta_id=meta.get("id"),
+            preload=_preload(type_dir, meta),
         )
         return ServiceHandle(
             proxy_id=proxy_id,
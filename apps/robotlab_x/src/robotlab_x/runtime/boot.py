@@ -49,7 +49,7 @@ from robotlab_x.runtime.config_sets import (
     load_runtime_yml,
     save_proxy_yml,
 )
-from robotlab_x.runtime.repo import PackageManifest, repo_roots, root_of, scan_repo, scan_repos
+from robotlab_x.runtime.repo import PackageManifest, find_manifest, repo_roots, root_of, scan_repo, scan_repos
 
 
 def _all_roots(repo_dir: Path) -> List[Path]:
@@ -335,6 +335,12 @@ def sync_config_set_to_db(
         return actions
     runtime_yml = load_runtime_yml(set_dir)
     in_start_order = set(runtime_yml.start_order)
+    # One read for the whole set, one batched write at the end — a set
+    # of N proxies used to cost N get_item + N separate commits.
+    existing_rows = {
+        row["id"]: row for row in (db.get_all_items("service_proxy") or []) if row.get("id")
+    }
+    rows: Dict[str, Dict[str, Any]] = {}
     for path in sorted(set_dir.iterdir()):
         if not path.is_file() or path.suffix != ".yml":
             continue
@@ -362,8 +368,8 @@ def sync_config_set_to_db(
 
         desired_state = parsed.get("desired_state")
 
-        existing = db.get_item("service_proxy", proxy_id)
-        if existing is None:
+        existing = existing_rows.get(proxy_id)
+        if not existing:
             new_row = {
                 "id": proxy_id,
                 "name": proxy_id,
@@ -390,7 +396,7 @@ def sync_config_set_to_db(
                 # Legacy fallback: no desired_state recorded, but the yml is
                 # in start_order — boot path expects to spawn it.
                 new_row["status"] = "running"
-            db.insert_item("service_proxy", proxy_id, new_row)
+            rows[proxy_id] = new_row
             actions[proxy_id] = "created"
             continue
 
@@ -416,8 +422,10 @@ def sync_config_set_to_db(
             # Legacy fallback (yml predates desired_state).
             existing["status"] = "running"
             existing["error"] = None
-        db.update_item("service_proxy", proxy_id, existing, include_nulls=True)
+        rows[proxy_id] = existing
         actions[proxy_id] = "updated"
+    if rows:
+        db.upsert_many("service_proxy", rows)
     return actions
 
 
@@ -456,6 +464,7 @@ def boot_from_config_set(
             )
 
     actions = sync_config_set_to_db(db, set_dir, manifests, decrypt_fn=decrypt_fn)
+    runtime_yml = load_runtime_yml(set_dir)
     if actions:
         created = [k for k, v in actions.items() if v == "created"]
         updated = [k for k, v in actions.items() if v == "updated"]
@@ -474,6 +483,9 @@ def boot_from_config_set(
         "migrated": migrated,
         "sync_actions": actions,
         "security_available": sec_core is not None,
+        # Consumed by reconcile_running_proxies' parallel start.
+        "start_order": runtime_yml.start_order,
+        "depends_on": runtime_yml.depends_on,
     }
 
 
@@ -572,7 +584,8 @@ def save_one_service_config(
             "proxy_id": proxy_id,
         }
 
-    manifests = {m.id: m for m in scan_repos(_all_roots(repo_dir))}
+    manifest = find_manifest(_all_roots(repo_dir), type_id)
+    manifests = {type_id: manifest} if manifest is not None else {}
     set_dir = active_set_dir(data_dir)
     set_dir.mkdir(parents=True, exist_ok=True)
     sec_core = bootstrap_security_core(data_dir, repo_dir=repo_dir)
@@ -636,12 +649,13 @@ def save_all_service_config(
     skipped: Dict[str, str] = {}
     live_states: Dict[str, str] = {}
 
+    metas = {m.get("id"): m for m in (db.get_all_items("service_meta") or [])}
     for row in (db.get_all_items("service_proxy") or []):
         proxy_id = row.get("id")
         type_id = row.get("service_meta_id")
         if not proxy_id or not type_id:
             continue
-        meta = db.get_item("service_meta", type_id) or {}
+        meta = metas.get(type_id) or {}
         if "singleton" in (meta.get("tags") or []):
             skipped[proxy_id] = "singleton (rides restart)"
             continue
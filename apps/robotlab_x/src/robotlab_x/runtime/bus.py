@@ -16,7 +16,9 @@ Backpressure: every subscriber gets its own bounded ``asyncio.Queue``.
 On a full queue we drop the *oldest* message (consumer fell behind, not
 publisher), increment a counter, and emit one ``bus.slow_consumer`` log
 line per subscriber per 1 second window. We never drop the publish call
-itself.
+itself. A consumer holding many subscriptions (a ``/v1/ws`` connection)
+can instead attach them all to one ``BusSink`` — one shared bounded
+queue, same drop-oldest rule, drops still counted per subscription.
 """
 
 from __future__ import annotations
@@ -26,8 +28,10 @@ import logging
 import re
 import threading
 import time
-from dataclasses import dataclass
-from typing import Any, AsyncIterator, Dict, List, Optional, Set
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Union
+
+from rlx_bus import codec as wire
 
 
 logger = logging.getLogger(__name__)
@@ -40,6 +44,12 @@ _DEFAULT_QUEUE_DEPTH = 128
 # subscriber — prevents log spam when a consumer is sustained-slow.
 _SLOW_LOG_THROTTLE_SECONDS = 1.0
 
+# Upper bound on the per-topic wildcard match cache. Topics are mostly a
+# fixed set per robot, but ids in topic names (request ids, sessions)
+# can make the key space open-ended — past this size the cache is
+# simply dropped and rebuilt from the trie.
+_MATCH_CACHE_MAX = 4096
+
 
 @dataclass
 class BusMessage:
@@ -56,6 +66,43 @@ class BusMessage:
     reply_to: Optional[str] = None
     sender_id: Optional[str] = None
     timestamp: float = 0.0
+    # Lazily-encoded WS delivery frames, one per wire codec, shared by
+    # every consumer of this message. See ``ws_frame``.
+    _ws_frame: Optional[str] = field(
+        default=None, init=False, repr=False, compare=False,
+    )
+    _ws_frame_bin: Optional[bytes] = field(
+        default=None, init=False, repr=False, compare=False,
+    )
+
+    def ws_frame(self, codec: str = wire.JSON) -> Union[str, bytes]:
+        """The ``method: "message"`` frame for this envelope, encoded
+        with ``codec`` (JSON text, or MessagePack bytes).
+
+        Encoded on first call per codec and cached, so a publish fanned
+        out to N ``/v1/ws`` connections (browser tabs, subprocess
+        services, peer runtimes) pays for one encode instead of N. A
+        delivered message is treated as immutable — mutating ``payload``
+        after the first call is not reflected. Two loops racing on the
+        first call both encode the same bytes; the last write wins,
+        harmlessly.
+        """
+        binary = codec != wire.JSON
+        frame = self._ws_frame_bin if binary else self._ws_frame
+        if frame is None:
+            frame = wire.encode({
+                "method": "message",
+                "topic": self.topic,
+                "payload": self.payload,
+                "sender_id": self.sender_id,
+                "reply_to": self.reply_to,
+                "timestamp": self.timestamp,
+            }, codec)
+            if binary:
+                self._ws_frame_bin = frame
+            else:
+                self._ws_frame = frame
+        return frame
 
 
 class _Subscriber:
@@ -74,12 +121,20 @@ class _Subscriber:
     path, and that happens on the consumer's own loop.
     """
 
-    __slots__ = ("topic", "queue", "subscriber_id", "dropped",
+    __slots__ = ("topic", "queue", "subscriber_id", "dropped", "options",
                  "_last_slow_log", "_consumer_loop")
 
-    def __init__(self, topic: str, subscriber_id: str, queue_depth: int):
+    sink = None  # see _SinkSubscriber
+
+    def __init__(
+        self, topic: str, subscriber_id: str, queue_depth: int,
+        options: Optional[Dict[str, Any]] = None,
+    ):
         self.topic = topic
         self.subscriber_id = subscriber_id
+        # Subscription options (subscription_options) — only forwarded
+        # to the peer manager for ``@peer`` topics.
+        self.options = options
         self.queue: asyncio.Queue[BusMessage] = asyncio.Queue(maxsize=queue_depth)
         # Public so introspection (Bus.dropped_count, list_topics) can read it.
         self.dropped = 0
@@ -141,13 +196,143 @@ class _Subscriber:
                 return
         self._enqueue(message)
 
+    def terminate(self) -> None:
+        """Wake the awaiting consumer so its ``finally`` cleanup runs."""
+        try:
+            self.queue.put_nowait(_TERMINATE)
+        except asyncio.QueueFull:
+            pass
+
+
+class _SinkSubscriber:
+    """One topic's registration inside a shared ``BusSink``.
+
+    Sits in the same registries as ``_Subscriber`` and exposes the same
+    introspection surface (``topic``, ``subscriber_id``, ``dropped``),
+    but has no queue of its own — deliveries go to the sink, tagged with
+    this subscription so drops are charged to the right topic.
+    """
+
+    __slots__ = ("topic", "sink", "subscriber_id", "dropped", "active", "options")
+
+    def __init__(self, topic: str, sink: "BusSink", options: Optional[Dict[str, Any]] = None):
+        self.topic = topic
+        self.sink = sink
+        self.subscriber_id = sink.subscriber_id
+        self.dropped = 0
+        self.options = options
+        # Cleared on detach. Messages already sitting in the sink for
+        # an inactive subscription are skipped by the consumer, matching
+        # the old per-topic behaviour where cancelling the pump threw its
+        # queue away.
+        self.active = True
+
+    def deliver(self, message: BusMessage) -> None:
+        self.sink.deliver(self, message)
+
+    def terminate(self) -> None:
+        self.active = False
+
+
+class BusSink:
+    """One bounded delivery queue shared by many subscriptions.
+
+    Per-topic ``Bus.subscribe`` iterators cost a task and a queue each;
+    a WebSocket client subscribed to hundreds of topics would hold
+    hundreds of both. ``Bus.attach(topic, sink)`` registers a topic
+    against this sink instead, and the owner drains every topic with a
+    single ``async for msg in sink.messages()``.
+
+    Same drop-oldest backpressure as ``_Subscriber``; the evicted
+    message's *own* subscription gets the ``dropped`` increment, so
+    ``Bus.dropped_count`` / ``list_topics_detail`` still say which topic
+    the consumer is falling behind on. Same loop-affinity rule too:
+    bound to the loop it was created on, cross-loop deliveries hop via
+    ``call_soon_threadsafe``.
+    """
+
+    def __init__(self, subscriber_id: str, queue_depth: int = _DEFAULT_QUEUE_DEPTH):
+        self.subscriber_id = subscriber_id
+        self.queue: asyncio.Queue[tuple[Optional[_SinkSubscriber], BusMessage]] = (
+            asyncio.Queue(maxsize=queue_depth)
+        )
+        # topic → registration; owned by Bus.attach / Bus.detach.
+        self.subscriptions: Dict[str, _SinkSubscriber] = {}
+        self._last_slow_log = 0.0
+        try:
+            self._consumer_loop: Optional[asyncio.AbstractEventLoop] = (
+                asyncio.get_running_loop()
+            )
+        except RuntimeError:
+            self._consumer_loop = None
+
+    def deliver(self, sub: _SinkSubscriber, message: BusMessage) -> None:
+        loop = self._consumer_loop
+        if loop is not None:
+            try:
+                current = asyncio.get_running_loop()
+            except RuntimeError:
+                current = None
+            if current is not loop:
+                loop.call_soon_threadsafe(self._enqueue, sub, message)
+                return
+        self._enqueue(sub, message)
+
+    def _enqueue(self, sub: Optional[_SinkSubscriber], message: BusMessage) -> None:
+        """Put on the shared queue. MUST run on the consumer's loop."""
+        if sub is not None and not sub.active:
+            return
+        if self.queue.full():
+            try:
+                victim, _ = self.queue.get_nowait()
+            except asyncio.QueueEmpty:  # pragma: no cover — concurrent drain
+                victim = None
+            if victim is not None:
+                victim.dropped += 1
+                now = time.monotonic()
+                if now - self._last_slow_log >= _SLOW_LOG_THROTTLE_SECONDS:
+                    logger.warning(
+                        "bus.slow_consumer subscriber=%s topic=%s dropped=%d",
+                        self.subscriber_id,
+                        victim.topic,
+                        victim.dropped,
+                    )
+                    self._last_slow_log = now
+        try:
+            self.queue.put_nowait((sub, message))
+        except asyncio.QueueFull:  # pragma: no cover — drained above
+            pass
+
+    def close(self) -> None:
+        """End ``messages()`` once the consumer drains to this point."""
+        self.deliver(None, _TERMINATE)  # type: ignore[arg-type]
+
+    async def messages(self) -> AsyncIterator[BusMessage]:
+        """Every delivery for every attached topic, in arrival order."""
+        async for _, message in self.deliveries():
+            yield message
+
+    async def deliveries(self) -> AsyncIterator[tuple[_SinkSubscriber, BusMessage]]:
+        """``messages`` paired with the subscription each one arrived on,
+        for consumers that treat their subscriptions differently
+        (``ws_endpoint``'s per-subscription rate limits)."""
+        while True:
+            sub, message = await self.queue.get()
+            if sub is None:
+                return
+            if sub.active:
+                yield sub, message
+
 
 def is_wildcard_pattern(pattern: str) -> bool:
     """True if ``pattern`` contains MQTT-style wildcards.
 
     Pure exact-match topics take a fast path on subscribe; wildcards
-    register into the slower _wildcard_subscribers bucket.
+    register into the _wildcard_subscribers bucket and the segment trie.
+    A federation suffix doesn't count: ``/a/#@silly-droid`` is a pattern.
     """
+    if "@" in pattern:
+        pattern, _ = parse_id_suffix(pattern)
     return "+" in pattern or pattern.endswith("#") or "/#/" in pattern
 
 
@@ -162,9 +347,17 @@ def topic_matches_pattern(topic: str, pattern: str) -> bool:
     Both ``topic`` and ``pattern`` are split on '/'. Empty leading
     segments (from leading slashes) participate — ``/a/b`` has segments
     ``['', 'a', 'b']``, which is fine as long as both sides agree.
+
+    A pattern with a federation suffix matches topics with the same
+    suffix whose base matches: ``/a/#@silly-droid`` matches
+    ``/a/b@silly-droid`` (bridged from that peer), not ``/a/b``.
     """
     if not is_wildcard_pattern(pattern):
         return topic == pattern
+    p_base, p_peer = parse_id_suffix(pattern)
+    if p_peer is not None:
+        t_base, t_peer = parse_id_suffix(topic)
+        return t_peer == p_peer and topic_matches_pattern(t_base, p_base)
     p_segs = pattern.split("/")
     t_segs = topic.split("/")
     # '#' must be the last segment if present anywhere; if not last, no match.
@@ -183,6 +376,172 @@ def topic_matches_pattern(topic: str, pattern: str) -> bool:
     return len(p_segs) == len(t_segs)
 
 
+def pattern_covers(outer: str, inner: str) -> bool:
+    """True if every topic ``inner`` matches is also matched by ``outer``
+    (either may be a literal topic): ``#`` covers ``+`` covers exact, so
+    ``/a/#`` ⊇ ``/a/+/c`` ⊇ ``/a/b/c``. The peer manager uses it to
+    collapse overlapping upstream subscriptions."""
+    if outer == inner:
+        return True
+    o_segs = outer.split("/")
+    i_segs = inner.split("/")
+    if any(s == "#" for s in o_segs[:-1]):
+        return False
+    for i, seg in enumerate(o_segs):
+        if seg == "#":
+            return True
+        if i >= len(i_segs) or i_segs[i] == "#":
+            return False
+        if seg != "+" and seg != i_segs[i]:
+            return False
+    return len(o_segs) == len(i_segs)
+
+
+class _TrieNode:
+    """One segment level of ``_PatternTrie``."""
+
+    __slots__ = ("children", "plus", "hash_pattern", "pattern")
+
+    def __init__(self) -> None:
+        self.children: Dict[str, _TrieNode] = {}
+        self.plus: Optional[_TrieNode] = None
+        # Pattern that ends in ``#`` at this level (``/a/#`` lives on the
+        # ``a`` node) — matches this node and everything below it.
+        self.hash_pattern: Optional[str] = None
+        # Pattern that ends exactly at this node.
+        self.pattern: Optional[str] = None
+
+    def is_empty(self) -> bool:
+        return (
+            not self.children and self.plus is None
+            and self.hash_pattern is None and self.pattern is None
+        )
+
+
+class _PatternTrie:
+    """Segment trie over the registered wildcard patterns.
+
+    Replaces the linear ``topic_matches_pattern`` scan on publish:
+    matching walks the topic's segments once, branching only into the
+    ``+`` child where one exists, so the cost is O(topic depth) rather
+    than O(patterns × segments). Semantics are identical to
+    ``topic_matches_pattern`` — malformed patterns (``#`` anywhere but
+    last) are never inserted, so they never match.
+
+    Patterns with a federation suffix (``/+/state@silly-droid``) go in a
+    per-peer sub-trie keyed on their base, consulted only for topics
+    carrying that suffix.
+
+    Not thread-safe on its own; the Bus calls it under ``_lock``.
+    """
+
+    __slots__ = ("_root", "_peers")
+
+    def __init__(self) -> None:
+        self._root = _TrieNode()
+        self._peers: Dict[str, _PatternTrie] = {}
+
+    def add(self, pattern: str) -> None:
+        base, peer_id = parse_id_suffix(pattern)
+        if peer_id is not None:
+            self._peers.setdefault(peer_id, _PatternTrie())._add(base, pattern)
+        else:
+            self._add(pattern, pattern)
+
+    def remove(self, pattern: str) -> None:
+        base, peer_id = parse_id_suffix(pattern)
+        if peer_id is None:
+            self._remove(pattern)
+            return
+        sub = self._peers.get(peer_id)
+        if sub is not None:
+            sub._remove(base)
+            if sub._root.is_empty():
+                del self._peers[peer_id]
+
+    def match(self, topic: str) -> List[str]:
+        """Every registered pattern that matches ``topic``."""
+        out = self._match(topic)
+        if self._peers:
+            base, peer_id = parse_id_suffix(topic)
+            sub = self._peers.get(peer_id) if peer_id is not None else None
+            if sub is not None:
+                out.extend(sub._match(base))
+        return out
+
+    def _add(self, key: str, pattern: str) -> None:
+        segs = key.split("/")
+        if any(s == "#" for s in segs[:-1]):
+            return  # malformed — matches nothing, nothing to index
+        node = self._root
+        for seg in segs[:-1]:
+            node = self._child(node, seg)
+        last = segs[-1]
+        if last == "#":
+            node.hash_pattern = pattern
+        else:
+            self._child(node, last).pattern = pattern
+
+    def _remove(self, key: str) -> None:
+        segs = key.split("/")
+        if any(s == "#" for s in segs[:-1]):
+            return
+        path: List[tuple[_TrieNode, str]] = []
+        node = self._root
+        walk = segs if segs[-1] != "#" else segs[:-1]
+        for seg in walk:
+            nxt = node.plus if seg == "+" else node.children.get(seg)
+            if nxt is None:
+                return
+            path.append((node, seg))
+            node = nxt
+        if segs[-1] == "#":
+            node.hash_pattern = None
+        else:
+            node.pattern = None
+        # Prune now-empty nodes bottom-up so the trie doesn't accrete
+        # dead branches as UI tabs come and go.
+        for parent, seg in reversed(path):
+            child = parent.plus if seg == "+" else parent.children.get(seg)
+            if child is None or not child.is_empty():
+                break
+            if seg == "+":
+                parent.plus = None
+            else:
+                parent.children.pop(seg, None)
+
+    def _match(self, topic: str) -> List[str]:
+        segs = topic.split("/")
+        depth = len(segs)
+        out: List[str] = []
+        stack: List[tuple[_TrieNode, int]] = [(self._root, 0)]
+        while stack:
+            node, i = stack.pop()
+            if node.hash_pattern is not None:
+                out.append(node.hash_pattern)
+            if i == depth:
+                if node.pattern is not None:
+                    out.append(node.pattern)
+                continue
+            child = node.children.get(segs[i])
+            if child is not None:
+                stack.append((child, i + 1))
+            if node.plus is not None:
+                stack.append((node.plus, i + 1))
+        return out
+
+    @staticmethod
+    def _child(node: _TrieNode, seg: str) -> _TrieNode:
+        if seg == "+":
+            if node.plus is None:
+                node.plus = _TrieNode()
+            return node.plus
+        child = node.children.get(seg)
+        if child is None:
+            child = node.children[seg] = _TrieNode()
+        return child
+
+
 # ─────────────────────────────────────────────────────────────────────
 # Federation address parsing — ``/topic@<runtime-id>`` suffix grammar.
 # ─────────────────────────────────────────────────────────────────────
@@ -239,30 +598,34 @@ def _route_remote_publish(
     )
 
 
-def _notify_remote_subscribe(peer_id: str, base_topic: str, local_topic: str) -> None:
-    """First local subscriber on ``local_topic`` (suffix form) — ask
-    the peer manager to open the upstream subscription so messages
-    start flowing back."""
+def _notify_remote_subscribe(
+    peer_id: str, base_topic: str, local_topic: str, options: Optional[Dict[str, Any]],
+) -> None:
+    """New local subscriber on ``local_topic`` (suffix form) — ask the
+    peer manager to open the upstream subscription so messages start
+    flowing back, or to widen it to this subscriber's ``options``."""
     try:
         from robotlab_x.runtime import peer_manager
     except ImportError:
         return
     try:
-        peer_manager.on_local_subscribe(peer_id, base_topic, local_topic)
+        peer_manager.on_local_subscribe(peer_id, base_topic, local_topic, options)
     except Exception:  # noqa: BLE001
         logger.exception("peer_manager.on_local_subscribe raised")
 
 
-def _notify_remote_unsubscribe(peer_id: str, base_topic: str, local_topic: str) -> None:
-    """Last local subscriber on ``local_topic`` gone — peer manager
-    can drop the upstream subscription. Fire-and-forget; failures
-    log but don't propagate."""
+def _notify_remote_unsubscribe(
+    peer_id: str, base_topic: str, local_topic: str, options: Optional[Dict[str, Any]],
+) -> None:
+    """A local subscriber on ``local_topic`` is gone — the peer manager
+    drops its reference and, with the last one, the upstream
+    subscription. Fire-and-forget; failures log but don't propagate."""
     try:
         from robotlab_x.runtime import peer_manager
     except ImportError:
         return
     try:
-        peer_manager.on_local_unsubscribe(peer_id, base_topic, local_topic)
+        peer_manager.on_local_unsubscribe(peer_id, base_topic, local_topic, options)
     except Exception:  # noqa: BLE001
         logger.exception("peer_manager.on_local_unsubscribe raised")
 
@@ -285,10 +648,15 @@ class Bus:
         # Exact-topic subscribers — fast O(1) lookup on publish.
         self._subscribers: Dict[str, Set[_Subscriber]] = {}
         # Wildcard pattern subscribers (containing '+' or terminal '#').
-        # Publishers iterate these and run topic_matches_pattern() per pattern.
-        # We never have many patterns at once — linear scan is fine until
-        # subscriber counts get into the hundreds.
+        # Keyed by pattern; the trie below indexes the same keys by
+        # segment so publish never scans the whole pattern set.
         self._wildcard_subscribers: Dict[str, Set[_Subscriber]] = {}
+        self._pattern_trie = _PatternTrie()
+        # topic → patterns matching it. Hot telemetry topics hit this on
+        # every publish; cleared whenever a pattern appears or disappears
+        # (NOT on every subscribe — adding a subscriber to an existing
+        # pattern doesn't change which patterns match).
+        self._match_cache: Dict[str, tuple[str, ...]] = {}
         self._retained: Dict[str, BusMessage] = {}
         # threading.Lock instead of asyncio.Lock so the bus is safely
         # callable from either coroutines or sync FastAPI handlers (which
@@ -310,6 +678,26 @@ class Bus:
         # don't take the lock just to count.
         self._publish_counts: Dict[str, int] = {}
 
+    def _matching_patterns(self, topic: str) -> tuple[str, ...]:
+        """Wildcard patterns matching ``topic``. Caller holds ``_lock``."""
+        cached = self._match_cache.get(topic)
+        if cached is None:
+            cached = tuple(self._pattern_trie.match(topic))
+            if len(self._match_cache) >= _MATCH_CACHE_MAX:
+                self._match_cache.clear()
+            self._match_cache[topic] = cached
+        return cached
+
+    def _add_pattern(self, pattern: str) -> None:
+        """First subscriber on a new wildcard pattern. Caller holds ``_lock``."""
+        self._pattern_trie.add(pattern)
+        self._match_cache.clear()
+
+    def _remove_pattern(self, pattern: str) -> None:
+        """Last subscriber on a wildcard pattern gone. Caller holds ``_lock``."""
+        self._pattern_trie.remove(pattern)
+        self._match_cache.clear()
+
     def publish_counts(self) -> Dict[str, int]:
         """Snapshot of cumulative publish counts per topic. The digest
         diffs successive snapshots to compute a rate."""
@@ -351,9 +739,9 @@ class Bus:
             self._retained[topic] = message
         with self._lock:
             subs = list(self._subscribers.get(topic, ()))
-            for pattern, bucket in self._wildcard_subscribers.items():
-                if topic_matches_pattern(topic, pattern):
-                    subs.extend(bucket)
+            if self._wildcard_subscribers:
+                for pattern in self._matching_patterns(topic):
+                    subs.extend(self._wildcard_subscribers[pattern])
         for sub in subs:
             sub.deliver(message)
         return len(subs)
@@ -416,10 +804,10 @@ class Bus:
 
         with self._lock:
             subs = list(self._subscribers.get(topic, ()))
-            # Wildcard fan-out — small N, linear scan is fine.
-            for pattern, bucket in self._wildcard_subscribers.items():
-                if topic_matches_pattern(topic, pattern):
-                    subs.extend(bucket)
+            # Wildcard fan-out — trie lookup, cached per topic.
+            if self._wildcard_subscribers:
+                for pattern in self._matching_patterns(topic):
+                    subs.extend(self._wildcard_subscribers[pattern])
 
         for sub in subs:
             sub.deliver(message)
@@ -454,8 +842,128 @@ class Bus:
 
     # ─── subscribe ───────────────────────────────────────────────────────
 
+    def _register(self, sub: "_Subscriber | _SinkSubscriber") -> bool:
+        """Add ``sub`` to its registry. Returns True if it is the first
+        subscriber on its topic/pattern."""
+        topic = sub.topic
+        wildcard = is_wildcard_pattern(topic)
+        with self._lock:
+            registry = self._wildcard_subscribers if wildcard else self._subscribers
+            existed_before = topic in registry and bool(registry[topic])
+            registry.setdefault(topic, set()).add(sub)
+            if wildcard and not existed_before:
+                self._add_pattern(topic)
+        return not existed_before
+
+    def _unregister(self, sub: "_Subscriber | _SinkSubscriber") -> bool:
+        """Remove ``sub`` from its registry. Returns False if it wasn't
+        registered (already swept by ``unsubscribe_all``)."""
+        topic = sub.topic
+        wildcard = is_wildcard_pattern(topic)
+        with self._lock:
+            registry = self._wildcard_subscribers if wildcard else self._subscribers
+            bucket = registry.get(topic)
+            if bucket is None or sub not in bucket:
+                return False
+            bucket.discard(sub)
+            if not bucket:
+                registry.pop(topic, None)
+                if wildcard:
+                    self._remove_pattern(topic)
+            return True
+
+    def _replay_retained(self, sub: "_Subscriber | _SinkSubscriber") -> None:
+        """Retained replay. Exact topics get O(1); wildcard subs scan the
+        retained map. Replay only happens at subscribe time — small
+        cost relative to staying subscribed."""
+        topic = sub.topic
+        if is_wildcard_pattern(topic):
+            for stored_topic, retained_msg in list(self._retained.items()):
+                if topic_matches_pattern(stored_topic, topic):
+                    sub.deliver(retained_msg)
+        else:
+            retained = self._retained.get(topic)
+            if retained is not None:
+                sub.deliver(retained)
+
+    def _local_subscribe_topic(self, topic: str) -> str:
+        """Self-id suffix strips; a remote peer's suffix is KEPT so local
+        consumers see remote messages on the natural ``/foo@silly-droid``
+        address. The peer bridge handles opening the upstream
+        subscription + forwarding."""
+        base, peer_id = parse_id_suffix(topic)
+        if peer_id is not None and peer_id == self._local_id:
+            return base
+        return topic
+
+    def _remote_hook(
+        self, topic: str, opened: bool, options: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Report each local subscriber on a peer-suffixed topic, with its
+        subscription ``options``, to the peer manager as it comes and
+        goes. The manager reference-counts them and decides what to
+        subscribe upstream. Fired OUTSIDE the lock so the manager's own
+        network I/O can't deadlock back into us."""
+        base, peer_id = parse_id_suffix(topic)
+        if peer_id is None or peer_id == self._local_id:
+            return
+        if opened:
+            _notify_remote_subscribe(peer_id, base, topic, options)
+        else:
+            _notify_remote_unsubscribe(peer_id, base, topic, options)
+
+    def attach(
+        self, topic: str, sink: BusSink, options: Optional[Dict[str, Any]] = None,
+    ) -> bool:
+        """Subscribe ``sink`` to ``topic`` (literal or wildcard pattern).
+
+        The sink counterpart of ``subscribe``: same federation handling
+        and retained replay, but no iterator or per-topic queue —
+        deliveries land on the sink's shared queue. Idempotent; returns
+        False if the sink was already attached to ``topic``. Its
+        ``options`` are still replaced if they differ.
+        ``options`` (see subscription_options) only shape the upstream
+        subscription of a ``@peer`` topic; the bus itself delivers
+        everything.
+        """
+        topic = self._local_subscribe_topic(topic)
+        sub = sink.subscriptions.get(topic)
+        if sub is not None:
+            if sub.options != options:
+                old, sub.options = sub.options, options
+                # New reference before dropping the old one, so the
+                # upstream subscription never lapses in between.
+                self._remote_hook(topic, opened=True, options=options)
+                self._remote_hook(topic, opened=False, options=old)
+            return False
+        sub = _SinkSubscriber(topic, sink, options)
+        sink.subscriptions[topic] = sub
+        self._register(sub)
+        self._remote_hook(topic, opened=True, options=options)
+        self._replay_retained(sub)
+        return True
+
+    def detach(self, topic: str, sink: BusSink) -> bool:
+        """Undo ``attach``. Messages for ``topic`` still queued on the
+        sink are discarded. Returns False if it wasn't attached."""
+        topic = self._local_subscribe_topic(topic)
+        sub = sink.subscriptions.pop(topic, None)
+        if sub is None:
+            return False
+        sub.active = False
+        if self._unregister(sub):
+            self._remote_hook(topic, opened=False, options=sub.options)
+        return True
+
+    def detach_all(self, sink: BusSink) -> int:
+        """Detach every topic from ``sink`` — WebSocket disconnect path."""
+        topics = list(sink.subscriptions)
+        for topic in topics:
+            self.detach(topic, sink)
+        return len(topics)
+
     async def subscribe(
-        self, topic: str, subscriber_id: str
+        self, topic: str, subscriber_id: str, options: Optional[Dict[str, Any]] = None,
     ) -> AsyncIterator[BusMessage]:
         """Async iterator over messages on ``topic`` for ``subscriber_id``.
 
@@ -470,66 +978,29 @@ class Bus:
         form as the LOCAL subscription topic — the peer bridge
         forwards remote ``/foo`` messages here by re-publishing them
         to ``/foo@<peer-id>`` locally. We also notify the peer manager
-        on subscribe so it can open the upstream subscription lazily.
+        on subscribe so it can open the upstream subscription lazily,
+        shaped by ``options`` (rate limit / projection, see
+        subscription_options).
         """
-        base, peer_id = parse_id_suffix(topic)
-        if peer_id is not None and peer_id == self._local_id:
-            topic = base   # self-id: strip and subscribe locally
-        # Note: when peer_id matches a remote runtime we KEEP the
-        # suffixed topic so local consumers see remote messages on the
-        # natural ``/foo@silly-droid`` address. The peer bridge handles
-        # opening the upstream subscription + forwarding.
-        sub = _Subscriber(topic, subscriber_id, self._queue_depth)
+        topic = self._local_subscribe_topic(topic)
+        sub = _Subscriber(topic, subscriber_id, self._queue_depth, options)
         # Capture the consumer's loop NOW — before registration, before
         # any deliver() call from another loop can race in. From this
         # point on, cross-loop delivers route via call_soon_threadsafe.
         sub.bind_loop(asyncio.get_running_loop())
-        wildcard = is_wildcard_pattern(topic)
-        with self._lock:
-            registry = self._wildcard_subscribers if wildcard else self._subscribers
-            existed_before = topic in registry and bool(registry[topic])
-            registry.setdefault(topic, set()).add(sub)
-        # Federation hook: if this is the first local subscriber on a
-        # peer-suffixed topic, ask the peer manager to open the upstream
-        # subscription. Fired OUTSIDE the lock so the manager's own
-        # network I/O can't deadlock back into us.
-        sub_peer_base, sub_peer_id = parse_id_suffix(topic)
-        if sub_peer_id is not None and sub_peer_id != self._local_id and not existed_before:
-            _notify_remote_subscribe(sub_peer_id, sub_peer_base, topic)
-
-        # Retained replay. Exact topics get O(1); wildcard subs scan the
-        # retained map. Replay only happens at subscribe time — small
-        # cost relative to staying subscribed.
-        if wildcard:
-            for stored_topic, retained_msg in list(self._retained.items()):
-                if topic_matches_pattern(stored_topic, topic):
-                    sub.deliver(retained_msg)
-        else:
-            retained = self._retained.get(topic)
-            if retained is not None:
-                sub.deliver(retained)
+        self._register(sub)
+        self._remote_hook(topic, opened=True, options=options)
+        self._replay_retained(sub)
 
         try:
             while True:
                 message = await sub.queue.get()
                 yield message
         finally:
-            with self._lock:
-                bucket = (self._wildcard_subscribers if wildcard else self._subscribers).get(topic)
-                empty_after = False
-                if bucket is not None:
-                    bucket.discard(sub)
-                    if not bucket:
-                        (self._wildcard_subscribers if wildcard else self._subscribers).pop(topic, None)
-                        empty_after = True
-            # Federation hook: last local subscriber gone → close the
-            # upstream subscription to stop the firehose. Same outside-
-            # the-lock discipline as the open path.
-            if (
-                empty_after and sub_peer_id is not None
-                and sub_peer_id != self._local_id
-            ):
-                _notify_remote_unsubscribe(sub_peer_id, sub_peer_base, topic)
+            # Drop this subscriber's upstream reference; the last one
+            # gone closes the upstream subscription.
+            if self._unregister(sub):
+                self._remote_hook(topic, opened=False, options=sub.options)
 
     async def unsubscribe_all(self, subscriber_id: str) -> int:
         """Drop every subscription (exact + wildcard) owned by ``subscriber_id``.
@@ -538,6 +1009,7 @@ class Bus:
         held many subscriptions.
         """
         removed = 0
+        swept: List["_Subscriber | _SinkSubscriber"] = []
         with self._lock:
             for registry in (self._subscribers, self._wildcard_subscribers):
                 for topic, bucket in list(registry.items()):
@@ -546,14 +1018,21 @@ class Bus:
                         continue
                     for s in stale:
                         bucket.discard(s)
-                        # Wake the awaiting consumer so its `finally` cleanup runs.
-                        try:
-                            s.queue.put_nowait(_TERMINATE)  # type: ignore[arg-type]
-                        except asyncio.QueueFull:
-                            pass
+                        # Iterators wake and run their `finally`; sink
+                        # registrations just go inactive.
+                        s.terminate()
+                        if s.sink is not None:
+                            s.sink.subscriptions.pop(s.topic, None)
+                        swept.append(s)
                         removed += 1
                     if not bucket:
                         registry.pop(topic, None)
+                        if registry is self._wildcard_subscribers:
+                            self._remove_pattern(topic)
+        # Swept iterators find themselves gone in their ``finally``, so
+        # their upstream references are released here instead.
+        for s in swept:
+            self._remote_hook(s.topic, opened=False, options=s.options)
         return removed
 
     # ─── introspection ───────────────────────────────────────────────────
@@ -568,11 +1047,12 @@ class Bus:
     def subscriber_count(self, topic: str) -> int:
         """Direct subscribers to an exact topic. Wildcard matches are
         counted under their pattern via ``pattern_subscriber_count``."""
-        exact = len(self._subscribers.get(topic, ()))
-        wildcard = sum(
-            len(b) for p, b in self._wildcard_subscribers.items()
-            if topic_matches_pattern(topic, p)
-        )
+        with self._lock:
+            exact = len(self._subscribers.get(topic, ()))
+            wildcard = sum(
+                len(self._wildcard_subscribers[p])
+                for p in self._matching_patterns(topic)
+            )
         return exact + wildcard
 
     def dropped_count(self, topic: str) -> int:
@@ -580,11 +1060,11 @@ class Bus:
         wildcard patterns that match ``topic`` are included so a slow
         consumer shows up under the topic it's eating."""
         total = 0
-        for sub in self._subscribers.get(topic, ()):
-            total += sub.dropped
-        for pattern, bucket in self._wildcard_subscribers.items():
-            if topic_matches_pattern(topic, pattern):
-                for sub in bucket:
+        with self._lock:
+            for sub in self._subscribers.get(topic, ()):
+                total += sub.dropped
+            for pattern in self._matching_patterns(topic):
+                for sub in self._wildcard_subscribers[pattern]:
                     total += sub.dropped
         return total
 
@@ -613,10 +1093,8 @@ class Bus:
                 out.append({**parse_subscriber_id(sub.subscriber_id),
                             "id": sub.subscriber_id,
                             "matched_via": "exact"})
-            for pattern, bucket in self._wildcard_subscribers.items():
-                if not topic_matches_pattern(topic, pattern):
-                    continue
-                for sub in bucket:
+            for pattern in self._matching_patterns(topic):
+                for sub in self._wildcard_subscribers[pattern]:
                     if id(sub) in seen:
                         continue
                     seen.add(id(sub))
@@ -29,7 +29,7 @@ from __future__ import annotations
 
 import logging
 from pathlib import Path
-from typing import List
+from typing import Dict, List
 
 from database.interface import DatabaseAdapter
 
@@ -122,44 +122,55 @@ def reconcile_catalog(db: DatabaseAdapter, repo_dirs) -> dict:
         return {"inserted": 0, "upserted": 0, "removed": 0, "found": 0, "error": "scan_failed"}
     found_ids = {m.id for m in manifests}
 
-    existing_rows = db.get_all_items("service_meta") or []
-    existing_ids = {row.get("id") for row in existing_rows if row.get("id")}
-
-    # Empty-scan guard: if the scan found nothing but the catalog already
-    # has rows, treat it as a transient/misconfigured scan (e.g. wrong
-    # cwd, a root being rewritten) rather than "every service was deleted
-    # from disk". Skip the whole reconcile so the catalog can't be wiped;
-    # a later good scan reconciles normally.
-    if not manifests and existing_ids:
-        logger.warning(
-            "catalog.reconcile: 0 manifests but %d existing rows (roots=%s) — "
-            "skipping to avoid wiping the catalog (empty-scan guard)",
-            len(existing_ids), [str(r) for r in roots],
-        )
-        return {"inserted": 0, "upserted": 0, "removed": 0, "found": 0, "skipped": "empty_scan_guard"}
-
-    inserted = 0
-    upserted = 0
-    for m in manifests:
-        record = manifest_to_service_meta(m)
-        # Tag which local root this type's source resolved from so the
-        # registry's install/uninstall know where it lives.
-        record["repo_root"] = str(root_of(m))
-        if m.id in existing_ids:
-            db.update_item("service_meta", m.id, record, include_nulls=True)
-            upserted += 1
-        else:
-            db.insert_item("service_meta", m.id, record)
-            inserted += 1
+    # One transaction for read, merge and rewrite: a crash half-way
+    # leaves the previous catalog, not a mix of old and new rows, and a
+    # row another thread updates meanwhile can't be overwritten by the
+    # merge of an older read (see the adapter's transaction() for what
+    # it isolates).
+    with db.transaction():
+        existing_rows = db.get_all_items("service_meta") or []
+        existing_ids = {row.get("id") for row in existing_rows if row.get("id")}
+
+        # Empty-scan guard: if the scan found nothing but the catalog already
+        # has rows, treat it as a transient/misconfigured scan (e.g. wrong
+        # cwd, a root being rewritten) rather than "every service was deleted
+        # from disk". Skip the whole reconcile so the catalog can't be wiped;
+        # a later good scan reconciles normally.
+        if not manifests and existing_ids:
+            logger.warning(
+                "catalog.reconcile: 0 manifests but %d existing rows (roots=%s) — "
+                "skipping to avoid wiping the catalog (empty-scan guard)",
+                len(existing_ids), [str(r) for r in roots],
+            )
+            return {"inserted": 0, "upserted": 0, "removed": 0, "found": 0, "skipped": "empty_scan_guard"}
+
+        # update_item merged the record over the stored row; upsert_many
+        # replaces, so merge here and write the whole catalog in one batch.
+        existing_by_id = {row["id"]: row for row in existing_rows if row.get("id")}
+        rows: Dict[str, dict] = {}
+        inserted = 0
+        upserted = 0
+        for m in manifests:
+            record = manifest_to_service_meta(m)
+            # Tag which local root this type's source resolved from so the
+            # registry's install/uninstall know where it lives.
+            record["repo_root"] = str(root_of(m))
+            if m.id in existing_ids:
+                rows[m.id] = {**existing_by_id.get(m.id, {}), **record}
+                upserted += 1
+            else:
+                rows[m.id] = record
+                inserted += 1
+
+        stale_ids = existing_ids - found_ids
+        db.upsert_many("service_meta", rows)
+        db.delete_many("service_meta", stale_ids)
         # Auto-materialize singleton instances. The runtime is the
         # canonical case — the backend process IS the running service,
         # so the proxy row should always exist and reflect this process.
-        _ensure_singleton_proxy(db, m)
-
-    removed = 0
-    for stale_id in existing_ids - found_ids:
-        db.delete_item("service_meta", stale_id)
-        removed += 1
+        for m in manifests:
+            _ensure_singleton_proxy(db, m)
+    removed = len(stale_ids)
 
     summary = {"inserted": inserted, "upserted": upserted, "removed": removed, "found": len(manifests)}
     logger.info("catalog.reconciled %s roots=%s", summary, [str(r) for r in roots])
@@ -98,9 +98,12 @@ class DecryptError(ConfigSetError):
 
 @dataclass
 class RuntimeYml:
-    """Parsed ``runtime.yml``. Today: just start_order; the file can
-    grow new fields without breaking existing callers."""
+    """Parsed ``runtime.yml``: start_order plus the optional explicit
+    ``depends_on`` map (proxy_id → proxy_ids it waits for at boot, see
+    ``start_graph``). The file can grow new fields without breaking
+    existing callers."""
     start_order: List[str] = field(default_factory=list)
+    depends_on: Dict[str, List[str]] = field(default_factory=dict)
 
 
 @dataclass
@@ -250,7 +253,18 @@ def load_runtime_yml(set_dir: Path) -> RuntimeYml:
         raise RuntimeYmlInvalid(
             f"runtime.yml::start_order must be a list of strings; got {start_order!r}"
         )
-    return RuntimeYml(start_order=[s for s in start_order])
+    depends_on = raw.get("depends_on") or {}
+    if not isinstance(depends_on, dict) or not all(
+        isinstance(k, str) and isinstance(v, list) and all(isinstance(x, str) for x in v)
+        for k, v in depends_on.items()
+    ):
+        raise RuntimeYmlInvalid(
+            f"runtime.yml::depends_on must map proxy ids to lists of proxy ids; got {depends_on!r}"
+        )
+    return RuntimeYml(
+        start_order=[s for s in start_order],
+        depends_on={k: list(v) for k, v in depends_on.items()},
+    )
 
 
 # ─── proxy yml ────────────────────────────────────────────────────────
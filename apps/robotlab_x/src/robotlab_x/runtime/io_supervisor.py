@@ -0,0 +1,375 @@
+# unmanaged
+"""One selector loop for every supervised subprocess's pipes and exit.
+
+process_manager used to give each child three daemon threads: a
+readline pump for stdout, one for stderr, and a crash watcher parked on
+the child's pidfd. Every log line was its own ``publish_sync``. A robot
+running 30 subprocess services therefore carried 90 mostly-idle threads
+and, under a chatty service, paid one bus fan-out per printed line.
+
+This module replaces them with ONE daemon thread (``pm_io``) running a
+``selectors`` loop over:
+
+  * each child's stdout/stderr fd, switched to non-blocking and read as
+    raw bytes into a per-stream line buffer (partial lines wait for
+    their newline; a line longer than ``MAX_LINE_BYTES`` is cut);
+  * each child's pidfd (Linux 5.3+), which turns readable when the
+    child exits. Where pidfds aren't available the loop ``poll()``s
+    those children once per tick instead;
+  * a self-pipe, so ``register`` from another thread wakes the loop.
+
+Log lines are batched per proxy per tick (``FLUSH_INTERVAL_S``, or
+sooner once ``MAX_BATCH_LINES`` pile up). Each batch is ONE message on
+``/service_proxy/{id}/log``::
+
+    {"proxy_id": "video-1", "stream": "stdout", "line": "a\\nb", "ts": 1.0,
+     "lines": [{"stream": "stdout", "line": "a", "ts": 1.0},
+               {"stream": "stdout", "line": "b", "ts": 1.0}]}
+
+``lines`` is the batch; each line also carries the ``seq`` that
+``service_logs`` (which stores it) assigned. The top-level ``stream``/``line``/``ts`` keep
+the old single-line shape for subscribers that predate batching. They
+hold the lines joined with newlines, ``stderr`` if any line in the
+batch was, and the first line's timestamp. A batch of one is exactly
+the old message plus ``lines``.
+
+The loop itself never touches the disk: each batch is handed to one
+writer thread (``pm_log``) that stores it in ``service_logs`` and then
+publishes it, so a slow disk delays log delivery, not pipe reads.
+
+On exit the loop flushes what the child printed, reaps it, and hands
+the return code to the owner's ``on_exit`` callback on a single worker
+thread (``pm_exit``), so a slow DB write in crash handling never stalls
+other services' logs. The hand-off is queued on ``pm_log`` behind the
+child's last batch, so those lines are on the bus before ``on_exit``
+runs. Pipes stay registered until EOF, so output from
+grandchildren that outlive the proxy still reaches the bus.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import selectors
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from robotlab_x.runtime import service_logs
+from robotlab_x.runtime.bus import get_bus
+
+
+logger = logging.getLogger(__name__)
+
+FLUSH_INTERVAL_S = 0.05
+MAX_BATCH_LINES = 500
+MAX_LINE_BYTES = 64 * 1024
+_READ_SIZE = 65536
+
+
+@dataclass
+class _Stream:
+    name: str
+    file: Any
+    fd: int
+    buf: bytearray = field(default_factory=bytearray)
+
+
+@dataclass
+class _Child:
+    key: str
+    process: subprocess.Popen
+    topic: str
+    on_exit: Callable[[Optional[int]], None]
+    streams: Dict[int, _Stream]
+    pidfd: Optional[int] = None
+    exited: bool = False
+    pending: List[Dict[str, Any]] = field(default_factory=list)
+    first_pending: float = 0.0
+    drained: threading.Event = field(default_factory=threading.Event)
+
+
+_lock = threading.Lock()
+_children: List[_Child] = []
+_incoming: List[_Child] = []
+_thread: Optional[threading.Thread] = None
+_wake_r: Optional[int] = None
+_wake_w: Optional[int] = None
+_exit_pool: Optional[ThreadPoolExecutor] = None
+_log_pool: Optional[ThreadPoolExecutor] = None
+_stats = {"batches": 0, "lines": 0}
+
+
+def register(
+    key: str,
+    process: subprocess.Popen,
+    topic: str,
+    on_exit: Callable[[Optional[int]], None],
+) -> None:
+    """Supervise ``process``: its stdout/stderr go to ``topic`` in
+    batches and ``on_exit(rc)`` runs once it has exited and been reaped.
+    ``key`` (the proxy id) names the child for ``drain``/``supervised``."""
+    streams: Dict[int, _Stream] = {}
+    for name, f in (("stdout", process.stdout), ("stderr", process.stderr)):
+        if f is None:
+            continue
+        fd = f.fileno()
+        os.set_blocking(fd, False)
+        streams[fd] = _Stream(name=name, file=f, fd=fd)
+    child = _Child(key=key, process=process, topic=topic, on_exit=on_exit, streams=streams)
+    child.pidfd = _open_pidfd(process.pid)
+    if not streams:
+        child.drained.set()
+    with _lock:
+        _ensure_loop()
+        _children.append(child)
+        _incoming.append(child)
+    _wake()
+
+
+def drain(key: str, timeout: float = 0.5) -> bool:
+    """Wait up to ``timeout`` for ``key``'s pipes to reach EOF and their
+    last lines to be published. True when drained (or not supervised)."""
+    with _lock:
+        child = next((c for c in reversed(_children) if c.key == key), None)
+    if child is None:
+        return True
+    return child.drained.wait(timeout)
+
+
+def supervised() -> List[str]:
+    """Keys of every child whose exit hasn't been handled yet."""
+    with _lock:
+        return [c.key for c in _children if not c.exited]
+
+
+def stats() -> Dict[str, int]:
+    """Loop counters for diagnostics/tests."""
+    with _lock:
+        return {
+            "children": sum(1 for c in _children if not c.exited),
+            "streams": sum(len(c.streams) for c in _children),
+            **_stats,
+        }
+
+
+# ─── loop ─────────────────────────────────────────────────────────────
+
+
+def _ensure_loop() -> None:
+    """Start the loop thread on first use. Caller holds ``_lock``."""
+    global _thread, _wake_r, _wake_w, _exit_pool, _log_pool
+    if _thread is not None and _thread.is_alive():
+        return
+    if _wake_r is None:
+        _wake_r, _wake_w = os.pipe()
+        os.set_blocking(_wake_r, False)
+        os.set_blocking(_wake_w, False)
+    if _exit_pool is None:
+        _exit_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pm_exit")
+    if _log_pool is None:
+        # One worker: batches are stored and published in flush order.
+        _log_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pm_log")
+    _thread = threading.Thread(target=_loop, name="pm_io", daemon=True)
+    _thread.start()
+
+
+def _wake() -> None:
+    try:
+        os.write(_wake_w, b"\0")
+    except (BlockingIOError, OSError, TypeError):
+        pass  # pipe full means a wake is already pending
+
+
+def _loop() -> None:
+    sel = selectors.DefaultSelector()
+    sel.register(_wake_r, selectors.EVENT_READ, None)
+    while True:
+        try:
+            _adopt(sel)
+            for key, _ in sel.select(_timeout()):
+                if key.data is None:
+                    _clear_wake()
+                    continue
+                kind, child, stream = key.data
+                if kind == "pipe":
+                    _read(sel, child, stream)
+                else:
+                    _exited(sel, child)
+            _tick(sel)
+        except Exception:  # noqa: BLE001 — the loop must outlive any one child
+            logger.exception("io_supervisor: loop error")
+            time.sleep(FLUSH_INTERVAL_S)
+
+
+def _adopt(sel: selectors.BaseSelector) -> None:
+    with _lock:
+        fresh = list(_incoming)
+        _incoming.clear()
+    for child in fresh:
+        for stream in child.streams.values():
+            sel.register(stream.fd, selectors.EVENT_READ, ("pipe", child, stream))
+        if child.pidfd is not None:
+            sel.register(child.pidfd, selectors.EVENT_READ, ("exit", child, None))
+
+
+def _timeout() -> Optional[float]:
+    """Sleep until the oldest pending batch is due, or one tick when some
+    child can only be polled for exit; otherwise until an fd fires."""
+    with _lock:
+        children = list(_children)
+    due = [c.first_pending + FLUSH_INTERVAL_S for c in children if c.pending]
+    polled = any(c.pidfd is None and not c.exited for c in children)
+    if due:
+        return max(0.0, min(due) - time.monotonic())
+    return FLUSH_INTERVAL_S if polled else None
+
+
+def _clear_wake() -> None:
+    try:
+        while os.read(_wake_r, 4096):
+            pass
+    except (BlockingIOError, OSError):
+        pass
+
+
+def _read(sel: selectors.BaseSelector, child: _Child, stream: _Stream) -> None:
+    try:
+        chunk = os.read(stream.fd, _READ_SIZE)
+    except BlockingIOError:
+        return
+    except OSError:
+        chunk = b""
+    if chunk:
+        stream.buf += chunk
+        _split(child, stream, final=False)
+        return
+    _split(child, stream, final=True)
+    sel.unregister(stream.fd)
+    try:
+        stream.file.close()
+    except Exception:  # noqa: BLE001
+        pass
+    del child.streams[stream.fd]
+    if not child.streams:
+        _flush(child)
+        _log_pool.submit(_drained, child)
+
+
+def _split(child: _Child, stream: _Stream, *, final: bool) -> None:
+    buf = stream.buf
+    now = time.time()
+    start = 0
+    while True:
+        nl = buf.find(b"\n", start)
+        if nl < 0:
+            break
+        _append(child, stream.name, bytes(buf[start:nl]), now)
+        start = nl + 1
+    del buf[:start]
+    if buf and (final or len(buf) >= MAX_LINE_BYTES):
+        _append(child, stream.name, bytes(buf), now)
+        buf.clear()
+
+
+def _append(child: _Child, stream: str, raw: bytes, ts: float) -> None:
+    line = raw.decode("utf-8", errors="replace").rstrip("\r")
+    if not child.pending:
+        child.first_pending = time.monotonic()
+    child.pending.append({"stream": stream, "line": line, "ts": ts})
+    if len(child.pending) >= MAX_BATCH_LINES:
+        _flush(child)
+
+
+def _exited(sel: selectors.BaseSelector, child: _Child) -> None:
+    sel.unregister(child.pidfd)
+    os.close(child.pidfd)
+    child.pidfd = None
+    _finish(child, child.process.wait())
+
+
+def _tick(sel: selectors.BaseSelector) -> None:
+    now = time.monotonic()
+    with _lock:
+        children = list(_children)
+    for child in children:
+        if child.pending and now - child.first_pending >= FLUSH_INTERVAL_S:
+            _flush(child)
+        if child.pidfd is None and not child.exited:
+            rc = child.process.poll()
+            if rc is not None:
+                _finish(child, rc)
+
+
+def _finish(child: _Child, rc: Optional[int]) -> None:
+    """Child has exited: pick up whatever it printed, publish it ahead of
+    the exit handling, and hand ``rc`` to the owner."""
+    for stream in list(child.streams.values()):
+        try:
+            chunk = os.read(stream.fd, _READ_SIZE)
+        except (BlockingIOError, OSError):
+            continue
+        if chunk:
+            stream.buf += chunk
+            _split(child, stream, final=False)
+    _flush(child)
+    child.exited = True
+    _log_pool.submit(_hand_off_exit, child, rc)
+
+
+def _drained(child: _Child) -> None:
+    """On ``pm_log``, after the child's last batch went out."""
+    child.drained.set()
+    _maybe_forget(child)
+
+
+def _hand_off_exit(child: _Child, rc: Optional[int]) -> None:
+    """On ``pm_log``, after the child's last batch went out."""
+    _exit_pool.submit(_run_on_exit, child, rc)
+    _maybe_forget(child)
+
+
+def _run_on_exit(child: _Child, rc: Optional[int]) -> None:
+    try:
+        child.on_exit(rc)
+    except Exception:  # noqa: BLE001
+        logger.exception("io_supervisor: exit handler failed for %s", child.key)
+
+
+def _maybe_forget(child: _Child) -> None:
+    if child.exited and not child.streams:
+        with _lock:
+            if child in _children:
+                _children.remove(child)
+
+
+def _flush(child: _Child) -> None:
+    lines, child.pending = child.pending, []
+    if not lines:
+        return
+    _stats["batches"] += 1
+    _stats["lines"] += len(lines)
+    _log_pool.submit(_store_and_publish, child.key, child.topic, lines)
+
+
+def _store_and_publish(key: str, topic: str, lines: List[Dict[str, Any]]) -> None:
+    """On ``pm_log``: number and store a batch, then publish it."""
+    try:
+        service_logs.append(key, lines)
+        get_bus().publish_sync(topic, service_logs.batch_payload(key, lines))
+    except Exception:  # noqa: BLE001 — a disk or bus hiccup drops this batch, not the writer
+        logger.debug("io_supervisor: log batch failed for %s", key, exc_info=True)
+
+
+def _open_pidfd(pid: int) -> Optional[int]:
+    """A pidfd for ``pid``, or None where they aren't available (non-Linux,
+    kernels before 5.3, or the child was already reaped)."""
+    pidfd_open = getattr(os, "pidfd_open", None)
+    if pidfd_open is None:
+        return None
+    try:
+        return pidfd_open(pid)
+    except OSError:
+        return None
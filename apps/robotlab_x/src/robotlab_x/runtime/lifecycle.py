@@ -50,6 +50,7 @@ from database.factory import get_database_client
 
 from robotlab_x.runtime.bus import get_bus
 from robotlab_x.runtime import installer
+from robotlab_x.runtime import service_logs
 from robotlab_x.runtime import system
 from robotlab_x import framework
 
@@ -59,6 +60,11 @@ from robotlab_x import framework
 # Install is rare; a single coarse lock is fine.
 _INSTALL_LOCK = threading.Lock()
 
+# Per-slot (``<type>/<version>``) locks serialising _ensure_type_installed,
+# so concurrent Starts of one type share a single venv build.
+_TYPE_INSTALL_LOCKS: Dict[str, threading.Lock] = {}
+_TYPE_INSTALL_LOCKS_GUARD = threading.Lock()
+
 
 logger = logging.getLogger(__name__)
 
@@ -230,60 +236,70 @@ def _ensure_type_installed(
     type_dir = repo_dir / type_name / type_version
     venv_slot = f"{type_name}/{type_version}"
 
-    # Multi-root: the type's SOURCE may live in a read-only repo_paths root
-    # (e.g. the image's bundled repo/) while repo_dir is a SEPARATE writable
-    # root (a persisted var/repo volume on the s1 deploy). The per-type venv
-    # must build in the writable root, so copy the source there first if it
-    # isn't already present. ${APP_ROOT}/repo resolves to repo_dir, so the
-    # editable spec then points at this copied source. Without this, pip
-    # installs an editable spec pointing at an empty dir → "exit 1".
-    if not (type_dir / "package.yml").exists():
-        # Best-effort: locate the source in another root. If settings/roots
-        # aren't resolvable (e.g. unit tests that stub _resolve_repo_dir),
-        # fall back to the prior behaviour and let install proceed as before.
-        try:
-            from robotlab_x.runtime.repo import find_type_dir
-            src = find_type_dir(get_settings(), type_name, type_version)
-        except Exception:  # noqa: BLE001
-            src = None
-        if src is not None and src.resolve() != type_dir.resolve():
-            type_dir.parent.mkdir(parents=True, exist_ok=True)
-            shutil.copytree(
-                src, type_dir, dirs_exist_ok=True,
-                ignore=shutil.ignore_patterns(".venv", "__pycache__", "*.pyc"),
-            )
+    # One install per slot at a time: boot starts several proxies at once
+    # (start_graph), and two instances of a not-yet-installed type would
+    # otherwise both build the venv, or one would see a half-built
+    # ``.venv/bin`` and skip pip.
+    with _type_install_lock(venv_slot):
+        # Multi-root: the type's SOURCE may live in a read-only repo_paths root
+        # (e.g. the image's bundled repo/) while repo_dir is a SEPARATE writable
+        # root (a persisted var/repo volume on the s1 deploy). The per-type venv
+        # must build in the writable root, so copy the source there first if it
+        # isn't already present. ${APP_ROOT}/repo resolves to repo_dir, so the
+        # editable spec then points at this copied source. Without this, pip
+        # installs an editable spec pointing at an empty dir → "exit 1".
+        if not (type_dir / "package.yml").exists():
+            # Best-effort: locate the source in another root. If settings/roots
+            # aren't resolvable (e.g. unit tests that stub _resolve_repo_dir),
+            # fall back to the prior behaviour and let install proceed as before.
+            try:
+                from robotlab_x.runtime.repo import find_type_dir
+                src = find_type_dir(get_settings(), type_name, type_version)
+            except Exception:  # noqa: BLE001
+                src = None
+            if src is not None and src.resolve() != type_dir.resolve():
+                type_dir.parent.mkdir(parents=True, exist_ok=True)
+                shutil.copytree(
+                    src, type_dir, dirs_exist_ok=True,
+                    ignore=shutil.ignore_patterns(".venv", "__pycache__", "*.pyc"),
+                )
+                _publish_progress(
+                    progress_req_id, "install", "running",
+                    f"copied {type_name}@{type_version} source into the writable repo",
+                )
+
+        # SHORT-CIRCUIT: a service TYPE only needs pip-install once. Re-starting
+        # an instance (or starting a second instance) of a type whose venv
+        # already exists skips pip — saves seconds and avoids noisy output when
+        # the deps are already resolved. The explicit "release the type" path
+        # (future work) is the way to force a reinstall.
+        venv_bin = type_dir / ".venv" / "bin"
+        if venv_bin.exists():
             _publish_progress(
                 progress_req_id, "install", "running",
-                f"copied {type_name}@{type_version} source into the writable repo",
+                f"type {type_name}@{type_version} already installed — skipping pip",
+            )
+        else:
+            def on_event(event: Dict[str, Any]) -> None:
+                _publish_install_event(progress_req_id, event)
+
+            installer.install(
+                dependency_manager,
+                resolved_spec,
+                venv_slot,
+                repo_dir,
+                on_event=on_event,
             )
-
-    # SHORT-CIRCUIT: a service TYPE only needs pip-install once. Re-starting
-    # an instance (or starting a second instance) of a type whose venv
-    # already exists skips pip — saves seconds and avoids noisy output when
-    # the deps are already resolved. The explicit "release the type" path
-    # (future work) is the way to force a reinstall.
-    venv_bin = type_dir / ".venv" / "bin"
-    if venv_bin.exists():
-        _publish_progress(
-            progress_req_id, "install", "running",
-            f"type {type_name}@{type_version} already installed — skipping pip",
-        )
-    else:
-        def on_event(event: Dict[str, Any]) -> None:
-            _publish_install_event(progress_req_id, event)
-
-        installer.install(
-            dependency_manager,
-            resolved_spec,
-            venv_slot,
-            repo_dir,
-            on_event=on_event,
-        )
 
     # The venv is present now — stamp the catalog flag truthful.
     _mark_type_installed(meta, db)
 
 
+def _type_install_lock(venv_slot: str) -> threading.Lock:
+    with _TYPE_INSTALL_LOCKS_GUARD:
+        return _TYPE_INSTALL_LOCKS.setdefault(venv_slot, threading.Lock())
+
+
 def _mark_type_installed(meta: Dict[str, Any], db: Optional[DatabaseAdapter]) -> None:
     """Flip service_meta.installed→True (clearing any prior exception) and
     broadcast, after a successful type install. No-op without a db handle
@@ -618,6 +634,7 @@ def _handle_uninstall(req: Dict[str, Any], db: DatabaseAdapter) -> Dict[str, Any
     # the runtime canvas where membership is computed — silently keeps
     # the orphan position around for a future proxy of the same name.
     _tidy_workspace_refs(db, proxy_id)
+    service_logs.drop(proxy_id)
 
     _publish_lifecycle(final_state)
     _publish_progress(req["id"], "uninstall", "completed")
@@ -1005,7 +1022,7 @@ def reload_one_service_config(proxy_id: str) -> Dict[str, Any]:
 
     from robotlab_x.runtime import boot  # lazy: avoid import cycle
     from robotlab_x.runtime.config_sets import active_set_dir, active_set_name
-    from robotlab_x.runtime.repo import repo_roots, scan_repos
+    from robotlab_x.runtime.repo import find_manifest, repo_roots
 
     data_dir = _resolve_data_dir()
     repo_dir = _resolve_repo_dir()
@@ -1025,7 +1042,7 @@ def reload_one_service_config(proxy_id: str) -> Dict[str, Any]:
 
     # Validate against the type's config_class so a bad hand-edit is
     # caught HERE with a readable message, not silently dropped live.
-    manifest = {m.id: m for m in scan_repos(repo_roots(get_settings()))}.get(type_id)
+    manifest = find_manifest(repo_roots(get_settings()), type_id)
     if manifest is not None:
         probe = dict(row)
         probe["service_config"] = new_config
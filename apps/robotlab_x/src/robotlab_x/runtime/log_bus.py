@@ -18,7 +18,7 @@ from __future__ import annotations
 import logging
 from collections import deque
 from threading import Lock
-from typing import Any, Deque, Dict, List
+from typing import Any, Deque, Dict, List, Optional
 
 _MAX = 1000
 _BUFFER: Deque[Dict[str, Any]] = deque(maxlen=_MAX)
@@ -46,10 +46,28 @@ class RingLogHandler(logging.Handler):
             pass
 
 
-def recent(limit: int = 300) -> List[Dict[str, Any]]:
-    """Return the most recent ``limit`` buffered records (oldest first)."""
+def recent(
+    limit: int = 300,
+    *,
+    since: Optional[float] = None,
+    until: Optional[float] = None,
+    q: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """Return the most recent ``limit`` buffered records (oldest first),
+    optionally only those logged within ``since``..``until`` (epoch
+    seconds, inclusive) whose line contains ``q`` (case-insensitive)."""
     with _LOCK:
         items = list(_BUFFER)
+    if since is not None or until is not None or q:
+        lo = since * 1000 if since is not None else None
+        hi = until * 1000 if until is not None else None
+        needle = q.lower() if q else None
+        items = [
+            r for r in items
+            if (lo is None or r["ts"] >= lo)
+            and (hi is None or r["ts"] <= hi)
+            and (needle is None or needle in r["line"].lower())
+        ]
     return items[-limit:] if limit and len(items) > limit else items
 
 
@@ -14,21 +14,42 @@ long-lived WS to a remote runtime's ``/v1/ws`` endpoint:
   4. On disconnect, reconnect with exponential backoff (250ms → 30s,
      full jitter) so a peer reboot doesn't require manual reconnect.
 
+Outbound publishes don't touch the socket directly. ``queue_publish``
+(callable from any thread) drops the frame into a bounded per-peer
+queue and one writer task per connection drains it. Whatever piled up
+while the previous send was in flight goes out as a single
+``{method: "batch", data: {frames: [...]}}`` frame (up to
+``batch_max_frames``), which the remote ``/v1/ws`` unpacks into the same
+individual publishes. A lone frame goes out as a plain publish. Batches
+are only sent once the remote's ``/runtime/info`` lists ``batch`` in
+its ``ws_features``. Until then, and for an older runtime that doesn't
+advertise it, each frame goes out as its own publish. An
+``unknown_method`` reply to a batch turns batching off again for the
+connection. When the
+queue is full the oldest frame is dropped. A ``coalesce=True`` publish
+(retained state, or topics the peer manager marks latest-value-wins)
+replaces a still-queued frame for the same topic instead of queuing
+behind it. ``send_stats()`` reports depth, drops and batching for the
+peers API.
+
 This file knows nothing about the local bus. It speaks the WS wire
-protocol and dispatches inbound frames to registered callbacks. The
+protocol (JSON, or MessagePack when negotiated — see ``rlx_bus.codec``)
+and dispatches inbound frames to registered callbacks. The
 peer_manager (next step) is what glues PeerConnection to the bus.
 """
 from __future__ import annotations
 
 import asyncio
-import json
 import logging
 import random
+import threading
 import uuid
+from collections import OrderedDict
 from enum import Enum
-from typing import Any, Awaitable, Callable, Dict, Optional, Set
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Union
 
 import websockets
+from rlx_bus import codec as wire
 from websockets.exceptions import WebSocketException
 
 
@@ -56,6 +77,13 @@ _EXPECTED_PEER_ERRORS = (
 _BACKOFF_MIN_S = 0.25
 _BACKOFF_MAX_S = 30.0
 
+# Publishes held per peer while the writer catches up. A 100 Hz topic
+# over a slow link fills this in ~10s; past that the oldest frames go.
+_DEFAULT_SEND_QUEUE = 1024
+
+# Frames per outbound ``batch`` frame — same cap as rlx_bus.BusClient.
+_DEFAULT_BATCH_MAX_FRAMES = 64
+
 
 class PeerState(str, Enum):
     """Lifecycle states. Surfaced through ``PeerConnection.state`` so
@@ -91,6 +119,9 @@ class PeerConnection:
         on_state_change: Optional[Callable[["PeerConnection"], None]] = None,
         on_message: Optional[Callable[[str, Any, Dict[str, Any]], None]] = None,
         local_id_provider: Optional[Callable[[], str]] = None,
+        codec: str = wire.JSON,
+        send_queue_size: int = _DEFAULT_SEND_QUEUE,
+        batch_max_frames: int = _DEFAULT_BATCH_MAX_FRAMES,
     ) -> None:
         # Normalise the URL — accept either ``ws://host:port`` or
         # ``ws://host:port/v1/ws``; the latter is what gets actually
@@ -103,6 +134,15 @@ class PeerConnection:
         # value to compare against. Lazy because identity might still
         # be resolving when PeerConnection is constructed.
         self._local_id_provider = local_id_provider
+        # Requested wire codec (downgraded to JSON when msgpack is
+        # missing) and the one in use on the current socket — JSON
+        # until the remote answers in binary, so an older runtime that
+        # ignores ``?codec=`` still bridges.
+        self._codec = wire.resolve_codec(codec)
+        self._wire_codec = wire.JSON
+        # Whether the remote accepts ``batch`` frames — off until its
+        # /runtime/info says so, again per connection.
+        self._batch_ok = False
 
         self._state = PeerState.INIT
         self.remote_id: Optional[str] = None
@@ -113,12 +153,26 @@ class PeerConnection:
         # peers API so the UI can show why the bridge is dead.
         self.collision_detected: bool = False
         self.collision_detail: Optional[str] = None
-        # Locally-issued subscription ids → topic the caller asked
-        # for. Used when an ack/message comes back so we can route it.
-        self._upstream_subscriptions: Set[str] = set()
+        # Topics subscribed upstream → the subscription options sent
+        # with them (rate limit / projection, see subscription_options;
+        # None for everything). Replayed as-is on reconnect.
+        self._upstream_subscriptions: Dict[str, Optional[Dict[str, Any]]] = {}
         self._ws: Optional[websockets.WebSocketClientProtocol] = None
         self._task: Optional[asyncio.Task] = None
         self._stop_event = asyncio.Event()
+        # Outbound publish queue, drained by ``_write_loop``. Keys are a
+        # running counter, or ``("topic", topic)`` for a coalesced frame
+        # so a newer value can overwrite it in place. Guarded by a
+        # thread lock because bus publishes arrive from any thread.
+        self._send_queue_size = max(1, int(send_queue_size))
+        self._batch_max_frames = max(1, int(batch_max_frames))
+        self._outbox: "OrderedDict[Any, Dict[str, Any]]" = OrderedDict()
+        self._outbox_lock = threading.Lock()
+        self._outbox_seq = 0
+        self._outbox_ready: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._writer: Optional[asyncio.Task] = None
+        self._stats = {"queued": 0, "sent": 0, "frames": 0, "coalesced": 0, "dropped": 0}
 
     # ─── public API ───────────────────────────────────────────────────
 
@@ -132,9 +186,14 @@ class PeerConnection:
         if self._task is not None and not self._task.done():
             return
         self._stop_event = asyncio.Event()
+        self._loop = asyncio.get_running_loop()
+        self._outbox_ready = asyncio.Event()
         self._task = asyncio.create_task(
             self._run(), name=f"peer:{self.url}",
         )
+        self._writer = asyncio.create_task(
+            self._write_loop(), name=f"peer_writer:{self.url}",
+        )
 
     async def stop(self) -> None:
         """Signal shutdown + wait for the run task to wind down."""
@@ -152,6 +211,12 @@ class PeerConnection:
             except asyncio.TimeoutError:
                 self._task.cancel()
             self._task = None
+        if self._writer is not None:
+            self._writer.cancel()
+            await asyncio.gather(self._writer, return_exceptions=True)
+            self._writer = None
+        with self._outbox_lock:
+            self._outbox.clear()
 
     @property
     def state(self) -> PeerState:
@@ -167,35 +232,74 @@ class PeerConnection:
         payload: Any,
         *,
         retained: bool = False,
+        coalesce: bool = False,
     ) -> bool:
-        """Send a publish frame upstream. Returns True if the frame
-        was put on the wire, False if disconnected (caller decides
-        whether to buffer or drop). Doesn't wait for an ack."""
-        return await self._send({
+        """Queue a publish frame upstream (see ``queue_publish``)."""
+        return self.queue_publish(topic, payload, retained=retained, coalesce=coalesce)
+
+    def queue_publish(
+        self,
+        topic: str,
+        payload: Any,
+        *,
+        retained: bool = False,
+        coalesce: bool = False,
+    ) -> bool:
+        """Hand a publish to the writer task. Safe from any thread; never
+        blocks. Returns False if disconnected (caller decides whether to
+        buffer or drop), True once queued. Doesn't wait for the wire or
+        an ack. ``coalesce`` makes a still-queued frame for ``topic``
+        take this payload instead of queuing a second one."""
+        if not self.is_connected or self._loop is None:
+            return False
+        frame = {
             "id": _new_frame_id(),
             "method": "publish",
             "data": {"topic": topic, "payload": payload, "retained": retained},
-        })
+        }
+        with self._outbox_lock:
+            self._stats["queued"] += 1
+            key = ("topic", topic) if coalesce else None
+            if key is not None and key in self._outbox:
+                self._outbox[key] = frame
+                self._stats["coalesced"] += 1
+                return True
+            if key is None:
+                self._outbox_seq += 1
+                key = self._outbox_seq
+            if len(self._outbox) >= self._send_queue_size:
+                self._outbox.popitem(last=False)
+                self._stats["dropped"] += 1
+            self._outbox[key] = frame
+        self._wake_writer()
+        return True
+
+    def send_stats(self) -> Dict[str, int]:
+        """Outbound queue counters: current ``depth`` against ``max``, and
+        totals for ``queued``/``sent`` publishes, WS ``frames`` written,
+        and publishes ``coalesced`` or ``dropped`` (queue full)."""
+        with self._outbox_lock:
+            return {"depth": len(self._outbox), "max": self._send_queue_size, **self._stats}
 
-    async def subscribe_upstream(self, topic: str) -> bool:
+    async def subscribe_upstream(
+        self, topic: str, options: Optional[Dict[str, Any]] = None,
+    ) -> bool:
         """Open an upstream subscription. Idempotent — repeat calls
         for the same topic produce one upstream sub. The peer manager
-        relies on this for the lazy-bridge in step 2c."""
-        if topic in self._upstream_subscriptions:
+        relies on this for the lazy-bridge in step 2c. A repeat call
+        with different ``options`` re-sends the subscribe, which the
+        remote ``/v1/ws`` treats as an options update."""
+        if topic in self._upstream_subscriptions and self._upstream_subscriptions[topic] == options:
             return True
-        if not await self._send({
-            "id": _new_frame_id(),
-            "method": "subscribe",
-            "data": {"topic": topic},
-        }):
+        if not await self._send(_subscribe_frame(topic, options)):
             return False
-        self._upstream_subscriptions.add(topic)
+        self._upstream_subscriptions[topic] = options
         return True
 
     async def unsubscribe_upstream(self, topic: str) -> bool:
         if topic not in self._upstream_subscriptions:
             return True
-        self._upstream_subscriptions.discard(topic)
+        self._upstream_subscriptions.pop(topic, None)
         return await self._send({
             "id": _new_frame_id(),
             "method": "unsubscribe",
@@ -209,18 +313,69 @@ class PeerConnection:
             return
         logger.info("peer %s: state %s → %s", self.url, self._state.value, new_state.value)
         self._state = new_state
+        if new_state == PeerState.CONNECTED:
+            self._wake_writer()  # flush anything left queued by a previous drop
         if self._on_state_change is not None:
             try:
                 self._on_state_change(self)
             except Exception:  # noqa: BLE001
                 logger.exception("peer %s: on_state_change raised", self.url)
 
+    def _wake_writer(self) -> None:
+        loop, ready = self._loop, self._outbox_ready
+        if loop is None or ready is None:
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            ready.set()
+        else:
+            try:
+                loop.call_soon_threadsafe(ready.set)
+            except RuntimeError:
+                pass  # loop closed — shutting down
+
+    async def _write_loop(self) -> None:
+        """Single writer: drain the outbox onto the socket, batching
+        whatever accumulated while the previous send was in flight if
+        the remote accepts batches."""
+        ready = self._outbox_ready
+        while not self._stop_event.is_set():
+            await ready.wait()
+            ready.clear()
+            while self.is_connected:
+                with self._outbox_lock:
+                    frames: List[Dict[str, Any]] = []
+                    while self._outbox and len(frames) < self._batch_max_frames:
+                        frames.append(self._outbox.popitem(last=False)[1])
+                if not frames:
+                    break
+                if len(frames) > 1 and self._batch_ok:
+                    sends = [{"id": _new_frame_id(), "method": "batch", "data": {"frames": frames}}]
+                else:
+                    sends = frames
+                sent = 0
+                for out in sends:
+                    if not await self._send(out):
+                        break
+                    sent += 1
+                # A batch carries every frame; otherwise one send each.
+                delivered = len(frames) * sent if len(sends) < len(frames) else sent
+                with self._outbox_lock:
+                    self._stats["sent"] += delivered
+                    self._stats["dropped"] += len(frames) - delivered
+                    self._stats["frames"] += sent
+                if sent < len(sends):
+                    break
+
     async def _send(self, frame: Dict[str, Any]) -> bool:
         ws = self._ws
         if ws is None or self._state in (PeerState.DISCONNECTED, PeerState.STOPPED, PeerState.INIT):
             return False
         try:
-            await ws.send(json.dumps(frame))
+            await ws.send(wire.encode(frame, self._wire_codec))
             return True
         except Exception:  # noqa: BLE001
             logger.exception("peer %s: send failed", self.url)
@@ -265,6 +420,10 @@ class PeerConnection:
         disconnect; the outer loop handles retry."""
         token = self._token_provider()
         url_with_token = f"{self.url}?token={token}"
+        if self._codec != wire.JSON:
+            url_with_token += f"&codec={self._codec}"
+        self._wire_codec = wire.JSON
+        self._batch_ok = False
         self._set_state(PeerState.CONNECTING)
 
         try:
@@ -276,21 +435,19 @@ class PeerConnection:
                 # message arrives almost immediately and carries the
                 # remote id. We DON'T flip CONNECTED until that lands —
                 # the bridge needs the id to address messages.
-                await ws.send(json.dumps({
+                await ws.send(wire.encode({
                     "id": _new_frame_id(),
                     "method": "subscribe",
                     "data": {"topic": "/runtime/info"},
-                }))
+                }, self._wire_codec))
 
                 # Replay upstream subscriptions the caller asked for
                 # before a previous disconnect — peer_manager state
                 # outlives the WS connection.
-                for topic in list(self._upstream_subscriptions):
-                    await ws.send(json.dumps({
-                        "id": _new_frame_id(),
-                        "method": "subscribe",
-                        "data": {"topic": topic},
-                    }))
+                for topic, options in list(self._upstream_subscriptions.items()):
+                    await ws.send(wire.encode(
+                        _subscribe_frame(topic, options), self._wire_codec,
+                    ))
 
                 async for raw in ws:
                     if self._stop_event.is_set():
@@ -319,18 +476,23 @@ class PeerConnection:
         except Exception:  # noqa: BLE001
             return None
 
-    def _handle_inbound(self, raw: str) -> None:
+    def _handle_inbound(self, raw: Union[str, bytes]) -> None:
         try:
-            frame = json.loads(raw)
-        except json.JSONDecodeError:
-            logger.warning("peer %s: dropped non-JSON frame", self.url)
+            frame = wire.decode(raw)
+        except ValueError:
+            logger.warning("peer %s: dropped undecodable frame", self.url)
             return
+        if isinstance(raw, (bytes, bytearray)) and self._codec != wire.JSON:
+            # Remote agreed to our codec — switch our outbound side too.
+            self._wire_codec = self._codec
         method = frame.get("method")
         if method == "message":
             topic = frame.get("topic")
             payload = frame.get("payload")
             # /runtime/info from the remote completes identification.
             if topic == "/runtime/info" and isinstance(payload, dict):
+                features = payload.get("ws_features")
+                self._batch_ok = isinstance(features, list) and "batch" in features
                 remote_id = payload.get("id")
                 if isinstance(remote_id, str) and remote_id != self.remote_id:
                     # Collision guard — if a peer identifies with the
@@ -367,6 +529,10 @@ class PeerConnection:
             # No-op for now — tracking acks is a step-2c concern.
             pass
         elif method == "error":
+            if frame.get("error") == "unknown_method" and frame.get("method_received") == "batch":
+                # Advertised but refused (a downgraded remote): publish one
+                # frame at a time from here on. That batch's frames are lost.
+                self._batch_ok = False
             logger.warning("peer %s: error frame %s", self.url, frame.get("error"))
 
 
@@ -394,5 +560,13 @@ def _backoff(attempt: int) -> float:
     return max(_BACKOFF_MIN_S, random.uniform(_BACKOFF_MIN_S, base))
 
 
+def _subscribe_frame(topic: str, options: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    return {
+        "id": _new_frame_id(),
+        "method": "subscribe",
+        "data": {"topic": topic, **(options or {})},
+    }
+
+
 def _new_frame_id() -> str:
     return uuid.uuid4().hex[:10]
@@ -6,8 +6,8 @@ PeerConnection (step 2b). Lifecycle:
 
   * ``connect(url)`` — start a PeerConnection. Initially the peer's id
     is unknown; once the connection's identify phase completes, the
-    peer is keyed by its remote runtime id and any pending local
-    subscriptions on ``@<id>`` topics are replayed upstream.
+    peer is keyed by its remote runtime id and the upstream
+    subscriptions for local ``@<id>`` subscribers are replayed.
   * ``disconnect(peer_id)`` — stop a connection.
   * ``publish_remote / on_local_subscribe / on_local_unsubscribe`` —
     callbacks the bus invokes via runtime.bus when it sees suffixed
@@ -23,7 +23,30 @@ topic receive it without triggering another remote routing pass.
 Bridge direction: outbound. Local code publishes to ``/foo@<peer_id>``;
 bus's ``publish_sync`` recognises the non-self suffix, strips it, and
 hands ``(peer_id, "/foo", payload, …)`` to ``publish_remote``. We
-forward via the PeerConnection's ``publish_upstream``.
+hand it to the PeerConnection's bounded send queue (``queue_publish``);
+its single writer task batches frames onto the wire. Retained publishes
+and topics registered with ``coalesce_topics`` are latest-value-wins
+while queued; everything else is drop-oldest when the queue is full.
+
+Upstream aggregation. The bus reports every local subscriber on a
+``@<peer_id>`` topic or pattern (``on_local_subscribe`` /
+``on_local_unsubscribe``). The manager reference-counts them per peer
+and subscribes upstream only to the patterns no other one covers
+(``bus.pattern_covers``: ``#`` covers ``+`` covers exact). Three UIs on
+``/+/+/state@peer`` plus a service on ``/arm/a1/state@peer`` make one
+upstream ``/+/+/state``. The bridged ``/arm/a1/state@peer`` then fans
+out to all four locally. Patterns that merely overlap (``/a/+`` and
+``/+/b``) both go upstream, and the remote ``/v1/ws`` sends a message
+matching both only once. When the covering pattern's last subscriber
+leaves, the patterns it covered are subscribed before it is
+unsubscribed, so nothing is missed in between.
+
+Subscription options (rate limit, latest-only, field projection — see
+``subscription_options``) come with each local subscriber. An upstream
+subscription is opened with the widest options of every local
+subscriber it covers. The remote ``/v1/ws`` enforces those before
+anything crosses the link. Each local ``/v1/ws`` connection still
+applies its own limits.
 
 Loop affinity note: the manager runs on the FastAPI / main loop where
 ``event_handlers.on_startup`` resolves it. Local consumers may sit on
@@ -36,9 +59,12 @@ from __future__ import annotations
 import asyncio
 import logging
 import threading
-from typing import Any, Dict, Optional, Set
+from typing import Any, Dict, List, Optional, Set
 
-from robotlab_x.runtime.bus import get_bus
+from rlx_bus import codec as wire
+
+from robotlab_x.runtime import subscription_options
+from robotlab_x.runtime.bus import get_bus, pattern_covers, topic_matches_pattern
 from robotlab_x.runtime.peer_connection import PeerConnection, PeerState
 
 
@@ -51,9 +77,17 @@ logger = logging.getLogger(__name__)
 # control API runs on whatever loop the caller is on.
 _peers_by_id: Dict[str, PeerConnection] = {}
 _peers_by_url: Dict[str, PeerConnection] = {}
-# Subscriptions the bus told us about before the peer was connected.
-# Replayed when the peer transitions to CONNECTED.
-_pending_subs: Dict[str, Set[str]] = {}     # peer_id (or url-key) → set of base topics
+# Local subscribers per remote topic/pattern: peer_id → base topic →
+# one options entry (None = everything) per local subscriber, so the
+# list length is the reference count.
+_local_subs: Dict[str, Dict[str, List[Optional[Dict[str, Any]]]]] = {}
+# What each peer should be subscribed to upstream — the covering
+# patterns of ``_local_subs`` with their merged options. Kept whether or
+# not the peer is connected; replayed when it transitions to CONNECTED.
+_upstream: Dict[str, Dict[str, Optional[Dict[str, Any]]]] = {}
+# Topic patterns whose outbound publishes are latest-value-wins in each
+# peer's send queue (see ``coalesce_topics``).
+_coalesce_patterns: Set[str] = set()
 _lock = threading.Lock()
 
 
@@ -103,6 +137,9 @@ def connect(url: str) -> PeerConnection:
         on_state_change=_on_peer_state_change,
         on_message=_msg_callback,
         local_id_provider=_local_id,
+        # Peer links carry telemetry and media between runtimes — ask
+        # for MessagePack; falls back to JSON when either side lacks it.
+        codec=wire.MSGPACK,
     )
     pc_holder[0] = pc
     with _lock:
@@ -130,7 +167,10 @@ async def disconnect(peer_id_or_url: str) -> None:
 def peers() -> Dict[str, Dict[str, Any]]:
     """Snapshot of all known peers. Used by the topology API to render
     a peers panel. Returns {peer_id_or_url: {state, url, remote_id,
-    upstream_subs, collision}}."""
+    upstream_subs, local_subs, outbound, collision}}; ``local_subs`` is
+    the local subscriber count per remote topic/pattern and
+    ``outbound`` the peer's send-queue counters
+    (``PeerConnection.send_stats``)."""
     out: Dict[str, Dict[str, Any]] = {}
     with _lock:
         for url, pc in _peers_by_url.items():
@@ -140,6 +180,10 @@ def peers() -> Dict[str, Dict[str, Any]]:
                 "remote_id": pc.remote_id,
                 "state": pc.state.value,
                 "upstream_subs": sorted(pc._upstream_subscriptions),
+                "local_subs": {
+                    t: len(refs) for t, refs in _local_subs.get(pc.remote_id or "", {}).items()
+                },
+                "outbound": pc.send_stats(),
             }
             if pc.collision_detected:
                 entry["collision"] = pc.collision_detail or "runtime id collision with self"
@@ -160,7 +204,7 @@ def publish_remote(
     sender_id: Optional[str] = None,
     retained: bool = False,
 ) -> int:
-    """Outbound publish bus → peer. Returns 1 if queued onto the wire,
+    """Outbound publish bus → peer. Returns 1 if queued for the wire,
     0 if no peer connected (caller treats this as 'delivered to nobody')."""
     pc = _resolve_peer(peer_id)
     if pc is None or not pc.is_connected:
@@ -169,50 +213,120 @@ def publish_remote(
             peer_id, topic,
         )
         return 0
-    # publish_upstream is async. We're called from sync bus.publish_sync
-    # which may be on any loop. Schedule the send on the peer's loop
-    # via call_soon_threadsafe so we don't block, and don't care about
-    # the return — the bus contract is best-effort.
-    _schedule_send(pc.publish_upstream(topic, payload, retained=retained))
-    return 1
+    # queue_publish is thread-safe and never blocks; the peer's writer
+    # task does the encoding and socket I/O on its own loop.
+    coalesce = retained or _is_coalesced(topic)
+    return 1 if pc.queue_publish(topic, payload, retained=retained, coalesce=coalesce) else 0
 
 
-def on_local_subscribe(peer_id: str, base_topic: str, local_topic: str) -> None:
-    """Fire-and-forget: open the upstream subscription if we have a
-    connected peer; otherwise queue + replay on next CONNECTED."""
-    pc = _resolve_peer(peer_id)
-    if pc is not None and pc.is_connected:
-        _schedule_send(pc.subscribe_upstream(base_topic))
-    else:
-        with _lock:
-            _pending_subs.setdefault(peer_id, set()).add(base_topic)
-        logger.debug(
-            "peer_manager.on_local_subscribe: queued %s for peer %s",
-            base_topic, peer_id,
-        )
+def coalesce_topics(*patterns: str) -> None:
+    """Mark topics (literal or ``+``/``#`` patterns) latest-value-wins in
+    every peer's send queue: a queued publish not yet on the wire is
+    replaced by a newer one on the same topic. Suits state and telemetry
+    where only the freshest value matters."""
+    with _lock:
+        _coalesce_patterns.update(patterns)
 
 
-def on_local_unsubscribe(peer_id: str, base_topic: str, local_topic: str) -> None:
-    """Close the upstream subscription; also drop from the pending
-    queue in case the local sub was added and removed before the peer
-    connected."""
-    pc = _resolve_peer(peer_id)
+def _is_coalesced(topic: str) -> bool:
+    with _lock:
+        patterns = list(_coalesce_patterns)
+    return any(topic_matches_pattern(topic, p) for p in patterns)
+
+
+def on_local_subscribe(
+    peer_id: str,
+    base_topic: str,
+    local_topic: str,
+    options: Optional[Dict[str, Any]] = None,
+) -> None:
+    """A local subscriber appeared on ``local_topic`` (``base_topic`` on
+    peer ``peer_id``, literal or pattern). Takes a reference and updates
+    the upstream subscriptions if that changes them — immediately when
+    the peer is connected, otherwise on its next CONNECTED."""
     with _lock:
-        s = _pending_subs.get(peer_id)
-        if s is not None:
-            s.discard(base_topic)
-            if not s:
-                _pending_subs.pop(peer_id, None)
-    if pc is not None and pc.is_connected:
-        _schedule_send(pc.unsubscribe_upstream(base_topic))
+        _local_subs.setdefault(peer_id, {}).setdefault(base_topic, []).append(options)
+    _sync_upstream(peer_id)
+
+
+def on_local_unsubscribe(
+    peer_id: str,
+    base_topic: str,
+    local_topic: str,
+    options: Optional[Dict[str, Any]] = None,
+) -> None:
+    """A local subscriber on ``local_topic`` went away. Drops its
+    reference; the last one gone releases the upstream subscription
+    (or hands over to the narrower ones it was covering)."""
+    with _lock:
+        per_peer = _local_subs.get(peer_id, {})
+        refs = per_peer.get(base_topic)
+        if not refs:
+            return
+        refs.remove(options if options in refs else refs[0])
+        if not refs:
+            per_peer.pop(base_topic, None)
+            if not per_peer:
+                _local_subs.pop(peer_id, None)
+    _sync_upstream(peer_id)
+
+
+def _sync_upstream(peer_id: str) -> None:
+    """Recompute ``peer_id``'s upstream subscriptions and send the
+    difference: new or re-optioned ones first, then removals, so a
+    pattern handing over to the ones it covered leaves no gap. Sends
+    are scheduled under the lock so two callers can't reorder them."""
+    with _lock:
+        wanted = _aggregate(_local_subs.get(peer_id, {}))
+        before = _upstream.get(peer_id, {})
+        if wanted:
+            _upstream[peer_id] = wanted
+        else:
+            _upstream.pop(peer_id, None)
+        opened = [(t, o) for t, o in wanted.items() if t not in before or before[t] != o]
+        closed = [t for t in before if t not in wanted]
+        pc = _peers_by_id.get(peer_id) or _peers_by_url.get(peer_id)
+        if pc is None:
+            if opened:
+                logger.debug("peer_manager: upstream subs for %s queued until it connects", peer_id)
+            return
+        if pc.is_connected:
+            for topic, options in opened:
+                _schedule_send(pc.subscribe_upstream(topic, options))
+        # Also while disconnected, so the connection doesn't replay a
+        # stale subscription on reconnect.
+        for topic in closed:
+            _schedule_send(pc.unsubscribe_upstream(topic))
+
+
+def _aggregate(
+    local: Dict[str, List[Optional[Dict[str, Any]]]],
+) -> Dict[str, Optional[Dict[str, Any]]]:
+    """The upstream subscriptions serving ``local`` (base topic → local
+    subscribers' options): every pattern no other one covers, with the
+    widest options of everything it covers."""
+    topics = [t for t, refs in local.items() if refs]
+    out: Dict[str, Optional[Dict[str, Any]]] = {}
+    for outer in topics:
+        if any(other != outer and pattern_covers(other, outer) for other in topics):
+            continue
+        merged: List[Optional[Dict[str, Any]]] = [
+            opts for inner in topics if pattern_covers(outer, inner) for opts in local[inner]
+        ]
+        options = merged[0]
+        for opts in merged[1:]:
+            options = subscription_options.widest(options, opts)
+        out[outer] = options
+    return out
 
 
 # ─── PeerConnection callbacks ─────────────────────────────────────────
 
 
 def _on_peer_state_change(pc: PeerConnection) -> None:
-    """Index by remote id once identification completes; replay any
-    queued subscriptions so the lazy bridge catches up after connect.
+    """Index by remote id once identification completes; replay the
+    peer's upstream subscriptions so the lazy bridge catches up after
+    connect.
 
     Dedup guard: a single runtime can show up under multiple mDNS
     hostnames (machine hostname AND ``<runtime_id>.local``). Both
@@ -235,12 +349,12 @@ def _on_peer_state_change(pc: PeerConnection) -> None:
                         _peers_by_url.pop(u, None)
             else:
                 _peers_by_id[pc.remote_id] = pc
-            # Replay any subs queued by id, and any queued by url (if a
-            # caller subscribed before connect produced an id).
-            replays: Set[str] = set()
+            # Replay what local subscribers need from this peer. The
+            # connection re-sends its own subscriptions on reconnect, so
+            # only ones made while it was down actually go out here.
+            replays: Dict[str, Optional[Dict[str, Any]]] = {}
             if dup_to_stop is None:
-                replays.update(_pending_subs.pop(pc.remote_id, set()))
-                replays.update(_pending_subs.pop(pc.url, set()))
+                replays = dict(_upstream.get(pc.remote_id, {}))
         if dup_to_stop is not None:
             logger.info(
                 "peer_manager: discarding duplicate peer %s — already connected as %s",
@@ -248,11 +362,11 @@ def _on_peer_state_change(pc: PeerConnection) -> None:
             )
             _schedule_send(dup_to_stop.stop())
             return
-        for topic in replays:
-            _schedule_send(pc.subscribe_upstream(topic))
+        for topic, options in replays.items():
+            _schedule_send(pc.subscribe_upstream(topic, options))
         if replays:
             logger.info(
-                "peer_manager: replayed %d subs on peer %s connect",
+                "peer_manager: %d upstream subs on peer %s connect",
                 len(replays), pc.remote_id,
             )
 
@@ -332,7 +446,8 @@ async def stop_all() -> None:
         pcs = list(_peers_by_url.values())
         _peers_by_url.clear()
         _peers_by_id.clear()
-        _pending_subs.clear()
+        _local_subs.clear()
+        _upstream.clear()
     for pc in pcs:
         try:
             await pc.stop()
@@ -347,7 +462,9 @@ def reset_for_tests() -> None:
     with _lock:
         _peers_by_url.clear()
         _peers_by_id.clear()
-        _pending_subs.clear()
+        _local_subs.clear()
+        _upstream.clear()
+        _coalesce_patterns.clear()
 
 
 # ─── test affordances kept for step 2a's stub-era unit tests ──────────
@@ -363,12 +480,7 @@ def pending_publishes() -> list:
 
 
 def open_subscriptions() -> Dict[str, Set[str]]:
-    """Subscriptions we've forwarded upstream, grouped by peer id."""
-    out: Dict[str, Set[str]] = {}
+    """Upstream subscriptions local subscribers need, grouped by peer
+    id — sent, or waiting for the peer to connect."""
     with _lock:
-        for pid, pc in _peers_by_id.items():
-            out[pid] = set(pc._upstream_subscriptions)
-        # Plus pending (peer not connected yet)
-        for pid, topics in _pending_subs.items():
-            out.setdefault(pid, set()).update(topics)
-    return out
+        return {pid: set(topics) for pid, topics in _upstream.items()}
@@ -0,0 +1,164 @@
+# unmanaged
+"""Persistent registry of the service subprocesses this runtime spawned.
+
+process_manager records every child it starts here and removes it when
+the child is reaped. The reconciler walks this registry on every tick
+instead of listing all of ``/proc``. Steady-state orphan detection is
+then O(managed services), not O(processes on the host).
+
+The registry is persisted to ``<data_dir>/service_pids.json``, so the
+next runtime on the same data dir still knows which pids the previous
+one left behind after a crash or ``kill -9``. Each entry carries the
+child's and the owning runtime's kernel start time (field 22 of
+``/proc/<pid>/stat``). A recycled pid therefore never matches a stale
+entry, and neither does a new runtime that happens to get the old
+runtime's pid.
+
+Entry shape::
+
+    {"pid": 4242, "proxy_id": "arduino-1", "cmdline": "python -m ...",
+     "start_ticks": 1234567, "owner_pid": 4100, "owner_start_ticks": 1200000,
+     "recorded_at": 1734000000.0}
+
+Until ``configure()`` is called (tests, ad-hoc tools) the registry
+lives in memory only.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+
+logger = logging.getLogger(__name__)
+
+_FILE_NAME = "service_pids.json"
+
+_lock = threading.Lock()
+_entries: Dict[int, Dict[str, Any]] = {}
+_path: Optional[Path] = None
+
+
+def process_start_ticks(pid: Optional[int]) -> Optional[int]:
+    """Kernel start time of ``pid`` in clock ticks since boot, or None
+    when the process is gone (or there's no /proc to ask)."""
+    if not pid or pid <= 0:
+        return None
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            # comm (field 2) may contain spaces and parens; skip past it.
+            fields = f.read().rsplit(") ", 1)[-1].split()
+        return int(fields[19])  # field 22 overall; 20 after pid + comm
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def is_same_process(pid: Optional[int], start_ticks: Optional[int]) -> bool:
+    """True if ``pid`` is alive and is still the process that was
+    recorded. Without /proc, or without recorded ticks, this falls back
+    to a plain liveness check."""
+    if not pid or pid <= 0:
+        return False
+    ticks = process_start_ticks(pid)
+    if ticks is not None:
+        return start_ticks is None or ticks == start_ticks
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    except OSError:
+        return False
+    return True
+
+
+def configure(data_dir: Path) -> None:
+    """Persist to ``<data_dir>/service_pids.json``, loading any entries a
+    previous runtime left there."""
+    global _path
+    path = Path(data_dir) / _FILE_NAME
+    loaded: Dict[int, Dict[str, Any]] = {}
+    try:
+        raw = json.loads(path.read_text())
+        for entry in raw.get("entries", []):
+            if isinstance(entry, dict) and isinstance(entry.get("pid"), int):
+                loaded[entry["pid"]] = entry
+    except FileNotFoundError:
+        pass
+    except (OSError, ValueError) as exc:
+        logger.warning("pid_registry: ignoring unreadable %s: %s", path, exc)
+    with _lock:
+        _path = path
+        # Our own in-memory entries (recorded before configure) win.
+        _entries.update({pid: e for pid, e in loaded.items() if pid not in _entries})
+        _save_locked()
+    if loaded:
+        logger.info("pid_registry: loaded %d entries from %s", len(loaded), path)
+
+
+def record(pid: int, proxy_id: str, cmdline: str = "") -> None:
+    """Remember a freshly spawned child of this runtime."""
+    entry = {
+        "pid": pid,
+        "proxy_id": proxy_id,
+        "cmdline": cmdline[:200],
+        "start_ticks": process_start_ticks(pid),
+        "owner_pid": os.getpid(),
+        "owner_start_ticks": _own_start_ticks(),
+        "recorded_at": time.time(),
+    }
+    with _lock:
+        _entries[pid] = entry
+        _save_locked()
+
+
+def forget(pid: int) -> None:
+    """Drop ``pid`` (reaped, or no longer the recorded process)."""
+    with _lock:
+        if _entries.pop(pid, None) is not None:
+            _save_locked()
+
+
+def entries() -> List[Dict[str, Any]]:
+    """Snapshot of every entry, own and inherited."""
+    with _lock:
+        return [dict(e) for e in _entries.values()]
+
+
+def owned_by_me(entry: Dict[str, Any]) -> bool:
+    return entry.get("owner_pid") == os.getpid() and entry.get("owner_start_ticks") == _own_start_ticks()
+
+
+def reset() -> None:
+    """Forget everything and go back to memory-only (tests)."""
+    global _path
+    with _lock:
+        _entries.clear()
+        _path = None
+
+
+_own_ticks: Optional[int] = None
+
+
+def _own_start_ticks() -> Optional[int]:
+    global _own_ticks
+    if _own_ticks is None:
+        _own_ticks = process_start_ticks(os.getpid())
+    return _own_ticks
+
+
+def _save_locked() -> None:
+    if _path is None:
+        return
+    tmp = _path.with_name(f".{_path.name}.tmp")
+    try:
+        _path.parent.mkdir(parents=True, exist_ok=True)
+        tmp.write_text(json.dumps({"entries": list(_entries.values())}))
+        os.replace(tmp, _path)
+    except OSError as exc:
+        logger.warning("pid_registry: could not persist %s: %s", _path, exc)
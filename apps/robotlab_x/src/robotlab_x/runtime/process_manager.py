@@ -3,7 +3,7 @@
 
 Phase 6 swap-in for the mocked pid/host/port that lifecycle.py was
 emitting. Each running proxy holds a Popen handle keyed by proxy_id in
-``_REGISTRY``; stdout/stderr are pumped line-by-line to
+``_REGISTRY``; stdout/stderr are published to
 ``/service_proxy/{id}/log`` so a dashboard log widget pointed at that
 topic fills in real time.
 
@@ -11,13 +11,21 @@ Process model:
     • subprocess.Popen with os.setsid() so the proxy + any children
       share one process group. stop() signals the group, which reaps
       everything the proxy might have spawned (uvicorn workers etc.).
-    • PYTHONUNBUFFERED=1 + a line-buffered text mode so prints flush
-      promptly into our pumps. Without this, "starting on port X" can
-      get stuck in the buffer until graceful shutdown.
-    • Crash detection runs in a daemon watcher thread: poll() every
-      half second; when the process exits unexpectedly (status was
-      still "running"), publish an error event on the proxy's
-      lifecycle topic so the UI notices.
+    • PYTHONUNBUFFERED=1 so prints reach our pipes promptly. Without
+      this, "starting on port X" can get stuck in the child's buffer
+      until graceful shutdown.
+    • Pipes and exit notification for every child are multiplexed by
+      ``io_supervisor``'s single selector thread — no per-process pump
+      or watcher threads. Log lines are batched per proxy per tick into
+      one bus message. When the process exits unexpectedly (status was
+      still "running"), ``_on_exit`` publishes an error event on the
+      proxy's lifecycle topic so the UI notices.
+    • Every child is recorded in ``pid_registry`` for its lifetime so
+      the reconciler can find it (or, after a crash, the next
+      runtime's reconciler can) without sweeping /proc.
+    • Types that declare ``entry.preload`` can start on a parked,
+      pre-imported interpreter from ``warm_pool`` instead of a fresh
+      Popen (opt-in via ``subprocess_warm_pool``; see event_handlers).
 
 Port allocation is OS-assisted: we bind a SO_REUSEADDR socket to
 127.0.0.1:0, read the port the kernel handed back, close the socket,
@@ -41,6 +49,7 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Dict, List, Optional
 
+from robotlab_x.runtime import io_supervisor, pid_registry, warm_pool
 from robotlab_x.runtime.bus import get_bus
 
 
@@ -58,8 +67,6 @@ class _Running:
     host: str
     bin_dir: Path
     log_topic: str
-    pumps: List[threading.Thread]
-    watcher: threading.Thread
     expected_stop: threading.Event
 
 
@@ -76,13 +83,6 @@ def _lifecycle_topic(proxy_id: str) -> str:
     return f"/service_proxy/{proxy_id}/lifecycle"
 
 
-def _publish_log(topic: str, stream: str, line: str, proxy_id: str) -> None:
-    get_bus().publish_sync(
-        topic,
-        {"proxy_id": proxy_id, "stream": stream, "line": line, "ts": time.time()},
-    )
-
-
 def _allocate_port() -> int:
     """Ask the OS for a free port. See module docstring re: the race."""
     s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
@@ -104,30 +104,17 @@ def _substitute(argv: List[str], substitutions: Dict[str, str]) -> List[str]:
     return out
 
 
-def _pump_stream(proxy_id: str, topic: str, stream, name: str) -> None:
-    try:
-        for line in iter(stream.readline, ""):
-            _publish_log(topic, name, line.rstrip("\n"), proxy_id)
-    finally:
-        try:
-            stream.close()
-        except Exception:
-            pass
-
-
-def _watch_for_crash(running: _Running) -> None:
-    """Detect unexpected exits, mark the proxy as errored, and emit a
-    lifecycle event so the UI updates without waiting for a poll.
+def _on_exit(running: _Running, rc: Optional[int]) -> None:
+    """io_supervisor's exit callback: detect unexpected exits, mark the
+    proxy as errored, and emit a lifecycle event so the UI updates
+    without waiting for a poll.
 
     Persists to the service_proxy row directly — previous versions only
     published to the bus, which meant a crashed subprocess looked alive
     in the registry and the user couldn't release it. Authority lives
-    here because we're the only thread that knows the exit code.
+    here because we're the only code that knows the exit code.
     """
-    proc = running.process
-    while proc.poll() is None:
-        time.sleep(0.5)
-    rc = proc.returncode
+    pid_registry.forget(running.process.pid)
     if running.expected_stop.is_set():
         return  # stop() drove this — nothing surprising.
     logger.warning("process_manager.crash proxy=%s rc=%s", running.proxy_id, rc)
@@ -185,7 +172,7 @@ def pid_alive(pid: Optional[int]) -> bool:
     """Cheap liveness check for an OS pid. None / 0 / <0 → False.
 
     Used by lifecycle code to detect proxy rows that claim status=running
-    but whose process is gone (crashed without crash-watcher pickup,
+    but whose process is gone (crashed without exit-handler pickup,
     backend restart with orphan never showing up, etc.).
     """
     if pid is None or pid <= 0:
@@ -211,8 +198,13 @@ def start(
     host: str = "127.0.0.1",
     cwd: Optional[Path] = None,
     service_meta_id: Optional[str] = None,
+    preload: Optional[List[str]] = None,
 ) -> Dict[str, object]:
-    """Spawn the proxy. Returns {pid, host, port}. Idempotent on already-running."""
+    """Spawn the proxy. Returns {pid, host, port}. Idempotent on already-running.
+
+    ``preload`` (the type's ``entry.preload``) opts the start into
+    ``warm_pool``: a parked interpreter is used when one is ready, and a
+    spare is parked afterwards for the next start."""
     if not entry_argv:
         raise ValueError("entry_argv is required")
 
@@ -275,59 +267,38 @@ def start(
         logger.exception("subprocess_auth setup failed; continuing without bus credentials")
 
     logger.info("process_manager.start proxy=%s argv=%s port=%d", proxy_id, argv, bound_port)
-    process = subprocess.Popen(
-        argv,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        stdin=subprocess.DEVNULL,
-        bufsize=1,
-        text=True,
-        preexec_fn=os.setsid,
-        cwd=str(cwd) if cwd else str(bin_dir.parent),
-        env=env,
-    )
+    run_cwd = str(cwd) if cwd else str(bin_dir.parent)
+    pool_key = service_meta_id or proxy_id
+    process = warm_pool.acquire(pool_key, argv, env, run_cwd) if preload else None
+    if process is None:
+        process = subprocess.Popen(
+            argv,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            stdin=subprocess.DEVNULL,
+            bufsize=1,
+            text=True,
+            preexec_fn=os.setsid,
+            cwd=run_cwd,
+            env=env,
+        )
+    if preload:
+        warm_pool.replenish(pool_key, argv[0], run_cwd, preload, env)
+
+    pid_registry.record(process.pid, proxy_id, " ".join(argv))
 
-    log_topic = _log_topic(proxy_id)
-    pumps = [
-        threading.Thread(
-            target=_pump_stream,
-            args=(proxy_id, log_topic, process.stdout, "stdout"),
-            name=f"pm_pump_stdout:{proxy_id}",
-            daemon=True,
-        ),
-        threading.Thread(
-            target=_pump_stream,
-            args=(proxy_id, log_topic, process.stderr, "stderr"),
-            name=f"pm_pump_stderr:{proxy_id}",
-            daemon=True,
-        ),
-    ]
-    for t in pumps:
-        t.start()
-
-    expected_stop = threading.Event()
     running = _Running(
         proxy_id=proxy_id,
         process=process,
         port=bound_port,
         host=host,
         bin_dir=bin_dir,
-        log_topic=log_topic,
-        pumps=pumps,
-        watcher=threading.Thread(),  # placeholder; replaced below
-        expected_stop=expected_stop,
-    )
-    watcher = threading.Thread(
-        target=_watch_for_crash,
-        args=(running,),
-        name=f"pm_watch:{proxy_id}",
-        daemon=True,
+        log_topic=_log_topic(proxy_id),
+        expected_stop=threading.Event(),
     )
-    running.watcher = watcher
-
     with _REGISTRY_LOCK:
         _REGISTRY[proxy_id] = running
-    watcher.start()
+    io_supervisor.register(proxy_id, process, running.log_topic, lambda rc: _on_exit(running, rc))
 
     return {"pid": process.pid, "host": host, "port": bound_port}
 
@@ -368,16 +339,17 @@ def stop(proxy_id: str, *, timeout: float = _GRACEFUL_STOP_SECONDS) -> Dict[str,
         process.wait(timeout=1.0)
 
     rc = process.returncode
-    # Give the pumps a moment to drain final stdout before we deregister.
-    for t in running.pumps:
-        t.join(timeout=0.5)
+    # Give the supervisor a moment to publish final stdout before we deregister.
+    io_supervisor.drain(proxy_id, timeout=0.5)
     with _REGISTRY_LOCK:
         _REGISTRY.pop(proxy_id, None)
     return {"stopped": True, "rc": rc}
 
 
 def stop_all() -> None:
-    """Best-effort shutdown of every supervised process. Used on app exit."""
+    """Best-effort shutdown of every supervised process (and any parked
+    warm-pool interpreters). Used on app exit."""
+    warm_pool.shutdown()
     with _REGISTRY_LOCK:
         proxy_ids = list(_REGISTRY.keys())
     for pid in proxy_ids:
@@ -16,9 +16,18 @@ drift unconditionally — the *converge* answer to drift, instead of the
 Sweep cadence is 15s by default. Each pass:
   1. Pid-alive check on every running/starting proxy row. If the PID is
      gone, flip status=error.
-  2. Orphan-subprocess scan: any arduino/echo_http subprocess alive but
-     not referenced by a service_proxy row gets SIGTERM'd, with a grace
+  2. Orphan-subprocess scan: any service subprocess alive but not
+     referenced by a service_proxy row gets SIGTERM'd, with a grace
      window so freshly spawned ones get a chance to announce hello.
+     Steady-state ticks only look at the pids in ``pid_registry`` —
+     every child this runtime (or a dead predecessor on the same data
+     dir) spawned — so the pass is O(managed services). The full
+     ``/proc`` sweep runs on the first pass after boot, whenever
+     ``request_full_sweep()`` is called (POST /v1/admin/reconcile/sweep),
+     and on every tick when ``reconcile_proc_sweep`` is set
+     (``ROBOTLAB_X_RECONCILE_PROC_SWEEP=true``; see event_handlers).
+     Crashes themselves are caught the moment they happen by
+     process_manager's pidfd watcher, not by this sweep.
   3. Workspace ref tidy: any proxy_id in workspace.service_proxy_ids /
      node_positions / node_view_types / edges that has no DB row gets
      stripped.
@@ -40,7 +49,7 @@ from typing import Any, Dict, List, Optional, Set
 
 from database.factory import get_database_client
 from database.interface import DatabaseAdapter
-from robotlab_x.runtime import process_manager
+from robotlab_x.runtime import pid_registry, process_manager
 from robotlab_x.runtime.bus import get_bus
 
 
@@ -61,6 +70,9 @@ REPORT_TOPIC = "/system/reconcile/report"
 _thread: Optional[threading.Thread] = None
 _started = threading.Event()
 _stop = threading.Event()
+# Set to make the next pass a full /proc sweep (and run it now).
+_sweep_requested = threading.Event()
+_wake = threading.Event()
 
 
 def _now_iso() -> str:
@@ -83,6 +95,17 @@ def _process_age_seconds(pid: int) -> float:
         return 0.0
 
 
+def _orphan_age_seconds(proc: Dict[str, Any]) -> float:
+    """How long ``proc`` has been a service. For registered pids that's
+    since ``pid_registry.record`` — a warm-pool interpreter may have been
+    parked for minutes before its handoff, so its /proc age says nothing
+    about whether it has had time to say hello."""
+    recorded_at = proc.get("recorded_at")
+    if recorded_at is not None:
+        return time.time() - recorded_at
+    return _process_age_seconds(proc["pid"])
+
+
 def _read_cmdline(pid: int) -> Optional[str]:
     """Return ``/proc/{pid}/cmdline`` joined, or None if unreadable."""
     try:
@@ -180,6 +203,42 @@ def _scan_service_subprocesses() -> List[Dict[str, Any]]:
     return out
 
 
+def _registered_subprocesses() -> List[Dict[str, Any]]:
+    """Same shape as ``_scan_service_subprocesses`` but sourced from
+    ``pid_registry``: only the pids we (or a dead runtime sharing our
+    data dir) spawned, so the cost is one /proc/<pid>/stat read each.
+    Entries whose process is gone — or whose pid now belongs to some
+    other process — are dropped from the registry."""
+    out: List[Dict[str, Any]] = []
+    for entry in pid_registry.entries():
+        pid = entry["pid"]
+        if not pid_registry.is_same_process(pid, entry.get("start_ticks")):
+            pid_registry.forget(pid)
+            continue
+        owner_pid = entry.get("owner_pid")
+        if pid_registry.owned_by_me(entry):
+            owner = "mine"
+        elif pid_registry.is_same_process(owner_pid, entry.get("owner_start_ticks")):
+            continue  # another live runtime on this data dir owns it
+        else:
+            owner = "orphan"
+        out.append({
+            "pid": pid,
+            "cmdline": entry.get("cmdline") or entry.get("proxy_id") or "?",
+            "ppid": owner_pid,
+            "owner": owner,
+            "recorded_at": entry.get("recorded_at"),
+        })
+    return out
+
+
+def request_full_sweep() -> None:
+    """Make the next reconciler pass sweep all of /proc, and run it now
+    rather than at the next interval."""
+    _sweep_requested.set()
+    _wake.set()
+
+
 def _signal(pid: int, sig: int) -> bool:
     """Best-effort signal delivery — process group first (catches every
     descendant the subprocess may have spawned), falling back to a
@@ -213,8 +272,11 @@ def _force_kill(pid: int) -> bool:
     return _signal(pid, signal.SIGKILL)
 
 
-def _reconcile_once(db: DatabaseAdapter) -> Dict[str, Any]:
-    """One pass. Returns a stats dict for /system/reconcile/report."""
+def _reconcile_once(db: DatabaseAdapter, *, full_sweep: bool = True) -> Dict[str, Any]:
+    """One pass. Returns a stats dict for /system/reconcile/report.
+
+    ``full_sweep`` scans all of /proc for orphans; otherwise only the
+    pids in ``pid_registry`` are checked."""
     # Lazy import to dodge circular imports at module load.
     from robotlab_x.runtime.lifecycle import _publish_lifecycle, _tidy_workspace_refs
 
@@ -224,6 +286,8 @@ def _reconcile_once(db: DatabaseAdapter) -> Dict[str, Any]:
         "orphan_processes_killed": 0,
         "orphan_processes_force_killed": 0,
         "orphan_refs_tidied": 0,
+        "sweep": "proc" if full_sweep else "registry",
+        "processes_checked": 0,
     }
 
     proxies = db.get_all_items("service_proxy") or []
@@ -271,13 +335,25 @@ def _reconcile_once(db: DatabaseAdapter) -> Dict[str, Any]:
     # the bus, clobbering the legitimate live instance's state on a
     # last-write-wins basis.
     seen_orphans: Set[int] = set()
-    for proc in _scan_service_subprocesses():
+    candidates = _registered_subprocesses()
+    known = {proc["pid"] for proc in candidates}
+    if full_sweep:
+        candidates += [proc for proc in _scan_service_subprocesses() if proc["pid"] not in known]
+    else:
+        # Orphans a full sweep found (and SIGTERM'd) aren't in the
+        # registry; keep following them so the SIGKILL escalation runs.
+        for pid in list(_orphan_sigterm_at.keys()):
+            joined = _read_cmdline(pid)
+            if pid not in known and joined:
+                candidates.append({"pid": pid, "cmdline": joined, "ppid": _read_ppid(pid), "owner": "orphan"})
+    stats["processes_checked"] = len(candidates)
+    for proc in candidates:
         pid = proc["pid"]
         if pid in proxy_pids:
             continue
         # Newly-spawned subprocesses haven't published their hello yet —
         # give them a grace window so we don't kill a healthy fresh start.
-        if _process_age_seconds(pid) < ORPHAN_GRACE_S:
+        if _orphan_age_seconds(proc) < ORPHAN_GRACE_S:
             continue
         seen_orphans.add(pid)
         first_at = _orphan_sigterm_at.get(pid)
@@ -336,16 +412,21 @@ def _reconcile_once(db: DatabaseAdapter) -> Dict[str, Any]:
     return stats
 
 
-async def _consume_loop(interval_s: float) -> None:
+async def _consume_loop(interval_s: float, proc_sweep: bool = False) -> None:
     db = get_database_client()
     if db is None:
         logger.error("reconciler: no database client — exiting")
         return
     # Brief delay so the rest of on_startup finishes before our first pass.
     await asyncio.sleep(2.0)
+    # Boot pass: full sweep, to catch orphans of a runtime that died
+    # before (or without) recording them in the pid registry.
+    _sweep_requested.set()
     while not _stop.is_set():
+        full_sweep = proc_sweep or _sweep_requested.is_set()
+        _sweep_requested.clear()
         try:
-            stats = _reconcile_once(db)
+            stats = _reconcile_once(db, full_sweep=full_sweep)
             if any(stats.get(k, 0) for k in (
                 "stale_rows_marked_error",
                 "orphan_processes_killed",
@@ -356,19 +437,20 @@ async def _consume_loop(interval_s: float) -> None:
             logger.exception("reconciler: pass raised; continuing")
         try:
             await asyncio.wait_for(
-                asyncio.get_running_loop().run_in_executor(None, _stop.wait, interval_s),
+                asyncio.get_running_loop().run_in_executor(None, _wake.wait, interval_s),
                 timeout=interval_s + 1,
             )
         except asyncio.TimeoutError:
-            continue
+            pass
+        _wake.clear()
 
 
-def _thread_main(interval_s: float) -> None:
+def _thread_main(interval_s: float, proc_sweep: bool) -> None:
     loop = asyncio.new_event_loop()
     asyncio.set_event_loop(loop)
     _started.set()
     try:
-        loop.run_until_complete(_consume_loop(interval_s))
+        loop.run_until_complete(_consume_loop(interval_s, proc_sweep))
     except Exception:  # noqa: BLE001
         logger.exception("reconciler: loop crashed")
     finally:
@@ -379,22 +461,25 @@ def _thread_main(interval_s: float) -> None:
         loop.close()
 
 
-def start(interval_s: float = DEFAULT_INTERVAL_S) -> None:
-    """Spin up the reconciler. Idempotent."""
+def start(interval_s: float = DEFAULT_INTERVAL_S, *, proc_sweep: bool = False) -> None:
+    """Spin up the reconciler. Idempotent. ``proc_sweep`` restores the
+    legacy full /proc sweep on every tick."""
     global _thread
     if _thread is not None and _thread.is_alive():
         return
     _stop.clear()
+    _wake.clear()
     _thread = threading.Thread(
         target=_thread_main,
-        args=(interval_s,),
+        args=(interval_s, proc_sweep),
         name="rlx-reconciler",
         daemon=True,
     )
     _thread.start()
     _started.wait(timeout=2.0)
-    logger.info("reconciler: started, interval=%ss", interval_s)
+    logger.info("reconciler: started, interval=%ss proc_sweep=%s", interval_s, proc_sweep)
 
 
 def stop() -> None:
     _stop.set()
+    _wake.set()
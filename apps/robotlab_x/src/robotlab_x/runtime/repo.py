@@ -20,14 +20,24 @@ The scanner is deliberately forgiving — malformed yml is logged and
 skipped, not raised, so one broken package doesn't blackhole the whole
 boot. The catalog row for a broken package just disappears until the
 file is fixed.
+
+Parsed manifests are kept in a process-wide index keyed by package.yml
+path and validated by its ``(st_ino, st_mtime_ns, st_size)`` plus the
+mtime of its version dir, which catches an icon being added. A rescan
+therefore costs one directory walk and two stats per package; only new or edited package.yml files are re-parsed. Callers
+get the SAME ``PackageManifest`` objects back on every scan. Treat them
+as read-only. ``find_manifest`` resolves one ``name@version`` with a
+stat per root and never walks the tree.
 """
 
 from __future__ import annotations
 
 import logging
+import os
+import threading
 from dataclasses import dataclass, field, asdict
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import yaml
 
@@ -69,6 +79,9 @@ class EntrySpec:
     argv: List[str] = field(default_factory=list)
     module: Optional[str] = None       # e.g. 'clock' (relative to the version dir)
     class_name: Optional[str] = None   # e.g. 'ClockService'
+    # Heavy modules a parked warm-pool interpreter imports ahead of a
+    # subprocess start (runtime/warm_pool.py), e.g. ['numpy', 'cv2'].
+    preload: List[str] = field(default_factory=list)
 
 
 @dataclass
@@ -179,10 +192,15 @@ def _parse_entry(raw: Any) -> EntrySpec:
             module = str(in_process["module"])
         if in_process.get("class") is not None:
             class_name = str(in_process["class"])
+    preload = raw.get("preload") or []
+    if not isinstance(preload, list):
+        logger.warning("entry.preload must be a list of module names")
+        preload = []
     return EntrySpec(
         argv=[str(x) for x in argv],
         module=module,
         class_name=class_name,
+        preload=[str(x) for x in preload],
     )
 
 
@@ -238,33 +256,94 @@ def _parse_manifest(path: Path, name: str, version: str) -> Optional[PackageMani
     )
 
 
+# ─── manifest index ───────────────────────────────────────────────────
+# package.yml path → (stamp, parsed manifest or None). A broken yml is
+# cached as None too, so it's warned about once per edit rather than on
+# every scan.
+
+_Stamp = Tuple[int, int, int, int]
+
+_index: Dict[Path, Tuple[_Stamp, Optional[PackageManifest]]] = {}
+_index_lock = threading.Lock()
+
+
+def _stamp(path: Path) -> Optional[_Stamp]:
+    """package.yml identity + the version dir's mtime. The latter moves
+    when an icon file appears or disappears next to the yml."""
+    try:
+        st = os.stat(path)
+        dir_mtime = os.stat(path.parent).st_mtime_ns
+    except OSError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size, dir_mtime)
+
+
+def load_manifest(path: Path, name: str, version: str) -> Optional[PackageManifest]:
+    """``_parse_manifest`` through the process-wide index: re-parses only
+    when package.yml or its directory changed since the last call. None
+    when the file is missing or broken."""
+    stamp = _stamp(path)
+    if stamp is None:
+        with _index_lock:
+            _index.pop(path, None)
+        return None
+    cached = _index.get(path)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    m = _parse_manifest(path, name, version)
+    with _index_lock:
+        _index[path] = (stamp, m)
+    return m
+
+
+def clear_manifest_cache() -> None:
+    """Drop every cached manifest; the next scan re-parses everything."""
+    with _index_lock:
+        _index.clear()
+
+
+def _prune(root: Path, seen: set) -> None:
+    with _index_lock:
+        for path in [p for p in _index if p not in seen and p.parent.parent.parent == root]:
+            del _index[path]
+
+
 # ─── scanning ─────────────────────────────────────────────────────────
 
 
+def _subdirs(path: Path) -> List[os.DirEntry]:
+    with os.scandir(path) as it:
+        entries = [e for e in it if not e.name.startswith(".") and e.is_dir()]
+    return sorted(entries, key=lambda e: e.name)
+
+
 def scan_repo(repo_dir: Path) -> List[PackageManifest]:
     """Walk ``<repo>/<name>/<version>/package.yml`` and return manifests.
 
     Skips broken manifests silently (warns); never raises. An empty repo
-    returns an empty list.
+    returns an empty list. Unchanged package.yml files come from the
+    manifest index instead of being re-parsed.
     """
     if not repo_dir.is_dir():
         logger.info("repo.scan: %s not a directory; empty catalog", repo_dir)
         return []
 
     out: List[PackageManifest] = []
-    for name_dir in sorted(repo_dir.iterdir()):
-        if not name_dir.is_dir() or name_dir.name.startswith("."):
+    seen: set = set()
+    for name_dir in _subdirs(repo_dir):
+        try:
+            version_dirs = _subdirs(Path(name_dir.path))
+        except OSError:
             continue
-        name = name_dir.name
-        for version_dir in sorted(name_dir.iterdir()):
-            if not version_dir.is_dir() or version_dir.name.startswith("."):
-                continue
-            manifest_path = version_dir / PACKAGE_MANIFEST_FILE
-            if not manifest_path.is_file():
-                continue
-            m = _parse_manifest(manifest_path, name, version_dir.name)
+        for version_dir in version_dirs:
+            manifest_path = Path(version_dir.path) / PACKAGE_MANIFEST_FILE
+            # Broken ymls too: their cached None is what stops the
+            # re-parse (and re-warn) on every scan.
+            seen.add(manifest_path)
+            m = load_manifest(manifest_path, name_dir.name, version_dir.name)
             if m is not None:
                 out.append(m)
+    _prune(repo_dir, seen)
     logger.info("repo.scan: found %d service-versions under %s", len(out), repo_dir)
     return out
 
@@ -330,6 +409,20 @@ def scan_repos(roots: List[Path]) -> List[PackageManifest]:
     return out
 
 
+def find_manifest(roots: List[Path], type_id: str) -> Optional[PackageManifest]:
+    """The manifest ``scan_repos(roots)`` would return for ``type_id``
+    (``name@version``), found by probing each root's
+    ``<name>/<version>/package.yml`` in precedence order. No tree walk."""
+    name, sep, version = type_id.rpartition("@")
+    if not sep or not name or not version:
+        return None
+    for root in roots:
+        m = load_manifest(root / name / version / PACKAGE_MANIFEST_FILE, name, version)
+        if m is not None:
+            return m
+    return None
+
+
 def find_type_dir(settings: Any, name: str, version: str) -> Optional[Path]:
     """Locate ``<root>/<name>/<version>/`` across all repo roots in
     precedence order. Returns the directory, or None if the type is
@@ -0,0 +1,403 @@
+# unmanaged
+"""Persistent, bounded per-service log history.
+
+``/service_proxy/{id}/log`` is a live topic. Once a line had been
+published it existed nowhere, so the Logs page opened after a crash
+showed nothing, and a reconnecting tab lost whatever scrolled by while
+it was away. Every service log line now also goes through here. That
+covers subprocess output batched by ``io_supervisor`` and in-process
+``emit_log`` calls.
+
+Each line gets a per-proxy sequence number (``seq``). The number is
+carried on the live bus payload too, so a client can stitch history
+and live tail together without duplicates. Lines are appended to
+segment files under ``<data_dir>/service_logs/<proxy_id>/``::
+
+    000000000001.jsonl   {"seq": 1, "ts": 1718.2, "stream": "stdout", "line": "..."}
+    000000004113.jsonl   ← file name is the segment's first seq
+
+A proxy keeps at most ``SEGMENTS`` files of ``max_bytes / SEGMENTS``
+each (``service_log_max_bytes``; see event_handlers). When the newest fills up, the
+oldest is deleted, so the disk per proxy is bounded. Memory holds each
+segment's seq/ts bounds plus the last ``TAIL_LINES`` lines. Appends are plain
+buffered writes, flushed per batch with no fsync. Queries read the
+segment files through the page cache, skipping segments whose seq or
+time bounds can't match. Segment files rather than a memory map:
+jsonl survives a crash mid-write (a torn last line is trimmed on
+reopen) and is greppable by hand.
+
+Queries (``GET /v1/logs?proxy_id=…``):
+  * ``since`` / ``until`` — epoch seconds, inclusive;
+  * ``q`` — case-insensitive substring of the line;
+  * ``after_seq`` — forward paging: the first ``limit`` lines past it.
+    Without it, the most recent ``limit`` matching lines come back.
+
+Backfill-then-tail: ``ws_endpoint`` accepts ``subscribe {topic,
+backfill: N}`` on ``/service_proxy/{id|+}/log`` and enqueues the last
+N stored lines (as one batch per proxy, flagged ``backfill: true``)
+ahead of the live messages. It reads them with ``backfill`` on an
+executor thread, before attaching, so the event loop never parses
+segment files. Lines numbered between that read and the attach come
+from the in-memory tail (``backfill_gap``). A burst longer than the
+tail in that window leaves a gap.
+Lines may arrive twice across that seam; clients drop ``seq`` values
+they've already seen for that proxy.
+
+Unconfigured (no data dir, or ``max_bytes`` 0) the store still numbers
+lines but keeps nothing.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import re
+import shutil
+import threading
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Deque, Dict, IO, Iterable, List, Optional, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BYTES = 4 * 1024 * 1024
+SEGMENTS = 4
+TAIL_LINES = 512
+_SUFFIX = ".jsonl"
+_SAFE_ID = re.compile(r"[^A-Za-z0-9._@-]")
+_LOG_TOPIC = re.compile(r"^/service_proxy/([^/]+)/log$")
+
+
+@dataclass
+class _Segment:
+    path: Path
+    first_seq: int
+    last_seq: int
+    first_ts: float
+    last_ts: float
+    size: int
+
+
+class _Log:
+    """One proxy's segment set. All access under ``lock``."""
+
+    def __init__(self, directory: Optional[Path]):
+        self.lock = threading.Lock()
+        self.directory = directory
+        self.segments: List[_Segment] = []
+        self.next_seq = 1
+        self.handle: Optional[IO[str]] = None
+        self.tail: Deque[Dict[str, Any]] = deque(maxlen=TAIL_LINES)
+        if directory is not None:
+            self._load()
+
+    def _load(self) -> None:
+        try:
+            names = sorted(p for p in self.directory.glob(f"*{_SUFFIX}") if p.stem.isdigit())
+        except OSError:
+            names = []
+        for path in names:
+            seg = _scan_segment(path)
+            if seg is not None:
+                self.segments.append(seg)
+        if self.segments:
+            self.next_seq = self.segments[-1].last_seq + 1
+
+
+_lock = threading.Lock()
+_root: Optional[Path] = None
+_max_bytes = DEFAULT_MAX_BYTES
+_logs: Dict[str, _Log] = {}
+
+
+def configure(data_dir: Optional[Path], max_bytes: Optional[int] = DEFAULT_MAX_BYTES) -> None:
+    """Store under ``<data_dir>/service_logs`` (event_handlers.on_startup).
+    ``data_dir=None`` or ``max_bytes`` 0 keeps nothing."""
+    global _root, _max_bytes
+    with _lock:
+        for log in _logs.values():
+            _close(log)
+        _logs.clear()
+        _max_bytes = int(max_bytes or 0)
+        _root = Path(data_dir) / "service_logs" if data_dir is not None and _max_bytes > 0 else None
+
+
+def append(proxy_id: str, lines: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Number and store ``lines`` (``{"stream", "line", "ts"}`` dicts) for
+    ``proxy_id``. Each dict gets its ``seq`` set in place; returns them."""
+    if not lines:
+        return lines
+    log = _log(proxy_id)
+    with log.lock:
+        for entry in lines:
+            entry["seq"] = log.next_seq
+            log.next_seq += 1
+        if log.directory is not None:
+            log.tail.extend(lines)
+            try:
+                _write(log, lines)
+            except OSError as exc:
+                logger.warning("service_logs: append failed for %s: %s", proxy_id, exc)
+                _close(log)
+    return lines
+
+
+def query(
+    proxy_id: str,
+    *,
+    since: Optional[float] = None,
+    until: Optional[float] = None,
+    q: Optional[str] = None,
+    after_seq: Optional[int] = None,
+    limit: int = 300,
+) -> List[Dict[str, Any]]:
+    """Stored lines for ``proxy_id`` matching every given filter, oldest
+    first. See the module docstring for the ``after_seq`` paging rule."""
+    log = _stored_log(proxy_id)
+    if log is None:
+        return []
+    with log.lock:
+        if log.handle is not None:
+            log.handle.flush()
+        segments = [
+            s for s in log.segments
+            if (since is None or s.last_ts >= since)
+            and (until is None or s.first_ts <= until)
+            and (after_seq is None or s.last_seq > after_seq)
+        ]
+    needle = q.lower() if q else None
+
+    def matches(rec: Dict[str, Any]) -> bool:
+        ts = rec.get("ts") or 0.0
+        return (
+            (since is None or ts >= since)
+            and (until is None or ts <= until)
+            and (after_seq is None or rec["seq"] > after_seq)
+            and (needle is None or needle in str(rec.get("line", "")).lower())
+        )
+
+    out: List[Dict[str, Any]] = []
+    if after_seq is not None:
+        for seg in segments:
+            out.extend(r for r in _read_segment(seg.path) if matches(r))
+            if len(out) >= limit:
+                break
+        return [dict(r, proxy_id=proxy_id) for r in out[:limit]]
+    for seg in reversed(segments):
+        out[:0] = [r for r in _read_segment(seg.path) if matches(r)]
+        if len(out) >= limit:
+            break
+    return [dict(r, proxy_id=proxy_id) for r in out[-limit:]]
+
+
+def last_seq(proxy_id: str) -> int:
+    """Highest seq handed out for ``proxy_id`` (0 if none)."""
+    log = _stored_log(proxy_id)
+    if log is None:
+        return 0
+    with log.lock:
+        return log.next_seq - 1
+
+
+def proxies() -> List[str]:
+    """Every proxy id with stored history."""
+    with _lock:
+        root = _root
+    if root is None or not root.is_dir():
+        return []
+    return sorted(p.name for p in root.iterdir() if p.is_dir())
+
+
+def batch_payload(proxy_id: str, lines: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """The ``/service_proxy/{id}/log`` message for a batch of lines: the
+    batch in ``lines`` plus the joined single-line fields older
+    subscribers read (see io_supervisor)."""
+    return {
+        "proxy_id": proxy_id,
+        "stream": "stderr" if any(l["stream"] == "stderr" for l in lines) else "stdout",
+        "line": "\n".join(l["line"] for l in lines),
+        "ts": lines[0]["ts"],
+        "lines": lines,
+    }
+
+
+def backfill(topic: str, limit: int) -> List[Tuple[str, Dict[str, Any]]]:
+    """(topic, payload) messages replaying the last ``limit`` stored lines
+    of each proxy ``topic`` covers — ``/service_proxy/{id}/log`` or the
+    ``/service_proxy/+/log`` wildcard. Anything else gets ``[]``."""
+    m = _LOG_TOPIC.match(topic)
+    if m is None or limit <= 0:
+        return []
+    ids = proxies() if m.group(1) == "+" else [m.group(1)]
+    return _backfill_messages((pid, query(pid, limit=limit)) for pid in ids)
+
+
+def backfill_gap(topic: str, replayed: Dict[str, int]) -> List[Tuple[str, Dict[str, Any]]]:
+    """Messages like ``backfill``'s for the lines numbered after a
+    ``backfill`` read. For each proxy ``topic`` covers, these are the
+    in-memory tail past ``replayed[proxy_id]``, the last seq that read
+    returned (0 if none). Reads no files, so it is safe on the event
+    loop."""
+    m = _LOG_TOPIC.match(topic)
+    if m is None:
+        return []
+    with _lock:
+        if m.group(1) == "+":
+            logs = list(_logs.items())
+        else:
+            logs = [(m.group(1), _logs[m.group(1)])] if m.group(1) in _logs else []
+    tails = []
+    for pid, log in logs:
+        after = replayed.get(pid, 0)
+        with log.lock:
+            tails.append((pid, [r for r in log.tail if r["seq"] > after]))
+    return _backfill_messages(tails)
+
+
+def drop(proxy_id: str) -> None:
+    """Forget ``proxy_id``'s history (the proxy was uninstalled)."""
+    with _lock:
+        log = _logs.pop(proxy_id, None)
+        root = _root
+    if log is not None:
+        with log.lock:
+            _close(log)
+    if root is not None:
+        shutil.rmtree(root / _dir_name(proxy_id), ignore_errors=True)
+
+
+# ─── internals ────────────────────────────────────────────────────────
+
+
+def _backfill_messages(
+    batches: Iterable[Tuple[str, List[Dict[str, Any]]]],
+) -> List[Tuple[str, Dict[str, Any]]]:
+    out: List[Tuple[str, Dict[str, Any]]] = []
+    for pid, records in batches:
+        lines = [
+            {"stream": r.get("stream", "stdout"), "line": r.get("line", ""), "ts": r.get("ts"), "seq": r["seq"]}
+            for r in records
+        ]
+        if lines:
+            out.append((f"/service_proxy/{pid}/log", dict(batch_payload(pid, lines), backfill=True)))
+    return out
+
+
+def _dir_name(proxy_id: str) -> str:
+    """``proxy_id`` as one path component under the store root. ``.``
+    survives ``_SAFE_ID``, so an empty or all-dot id would name the root
+    or its parent (which ``drop`` would then delete); those become
+    underscores."""
+    name = _SAFE_ID.sub("_", proxy_id)
+    if not name.strip("."):
+        return "_" * max(1, len(name))
+    return name
+
+
+def _log(proxy_id: str) -> _Log:
+    with _lock:
+        log = _logs.get(proxy_id)
+        if log is None:
+            directory = _root / _dir_name(proxy_id) if _root is not None else None
+            log = _logs[proxy_id] = _Log(directory)
+        return log
+
+
+def _stored_log(proxy_id: str) -> Optional[_Log]:
+    """``_log`` for readers: None instead of a new entry when this
+    process hasn't numbered a line for ``proxy_id`` and nothing is on
+    disk for it, so queries for arbitrary ids don't grow ``_logs``."""
+    with _lock:
+        log = _logs.get(proxy_id)
+        if log is not None:
+            return log
+        if _root is None or not (_root / _dir_name(proxy_id)).is_dir():
+            return None
+    return _log(proxy_id)
+
+
+def _segment_bytes() -> int:
+    return max(4096, _max_bytes // SEGMENTS)
+
+
+def _write(log: _Log, lines: List[Dict[str, Any]]) -> None:
+    """Append ``lines`` to the newest segment, rolling (and evicting the
+    oldest) when it's full. Caller holds ``log.lock``."""
+    data = "".join(
+        json.dumps({"seq": e["seq"], "ts": e["ts"], "stream": e["stream"], "line": e["line"]}) + "\n"
+        for e in lines
+    )
+    seg = log.segments[-1] if log.segments else None
+    if seg is None or seg.size >= _segment_bytes():
+        _close(log)
+        log.directory.mkdir(parents=True, exist_ok=True)
+        first = lines[0]
+        seg = _Segment(
+            path=log.directory / f"{first['seq']:012d}{_SUFFIX}",
+            first_seq=first["seq"], last_seq=first["seq"] - 1,
+            first_ts=first["ts"], last_ts=first["ts"], size=0,
+        )
+        log.segments.append(seg)
+        while len(log.segments) > SEGMENTS:
+            old = log.segments.pop(0)
+            try:
+                old.path.unlink()
+            except FileNotFoundError:
+                pass
+    if log.handle is None:
+        log.handle = open(seg.path, "a", encoding="utf-8")
+    log.handle.write(data)
+    log.handle.flush()
+    seg.size += len(data.encode("utf-8"))
+    seg.last_seq = lines[-1]["seq"]
+    seg.last_ts = lines[-1]["ts"]
+
+
+def _close(log: _Log) -> None:
+    if log.handle is not None:
+        try:
+            log.handle.close()
+        except OSError:
+            pass
+        log.handle = None
+
+
+def _read_segment(path: Path) -> List[Dict[str, Any]]:
+    out: List[Dict[str, Any]] = []
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            for raw in f:
+                try:
+                    out.append(json.loads(raw))
+                except ValueError:
+                    continue  # torn tail after a crash
+    except FileNotFoundError:
+        pass  # evicted between listing and reading
+    return out
+
+
+def _scan_segment(path: Path) -> Optional[_Segment]:
+    """Bounds of an existing segment file. Trims a torn last line left by
+    a crash mid-append so the next append starts on a line boundary."""
+    records = _read_segment(path)
+    if not records:
+        try:
+            path.unlink()
+        except OSError:
+            pass
+        return None
+    size = path.stat().st_size
+    with open(path, "rb+") as f:
+        if size:
+            f.seek(size - 1)
+            if f.read(1) != b"\n":
+                data = path.read_bytes()
+                size = data.rfind(b"\n") + 1
+                f.truncate(size)
+    return _Segment(
+        path=path,
+        first_seq=records[0]["seq"], last_seq=records[-1]["seq"],
+        first_ts=records[0].get("ts") or 0.0, last_ts=records[-1].get("ts") or 0.0,
+        size=size,
+    )
@@ -0,0 +1,208 @@
+# unmanaged
+"""Dependency-graph parallel starter for boot.
+
+``reconcile_running_proxies`` used to restart the previous lifetime's
+services one at a time in row order. Each ``_handle_start`` blocks on
+its own work — a lazy pip install, an in-process class import, a
+subprocess fork — so a 30-service robot paid the sum of all of them.
+This module starts every service whose dependencies are already up,
+concurrently, up to a limit (``boot_start_concurrency``, default 4 —
+``ROBOTLAB_X_BOOT_START_CONCURRENCY``; 1 keeps the old serial behaviour).
+Instances of one type still install it once: lifecycle holds a lock
+per type slot around the venv build, so a second instance waits for
+the first one's pip run rather than racing it.
+
+A proxy waits for:
+
+  * every proxy named in its ``depends_on`` entry in the active set's
+    ``runtime.yml``::
+
+        start_order: [arduino-1, servo-1, brain-1]
+        depends_on:
+          servo-1: [arduino-1]
+
+  * the implementers of each capability its type ``requires:`` — the
+    same contract ``config_sets.load_config_set`` checks. An
+    implementer declared earlier in ``start_order`` is preferred. Only
+    when there's none does the proxy wait on the later implementers
+    instead.
+
+Only proxies in the same batch are edges; anything already running is
+satisfied by definition. "Up" means ``_handle_start`` returned. It does
+not wait for a subprocess's discovery hello. A failed dependency still
+releases its dependents, as the serial loop did. They are started and
+fail or cope on their own. A dependency cycle is logged and broken by
+starting its earliest member anyway. Ready services launch in
+``start_order`` order.
+
+Workers share the runtime's database adapter, so it must tolerate
+concurrent calls. ``TinyDBDatabase`` (the default backend) serialises
+its operations on an adapter lock; the file-per-row and SQL backends
+are safe as they are.
+
+Progress goes out on the retained ``/system/boot/timeline`` topic after
+every completion, so a late UI subscriber still gets the whole boot::
+
+    {"done": bool, "concurrency": 4, "elapsed_s": 3.2,
+     "services": [{"proxy_id", "type_id", "depends_on", "status",
+                   "ready_s", "started_s", "duration_s", "error"}, ...]}
+
+Offsets are seconds since the batch began. ``ready_s`` is when the
+proxy's dependencies were satisfied and ``started_s`` when a worker
+picked it up, so a gap between the two is time spent queued behind the
+concurrency limit.
+"""
+from __future__ import annotations
+
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Set
+
+from robotlab_x.runtime.bus import get_bus
+
+
+logger = logging.getLogger(__name__)
+
+TIMELINE_TOPIC = "/system/boot/timeline"
+DEFAULT_CONCURRENCY = 4
+
+
+# ─── graph ────────────────────────────────────────────────────────────
+
+
+def priority_order(proxy_ids: Iterable[str], start_order: Optional[List[str]] = None) -> List[str]:
+    """``proxy_ids`` sorted by position in ``start_order``; ids it doesn't
+    list keep their relative order after the listed ones."""
+    rank = {pid: i for i, pid in enumerate(start_order or [])}
+    ids = list(proxy_ids)
+    return sorted(ids, key=lambda pid: (rank.get(pid, len(rank)), ids.index(pid)))
+
+
+def dependency_graph(
+    proxy_ids: List[str],
+    metas: Mapping[str, Mapping[str, Any]],
+    depends_on: Optional[Mapping[str, List[str]]] = None,
+    start_order: Optional[List[str]] = None,
+) -> Dict[str, Set[str]]:
+    """proxy_id → the proxy_ids in this batch it has to wait for.
+
+    ``metas`` maps proxy_id to its service_meta row (``implements`` /
+    ``requires`` lists); ``depends_on`` is runtime.yml's explicit map."""
+    order = priority_order(proxy_ids, start_order)
+    pos = {pid: i for i, pid in enumerate(order)}
+    implementers: Dict[str, List[str]] = {}
+    for pid in order:
+        for cap in (metas.get(pid) or {}).get("implements") or []:
+            implementers.setdefault(cap, []).append(pid)
+
+    graph: Dict[str, Set[str]] = {}
+    for pid in order:
+        deps = {d for d in (depends_on or {}).get(pid) or [] if d in pos and d != pid}
+        for cap in (metas.get(pid) or {}).get("requires") or []:
+            providers = [q for q in implementers.get(cap, []) if q != pid]
+            earlier = [q for q in providers if pos[q] < pos[pid]]
+            deps.update(earlier or providers)
+        graph[pid] = deps
+    return graph
+
+
+# ─── scheduler ────────────────────────────────────────────────────────
+
+
+def run(
+    order: List[str],
+    graph: Mapping[str, Set[str]],
+    start_fn: Callable[[str], Any],
+    *,
+    max_concurrency: int = DEFAULT_CONCURRENCY,
+    type_ids: Optional[Mapping[str, Optional[str]]] = None,
+) -> Dict[str, Any]:
+    """Call ``start_fn(proxy_id)`` for every id in ``order``, each once
+    its ``graph`` dependencies have finished, at most ``max_concurrency``
+    at a time. Exceptions are recorded in the timeline, not raised.
+    Returns the final timeline payload (also published)."""
+    limit = max(1, int(max_concurrency or 1))
+    t0 = time.monotonic()
+    batch = set(order)
+    waiting = {pid: set(graph.get(pid) or ()) & batch - {pid} for pid in order}
+    entries: Dict[str, Dict[str, Any]] = {
+        pid: {
+            "proxy_id": pid,
+            "type_id": (type_ids or {}).get(pid),
+            "depends_on": sorted(waiting[pid]),
+            "status": "pending",
+            "ready_s": None,
+            "started_s": None,
+            "duration_s": None,
+            "error": None,
+        }
+        for pid in order
+    }
+
+    def _offset() -> float:
+        return round(time.monotonic() - t0, 3)
+
+    def _timed(pid: str) -> None:
+        entries[pid]["started_s"] = _offset()
+        entries[pid]["status"] = "starting"
+        start_fn(pid)
+
+    def _payload(done: bool) -> Dict[str, Any]:
+        return {
+            "done": done,
+            "concurrency": limit,
+            "elapsed_s": _offset(),
+            "services": [dict(entries[pid]) for pid in order],
+        }
+
+    pending = list(order)
+    running: Dict[Future, str] = {}
+    with ThreadPoolExecutor(max_workers=limit, thread_name_prefix="rlx-boot-start") as pool:
+        while pending or running:
+            ready = [pid for pid in pending if not waiting[pid]]
+            if not ready and not running:
+                pid = pending[0]
+                logger.warning(
+                    "start_graph: dependency cycle — starting %s without waiting for %s",
+                    pid, sorted(waiting[pid]),
+                )
+                waiting[pid] = set()
+                ready = [pid]
+            for pid in ready:
+                if entries[pid]["ready_s"] is None:
+                    entries[pid]["ready_s"] = _offset()
+            for pid in ready[: limit - len(running)]:
+                pending.remove(pid)
+                running[pool.submit(_timed, pid)] = pid
+            done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+            for fut in done:
+                pid = running.pop(fut)
+                entry = entries[pid]
+                entry["duration_s"] = round(_offset() - (entry["started_s"] or 0.0), 3)
+                exc = fut.exception()
+                if exc is None:
+                    entry["status"] = "running"
+                else:
+                    entry["status"] = "error"
+                    entry["error"] = f"{type(exc).__name__}: {exc}"
+                    if any(pid in deps for deps in waiting.values()):
+                        logger.warning("start_graph: %s failed; starting its dependents anyway", pid)
+                for deps in waiting.values():
+                    deps.discard(pid)
+            _publish(_payload(done=not (pending or running)))
+
+    final = _payload(done=True)
+    logger.info(
+        "start_graph: started %d service(s) in %.2fs (concurrency=%d, errors=%d)",
+        len(order), final["elapsed_s"], limit,
+        sum(1 for e in final["services"] if e["status"] == "error"),
+    )
+    return final
+
+
+def _publish(payload: Dict[str, Any]) -> None:
+    try:
+        get_bus().publish_sync(TIMELINE_TOPIC, payload, retained=True)
+    except Exception:  # noqa: BLE001 — reporting must never fail a boot
+        logger.debug("start_graph: timeline publish failed", exc_info=True)
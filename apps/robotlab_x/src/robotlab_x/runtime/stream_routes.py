@@ -1,12 +1,17 @@
 # unmanaged
 """HTTP + WS routes for the stream media plane.
 
-Three endpoints:
+Four endpoints:
   * ``GET  /v1/stream``                — admin: list every registered stream
   * ``GET  /v1/stream/{id}/mjpeg``     — consumer: multipart/x-mixed-replace
                                           stream of JPEG frames. Auth via
                                           query-param ``?token=`` because
                                           ``<img src>`` can't set headers.
+  * ``WS   /v1/stream/{id}/ws``        — consumer: binary messages of
+                                          ``WS_FRAME_HEADER`` (seq, ts) +
+                                          JPEG, paced per viewer (max fps,
+                                          send-latency skipping). For
+                                          remote operators on slow links.
   * ``WS   /v1/stream/{id}/upload``    — producer: binary frame uploads from
                                           a subprocess service. Same JWT as
                                           /v1/ws; subprocess token works.
@@ -25,15 +30,17 @@ import asyncio
 import json
 import logging
 import os
+import time
 from typing import Any, AsyncGenerator, Dict, List, Optional
 
 import jwt
 from fastapi import Depends, FastAPI, HTTPException, Query, WebSocket, WebSocketDisconnect
 from fastapi.responses import StreamingResponse
 from fastapi.routing import APIRouter
+from rlx_bus.shm_ring import ShmFrameRing
 
 from robotlab_x.api.crud_router_factory import auth_deps
-from robotlab_x.runtime.streams import StreamMetadata, get_registry
+from robotlab_x.runtime.streams import MJPEG_BOUNDARY, StreamMetadata, StreamState, get_registry
 
 
 logger = logging.getLogger(__name__)
@@ -71,12 +78,7 @@ def _decode_query_token(token: Optional[str]) -> Dict[str, Any]:
     return payload
 
 
-# Multipart boundary used between MJPEG frames. Browsers parse the
-# boundary string from the Content-Type header; any unique-ish token
-# works. ``--frame`` is the conventional one and what Chrome/Firefox
-# DevTools display nicely.
-_MJPEG_BOUNDARY = "frame"
-_MJPEG_CONTENT_TYPE = f"multipart/x-mixed-replace; boundary={_MJPEG_BOUNDARY}"
+_MJPEG_CONTENT_TYPE = f"multipart/x-mixed-replace; boundary={MJPEG_BOUNDARY}"
 
 
 async def _mjpeg_generator(stream_id: str) -> AsyncGenerator[bytes, None]:
@@ -93,6 +95,9 @@ async def _mjpeg_generator(stream_id: str) -> AsyncGenerator[bytes, None]:
     the buffer drains. The producer is unaffected — only our own
     coroutine queues. That's the right behaviour: one slow consumer
     doesn't slow the producer or other consumers.
+
+    Parts come pre-encoded from the StreamState (one envelope per frame
+    shared by every consumer), so this loop never copies the JPEG.
     """
     registry = get_registry()
     state = registry.get(stream_id)
@@ -105,17 +110,17 @@ async def _mjpeg_generator(stream_id: str) -> AsyncGenerator[bytes, None]:
     try:
         last_seq = 0
         # 1. Send the most recent frame immediately if we have one.
-        snapshot = state.latest_frame()
+        snapshot = state.latest_part()
         if snapshot is not None:
-            frame, seq = snapshot
+            part, seq = snapshot
             last_seq = seq
-            yield _encode_mjpeg_part(frame)
+            yield part
 
         # 2. Loop waiting for new frames, with timeout-based keep-alive
         # so a dead producer surfaces as a dead stream rather than a
         # silently-stuck connection.
         while True:
-            result = await state.wait_for_frame(last_seq, timeout_s=5.0)
+            result = await state.wait_for_part(last_seq, timeout_s=5.0)
             if result is None:
                 # No new frame in 5s — check whether the stream is dead.
                 # If yes, exit; consumer will reconnect. If the producer's
@@ -123,9 +128,9 @@ async def _mjpeg_generator(stream_id: str) -> AsyncGenerator[bytes, None]:
                 if state.is_stale():
                     return
                 continue
-            frame, seq = result
+            part, seq = result
             last_seq = seq
-            yield _encode_mjpeg_part(frame)
+            yield part
     except asyncio.CancelledError:
         # Consumer disconnected (client closed the connection). The
         # cancellation comes from FastAPI/uvicorn's response framework.
@@ -134,16 +139,101 @@ async def _mjpeg_generator(stream_id: str) -> AsyncGenerator[bytes, None]:
         state.remove_consumer()
 
 
-def _encode_mjpeg_part(frame: bytes) -> bytes:
-    """Wrap a JPEG payload in the multipart envelope. Headers
-    intentionally minimal — Content-Type + Content-Length is the
-    well-known shape and is what every browser MJPEG decoder expects."""
-    return (
-        f"--{_MJPEG_BOUNDARY}\r\n"
-        f"Content-Type: image/jpeg\r\n"
-        f"Content-Length: {len(frame)}\r\n"
-        f"\r\n"
-    ).encode("ascii") + frame + b"\r\n"
+def _read_shm_frame(ring: Optional[ShmFrameRing], ctrl: Any) -> Optional[bytes]:
+    """Resolve a ``shm_frame`` control message to frame bytes. None when
+    there's no ring on this connection, the message is malformed, or
+    the producer already overwrote the slot (frame skipped)."""
+    if ring is None or not isinstance(ctrl, dict):
+        return None
+    try:
+        return ring.read(int(ctrl["slot"]), int(ctrl["seq"]), int(ctrl["size"]))
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+# ─── WS consumer ──────────────────────────────────────────────────────
+
+
+class _ViewerPacing:
+    """Per-viewer send policy for the WS consumer endpoint.
+
+    The MJPEG route pushes every frame and leans on TCP backpressure, so
+    a viewer on a slow link builds up seconds of stale frames in socket
+    buffers. Here the sender only ever takes the *latest* frame and
+    decides when it may send the next one:
+
+      * ``max_fps``     — client-requested ceiling; 0 means unlimited.
+      * ``latest_only`` — (default) also hold off for the measured send
+                          latency (EWMA of how long ``send_bytes`` took),
+                          so a link that needs 200 ms per frame gets ~5
+                          fresh frames/s instead of a growing backlog.
+                          Off: pace by ``max_fps`` only and let TCP
+                          backpressure do the rest, like MJPEG.
+
+    Frames that arrive while a viewer is holding off are never queued —
+    the next send picks up whatever is newest.
+    """
+
+    # Weight of the newest send-latency sample in the EWMA.
+    _ALPHA = 0.3
+
+    def __init__(self, max_fps: float = 0.0, latest_only: bool = True) -> None:
+        self.max_fps = 0.0
+        self.latest_only = True
+        self.send_latency_s = 0.0
+        self.update({"max_fps": max_fps, "latest_only": latest_only})
+
+    def update(self, control: Dict[str, Any]) -> None:
+        """Apply a client control message; unknown/invalid keys are ignored."""
+        if "max_fps" in control:
+            try:
+                self.max_fps = max(0.0, float(control["max_fps"] or 0.0))
+            except (TypeError, ValueError):
+                pass
+        if "latest_only" in control:
+            self.latest_only = bool(control["latest_only"])
+
+    def record_send(self, seconds: float) -> None:
+        if self.send_latency_s == 0.0:
+            self.send_latency_s = seconds
+        else:
+            self.send_latency_s += self._ALPHA * (seconds - self.send_latency_s)
+
+    def min_interval(self) -> float:
+        """Minimum spacing between two sends' start times."""
+        interval = 1.0 / self.max_fps if self.max_fps > 0 else 0.0
+        if self.latest_only:
+            interval = max(interval, self.send_latency_s)
+        return interval
+
+
+def _query_bool(value: Optional[str], default: bool) -> bool:
+    if value is None:
+        return default
+    return value.lower() not in ("0", "false", "no", "off", "")
+
+
+async def _ws_consumer_loop(websocket: WebSocket, state: StreamState, pacing: _ViewerPacing) -> None:
+    """Send the latest frame to one WS viewer, paced by ``pacing``.
+    Returns when the stream goes stale."""
+    last_seq = 0
+    last_send_at = 0.0
+    while True:
+        result = await state.wait_for_frame(last_seq, timeout_s=5.0)
+        if result is None:
+            if state.is_stale():
+                return
+            continue
+        wait = last_send_at + pacing.min_interval() - time.monotonic()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        # Whatever is newest *now* — frames that landed while we held
+        # off are skipped, not queued.
+        message, seq = state.latest_ws_message()
+        last_seq = seq
+        last_send_at = time.monotonic()
+        await websocket.send_bytes(message)
+        pacing.record_send(time.monotonic() - last_send_at)
 
 
 # ─── route registration ───────────────────────────────────────────────
@@ -201,6 +291,14 @@ def register_stream_routes(app: FastAPI) -> None:
              This registers the stream + makes it discoverable.
           3. Producer sends BINARY frames — each one is a complete JPEG.
              Latest-wins; we don't buffer history.
+             Shared-memory variant: if the metadata carried an ``shm``
+             ring descriptor and we could attach to it, we answer the
+             metadata with TEXT ``{"shm": true}`` and frames arrive as
+             TEXT ``{"shm_frame": {slot, seq, size}}`` pointing into the
+             ring (oversized frames still come as BINARY). A failed
+             attach answers ``{"shm": false}`` and the producer stays on
+             BINARY frames. Only ``ShmFrameRing``-named segments
+             (``rlx_<hex>``) are ever attached.
           4. Disconnect (clean or otherwise) leaves the StreamState in
              the registry but flagged stale after 10s with no frames.
              Re-connect re-registers + resumes pushing.
@@ -224,6 +322,7 @@ def register_stream_routes(app: FastAPI) -> None:
         await websocket.accept()
         registry = get_registry()
         stream_state = None
+        ring: Optional[ShmFrameRing] = None
 
         try:
             # First frame MUST be the metadata text frame.
@@ -247,11 +346,19 @@ def register_stream_routes(app: FastAPI) -> None:
                 fps=meta_dict.get("fps"),
             )
             stream_state = await registry.register(metadata)
-            logger.info("stream.upload connected id=%s producer=%s",
-                        stream_id, metadata.producer_id)
-
-            # Frame loop: binary frames are JPEG bytes, text frames
-            # update metadata mid-stream.
+            shm_offer = meta_dict.get("shm")
+            if isinstance(shm_offer, dict):
+                try:
+                    ring = ShmFrameRing.attach(shm_offer)
+                except (OSError, ValueError) as exc:
+                    logger.info("stream.upload shm refused id=%s reason=%s", stream_id, exc)
+                await websocket.send_text(json.dumps({"shm": ring is not None}))
+            stream_state.transport = "shm" if ring is not None else "ws"
+            logger.info("stream.upload connected id=%s producer=%s transport=%s",
+                        stream_id, metadata.producer_id, stream_state.transport)
+
+            # Frame loop: binary frames are JPEG bytes, text frames are
+            # shared-memory frame pointers or mid-stream metadata updates.
             while True:
                 msg = await websocket.receive()
                 # Starlette's WebSocket.receive() returns a discriminated
@@ -264,22 +371,29 @@ def register_stream_routes(app: FastAPI) -> None:
                 if payload_bytes:
                     await stream_state.set_frame(payload_bytes)
                 elif payload_text:
-                    # Metadata update — best-effort merge.
                     try:
                         update = json.loads(payload_text)
                     except json.JSONDecodeError:
                         continue
-                    if isinstance(update, dict):
-                        merged = StreamMetadata(
-                            stream_id=stream_id,
-                            producer_id=update.get("producer_id") or metadata.producer_id,
-                            kinds=list(update.get("kinds") or metadata.kinds),
-                            format=update.get("format") or metadata.format,
-                            resolution=update.get("resolution") or metadata.resolution,
-                            fps=update.get("fps") or metadata.fps,
-                        )
-                        await registry.register(merged)
-                        metadata = merged
+                    if not isinstance(update, dict):
+                        continue
+                    shm_frame = update.get("shm_frame")
+                    if shm_frame is not None:
+                        frame = _read_shm_frame(ring, shm_frame)
+                        if frame is not None:
+                            await stream_state.set_frame(frame)
+                        continue
+                    # Metadata update — best-effort merge.
+                    merged = StreamMetadata(
+                        stream_id=stream_id,
+                        producer_id=update.get("producer_id") or metadata.producer_id,
+                        kinds=list(update.get("kinds") or metadata.kinds),
+                        format=update.get("format") or metadata.format,
+                        resolution=update.get("resolution") or metadata.resolution,
+                        fps=update.get("fps") or metadata.fps,
+                    )
+                    await registry.register(merged)
+                    metadata = merged
 
         except WebSocketDisconnect:
             pass
@@ -290,7 +404,82 @@ def register_stream_routes(app: FastAPI) -> None:
             # stream instead of an outright 404 if the producer
             # reconnects quickly. The stale flag flips after _STALE_AFTER_S
             # of no frames.
+            if ring is not None:
+                ring.close()
             if stream_state is not None:
                 logger.info("stream.upload disconnected id=%s", stream_id)
 
+    @app.websocket("/v1/stream/{stream_id:path}/ws")
+    async def stream_ws_consumer(websocket: WebSocket, stream_id: str) -> None:
+        """Consumer-side WS: latest frames as binary messages.
+
+        Wire protocol:
+          1. Viewer connects with ``?token=`` and optionally
+             ``?max_fps=<float>`` and ``?latest_only=0|1`` (default 1).
+          2. Server sends BINARY messages: ``WS_FRAME_HEADER`` (16 bytes:
+             uint64 seq, float64 unix-seconds timestamp, big-endian)
+             followed by the JPEG. Seq gaps are frames skipped for this
+             viewer.
+          3. Viewer may send TEXT JSON ``{"max_fps": 5, "latest_only":
+             true}`` at any time to retune pacing.
+          4. Server closes with 4404 for an unknown stream and 1001 once
+             the producer has gone stale.
+        """
+        token = websocket.query_params.get("token")
+        try:
+            _decode_query_token(token)
+        except HTTPException as exc:
+            close_code = 4401 if exc.status_code == 401 else 4403
+            await websocket.close(code=close_code, reason=exc.detail)
+            return
+        state = get_registry().get(stream_id)
+        if state is None:
+            await websocket.close(code=4404, reason="stream not registered")
+            return
+
+        params = websocket.query_params
+        pacing = _ViewerPacing(latest_only=_query_bool(params.get("latest_only"), True))
+        pacing.update({"max_fps": params.get("max_fps") or 0.0})
+
+        await websocket.accept()
+        state.add_consumer()
+        sender = asyncio.create_task(
+            _ws_consumer_loop(websocket, state, pacing), name=f"stream_ws:{stream_id}",
+        )
+        try:
+            # Reader: control messages + disconnect detection. The sender
+            # never reads, so a viewer that stops reading can only stall
+            # its own send_bytes — not the producer or other viewers.
+            while not sender.done():
+                receive = asyncio.ensure_future(websocket.receive())
+                done, _ = await asyncio.wait(
+                    {receive, sender}, return_when=asyncio.FIRST_COMPLETED,
+                )
+                if receive not in done:
+                    receive.cancel()
+                    await asyncio.gather(receive, return_exceptions=True)
+                    break
+                msg = receive.result()
+                if msg.get("type") == "websocket.disconnect":
+                    return
+                text = msg.get("text")
+                if text:
+                    try:
+                        control = json.loads(text)
+                    except json.JSONDecodeError:
+                        continue
+                    if isinstance(control, dict):
+                        pacing.update(control)
+            if sender.exception() is None:
+                # Stream went stale.
+                await websocket.close(code=1001, reason="stream stale")
+        except WebSocketDisconnect:
+            pass
+        except Exception:  # noqa: BLE001
+            logger.exception("stream.ws_consumer error id=%s", stream_id)
+        finally:
+            sender.cancel()
+            await asyncio.gather(sender, return_exceptions=True)
+            state.remove_consumer()
+
     app.include_router(router)
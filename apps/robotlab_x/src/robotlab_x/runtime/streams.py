@@ -11,7 +11,13 @@ Wire model:
   ─────────────────────────────              ───────                       ────────────────────────
   WS /v1/stream/<id>/upload  ──── binary ──▶ StreamState.set_frame   ──▶  GET /v1/stream/<id>/mjpeg
   (JPEG bytes)                              (latest + per-consumer        ──▶ multipart frames
-                                             condvar wakeup)
+                                             condvar wakeup)          ──▶  WS /v1/stream/<id>/ws
+                                                                           header + JPEG, paced
+                                                                           per viewer
+
+  Same-host producers may instead write frames into a shared-memory ring
+  and send only ``{"shm_frame": {slot, seq, size}}`` on the upload WS;
+  the route copies the slot out and calls the same ``set_frame``.
 
   Producer also publishes:
     - retained /stream/index/<id>  (discovery — JSON metadata)
@@ -30,11 +36,19 @@ bytes and re-serves them verbatim.
 Backpressure: ``set_frame`` is non-blocking. If a consumer can't keep up
 its condvar wakeup races and it just sees the next frame instead of
 falling behind. Slow consumers don't slow the producer.
+
+Fan-out cost: the multipart envelope (boundary + headers + JPEG) is
+built at most once per frame, by whichever MJPEG consumer wakes first,
+and every other consumer yields that same ``bytes`` object. Adding a
+viewer adds a socket write per frame, not a full-frame copy. The WS
+consumer's binary message (``WS_FRAME_HEADER`` + JPEG) is shared the
+same way.
 """
 from __future__ import annotations
 
 import asyncio
 import logging
+import struct
 import time
 from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional
@@ -43,6 +57,36 @@ from typing import Any, Dict, List, Optional
 logger = logging.getLogger(__name__)
 
 
+# Multipart boundary used between MJPEG frames. Browsers parse the
+# boundary string from the Content-Type header; any unique-ish token
+# works. ``--frame`` is the conventional one and what Chrome/Firefox
+# DevTools display nicely.
+MJPEG_BOUNDARY = "frame"
+
+
+# Prefix of every binary message on the WS consumer endpoint: frame seq
+# (uint64) and producer-side wall-clock receive time (float64 unix
+# seconds), network byte order. The JPEG follows immediately.
+WS_FRAME_HEADER = struct.Struct("!Qd")
+
+
+def encode_mjpeg_part(frame: bytes) -> bytes:
+    """Wrap a JPEG payload in the multipart envelope. Headers
+    intentionally minimal — Content-Type + Content-Length is the
+    well-known shape and is what every browser MJPEG decoder expects.
+
+    One join, one copy of the JPEG. Callers on the fan-out path go
+    through ``StreamState.wait_for_part`` / ``latest_part`` so this runs
+    once per frame, not once per consumer."""
+    header = (
+        f"--{MJPEG_BOUNDARY}\r\n"
+        f"Content-Type: image/jpeg\r\n"
+        f"Content-Length: {len(frame)}\r\n"
+        f"\r\n"
+    ).encode("ascii")
+    return b"".join((header, frame, b"\r\n"))
+
+
 @dataclass
 class StreamMetadata:
     """Producer-supplied descriptor of a stream. Mirrors the wire shape
@@ -67,8 +111,9 @@ class StreamState:
     """
 
     __slots__ = (
-        "stream_id", "metadata",
-        "_frame", "_frame_seq", "_frame_at",
+        "stream_id", "metadata", "transport",
+        "_frame", "_frame_seq", "_frame_at", "_frame_ts",
+        "_part", "_part_seq", "_ws_msg", "_ws_msg_seq",
         "_condition", "_consumers",
         "_fps_window", "_last_producer_at",
     )
@@ -81,9 +126,21 @@ class StreamState:
     def __init__(self, stream_id: str, metadata: StreamMetadata) -> None:
         self.stream_id = stream_id
         self.metadata = metadata
+        # "ws" or "shm" — how the current producer connection delivers
+        # frames (see rlx_bus.shm_ring). Set by the upload route.
+        self.transport = "ws"
         self._frame: Optional[bytes] = None
         self._frame_seq = 0
         self._frame_at: float = 0.0
+        self._frame_ts: float = 0.0   # wall clock, for the WS header
+        # Multipart envelope for the current frame, shared by every MJPEG
+        # consumer. Built lazily on first demand (a stream nobody is
+        # watching never pays for it) and tagged with the seq it wraps so
+        # a newer set_frame implicitly invalidates it.
+        self._part: Optional[bytes] = None
+        self._part_seq = 0
+        self._ws_msg: Optional[bytes] = None
+        self._ws_msg_seq = 0
         # Shared condvar — every consumer waits on this; producer's
         # set_frame fires notify_all so each consumer wakes and pulls
         # the latest. Cheaper than per-consumer queues since consumers
@@ -106,6 +163,7 @@ class StreamState:
             self._frame_seq += 1
             now = time.monotonic()
             self._frame_at = now
+            self._frame_ts = time.time()
             self._last_producer_at = now
             # Slide the fps window so fps reflects only the last second.
             self._fps_window.append(now)
@@ -136,6 +194,46 @@ class StreamState:
                 return None
             return (self._frame, self._frame_seq) if self._frame is not None else None
 
+    async def wait_for_part(self, last_seen_seq: int, timeout_s: float = 5.0) -> Optional[tuple[bytes, int]]:
+        """Like ``wait_for_frame`` but returns the frame already wrapped
+        in its MJPEG multipart envelope — the same ``bytes`` object for
+        every consumer of this frame."""
+        async with self._condition:
+            try:
+                await asyncio.wait_for(
+                    self._condition.wait_for(lambda: self._frame_seq > last_seen_seq and self._frame is not None),
+                    timeout=timeout_s,
+                )
+            except asyncio.TimeoutError:
+                return None
+            return self._current_part()
+
+    def latest_part(self) -> Optional[tuple[bytes, int]]:
+        """Non-waiting snapshot of the current multipart part."""
+        return self._current_part()
+
+    def _current_part(self) -> Optional[tuple[bytes, int]]:
+        # No await between the check and the store, so consumers on the
+        # loop can't interleave here — the first one builds, the rest hit.
+        if self._frame is None:
+            return None
+        if self._part_seq != self._frame_seq:
+            self._part = encode_mjpeg_part(self._frame)
+            self._part_seq = self._frame_seq
+        return (self._part, self._part_seq)
+
+    def latest_ws_message(self) -> Optional[tuple[bytes, int]]:
+        """The current frame as a WS consumer binary message —
+        ``WS_FRAME_HEADER`` then the JPEG — built once per frame and
+        shared by every WS viewer, like ``latest_part``."""
+        if self._frame is None:
+            return None
+        if self._ws_msg_seq != self._frame_seq:
+            header = WS_FRAME_HEADER.pack(self._frame_seq, self._frame_ts)
+            self._ws_msg = b"".join((header, self._frame))
+            self._ws_msg_seq = self._frame_seq
+        return (self._ws_msg, self._ws_msg_seq)
+
     def latest_frame(self) -> Optional[tuple[bytes, int]]:
         """Non-waiting snapshot. Used by consumers that want to send the
         most recent frame immediately on connect rather than waiting for
@@ -176,6 +274,7 @@ class StreamState:
             "declared_fps": self.metadata.fps,
             "observed_fps": round(self.fps(), 2),
             "consumers": self._consumers,
+            "transport": self.transport,
             "last_frame_at": self._frame_at,
             "stale": self.is_stale(),
         }
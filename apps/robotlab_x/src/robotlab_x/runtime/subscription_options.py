@@ -0,0 +1,91 @@
+# unmanaged
+"""Per-subscription delivery options: rate limit, latest-only, projection.
+
+A subscribe frame may carry, next to its ``topic``::
+
+    {"topic": "/joystick/js1/input", "max_hz": 5, "latest_only": true,
+     "fields": ["axes", "buttons"]}
+
+  * ``max_hz`` — at most this many messages per second per concrete
+    topic (a ``+``/``#`` subscription limits each matching topic on its
+    own). Messages inside the interval are dropped;
+  * ``latest_only`` — with ``max_hz``, hold the newest dropped message
+    instead and send it when the interval ends, so the subscriber always
+    ends up on the latest value (state, telemetry);
+  * ``fields`` — top-level keys to keep from dict payloads (``a.b``
+    reaches into nested dicts). Other payloads pass through untouched.
+
+``ws_endpoint`` enforces them for the connection that asked, on the
+runtime that publishes. That runtime is where the saving is: a second robot's
+dashboard on ``/joystick/js1/input@other-bot`` asks for 5 Hz and the
+peer link carries 5 Hz, not the joystick's 60.
+
+For ``@peer`` topics the options travel with the upstream subscription
+(``Bus.attach``/``Bus.subscribe`` → ``peer_manager.on_local_subscribe``
+→ ``PeerConnection.subscribe_upstream``). Local subscribers to the same
+remote topic share one upstream stream, opened with the ``widest`` of
+their options; each local connection still gets its own limits applied
+by its own ``ws_endpoint``.
+
+Options are plain dicts holding only the keys that restrict something;
+``None`` means "everything, full rate".
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, List, Mapping, Optional
+
+
+def parse(data: Mapping[str, Any]) -> Optional[Dict[str, Any]]:
+    """Options from a subscribe frame's ``data``. Malformed values are
+    ignored rather than rejected, so an older peer's frame, or a typo,
+    still subscribes at full rate."""
+    out: Dict[str, Any] = {}
+    try:
+        max_hz = float(data.get("max_hz") or 0)
+    except (TypeError, ValueError):
+        max_hz = 0.0
+    if max_hz > 0:
+        out["max_hz"] = max_hz
+        if data.get("latest_only"):
+            out["latest_only"] = True
+    fields = data.get("fields")
+    if isinstance(fields, (list, tuple)) and fields and all(isinstance(f, str) for f in fields):
+        out["fields"] = sorted(set(fields))
+    return out or None
+
+
+def widest(a: Optional[Dict[str, Any]], b: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Options that deliver everything either ``a`` or ``b`` would: the
+    higher rate, latest-only only if both, the union of fields."""
+    if a is None or b is None:
+        return None
+    out: Dict[str, Any] = {}
+    if "max_hz" in a and "max_hz" in b:
+        out["max_hz"] = max(a["max_hz"], b["max_hz"])
+        if a.get("latest_only") and b.get("latest_only"):
+            out["latest_only"] = True
+    if "fields" in a and "fields" in b:
+        out["fields"] = sorted(set(a["fields"]) | set(b["fields"]))
+    return out or None
+
+
+def project(payload: Any, fields: List[str]) -> Any:
+    """``payload`` cut down to ``fields``. Non-dict payloads pass through;
+    missing keys are skipped."""
+    if not isinstance(payload, dict):
+        return payload
+    nested: Dict[str, List[str]] = {}
+    whole = set()
+    for path in fields:
+        head, _, rest = path.partition(".")
+        if rest:
+            nested.setdefault(head, []).append(rest)
+        else:
+            whole.add(head)
+    out: Dict[str, Any] = {}
+    for key, value in payload.items():
+        if key in whole:
+            out[key] = value
+        elif key in nested:
+            out[key] = project(value, nested[key])
+    return out
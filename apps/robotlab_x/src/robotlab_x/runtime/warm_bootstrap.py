@@ -0,0 +1,63 @@
+# unmanaged
+"""Parked-interpreter entry point for ``warm_pool``.
+
+Run BY PATH with a service type's venv python, so it imports nothing
+from robotlab_x — stdlib only::
+
+    <venv>/bin/python -u warm_bootstrap.py numpy cv2 rlx_bus
+
+Imports each module named on the command line (the type's
+``entry.preload`` list), then blocks reading ONE json line from stdin::
+
+    {"argv": ["-m", "video_service", "--port", "41234"],
+     "env": {...full environment...}, "cwd": "/abs/type/dir"}
+
+On that line it becomes the service. It swaps in the environment and
+working directory, points stdin at /dev/null as a cold spawn would, and
+runs the module (or script) as ``__main__``. EOF instead of a line
+means the runtime went away or retired us, so it exits quietly.
+"""
+import json
+import os
+import runpy
+import sys
+
+
+def _preload(modules):
+    for name in modules:
+        try:
+            __import__(name)
+        except Exception as exc:  # noqa: BLE001 — a missing extra mustn't kill the pool
+            print(f"[warm_bootstrap] preload {name} failed: {exc}", file=sys.stderr)
+
+
+def main():
+    # Running by path put this file's directory first on sys.path; the
+    # service must see what ``python -m`` would — its cwd.
+    sys.path[0] = os.getcwd()
+    _preload(sys.argv[1:])
+
+    line = sys.stdin.readline()
+    if not line:
+        return
+    spec = json.loads(line)
+    devnull = os.open(os.devnull, os.O_RDONLY)
+    os.dup2(devnull, 0)
+    os.close(devnull)
+
+    os.chdir(spec["cwd"])
+    sys.path[0] = os.getcwd()
+    os.environ.clear()
+    os.environ.update(spec["env"])
+
+    args = list(spec["argv"])
+    if args[0] == "-m":
+        sys.argv = [args[1]] + args[2:]
+        runpy.run_module(args[1], run_name="__main__", alter_sys=True)
+    else:
+        sys.argv = args
+        runpy.run_path(args[0], run_name="__main__")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+# unmanaged
+"""Pre-warmed interpreters for subprocess service starts.
+
+A cold ``python -m video_service`` pays for interpreter startup plus
+``import cv2, numpy`` (or pinocchio, pygame, …) on every start. Every
+config-change restart and every restart after a crash pays it again,
+which is seconds for the heavy types. With the pool enabled
+(``ROBOTLAB_X_SUBPROCESS_WARM_POOL=true``), process_manager keeps ONE parked
+interpreter per service type that declares heavy imports::
+
+    # package.yml
+    entry:
+      argv: [python, -m, video_service]
+      preload: [numpy, cv2, rlx_bus]
+
+The parked process is the type's venv python running
+``warm_bootstrap.py`` with the preload list already imported. It was
+spawned exactly like a cold start: the same Popen pipes, setsid and
+cwd. On start, process_manager hands it the real argv, environment
+(proxy id, port, bus token) and cwd as one json line on stdin. The
+parked process then runs the service module as ``__main__``, so the
+Popen it returns is the service. pid, pipes, io_supervisor, stop()
+and pid_registry all work unchanged. A fresh spare is parked in
+the background right after each start, so the next restart of that
+type is warm too.
+
+Scope and fallbacks:
+  * Only ``python [-u] -m <module> …`` and ``python [-u] <script>.py …``
+    argv shapes can be handed off; anything else starts cold.
+  * Types without ``entry.preload`` never get a pool — for them a spare
+    interpreter would save ~30ms at the cost of an idle process.
+  * A parked process whose interpreter or cwd no longer matches, or
+    that died, is retired and the start goes cold.
+  * A parked process exits by itself when its stdin hits EOF, so
+    spares never outlive the runtime that parked them, even after
+    a ``kill -9``.
+
+Cost: one idle interpreter (with its preloads resident) per warm type.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import signal
+import subprocess
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+BOOTSTRAP = str(Path(__file__).with_name("warm_bootstrap.py"))
+
+
+@dataclass
+class _Parked:
+    process: subprocess.Popen
+    python: str
+    cwd: str
+    preload: Tuple[str, ...]
+
+
+_enabled = False
+_lock = threading.Lock()
+_parked: Dict[str, _Parked] = {}
+
+
+def configure(enabled: bool) -> None:
+    """Turn the pool on/off (event_handlers.on_startup, from config).
+    Turning it off retires every parked interpreter."""
+    global _enabled
+    _enabled = bool(enabled)
+    if not _enabled:
+        shutdown()
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def handoff_args(argv: List[str]) -> Optional[List[str]]:
+    """The interpreter arguments a parked process can run in place of
+    ``argv`` (``["-m", mod, …]`` or ``[script.py, …]``), or None when
+    ``argv`` isn't a plain python invocation."""
+    if not argv or not os.path.basename(argv[0]).startswith("python"):
+        return None
+    rest = argv[1:]
+    if rest[:1] == ["-u"]:
+        rest = rest[1:]
+    if len(rest) >= 2 and rest[0] == "-m":
+        return rest
+    if rest and rest[0].endswith(".py"):
+        return rest
+    return None
+
+
+def acquire(key: str, argv: List[str], env: Dict[str, str], cwd: str) -> Optional[subprocess.Popen]:
+    """Hand the parked interpreter for ``key`` the real start. Returns
+    its Popen — now running the service — or None to start cold."""
+    if not _enabled:
+        return None
+    args = handoff_args(argv)
+    if args is None:
+        return None
+    with _lock:
+        parked = _parked.pop(key, None)
+    if parked is None:
+        return None
+    if parked.process.poll() is not None or parked.python != argv[0] or parked.cwd != cwd:
+        _retire(parked)
+        return None
+    try:
+        parked.process.stdin.write(json.dumps({"argv": args, "env": env, "cwd": cwd}) + "\n")
+        parked.process.stdin.flush()
+        parked.process.stdin.close()
+        # From here on it's indistinguishable from a stdin=DEVNULL spawn.
+        parked.process.stdin = None
+    except (OSError, ValueError) as exc:
+        logger.warning("warm_pool: handoff to pid=%s failed (%s); starting cold", parked.process.pid, exc)
+        _retire(parked)
+        return None
+    logger.info("warm_pool: %s started on parked pid=%s", key, parked.process.pid)
+    return parked.process
+
+
+def replenish(key: str, python: str, cwd: str, preload: List[str], env: Dict[str, str]) -> None:
+    """Park a spare interpreter for ``key`` in the background unless a
+    live one is already parked."""
+    if not _enabled or not preload:
+        return
+    with _lock:
+        existing = _parked.get(key)
+        if existing is not None and existing.process.poll() is None:
+            return
+    threading.Thread(
+        target=_park,
+        args=(key, python, cwd, tuple(preload), dict(env)),
+        name=f"warm_pool:{key}",
+        daemon=True,
+    ).start()
+
+
+def parked() -> Dict[str, int]:
+    """key → pid of every live parked interpreter (diagnostics/tests)."""
+    with _lock:
+        return {k: p.process.pid for k, p in _parked.items() if p.process.poll() is None}
+
+
+def shutdown() -> None:
+    """Retire every parked interpreter."""
+    with _lock:
+        spares = list(_parked.values())
+        _parked.clear()
+    for p in spares:
+        _retire(p)
+
+
+# ─── internals ────────────────────────────────────────────────────────
+
+
+def _park(key: str, python: str, cwd: str, preload: Tuple[str, ...], env: Dict[str, str]) -> None:
+    try:
+        process = subprocess.Popen(
+            [python, "-u", BOOTSTRAP, *preload],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            stdin=subprocess.PIPE,
+            bufsize=1,
+            text=True,
+            preexec_fn=os.setsid,
+            cwd=cwd,
+            env=env,
+        )
+    except OSError as exc:
+        logger.warning("warm_pool: could not park %s: %s", key, exc)
+        return
+    spare = _Parked(process=process, python=python, cwd=cwd, preload=preload)
+    with _lock:
+        existing = _parked.get(key)
+        if _enabled and (existing is None or existing.process.poll() is not None):
+            _parked[key] = spare
+            spare = None
+    if spare is not None:
+        _retire(spare)  # lost a race with another replenish, or disabled meanwhile
+    else:
+        logger.info("warm_pool: parked %s pid=%s preload=%s", key, process.pid, list(preload))
+
+
+def _retire(p: _Parked) -> None:
+    """Close the parked process's stdin (it exits on EOF) and reap it
+    off-thread so it doesn't linger as a zombie."""
+    try:
+        if p.process.stdin is not None:
+            p.process.stdin.close()
+    except (OSError, ValueError):
+        pass
+
+    def _reap() -> None:
+        try:
+            p.process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            try:
+                os.killpg(p.process.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+            p.process.wait()
+        for stream in (p.process.stdout, p.process.stderr):
+            if stream is not None:
+                stream.close()
+
+    threading.Thread(target=_reap, name="warm_pool:reap", daemon=True).start()
@@ -6,8 +6,10 @@ stays small:
 
   1. ``ensure_runtime_workspace`` materialises the singleton "runtime"
      workspace row on boot — the always-present canvas the user lands on.
-  2. ``restore_active_workspaces`` re-fires ``start_service`` for every
-     member of any workspace whose ``activated_at`` survived the last shutdown.
+  2. ``reconcile_running_proxies`` restarts whatever was running when the
+     previous lifetime ended (in parallel, via ``start_graph``), and
+     ``restore_active_workspaces`` re-stamps the workspaces that were
+     active.
 
 Membership for kind='runtime' is computed at read-time in
 ``services.workspace_service`` — this module deliberately does not stamp a
@@ -17,10 +19,12 @@ from __future__ import annotations
 
 import logging
 from datetime import datetime, timezone
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 from database.interface import DatabaseAdapter
 
+from robotlab_x.runtime import start_graph
+
 logger = logging.getLogger(__name__)
 
 RUNTIME_WORKSPACE_ID = "runtime"
@@ -63,7 +67,13 @@ def ensure_runtime_workspace(db: DatabaseAdapter) -> Dict[str, Any]:
     return row
 
 
-def reconcile_running_proxies(db: DatabaseAdapter) -> None:
+def reconcile_running_proxies(
+    db: DatabaseAdapter,
+    *,
+    start_order: Optional[List[str]] = None,
+    depends_on: Optional[Dict[str, List[str]]] = None,
+    max_concurrency: int = start_graph.DEFAULT_CONCURRENCY,
+) -> None:
     """Re-fire start_service for every non-singleton proxy that was running.
 
     On boot, ``service_proxy.status`` rows still say 'running' / 'starting'
@@ -71,6 +81,10 @@ def reconcile_running_proxies(db: DatabaseAdapter) -> None:
     those rows to 'stopped' and fire start_service so they come back up.
     Singletons (the runtime service) are auto-materialised elsewhere and
     must not be re-started here.
+
+    Starts run in parallel along the dependency graph built from the
+    active set's ``start_order`` / ``depends_on`` and each type's
+    ``requires`` / ``implements`` — see ``start_graph``.
     """
     from robotlab_x.runtime.lifecycle import _handle_start  # noqa: WPS433
     from robotlab_x.runtime import process_manager
@@ -78,6 +92,7 @@ def reconcile_running_proxies(db: DatabaseAdapter) -> None:
     proxies: List[Dict[str, Any]] = db.get_all_items("service_proxy") or []
     stale: List[Dict[str, Any]] = []
     survived: List[str] = []
+    metas: Dict[str, Dict[str, Any]] = {}
     for p in proxies:
         if p.get("status") not in {"running", "starting"}:
             continue
@@ -92,7 +107,10 @@ def reconcile_running_proxies(db: DatabaseAdapter) -> None:
         if process_manager.pid_alive(p.get("pid")):
             survived.append(p.get("id") or "?")
             continue
+        if not p.get("id"):
+            continue
         stale.append(p)
+        metas[p["id"]] = meta or {}
 
     if survived:
         logger.info("reconcile_running_proxies: survived restart: %s", survived)
@@ -102,18 +120,27 @@ def reconcile_running_proxies(db: DatabaseAdapter) -> None:
         return
 
     for p in stale:
-        proxy_id = p.get("id")
-        if not proxy_id:
-            continue
         p["status"] = "stopped"
         p["pid"] = None
         p["error"] = None
-        db.update_item("service_proxy", proxy_id, p, include_nulls=True)
+        db.update_item("service_proxy", p["id"], p, include_nulls=True)
+
+    def _start(proxy_id: str) -> None:
         try:
             _handle_start({"id": f"restore-{proxy_id}", "service_proxy_id": proxy_id}, db)
-            logger.info("reconcile_running_proxies: restarted %s", proxy_id)
         except Exception:  # noqa: BLE001
             logger.exception("reconcile_running_proxies: failed to restart %s", proxy_id)
+            raise
+        logger.info("reconcile_running_proxies: restarted %s", proxy_id)
+
+    ids = [p["id"] for p in stale]
+    start_graph.run(
+        start_graph.priority_order(ids, start_order),
+        start_graph.dependency_graph(ids, metas, depends_on, start_order),
+        _start,
+        max_concurrency=max_concurrency,
+        type_ids={p["id"]: p.get("service_meta_id") for p in stale},
+    )
 
 
 def restore_active_workspaces(db: DatabaseAdapter) -> None:
@@ -3,22 +3,69 @@
 
 Mounts ``GET /v1/ws`` on the FastAPI app via ``register_ws_routes(app)``,
 which is called from ``robotlab_x.yml`` ``api.extend``. One connection
-per user. Frames are JSON, matching the shape of the ``message`` model
-in the yml:
+per user. Frames match the shape of the ``message`` model in the yml:
 
     { "id": "<uuid>", "method": "<verb>", "data": { ... } }
 
 Methods (client → server):
-    subscribe   { topic }
+    subscribe   { topic, backfill?: int } — ``backfill`` on a
+                                               ``/service_proxy/{id|+}/log``
+                                               topic first replays that many
+                                               stored lines per service
+                                               (runtime/service_logs.py).
+                { topic, max_hz?, latest_only?, fields? }
+                                             — rate limit / projection for
+                                               this subscription, enforced
+                                               here before encoding
+                                               (runtime/subscription_options.py).
+                                               A repeat subscribe replaces
+                                               the options.
     unsubscribe { topic }
     publish     { topic, payload, retained?: bool }
     request     { topic, payload, reply_to } — same as publish; sender
                                                supplies reply_to so a
                                                responder can address them.
+    batch       { frames: [ <publish frame>, ... ] } — several publishes
+                                               in one frame (BusClient
+                                               batching window); acked
+                                               once with a positional
+                                               ``delivered`` list.
+
+Methods newer than the original protocol are listed in ``FEATURES``,
+which ``/runtime/info`` carries as ``ws_features``. A peer runtime
+uses one only when the remote's info lists it, so an older remote
+never gets a frame it would reject as ``unknown_method``.
 
 Server → client frames use ``method: "message"`` for bus deliveries,
 ``method: "ack"`` for command receipts, and ``method: "error"`` for
-malformed frames.
+malformed frames. Every outbound frame for a connection goes through
+one ``_ConnectionWriter`` so ordering is preserved between acks and
+deliveries, and a delivery frame is encoded once per message and codec
+(``BusMessage.ws_frame``) no matter how many connections receive it.
+
+Wire codec: JSON text frames unless the client connects with
+``?codec=msgpack`` and this runtime has msgpack installed, in which case
+the server greets with a binary ``codec`` frame and sends MessagePack
+from then on (native ``bytes`` payloads, no base64). Inbound frames are
+decoded by frame type, so a connection may mix the two. See
+``rlx_bus.codec``.
+
+All of a connection's subscriptions are attached to one ``BusSink``
+drained by one pump task, so a tab subscribed to 200 topics costs the
+same three tasks (reader, pump, writer) as a tab subscribed to one.
+A message that several of the connection's subscriptions match
+(``/a/+`` and ``/+/b``) is sent once per distinct payload those
+subscriptions admit. An unprojected and a projected subscription each
+get their own frame; two unprojected ones share one. For a peer
+runtime's connection that keeps overlapping upstream patterns from
+doubling link traffic. The browser client (wsClient.ts) dispatches a
+frame to every pattern it matches. ``rlx_bus.BusClient`` hands it to the
+first matching handler only, so a BusClient that registers overlapping
+patterns sees a shared message in one handler.
+Subscriptions with options get a ``_SubscriptionFilter`` the pump
+consults per delivery. Throttled messages are dropped (or, latest-only,
+held on a loop timer) before they are encoded, and a projected
+payload is encoded for this connection alone.
 
 Auth is JWT in the ``?token=`` query parameter. Browsers cannot set
 headers on ``new WebSocket(url)``, so the query carries the token. Same
@@ -28,18 +75,22 @@ shared secret + algorithm (HS256) as ``packages/auth/local_auth.py``.
 from __future__ import annotations
 
 import asyncio
-import json
+import collections
+import dataclasses
 import logging
 import os
+import time
 import uuid
-from typing import Dict, Optional
+from typing import Any, Dict, Optional, Tuple, Union
 
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from starlette.websockets import WebSocketState
 
 import jwt
+from rlx_bus import codec as wire
 
-from robotlab_x.runtime.bus import Bus, get_bus
+from robotlab_x.runtime import service_logs, subscription_options
+from robotlab_x.runtime.bus import BusMessage, BusSink, get_bus, parse_id_suffix
 
 
 logger = logging.getLogger(__name__)
@@ -49,6 +100,24 @@ logger = logging.getLogger(__name__)
 _CLOSE_NO_TOKEN = 4401      # like HTTP 401 for the WS world.
 _CLOSE_BAD_TOKEN = 4403     # like HTTP 403.
 
+# Outbound frames buffered per connection between the pumps and the
+# socket. Bounded so a slow client pushes back on its pumps — which in
+# turn leaves messages in the bus subscriber queues, where drop-oldest
+# and the ``dropped`` counters already live — instead of growing here.
+_WRITER_QUEUE_DEPTH = 256
+
+# Upper bound on frames the writer drains per wake-up. Keeps one busy
+# connection from monopolising the loop for an unbounded stretch.
+_WRITER_BATCH_MAX = 64
+
+# Optional methods this endpoint accepts, advertised in /runtime/info.
+FEATURES = ("batch",)
+
+# Cap on stored log lines replayed per service for ``subscribe {backfill}``.
+_BACKFILL_MAX = 1000
+# Recent (message, projection) pairs a pump remembers to send each once.
+_SENT_WINDOW = 256
+
 
 def _jwt_secret() -> str:
     # Match packages/auth/local_auth.py exactly — same env var, same default.
@@ -63,12 +132,15 @@ def _decode_token(token: str) -> Optional[dict]:
         return None
 
 
-async def _ws_send_json(ws: WebSocket, frame: dict) -> None:
+async def _ws_send(ws: WebSocket, data: Union[str, bytes]) -> None:
     """Send a frame but tolerate a half-closed socket."""
     if ws.client_state != WebSocketState.CONNECTED:
         return
     try:
-        await ws.send_text(json.dumps(frame))
+        if isinstance(data, bytes):
+            await ws.send_bytes(data)
+        else:
+            await ws.send_text(data)
     except (WebSocketDisconnect, RuntimeError):
         # Client disconnected mid-write or socket is closing — give up
         # silently; the main read-loop will catch the disconnect and
@@ -76,35 +148,210 @@ async def _ws_send_json(ws: WebSocket, frame: dict) -> None:
         pass
 
 
-async def _pump_bus_to_ws(
-    bus: Bus,
-    topic: str,
-    subscriber_id: str,
-    ws: WebSocket,
-) -> None:
-    """Forward every message on ``topic`` to ``ws`` as a frame.
+class _ConnectionWriter:
+    """The single outbound path for one ``/v1/ws`` connection.
 
-    Owned by the WS handler — cancelled on unsubscribe or disconnect.
+    Pumps and the command loop enqueue already-encoded frames; one writer
+    task drains the queue, sending everything that has accumulated
+    since its last wake-up back-to-back instead of bouncing through the
+    scheduler once per frame. ``codec`` is the connection's negotiated
+    wire codec.
     """
-    try:
-        async for msg in bus.subscribe(topic, subscriber_id=subscriber_id):
-            if msg.topic == "__terminate__":
-                return
-            await _ws_send_json(
-                ws,
-                {
-                    "method": "message",
-                    "topic": msg.topic,
-                    "payload": msg.payload,
-                    "sender_id": msg.sender_id,
-                    "reply_to": msg.reply_to,
-                    "timestamp": msg.timestamp,
-                },
+
+    def __init__(self, ws: WebSocket, name: str, codec: str = wire.JSON):
+        self._ws = ws
+        self.codec = codec
+        self._queue: asyncio.Queue[Union[str, bytes]] = asyncio.Queue(
+            maxsize=_WRITER_QUEUE_DEPTH,
+        )
+        self._task = asyncio.create_task(self._run(), name=f"ws_writer:{name}")
+
+    async def send_encoded(self, data: Union[str, bytes]) -> None:
+        await self._queue.put(data)
+
+    async def send_frame(self, frame: dict) -> None:
+        await self._queue.put(wire.encode(frame, self.codec))
+
+    async def _run(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < _WRITER_BATCH_MAX:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+            for data in batch:
+                await _ws_send(self._ws, data)
+
+    async def close(self) -> None:
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+
+
+class _SubscriptionFilter:
+    """One subscription's ``max_hz`` / ``latest_only`` / ``fields``.
+
+    Runs on the connection's loop, in the pump. Rate state is per
+    concrete topic, so ``/joystick/+/input`` at 5 Hz is 5 Hz per
+    joystick. A latest-only message caught inside the interval replaces
+    any earlier held one; when the interval ends a timer re-delivers it
+    through the sink, so it stays in order behind whatever was queued
+    meanwhile.
+    """
+
+    def __init__(self, sink: BusSink, key: str, options: Dict[str, Any]):
+        self._sink = sink
+        self._key = key
+        self._interval = 1.0 / options["max_hz"] if "max_hz" in options else 0.0
+        self._latest_only = bool(options.get("latest_only"))
+        self._fields = options.get("fields")
+        # What this filter's admitted payload depends on, for the pump's
+        # dedupe: subscriptions with equal projections admit equal payloads.
+        self.projection = tuple(self._fields) if self._fields is not None else None
+        self._next_ok: Dict[str, float] = {}
+        self._held: Dict[str, BusMessage] = {}
+        self._released: Dict[str, BusMessage] = {}
+        self._timers: Dict[str, asyncio.TimerHandle] = {}
+
+    def admit(self, msg: BusMessage) -> Optional[BusMessage]:
+        """The message to send for ``msg`` (projected), or None to skip it."""
+        if self._interval:
+            topic = msg.topic
+            now = time.monotonic()
+            if self._released.get(topic) is msg:
+                del self._released[topic]
+            elif now < self._next_ok.get(topic, 0.0):
+                if self._latest_only:
+                    self._held[topic] = msg
+                    if topic not in self._timers:
+                        self._timers[topic] = asyncio.get_running_loop().call_later(
+                            self._next_ok[topic] - now, self._release, topic,
+                        )
+                return None
+            else:
+                self._next_ok[topic] = now + self._interval
+        if self._fields is not None:
+            msg = dataclasses.replace(
+                msg, payload=subscription_options.project(msg.payload, self._fields),
+            )
+        return msg
+
+    def _release(self, topic: str) -> None:
+        self._timers.pop(topic, None)
+        msg = self._held.pop(topic, None)
+        if msg is None:
+            return
+        self._next_ok[topic] = time.monotonic() + self._interval
+        sub = self._sink.subscriptions.get(self._key)
+        if sub is None:
+            return
+        self._released[topic] = msg
+        self._sink.deliver(sub, msg)
+
+    def close(self) -> None:
+        for timer in self._timers.values():
+            timer.cancel()
+        self._timers.clear()
+        self._held.clear()
+
+
+class _PumpState:
+    """Delivery state the command loop shares with a connection's pump:
+    the ``filters`` of subscriptions that asked for rate limits or
+    projection (by their key in ``sink.subscriptions``), and the
+    (message, projection) pairs sent recently, oldest first."""
+
+    def __init__(self) -> None:
+        self.filters: Dict[str, _SubscriptionFilter] = {}
+        self.sent: "collections.OrderedDict[Tuple[int, Optional[tuple]], BusMessage]" = (
+            collections.OrderedDict()
+        )
+
+
+async def _pump_sink_to_ws(
+    sink: BusSink,
+    writer: _ConnectionWriter,
+    state: Optional[_PumpState] = None,
+) -> None:
+    """Forward every message attached to ``sink`` to the connection's writer.
+
+    One per connection, whatever the number of subscribed topics. Owned
+    by the WS handler — cancelled on disconnect. A message that can't be
+    encoded is logged and skipped rather than ending the pump, since the
+    pump now carries every topic, not just the offending one.
+
+    A publish reaches the sink once per matching subscription, not
+    necessarily back to back. Each delivery goes through its own
+    subscription's filter first. What that admits is sent unless the
+    same message with the same projection went out within the last
+    ``_SENT_WINDOW`` sends. A subscribe clears the window, so the
+    retained replay for a new pattern gets through even if that exact
+    message was just sent.
+    """
+    state = state if state is not None else _PumpState()
+    sent = state.sent
+    async for sub, msg in sink.deliveries():
+        flt = state.filters.get(sub.topic)
+        if flt is not None:
+            admitted = flt.admit(msg)
+            if admitted is None:
+                continue
+            key = (id(msg), flt.projection)
+        else:
+            admitted = msg
+            key = (id(msg), None)
+        # The stored message pins its id, so a hit is this very message.
+        if sent.get(key) is msg:
+            continue
+        sent[key] = msg
+        if len(sent) > _SENT_WINDOW:
+            sent.popitem(last=False)
+        try:
+            data = admitted.ws_frame(writer.codec)
+        except (TypeError, ValueError):
+            logger.exception(
+                "ws.pump_error topic=%s subscriber=%s", admitted.topic, sink.subscriber_id,
             )
-    except asyncio.CancelledError:
-        raise
-    except Exception:
-        logger.exception("ws.pump_error topic=%s subscriber=%s", topic, subscriber_id)
+            continue
+        await writer.send_encoded(data)
+
+
+def _attached(sink: BusSink, topic: str) -> Optional[str]:
+    """Key of ``sink``'s registration for ``topic`` as the client wrote
+    it (the bus strips a self-id ``@suffix``), or None if not attached."""
+    if topic in sink.subscriptions:
+        return topic
+    base, _ = parse_id_suffix(topic)
+    return base if base in sink.subscriptions else None
+
+
+async def _read_backfill(topic: str, requested: object) -> Optional[list]:
+    """Stored log history for ``topic``, read on an executor thread so
+    segment files are never parsed on the loop. None if ``requested``
+    isn't a line count."""
+    try:
+        limit = min(int(requested), _BACKFILL_MAX)
+    except (TypeError, ValueError):
+        return None
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, service_logs.backfill, topic, limit)
+
+
+def _enqueue_backfill(sink: BusSink, topic: str, messages: list) -> None:
+    """Queue history read by ``_read_backfill`` for a just-attached
+    ``topic`` on ``sink``. The lines numbered since that read follow it,
+    taken from service_logs' in-memory tail.
+
+    Runs on the connection's loop without awaiting, right after attach,
+    so it lands in the sink ahead of every live delivery from another
+    thread (those hop onto this loop via ``call_soon_threadsafe``)."""
+    key = _attached(sink, topic)
+    if key is None:
+        return
+    sub = sink.subscriptions[key]
+    replayed = {payload["proxy_id"]: payload["lines"][-1]["seq"] for _, payload in messages}
+    for msg_topic, payload in [*messages, *service_logs.backfill_gap(topic, replayed)]:
+        sink.deliver(sub, BusMessage(topic=msg_topic, payload=payload, timestamp=time.time()))
 
 
 def register_ws_routes(app: FastAPI) -> None:
@@ -131,18 +378,31 @@ def register_ws_routes(app: FastAPI) -> None:
         user_id = user.get("id") or payload.get("sub") or "anonymous"
         # Per-connection subscriber id keeps two tabs from sharing queues.
         connection_id = f"{user_id}#{uuid.uuid4().hex[:8]}"
-        pumps: Dict[str, asyncio.Task] = {}
-
-        logger.info("ws.connect user=%s conn=%s", user_id, connection_id)
+        codec = wire.resolve_codec(websocket.query_params.get("codec"))
+        writer = _ConnectionWriter(websocket, connection_id, codec)
+        if codec != wire.JSON:
+            await writer.send_encoded(wire.greeting(codec))
+        sink = BusSink(connection_id)
+        pump_state = _PumpState()
+        filters = pump_state.filters
+        pump = asyncio.create_task(
+            _pump_sink_to_ws(sink, writer, pump_state), name=f"ws_pump:{connection_id}",
+        )
+
+        logger.info("ws.connect user=%s conn=%s codec=%s", user_id, connection_id, codec)
 
         try:
             while True:
-                raw = await websocket.receive_text()
+                message = await websocket.receive()
+                if message["type"] == "websocket.disconnect":
+                    raise WebSocketDisconnect(message.get("code", 1000))
+                raw = message.get("text")
+                if raw is None:
+                    raw = message.get("bytes") or b""
                 try:
-                    frame = json.loads(raw)
-                except json.JSONDecodeError:
-                    await _ws_send_json(
-                        websocket,
+                    frame = wire.decode(raw)
+                except ValueError:
+                    await writer.send_frame(
                         {"method": "error", "error": "invalid_json"},
                     )
                     continue
@@ -154,41 +414,46 @@ def register_ws_routes(app: FastAPI) -> None:
 
                 if method == "subscribe":
                     if not topic:
-                        await _ws_send_json(
-                            websocket,
+                        await writer.send_frame(
                             {"method": "error", "id": frame_id, "error": "missing_topic"},
                         )
                         continue
-                    if topic in pumps:
-                        # idempotent: ack but don't double-subscribe.
-                        await _ws_send_json(
-                            websocket,
-                            {"method": "ack", "id": frame_id, "topic": topic, "subscribed": True},
-                        )
-                        continue
-                    task = asyncio.create_task(
-                        _pump_bus_to_ws(bus, topic, connection_id, websocket),
-                        name=f"ws_pump:{connection_id}:{topic}",
-                    )
-                    pumps[topic] = task
-                    await _ws_send_json(
-                        websocket,
+                    # idempotent: a repeat subscribe is acked but
+                    # doesn't double-attach; its options replace the
+                    # previous ones. Options on a ``@peer`` topic also
+                    # shape the upstream subscription (see peer_manager).
+                    options = subscription_options.parse(data)
+                    backfill = None
+                    if data.get("backfill"):
+                        backfill = await _read_backfill(topic, data.get("backfill"))
+                    bus.attach(topic, sink, options)
+                    pump_state.sent.clear()
+                    key = _attached(sink, topic)
+                    if key is not None:
+                        old = filters.pop(key, None)
+                        if old is not None:
+                            old.close()
+                        if options is not None:
+                            filters[key] = _SubscriptionFilter(sink, key, options)
+                    if backfill is not None:
+                        _enqueue_backfill(sink, topic, backfill)
+                    await writer.send_frame(
                         {"method": "ack", "id": frame_id, "topic": topic, "subscribed": True},
                     )
 
                 elif method == "unsubscribe":
-                    task = pumps.pop(topic, None) if topic else None
-                    if task is not None:
-                        task.cancel()
-                    await _ws_send_json(
-                        websocket,
+                    if topic:
+                        old = filters.pop(_attached(sink, topic) or topic, None)
+                        if old is not None:
+                            old.close()
+                        bus.detach(topic, sink)
+                    await writer.send_frame(
                         {"method": "ack", "id": frame_id, "topic": topic, "subscribed": False},
                     )
 
                 elif method == "publish":
                     if not topic:
-                        await _ws_send_json(
-                            websocket,
+                        await writer.send_frame(
                             {"method": "error", "id": frame_id, "error": "missing_topic"},
                         )
                         continue
@@ -200,8 +465,7 @@ def register_ws_routes(app: FastAPI) -> None:
                         sender_id=connection_id,
                         retained=retained,
                     )
-                    await _ws_send_json(
-                        websocket,
+                    await writer.send_frame(
                         {
                             "method": "ack",
                             "id": frame_id,
@@ -210,6 +474,38 @@ def register_ws_routes(app: FastAPI) -> None:
                         },
                     )
 
+                elif method == "batch":
+                    # A BusClient batching window flushed several publishes
+                    # in one frame. Each inner frame is published in order
+                    # and the whole batch is acked once; ``delivered`` is
+                    # positional, ``None`` for an inner frame that isn't a
+                    # well-formed publish.
+                    frames = data.get("frames") if isinstance(data, dict) else None
+                    if not isinstance(frames, list):
+                        await writer.send_frame(
+                            {"method": "error", "id": frame_id, "error": "missing_frames"},
+                        )
+                        continue
+                    delivered = []
+                    for inner in frames:
+                        if not isinstance(inner, dict) or inner.get("method") != "publish":
+                            delivered.append(None)
+                            continue
+                        inner_data = inner.get("data")
+                        inner_topic = inner_data.get("topic") if isinstance(inner_data, dict) else None
+                        if not inner_topic:
+                            delivered.append(None)
+                            continue
+                        delivered.append(await bus.publish(
+                            inner_topic,
+                            inner_data.get("payload"),
+                            sender_id=connection_id,
+                            retained=bool(inner_data.get("retained", False)),
+                        ))
+                    await writer.send_frame(
+                        {"method": "ack", "id": frame_id, "delivered": delivered},
+                    )
+
                 elif method == "list_topics":
                     # Inspector polls this to discover what's flowing on the
                     # bus. Returns active topic names with their current
@@ -221,8 +517,7 @@ def register_ws_routes(app: FastAPI) -> None:
                     # distinct from concrete topics.
                     topics_out = bus.list_topics_detail()
                     patterns_out = sorted(bus.patterns())
-                    await _ws_send_json(
-                        websocket,
+                    await writer.send_frame(
                         {
                             "method": "topics",
                             "id": frame_id,
@@ -235,8 +530,7 @@ def register_ws_routes(app: FastAPI) -> None:
                     # Same write path as publish; sender supplies reply_to
                     # so the responder can route a reply via publish.
                     if not topic:
-                        await _ws_send_json(
-                            websocket,
+                        await writer.send_frame(
                             {"method": "error", "id": frame_id, "error": "missing_topic"},
                         )
                         continue
@@ -248,8 +542,7 @@ def register_ws_routes(app: FastAPI) -> None:
                         sender_id=connection_id,
                         reply_to=reply_to,
                     )
-                    await _ws_send_json(
-                        websocket,
+                    await writer.send_frame(
                         {
                             "method": "ack",
                             "id": frame_id,
@@ -259,8 +552,7 @@ def register_ws_routes(app: FastAPI) -> None:
                     )
 
                 else:
-                    await _ws_send_json(
-                        websocket,
+                    await writer.send_frame(
                         {"method": "error", "id": frame_id, "error": "unknown_method", "method_received": method},
                     )
 
@@ -269,10 +561,11 @@ def register_ws_routes(app: FastAPI) -> None:
         except Exception:
             logger.exception("ws.handler_error conn=%s", connection_id)
         finally:
-            for task in pumps.values():
-                task.cancel()
-            # Wait briefly so the iterator's `finally` cleanup runs.
-            if pumps:
-                await asyncio.gather(*pumps.values(), return_exceptions=True)
+            for flt in filters.values():
+                flt.close()
+            bus.detach_all(sink)
+            pump.cancel()
+            await asyncio.gather(pump, return_exceptions=True)
             await bus.unsubscribe_all(connection_id)
+            await writer.close()
             logger.info("ws.disconnect conn=%s", connection_id)
@@ -54,6 +54,10 @@ class StubDB:
     def update_item(self, table: str, key: str, row: Dict[str, Any], *, include_nulls=True) -> None:
         self.tables.setdefault(table, {})[key] = dict(row)
 
+    def upsert_many(self, table: str, rows: Dict[str, Dict[str, Any]]) -> None:
+        for key, row in rows.items():
+            self.tables.setdefault(table, {})[key] = dict(row)
+
 
 # ─── empty-set predicate ──────────────────────────────────────────────
 
@@ -157,6 +161,27 @@ def test_sync_creates_row_from_yml(tmp_path, manifests):
     assert row["service_config"] == {"interval_ms": 750}
 
 
+def test_sync_writes_whole_set_in_one_batch_on_real_adapter(tmp_path, manifests):
+    """A real adapter answers a missing get_item with {} (not None) —
+    rows must still be created, and the set lands in one upsert_many."""
+    from database.tinydb import TinyDBDatabase
+    from models.database_tinydb_config import DatabaseTinydbConfig
+
+    db = TinyDBDatabase(DatabaseTinydbConfig(data_dir=str(tmp_path / "db")))
+    batches = []
+    upsert_many = db.upsert_many
+    db.upsert_many = lambda table, rows: (batches.append(sorted(rows)), upsert_many(table, rows))[1]
+    set_dir = tmp_path / "set"
+    set_dir.mkdir()
+    for name in ("clock-1", "clock-2"):
+        (set_dir / f"{name}.yml").write_text(yaml.safe_dump({"type": "clock@1.0.0"}))
+
+    actions = sync_config_set_to_db(db, set_dir, manifests)
+    assert actions == {"clock-1": "created", "clock-2": "created"}
+    assert batches == [["clock-1", "clock-2"]]
+    assert db.get_item("service_proxy", "clock-2")["service_meta_id"] == "clock@1.0.0"
+
+
 def test_sync_updates_existing_row(tmp_path, manifests):
     db = StubDB()
     db.insert_item("service_proxy", "clock-1", {
@@ -98,3 +98,16 @@ def test_one_peer_failing_does_not_block_others():
         except Exception:
             pass
     assert pm.connect.call_count == 2
+
+
+def test_coalesce_topics_accepts_a_single_string():
+    from robotlab_x.event_handlers import _topic_list
+    assert _topic_list({"t": "/+/+/telemetry"}, "t") == ["/+/+/telemetry"]
+    assert _topic_list({"t": ["/a", "/b/#"]}, "t") == ["/a", "/b/#"]
+    assert _topic_list({}, "t") == []
+
+
+def test_coalesce_topics_rejects_non_lists():
+    from robotlab_x.event_handlers import _topic_list
+    assert _topic_list({"t": {"/a": 1}}, "t") == []
+    assert _topic_list({"t": ["/a", 3]}, "t") == []
@@ -10,7 +10,7 @@ import logging
 
 import pytest
 
-from robotlab_x.runtime.bus import Bus, BusMessage
+from robotlab_x.runtime.bus import Bus, BusMessage, BusSink
 
 
 async def _collect(it, n, timeout=1.0):
@@ -218,3 +218,62 @@ def test_same_loop_publish_delivers_once_not_twice():
     out = run(scenario())
     assert len(out) == 1, f"expected exactly 1 delivery, got {len(out)}"
     assert out[0].payload == {"text": "hello"}
+
+
+def test_sink_multiplexes_topics_onto_one_queue():
+    async def scenario():
+        bus = Bus()
+        sink = BusSink("conn#1")
+        await bus.publish("/b", "retained-b", retained=True)
+        assert bus.attach("/a", sink)
+        assert bus.attach("/b", sink)
+        assert not bus.attach("/a", sink)  # idempotent
+        assert bus.attach("/c/+", sink)
+        await bus.publish("/a", 1)
+        await bus.publish("/c/x", 2)
+        sink.close()
+        return [(m.topic, m.payload) async for m in sink.messages()], bus
+
+    got, bus = run(scenario())
+    assert got == [("/b", "retained-b"), ("/a", 1), ("/c/x", 2)]
+    assert bus.subscriber_count("/a") == 1
+    assert bus.subscribers("/c/x")[0]["matched_via"] == "/c/+"
+
+
+def test_sink_drop_oldest_charges_the_evicted_topic():
+    async def scenario():
+        bus = Bus()
+        sink = BusSink("conn#1", queue_depth=2)
+        bus.attach("/slow", sink)
+        bus.attach("/fast", sink)
+        await bus.publish("/slow", 1)
+        await bus.publish("/fast", 1)
+        await bus.publish("/fast", 2)   # evicts /slow#1
+        await bus.publish("/fast", 3)   # evicts /fast#1
+        return bus
+
+    bus = run(scenario())
+    assert bus.dropped_count("/slow") == 1
+    assert bus.dropped_count("/fast") == 1
+    detail = {t["name"]: t["dropped"] for t in bus.list_topics_detail()}
+    assert detail == {"/slow": 1, "/fast": 1}
+
+
+def test_sink_detach_discards_queued_and_unregisters():
+    async def scenario():
+        bus = Bus()
+        sink = BusSink("conn#1")
+        bus.attach("/a", sink)
+        bus.attach("/b", sink)
+        await bus.publish("/a", "stale")
+        assert bus.detach("/a", sink)
+        assert not bus.detach("/a", sink)
+        await bus.publish("/b", "fresh")
+        sink.close()
+        got = [m.payload async for m in sink.messages()]
+        assert bus.detach_all(sink) == 1
+        return got, bus
+
+    got, bus = run(scenario())
+    assert got == ["fresh"]
+    assert bus.subscriber_count("/a") == 0 and bus.subscriber_count("/b") == 0
@@ -0,0 +1,75 @@
+# unmanaged
+"""Tests for BusClient publish batching and latest-value coalescing.
+
+The client is never connected here: with no socket, ``_send`` parks
+frames in the outbound deque, which is exactly what would have been
+written, so the tests read the wire frames back from there.
+"""
+from __future__ import annotations
+
+import asyncio
+
+from rlx_bus.client import BusClient
+
+
+def _client(**kw) -> BusClient:
+    return BusClient("http://localhost:8000", "tok", **kw)
+
+
+def test_unbatched_publish_sends_each_frame():
+    async def scenario():
+        c = _client()
+        await c.publish("/a", 1)
+        await c.publish("/a", 2)
+        return list(c._outbound)
+
+    frames = asyncio.run(scenario())
+    assert [f["method"] for f in frames] == ["publish", "publish"]
+    assert [f["data"]["payload"] for f in frames] == [1, 2]
+
+
+def test_window_groups_publishes_into_one_batch_frame():
+    async def scenario():
+        c = _client(batch_window_s=0.01)
+        await c.publish("/a", 1)
+        await c.publish("/b", 2)
+        assert not c._outbound  # still inside the window
+        await asyncio.sleep(0.05)
+        return list(c._outbound)
+
+    frames = asyncio.run(scenario())
+    assert len(frames) == 1 and frames[0]["method"] == "batch"
+    inner = frames[0]["data"]["frames"]
+    assert [(f["data"]["topic"], f["data"]["payload"]) for f in inner] == [("/a", 1), ("/b", 2)]
+
+
+def test_coalesce_keeps_latest_value_in_its_original_slot():
+    async def scenario():
+        c = _client(batch_window_s=10.0)
+        await c.publish("/servo/position", 1, coalesce=True)
+        await c.publish("/log", "x")
+        await c.publish("/servo/position", 2, coalesce=True)
+        await c.publish("/log", "y")
+        await c.flush()
+        return list(c._outbound)
+
+    (frame,) = asyncio.run(scenario())
+    inner = frame["data"]["frames"]
+    assert [(f["data"]["topic"], f["data"]["payload"]) for f in inner] == [
+        ("/servo/position", 2), ("/log", "x"), ("/log", "y"),
+    ]
+
+
+def test_full_batch_flushes_without_waiting_for_window():
+    async def scenario():
+        c = _client(batch_window_s=10.0, batch_max_frames=3)
+        for i in range(4):
+            await c.publish("/t", i)
+        sent = list(c._outbound)
+        await c.flush()
+        return sent, list(c._outbound)
+
+    sent, after = asyncio.run(scenario())
+    assert len(sent) == 1 and len(sent[0]["data"]["frames"]) == 3
+    # The lone leftover goes out as a plain publish, not a batch of one.
+    assert after[-1]["method"] == "publish" and after[-1]["data"]["payload"] == 3
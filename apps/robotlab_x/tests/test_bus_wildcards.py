@@ -1,5 +1,14 @@
 """Unit tests for the MQTT-style topic matcher on runtime.bus."""
-from robotlab_x.runtime.bus import is_wildcard_pattern, topic_matches_pattern
+import asyncio
+import random
+
+from robotlab_x.runtime.bus import (
+    Bus,
+    _PatternTrie,
+    is_wildcard_pattern,
+    pattern_covers,
+    topic_matches_pattern,
+)
 
 
 def test_exact_match():
@@ -43,3 +52,106 @@ def test_is_wildcard_pattern_detection():
     assert is_wildcard_pattern("/#")
     assert not is_wildcard_pattern("/clock/clock-1/tick")
     assert not is_wildcard_pattern("")
+
+
+# ─── segment trie + Bus integration ──────────────────────────────────
+
+def test_trie_agrees_with_topic_matches_pattern():
+    patterns = [
+        "/clock/+/tick", "/clock/#", "/#", "#", "/+/+/meta",
+        "/service_proxy/+/log", "/arduino/+/pin/#", "/arduino/+/pin/+",
+        "/clock/#/tick",  # malformed — must never match
+        "/a+b/c",          # '+' inside a segment is a literal
+    ]
+    topics = [
+        "/clock/clock-1/tick", "/clock", "/clock/clock-1/sub/tick",
+        "/servo/servo-1/meta", "/service_proxy/servo-1/log",
+        "/arduino/arduino-1/pin/5", "/arduino/arduino-1/state",
+        "/a+b/c", "/ax/c", "", "/",
+    ]
+    trie = _PatternTrie()
+    for p in patterns:
+        trie.add(p)
+    for t in topics:
+        expected = sorted(p for p in patterns if topic_matches_pattern(t, p))
+        assert sorted(trie.match(t)) == expected, t
+
+
+def test_trie_remove_prunes_and_stops_matching():
+    trie = _PatternTrie()
+    trie.add("/clock/+/tick")
+    trie.add("/clock/#")
+    trie.remove("/clock/+/tick")
+    assert trie.match("/clock/c1/tick") == ["/clock/#"]
+    trie.remove("/clock/#")
+    assert trie.match("/clock/c1/tick") == []
+    assert trie._root.is_empty()
+
+
+def test_trie_randomized_against_reference():
+    rng = random.Random(7)
+    segs = ["a", "b", "c", "+", "#"]
+    patterns = set()
+    for _ in range(200):
+        n = rng.randint(1, 4)
+        patterns.add("/" + "/".join(rng.choice(segs) for _ in range(n)))
+    trie = _PatternTrie()
+    for p in patterns:
+        trie.add(p)
+    for _ in range(300):
+        n = rng.randint(0, 5)
+        topic = "/" + "/".join(rng.choice("abc") for _ in range(n))
+        expected = sorted(p for p in patterns if topic_matches_pattern(topic, p))
+        assert sorted(trie.match(topic)) == expected, topic
+
+
+def test_bus_match_cache_invalidated_on_subscribe_and_unsubscribe():
+    async def scenario():
+        bus = Bus()
+        # Warm the cache with no patterns registered.
+        assert bus.publish_sync("/servo/s1/meta", 1) == 0
+        it = bus.subscribe("/+/+/meta", subscriber_id="ui")
+        first = asyncio.create_task(it.__anext__())
+        await asyncio.sleep(0.01)
+        assert bus.publish_sync("/servo/s1/meta", 2) == 1
+        msg = await first
+        assert msg.payload == 2
+        await it.aclose()
+        assert bus.patterns() == set()
+        return bus.publish_sync("/servo/s1/meta", 3)
+
+    assert asyncio.run(scenario()) == 0
+
+
+def test_peer_suffixed_patterns_match_bridged_topics():
+    assert is_wildcard_pattern("/arm/#@silly-droid")
+    assert not is_wildcard_pattern("/arm/a1@silly-droid")
+    assert topic_matches_pattern("/arm/a1/state@silly-droid", "/arm/#@silly-droid")
+    assert topic_matches_pattern("/x@silly-droid", "/+@silly-droid")
+    assert not topic_matches_pattern("/arm/a1/state", "/arm/#@silly-droid")
+    assert not topic_matches_pattern("/arm/a1/state@other-bot", "/arm/#@silly-droid")
+
+    trie = _PatternTrie()
+    for p in ("/arm/#@silly-droid", "/+@silly-droid", "/arm/#"):
+        trie.add(p)
+    # An unsuffixed ``#`` still swallows the suffix, as before.
+    assert sorted(trie.match("/arm/a1/state@silly-droid")) == ["/arm/#", "/arm/#@silly-droid"]
+    assert trie.match("/x@silly-droid") == ["/+@silly-droid"]
+    assert trie.match("/arm/a1") == ["/arm/#"]
+    trie.remove("/arm/#@silly-droid")
+    trie.remove("/+@silly-droid")
+    assert trie.match("/x@silly-droid") == [] and trie._peers == {}
+
+
+def test_pattern_covers():
+    assert pattern_covers("/a/#", "/a/+/c")
+    assert pattern_covers("/a/+/c", "/a/b/c")
+    assert pattern_covers("/a/#", "/a")
+    assert pattern_covers("#", "/a/#")
+    assert not pattern_covers("/a/+/c", "/a/#")
+    assert not pattern_covers("/a/b/c", "/a/+/c")
+    assert not pattern_covers("/a/+", "/+/b")
+    assert not pattern_covers("/a/+", "/a/b/c")
+    # Agrees with the matcher on concrete topics.
+    for outer, inner in (("/a/+/c", "/a/b/c"), ("/a/#", "/a/b"), ("/x/+", "/x/y/z")):
+        assert pattern_covers(outer, inner) == topic_matches_pattern(inner, outer)
@@ -8,6 +8,7 @@ service_meta row. The guard keeps the catalog intact in that case.
 """
 from __future__ import annotations
 
+from contextlib import contextmanager
 from pathlib import Path
 
 from robotlab_x.runtime import catalog
@@ -30,6 +31,18 @@ class FakeDB:
     def delete_item(self, table, key):
         self.t.get(table, {}).pop(key, None)
 
+    def upsert_many(self, table, items):
+        for key, item in items.items():
+            self.t.setdefault(table, {})[key] = dict(item)
+
+    def delete_many(self, table, keys):
+        for key in keys:
+            self.t.get(table, {}).pop(key, None)
+
+    @contextmanager
+    def transaction(self):
+        yield self
+
     def get_all_items(self, table):
         return list(self.t.get(table, {}).values())
 
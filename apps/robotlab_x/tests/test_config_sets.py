@@ -121,6 +121,18 @@ def test_load_runtime_yml_bad_start_order_shape(tmp_path):
         load_runtime_yml(tmp_path)
 
 
+def test_load_runtime_yml_depends_on(tmp_path):
+    write_yml(tmp_path / "runtime.yml", {
+        "start_order": ["arduino-1", "servo-1"],
+        "depends_on": {"servo-1": ["arduino-1"]},
+    })
+    assert load_runtime_yml(tmp_path).depends_on == {"servo-1": ["arduino-1"]}
+
+    write_yml(tmp_path / "runtime.yml", {"depends_on": {"servo-1": "arduino-1"}})
+    with pytest.raises(RuntimeYmlInvalid, match="depends_on"):
+        load_runtime_yml(tmp_path)
+
+
 def test_load_runtime_yml_malformed_yaml(tmp_path):
     (tmp_path / "runtime.yml").write_text("start_order: [unclosed")
     with pytest.raises(RuntimeYmlInvalid, match="failed to parse"):
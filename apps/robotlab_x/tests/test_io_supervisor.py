@@ -0,0 +1,144 @@
+# unmanaged
+"""Selector-based pipe/exit supervisor (runtime/io_supervisor.py).
+
+Real children, fake bus: per-tick log batching with the legacy
+single-line fields intact, partial lines at EOF, exit detection with
+and without pidfds, and process_manager's crash vs. expected-stop
+handling on top of it.
+"""
+from __future__ import annotations
+
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from robotlab_x.runtime import io_supervisor, process_manager
+
+
+class _Bus:
+    def __init__(self):
+        self.published = []
+
+    def publish_sync(self, topic, payload, retained=False):
+        self.published.append((topic, payload, retained))
+        return 1
+
+
+@pytest.fixture
+def bus(monkeypatch):
+    fake = _Bus()
+    monkeypatch.setattr(io_supervisor, "get_bus", lambda: fake)
+    monkeypatch.setattr(process_manager, "get_bus", lambda: fake)
+    return fake
+
+
+def _spawn(code: str):
+    return subprocess.Popen(
+        [sys.executable, "-c", code],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        stdin=subprocess.DEVNULL,
+        text=True,
+    )
+
+
+def _supervise(key: str, proc):
+    done = threading.Event()
+    rcs = []
+
+    def on_exit(rc):
+        rcs.append(rc)
+        done.set()
+
+    io_supervisor.register(key, proc, f"/service_proxy/{key}/log", on_exit)
+    assert done.wait(10), f"{key} exit never reported"
+    assert io_supervisor.drain(key, timeout=5)
+    return rcs[0]
+
+
+def _lines(bus, topic):
+    return [l for t, p, _ in bus.published if t == topic for l in p["lines"]]
+
+
+def test_lines_are_batched_per_tick(bus):
+    proc = _spawn("import sys\nfor i in range(300): print(i)\nsys.exit(3)")
+    assert _supervise("chatty-1", proc) == 3
+
+    topic = "/service_proxy/chatty-1/log"
+    batches = [p for t, p, _ in bus.published if t == topic]
+    assert [l["line"] for l in _lines(bus, topic)] == [str(i) for i in range(300)]
+    assert [l["seq"] for l in _lines(bus, topic)][-1] - [l["seq"] for l in _lines(bus, topic)][0] == 299
+    assert len(batches) < 300
+    first = batches[0]
+    assert first["proxy_id"] == "chatty-1" and first["stream"] == "stdout"
+    assert first["line"] == "\n".join(l["line"] for l in first["lines"])
+    assert first["ts"] == first["lines"][0]["ts"]
+
+
+def test_stderr_and_partial_last_line(bus):
+    proc = _spawn("import sys\nsys.stderr.write('boom\\n')\nsys.stdout.write('no newline')")
+    assert _supervise("partial-1", proc) == 0
+
+    got = sorted((l["stream"], l["line"]) for l in _lines(bus, "/service_proxy/partial-1/log"))
+    assert got == [("stderr", "boom"), ("stdout", "no newline")]
+
+
+def test_storage_runs_on_the_writer_thread(bus, monkeypatch):
+    threads = []
+    real = io_supervisor.service_logs.append
+
+    def recording(key, lines):
+        threads.append(threading.current_thread().name)
+        return real(key, lines)
+
+    monkeypatch.setattr(io_supervisor.service_logs, "append", recording)
+    proc = _spawn("print('stored')")
+    assert _supervise("stored-1", proc) == 0
+    assert threads and all(name.startswith("pm_log") for name in threads)
+    assert [l["line"] for l in _lines(bus, "/service_proxy/stored-1/log")] == ["stored"]
+
+
+def test_exit_detected_without_pidfd(bus, monkeypatch):
+    monkeypatch.setattr(io_supervisor, "_open_pidfd", lambda pid: None)
+    proc = _spawn("print('bye'); raise SystemExit(5)")
+    assert _supervise("polled-1", proc) == 5
+    assert "polled-1" not in io_supervisor.supervised()
+
+
+def _wait(pred, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if pred():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+def test_process_manager_crash_publishes_lifecycle_error(bus, tmp_path):
+    info = process_manager.start(
+        "crashy-1", [sys.executable, "-c", "print('up'); raise SystemExit(2)"], Path(sys.executable).parent,
+        cwd=tmp_path,
+    )
+    assert info["pid"] > 0
+    assert _wait(lambda: any(t == "/service_proxy/crashy-1/lifecycle" for t, _, _ in bus.published))
+
+    topic, payload, retained = next(e for e in bus.published if e[0] == "/service_proxy/crashy-1/lifecycle")
+    assert retained and payload["status"] == "error" and "rc=2" in payload["error"]
+    assert not process_manager.is_running("crashy-1")
+    log = [l["line"] for l in _lines(bus, "/service_proxy/crashy-1/log")]
+    assert "up" in log
+
+
+def test_process_manager_stop_is_not_a_crash(bus, tmp_path):
+    process_manager.start(
+        "calm-1", [sys.executable, "-c", "import time; print('ready', flush=True); time.sleep(30)"],
+        Path(sys.executable).parent, cwd=tmp_path,
+    )
+    assert _wait(lambda: _lines(bus, "/service_proxy/calm-1/log"))
+    assert process_manager.stop("calm-1", timeout=2.0)["stopped"]
+    assert _wait(lambda: "calm-1" not in io_supervisor.supervised())
+    assert not any(t == "/service_proxy/calm-1/lifecycle" for t, _, _ in bus.published)
@@ -518,6 +518,43 @@ def test_install_uninstall_cycle_repeatable(db, pip_meta):
     assert pip_meta["uninstall"] == 2
 
 
+def test_concurrent_starts_of_one_type_build_its_venv_once(db, pip_meta, monkeypatch, tmp_path):
+    # Boot starts proxies in parallel (start_graph). A second instance of a
+    # type being installed must wait for that install, not run pip into the
+    # same venv or skip pip on a half-built one.
+    import threading
+    import time
+
+    building = threading.Event()
+    done = []
+
+    def slow_install(dep, spec, slot, repo_dir, **kw):
+        pip_meta["install"] += 1
+        (tmp_path / "pipsvc" / "1.0.0" / ".venv" / "bin").mkdir(parents=True, exist_ok=True)
+        building.set()
+        time.sleep(0.2)
+        done.append(slot)
+
+    monkeypatch.setattr(lifecycle.installer, "install", slow_install)
+    meta = db.get_item("service_meta", "pipsvc@1.0.0")
+    returned = []
+
+    def start(req_id):
+        lifecycle._ensure_type_installed(dict(meta), req_id, db)
+        returned.append((req_id, list(done)))
+
+    first = threading.Thread(target=start, args=("r1",))
+    first.start()
+    assert building.wait(5)
+    second = threading.Thread(target=start, args=("r2",))
+    second.start()
+    first.join(5)
+    second.join(5)
+    assert pip_meta["install"] == 1
+    # Nobody came back before the venv build finished.
+    assert sorted(returned) == [("r1", ["pipsvc/1.0.0"]), ("r2", ["pipsvc/1.0.0"])]
+
+
 def test_start_self_heals_missing_install(db, pip_meta):
     # A stopped (non-placeholder) instance whose type venv vanished
     # reinstalls on Start rather than launching against a missing venv.
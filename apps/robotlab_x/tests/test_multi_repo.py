@@ -17,6 +17,7 @@ from __future__ import annotations
 import hashlib
 import io
 import tarfile
+from contextlib import contextmanager
 from pathlib import Path
 from types import SimpleNamespace
 from typing import Any, Dict, Optional
@@ -50,6 +51,18 @@ class FakeDB:
     def delete_item(self, table: str, key: str) -> None:
         self._t(table).pop(key, None)
 
+    def upsert_many(self, table: str, items: Dict[str, Dict[str, Any]]) -> None:
+        for key, item in items.items():
+            self._t(table)[key] = dict(item)
+
+    def delete_many(self, table: str, keys) -> None:
+        for key in keys:
+            self._t(table).pop(key, None)
+
+    @contextmanager
+    def transaction(self):
+        yield self
+
     def get_all_items(self, table: str) -> list:
         return list(self._t(table).values())
 
@@ -77,15 +77,24 @@ class FakePeerServer:
       * inbound  subscribe → ack + replay retained for /runtime/info
       * inbound  unsubscribe → ack
       * inbound  publish → record + ack
+      * inbound  batch → record each inner publish + one ack
       * outbound message frames pushed by ``push_message()``
+
+    ``legacy=True`` plays an older runtime: /runtime/info carries no
+    ``ws_features`` and a batch frame is answered with ``unknown_method``.
     """
 
-    def __init__(self, runtime_id: str = "silly-droid") -> None:
+    def __init__(self, runtime_id: str = "silly-droid", legacy: bool = False) -> None:
         self.runtime_id = runtime_id
+        self.legacy = legacy
         # Recorded frames the connecting peer sent us.
         self.received_subscribes: List[str] = []
+        # Full ``data`` of each subscribe frame (options included).
+        self.subscribe_frames: List[Dict[str, Any]] = []
         self.received_publishes: List[Dict[str, Any]] = []
         self.received_unsubscribes: List[str] = []
+        # Publish-carrying WS frames (a batch counts once).
+        self.publish_frames = 0
         # Connected client(s) so tests can push messages.
         self._clients: List[websockets.WebSocketServerProtocol] = []
         self.server: Optional[websockets.Server] = None
@@ -104,15 +113,18 @@ class FakePeerServer:
                 frame_id = frame.get("id")
                 if method == "subscribe":
                     self.received_subscribes.append(topic)
+                    self.subscribe_frames.append(data)
                     await ws.send(json.dumps({
                         "method": "ack", "id": frame_id,
                         "topic": topic, "subscribed": True,
                     }))
                     # Replay our identity on /runtime/info
                     if topic == "/runtime/info":
+                        info = {"id": self.runtime_id, "version": "test"}
+                        if not self.legacy:
+                            info["ws_features"] = ["batch"]
                         await ws.send(json.dumps({
-                            "method": "message", "topic": "/runtime/info",
-                            "payload": {"id": self.runtime_id, "version": "test"},
+                            "method": "message", "topic": "/runtime/info", "payload": info,
                         }))
                 elif method == "unsubscribe":
                     self.received_unsubscribes.append(topic)
@@ -121,6 +133,7 @@ class FakePeerServer:
                         "topic": topic, "subscribed": False,
                     }))
                 elif method == "publish":
+                    self.publish_frames += 1
                     self.received_publishes.append({
                         "topic": topic, "payload": data.get("payload"),
                         "retained": data.get("retained", False),
@@ -129,6 +142,23 @@ class FakePeerServer:
                         "method": "ack", "id": frame_id,
                         "topic": topic, "delivered": 1,
                     }))
+                elif method == "batch" and self.legacy:
+                    await ws.send(json.dumps({
+                        "method": "error", "id": frame_id,
+                        "error": "unknown_method", "method_received": method,
+                    }))
+                elif method == "batch":
+                    self.publish_frames += 1
+                    for inner in data.get("frames") or []:
+                        d = inner.get("data") or {}
+                        self.received_publishes.append({
+                            "topic": d.get("topic"), "payload": d.get("payload"),
+                            "retained": d.get("retained", False),
+                        })
+                    await ws.send(json.dumps({
+                        "method": "ack", "id": frame_id,
+                        "delivered": [1] * len(data.get("frames") or []),
+                    }))
         except websockets.exceptions.ConnectionClosed:
             pass
         finally:
@@ -405,3 +435,114 @@ async def test_reconnects_after_remote_drop(fake_server, monkeypatch):
         assert "/will-survive" in new_subs
     finally:
         await pc.stop()
+
+
+# ─────────────────────────────────────────────────────────────────────
+# Outbound send queue
+# ─────────────────────────────────────────────────────────────────────
+
+
+async def _connected(fake_server, **kwargs) -> PeerConnection:
+    pc = PeerConnection(
+        url=f"ws://127.0.0.1:{fake_server.port}",
+        token_provider=lambda: "test-token",
+        **kwargs,
+    )
+    pc.start()
+    for _ in range(40):
+        if pc.is_connected:
+            break
+        await asyncio.sleep(0.05)
+    assert pc.is_connected
+    return pc
+
+
+async def _received(fake_server, n: int) -> None:
+    for _ in range(100):
+        if len(fake_server.received_publishes) >= n:
+            return
+        await asyncio.sleep(0.02)
+
+
+@pytest.mark.asyncio
+async def test_burst_goes_out_in_batches_in_order(fake_server):
+    pc = await _connected(fake_server, batch_max_frames=50)
+    try:
+        for i in range(200):
+            assert pc.queue_publish("/telemetry", {"i": i})
+        await _received(fake_server, 200)
+        assert [p["payload"]["i"] for p in fake_server.received_publishes] == list(range(200))
+        assert fake_server.publish_frames == 4
+        stats = pc.send_stats()
+        assert stats["sent"] == 200 and stats["frames"] == 4 and stats["depth"] == 0
+    finally:
+        await pc.stop()
+
+
+@pytest.mark.asyncio
+async def test_burst_to_an_older_runtime_goes_out_as_single_publishes():
+    server = FakePeerServer(legacy=True)
+    await server.start()
+    pc = await _connected(server, batch_max_frames=50)
+    try:
+        for i in range(200):
+            assert pc.queue_publish("/telemetry", {"i": i})
+        await _received(server, 200)
+        assert [p["payload"]["i"] for p in server.received_publishes] == list(range(200))
+        assert server.publish_frames == 200
+        assert pc.send_stats()["sent"] == 200
+    finally:
+        await pc.stop()
+        await server.stop()
+
+
+@pytest.mark.asyncio
+async def test_unknown_method_reply_to_a_batch_turns_batching_off(fake_server):
+    pc = await _connected(fake_server)
+    try:
+        assert pc._batch_ok
+        fake_server.legacy = True
+        for i in range(10):
+            pc.queue_publish("/telemetry", {"i": i})
+        for _ in range(50):
+            if not pc._batch_ok:
+                break
+            await asyncio.sleep(0.02)
+        assert not pc._batch_ok
+        for i in range(10, 13):
+            pc.queue_publish("/telemetry", {"i": i})
+        await _received(fake_server, 3)
+        assert [p["payload"]["i"] for p in fake_server.received_publishes][-3:] == [10, 11, 12]
+    finally:
+        await pc.stop()
+
+
+@pytest.mark.asyncio
+async def test_coalesced_topic_keeps_only_latest_queued_value(fake_server):
+    pc = await _connected(fake_server)
+    try:
+        for i in range(10):
+            pc.queue_publish("/arm/pose", {"i": i}, coalesce=True)
+        pc.queue_publish("/arm/event", {"e": 1})
+        await _received(fake_server, 2)
+        await asyncio.sleep(0.05)
+        got = [(p["topic"], p["payload"]) for p in fake_server.received_publishes]
+        assert got == [("/arm/pose", {"i": 9}), ("/arm/event", {"e": 1})]
+        assert pc.send_stats()["coalesced"] == 9
+    finally:
+        await pc.stop()
+
+
+@pytest.mark.asyncio
+async def test_full_queue_drops_oldest(fake_server):
+    pc = await _connected(fake_server, send_queue_size=5)
+    try:
+        for i in range(20):
+            pc.queue_publish("/telemetry", {"i": i})
+        assert pc.send_stats()["depth"] == 5
+        await _received(fake_server, 5)
+        await asyncio.sleep(0.05)
+        assert [p["payload"]["i"] for p in fake_server.received_publishes] == [15, 16, 17, 18, 19]
+        assert pc.send_stats()["dropped"] == 15
+    finally:
+        await pc.stop()
@@ -106,6 +106,30 @@ async def test_local_publish_routes_to_peer(fresh_bus, fake_peer):
     assert received and received[0]["payload"] == {"action": "stop"}
 
 
+@pytest.mark.asyncio
+async def test_coalesced_publishes_and_outbound_stats(fresh_bus, fake_peer):
+    peer_manager.coalesce_topics("/arm/+/pose")
+    pc = peer_manager.connect(f"ws://127.0.0.1:{fake_peer.port}")
+    for _ in range(40):
+        if pc.is_connected:
+            break
+        await asyncio.sleep(0.05)
+
+    # No await between publishes: the writer can't run, so these queue.
+    for i in range(5):
+        fresh_bus.publish_sync("/arm/a1/pose@silly-droid", {"i": i})
+        fresh_bus.publish_sync("/arm/a1/state@silly-droid", {"i": i}, retained=True)
+        fresh_bus.publish_sync("/arm/a1/event@silly-droid", {"i": i})
+    await asyncio.sleep(0.1)
+
+    by_topic: Dict[str, List[Any]] = {}
+    for p in fake_peer.received_publishes:
+        by_topic.setdefault(p["topic"], []).append(p["payload"]["i"])
+    assert by_topic == {"/arm/a1/pose": [4], "/arm/a1/state": [4], "/arm/a1/event": [0, 1, 2, 3, 4]}
+    out = peer_manager.peers()["silly-droid"]["outbound"]
+    assert out["sent"] == 7 and out["coalesced"] == 8 and out["frames"] == 1 and out["depth"] == 0
+
+
 # ─────────────────────────────────────────────────────────────────────
 # Inbound: peer message → local /foo@<peer_id>
 # ─────────────────────────────────────────────────────────────────────
@@ -201,6 +225,99 @@ async def test_unsubscribe_closes_upstream(fresh_bus, fake_peer):
     assert "/foo" in fake_peer.received_unsubscribes
 
 
+@pytest.mark.asyncio
+async def test_subscription_options_go_upstream_widened(fresh_bus, fake_peer):
+    """Options ride the upstream subscribe; a second local subscriber
+    asking for more re-sends it with the widest of both."""
+    from robotlab_x.runtime.bus import BusSink
+
+    pc = peer_manager.connect(f"ws://127.0.0.1:{fake_peer.port}")
+    for _ in range(40):
+        if pc.is_connected:
+            break
+        await asyncio.sleep(0.05)
+
+    dash, ctl = BusSink("dash"), BusSink("ctl")
+    fresh_bus.attach("/joy@silly-droid", dash, {"max_hz": 5.0, "latest_only": True, "fields": ["axes"]})
+    await asyncio.sleep(0.1)
+    fresh_bus.attach("/joy@silly-droid", ctl, {"max_hz": 20.0, "fields": ["buttons"]})
+    await asyncio.sleep(0.1)
+
+    sent = [d for d in fake_peer.subscribe_frames if d["topic"] == "/joy"]
+    assert sent == [
+        {"topic": "/joy", "max_hz": 5.0, "latest_only": True, "fields": ["axes"]},
+        {"topic": "/joy", "max_hz": 20.0, "fields": ["axes", "buttons"]},
+    ]
+    assert pc._upstream_subscriptions["/joy"] == {"max_hz": 20.0, "fields": ["axes", "buttons"]}
+
+
+@pytest.mark.asyncio
+async def test_repeat_attach_with_new_options_reshapes_upstream(fresh_bus, fake_peer):
+    """A sink re-attaching with other options swaps its reference rather
+    than keeping the first options or adding a second one."""
+    from robotlab_x.runtime.bus import BusSink
+
+    pc = peer_manager.connect(f"ws://127.0.0.1:{fake_peer.port}")
+    for _ in range(40):
+        if pc.is_connected:
+            break
+        await asyncio.sleep(0.05)
+
+    dash = BusSink("dash")
+    assert fresh_bus.attach("/joy@silly-droid", dash, {"max_hz": 5.0})
+    await asyncio.sleep(0.1)
+    assert not fresh_bus.attach("/joy@silly-droid", dash, {"max_hz": 20.0, "fields": ["axes"]})
+    await asyncio.sleep(0.1)
+
+    assert dash.subscriptions["/joy@silly-droid"].options == {"max_hz": 20.0, "fields": ["axes"]}
+    assert pc._upstream_subscriptions["/joy"] == {"max_hz": 20.0, "fields": ["axes"]}
+    assert peer_manager.peers()["silly-droid"]["local_subs"] == {"/joy": 1}
+    fresh_bus.detach("/joy@silly-droid", dash)
+    await asyncio.sleep(0.1)
+    assert "/joy" in fake_peer.received_unsubscribes
+
+
+@pytest.mark.asyncio
+async def test_overlapping_local_subscriptions_share_one_upstream(fresh_bus, fake_peer):
+    """An exact topic, then two UIs on a covering pattern: upstream ends
+    up with the pattern alone, each bridged message crosses once and
+    reaches every local subscriber, and the exact topic takes over
+    again when the pattern's last subscriber leaves."""
+    from robotlab_x.runtime.bus import BusSink
+
+    pc = peer_manager.connect(f"ws://127.0.0.1:{fake_peer.port}")
+    for _ in range(40):
+        if pc.is_connected:
+            break
+        await asyncio.sleep(0.05)
+
+    svc, ui1, ui2 = BusSink("svc"), BusSink("ui1"), BusSink("ui2")
+    fresh_bus.attach("/arm/a1/state@silly-droid", svc)
+    await asyncio.sleep(0.05)
+    fresh_bus.attach("/+/+/state@silly-droid", ui1)
+    fresh_bus.attach("/+/+/state@silly-droid", ui2)
+    await asyncio.sleep(0.1)
+    assert peer_manager.open_subscriptions() == {"silly-droid": {"/+/+/state"}}
+    assert fake_peer.received_subscribes[-2:] == ["/arm/a1/state", "/+/+/state"]
+    assert fake_peer.received_unsubscribes == ["/arm/a1/state"]
+    assert peer_manager.peers()["silly-droid"]["local_subs"] == {"/arm/a1/state": 1, "/+/+/state": 2}
+
+    await fake_peer.push_message("/arm/a1/state", {"q": 1})
+    for sink in (svc, ui1, ui2):
+        sub, msg = await asyncio.wait_for(sink.queue.get(), timeout=1.0)
+        assert msg.topic == "/arm/a1/state@silly-droid" and msg.payload == {"q": 1}
+        assert sink.queue.empty()
+
+    fresh_bus.detach("/+/+/state@silly-droid", ui1)
+    await asyncio.sleep(0.05)
+    assert peer_manager.open_subscriptions() == {"silly-droid": {"/+/+/state"}}
+    fresh_bus.detach("/+/+/state@silly-droid", ui2)
+    await asyncio.sleep(0.1)
+    assert peer_manager.open_subscriptions() == {"silly-droid": {"/arm/a1/state"}}
+    assert fake_peer.received_subscribes[-1] == "/arm/a1/state"
+    assert fake_peer.received_unsubscribes[-1] == "/+/+/state"
+
+
 # ─────────────────────────────────────────────────────────────────────
 # /runtime/info is NOT bridged into the local bus
 # ─────────────────────────────────────────────────────────────────────
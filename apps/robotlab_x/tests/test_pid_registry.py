@@ -0,0 +1,103 @@
+# unmanaged
+"""Persistent pid registry + registry-driven orphan scan.
+
+Covers the pieces that let the reconciler skip the /proc sweep in
+steady state:
+  pid_registry     record / forget / persist / reload, pid-reuse guard
+  reconciler       _registered_subprocesses ownership classification
+"""
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from robotlab_x.runtime import pid_registry, reconciler
+
+
+@pytest.fixture(autouse=True)
+def _clean_registry():
+    pid_registry.reset()
+    yield
+    pid_registry.reset()
+
+
+@pytest.fixture
+def child():
+    proc = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)"])
+    yield proc
+    proc.kill()
+    proc.wait()
+
+
+def test_record_persists_and_forget_removes(tmp_path, child):
+    pid_registry.configure(tmp_path)
+    pid_registry.record(child.pid, "echo-1", "python -m echo_service")
+
+    saved = json.loads((tmp_path / "service_pids.json").read_text())["entries"]
+    assert [(e["pid"], e["proxy_id"], e["owner_pid"]) for e in saved] == [(child.pid, "echo-1", os.getpid())]
+    assert pid_registry.owned_by_me(saved[0])
+
+    pid_registry.forget(child.pid)
+    assert pid_registry.entries() == []
+    assert json.loads((tmp_path / "service_pids.json").read_text())["entries"] == []
+
+
+def test_configure_loads_previous_runtime_entries(tmp_path):
+    stale = {"pid": 999999, "proxy_id": "arduino-1", "start_ticks": 1, "owner_pid": 1, "owner_start_ticks": 1}
+    (tmp_path / "service_pids.json").write_text(json.dumps({"entries": [stale]}))
+
+    pid_registry.configure(tmp_path)
+
+    assert [e["proxy_id"] for e in pid_registry.entries()] == ["arduino-1"]
+
+
+@pytest.mark.skipif(not os.path.exists("/proc/self/stat"), reason="needs /proc")
+def test_start_ticks_guard_against_pid_reuse(child):
+    ticks = pid_registry.process_start_ticks(child.pid)
+    assert ticks is not None
+    assert pid_registry.is_same_process(child.pid, ticks)
+    assert not pid_registry.is_same_process(child.pid, ticks + 1)
+
+
+def test_registered_subprocesses_classifies_and_prunes(child):
+    pid_registry.record(child.pid, "echo-1", "python -m echo_service")
+    # A child of a runtime that is no longer alive → orphan.
+    pid_registry._entries[child.pid]["owner_pid"] = 999999
+    pid_registry._entries[child.pid]["owner_start_ticks"] = None
+    # A pid whose process is gone → pruned.
+    pid_registry._entries[999998] = {"pid": 999998, "proxy_id": "gone", "start_ticks": None}
+
+    found = reconciler._registered_subprocesses()
+
+    assert [(p["pid"], p["owner"]) for p in found] == [(child.pid, "orphan")]
+    assert [e["pid"] for e in pid_registry.entries()] == [child.pid]
+
+
+def test_registered_subprocesses_skips_live_foreign_runtime(child):
+    pid_registry.record(child.pid, "echo-1")
+    # Owner is some other live process (the test runner's parent).
+    ppid = os.getppid()
+    pid_registry._entries[child.pid]["owner_pid"] = ppid
+    pid_registry._entries[child.pid]["owner_start_ticks"] = pid_registry.process_start_ticks(ppid)
+
+    assert reconciler._registered_subprocesses() == []
+
+
+
+def test_orphan_grace_counts_from_registration_not_process_start(child, monkeypatch):
+    # A warm-pool interpreter parked for minutes is handed a proxy just
+    # now: its /proc age is large but it has only just become a service.
+    monkeypatch.setattr(reconciler, "_process_age_seconds", lambda pid: 600.0)
+    pid_registry.record(child.pid, "video-1")
+    proc = reconciler._registered_subprocesses()[0]
+    assert reconciler._orphan_age_seconds(proc) < reconciler.ORPHAN_GRACE_S
+
+    pid_registry._entries[child.pid]["recorded_at"] -= 2 * reconciler.ORPHAN_GRACE_S
+    proc = reconciler._registered_subprocesses()[0]
+    assert reconciler._orphan_age_seconds(proc) >= reconciler.ORPHAN_GRACE_S
+    # Swept pids have no registration; /proc age is all there is.
+    assert reconciler._orphan_age_seconds({"pid": child.pid}) == 600.0
@@ -26,6 +26,7 @@ from __future__ import annotations
 import hashlib
 import io
 import tarfile
+from contextlib import contextmanager
 from pathlib import Path
 from typing import Any, Dict, Optional
 
@@ -58,6 +59,18 @@ class FakeDB:
     def delete_item(self, table: str, key: str) -> None:
         self._table(table).pop(key, None)
 
+    def upsert_many(self, table: str, items: Dict[str, Dict[str, Any]]) -> None:
+        for key, item in items.items():
+            self._table(table)[key] = dict(item)
+
+    def delete_many(self, table: str, keys) -> None:
+        for key in keys:
+            self._table(table).pop(key, None)
+
+    @contextmanager
+    def transaction(self):
+        yield self
+
     def get_all_items(self, table: str) -> list:
         return list(self._table(table).values())
 
@@ -1,6 +1,7 @@
 """Manifest → service_meta mapping for the install-wizard fields (M3)."""
 from __future__ import annotations
 
+import os
 import textwrap
 from pathlib import Path
 
@@ -96,3 +97,51 @@ def test_title_absent_or_blank_maps_to_none(tmp_path):
     """)
     m2 = repo._parse_manifest(p2, "demo", "1.0.0")
     assert m2.title is None
+
+
+def test_scan_reuses_parsed_manifest_until_yml_changes(tmp_path, monkeypatch):
+    p = _write(tmp_path, """
+        name: demo
+        description: first
+    """)
+    os.utime(p.parent, ns=(0, 0))  # so the icon write below moves it
+    parses = []
+    real_parse = repo._parse_manifest
+    monkeypatch.setattr(repo, "_parse_manifest", lambda *a: parses.append(a) or real_parse(*a))
+
+    first = repo.scan_repo(tmp_path)
+    again = repo.scan_repo(tmp_path)
+    assert again[0] is first[0]
+    assert len(parses) == 1
+
+    p.write_text("name: demo\ndescription: second, longer\n")
+    assert repo.scan_repo(tmp_path)[0].description == "second, longer"
+    # The default icon appearing changes the version dir's mtime.
+    (p.parent / "icon.svg").write_text("<svg/>")
+    assert repo.scan_repo(tmp_path)[0].icon == "icon.svg"
+    assert len(parses) == 3
+
+
+def test_scan_parses_a_broken_manifest_once_until_it_changes(tmp_path, monkeypatch):
+    p = _write(tmp_path, "name: [unclosed\n")
+    parses = []
+    real_parse = repo._parse_manifest
+    monkeypatch.setattr(repo, "_parse_manifest", lambda *a: parses.append(a) or real_parse(*a))
+
+    assert repo.scan_repo(tmp_path) == []
+    assert repo.scan_repo(tmp_path) == []
+    assert len(parses) == 1
+
+    p.write_text("name: demo\ndescription: fixed now\n")
+    assert repo.scan_repo(tmp_path)[0].description == "fixed now"
+    assert len(parses) == 2
+
+
+def test_find_manifest_by_id_respects_root_order(tmp_path):
+    a, b = tmp_path / "a", tmp_path / "b"
+    _write(a, "description: from a\n")
+    _write(b, "description: from b\n")
+    assert repo.find_manifest([a, b], "demo@1.0.0").description == "from a"
+    assert repo.find_manifest([b], "demo@1.0.0").description == "from b"
+    assert repo.find_manifest([a, b], "demo@9.9.9") is None
+    assert repo.find_manifest([a, b], "demo") is None
@@ -42,6 +42,13 @@ def test_frame_round_trip():
     assert decode_frame(frame) == pcm
 
 
+def test_frame_round_trip_binary():
+    pcm = struct.pack("<2h", 1, -1)
+    frame = encode_frame(seq=1, ts=0.0, sample_rate=16000, channels=1, pcm=pcm, binary=True)
+    assert frame["data"] == pcm
+    assert decode_frame(frame) == pcm
+
+
 def test_level_rms():
     assert level_rms(b"") == 0.0
     assert level_rms(struct.pack("<8h", *([0] * 8))) == 0.0
@@ -0,0 +1,204 @@
+# unmanaged
+"""Tests for rlx_bus.streams.Stream — the producer-side frame ring.
+
+No runtime: the ring is exercised directly, and the sender loop runs
+against a fake ``websockets.connect`` that records what was sent.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+
+import pytest
+
+from rlx_bus import shm_ring
+from rlx_bus import streams as streams_mod
+from rlx_bus.shm_ring import ShmFrameRing
+from rlx_bus.streams import Stream
+
+needs_shm = pytest.mark.skipif(not shm_ring.available(), reason="no shared memory")
+
+
+def _stream(depth: int = 3, **kw) -> Stream:
+    kw.setdefault("shm", False)
+    return Stream("cam", "http://localhost:8000", "tok", queue_depth=depth, **kw)
+
+
+def test_push_keeps_bytes_by_reference():
+    s = _stream()
+    frame = b"\xff\xd8jpeg"
+    s.push(frame)
+    assert s._pop() is frame
+
+
+def test_push_wraps_buffers_without_copying():
+    s = _stream()
+    buf = bytearray(b"abcd")
+    s.push(buf)
+    buf[0] = ord("z")  # visible through the pending view → no copy
+    assert bytes(s._pop()) == b"zbcd"
+
+
+def test_push_flattens_multidimensional_buffers():
+    # cv2.imencode hands back an (N, 1) uint8 array; same shape here.
+    arr = memoryview(b"\x01\x02\x03\x04").cast("B", shape=[4, 1])
+    s = _stream()
+    s.push(arr)
+    view = s._pop()
+    assert view.ndim == 1 and len(view) == 4 and bytes(view) == b"\x01\x02\x03\x04"
+
+
+def test_push_rejects_non_buffers():
+    with pytest.raises(TypeError):
+        _stream().push("not bytes")
+
+
+def test_full_ring_overwrites_oldest():
+    s = _stream(depth=3)
+    for i in range(5):
+        s.push(bytes([i]))
+    assert s.drop_count == 2 and s.pending == 3
+    assert [s._pop() for _ in range(4)] == [b"\x02", b"\x03", b"\x04", None]
+
+
+class _FakeWS:
+    def __init__(self, reply=None) -> None:
+        self.sent: list = []
+        self._reply = reply
+
+    async def send(self, data) -> None:
+        self.sent.append(data)
+
+    async def recv(self):
+        if self._reply is None:
+            await asyncio.sleep(3600)  # a runtime that never answers
+        return self._reply
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        return None
+
+
+def test_sender_drains_ring_and_counts(monkeypatch):
+    fake = _FakeWS()
+    monkeypatch.setattr(streams_mod.websockets, "connect", lambda url, **kw: fake)
+
+    async def scenario():
+        s = _stream(depth=4)
+        s.start()
+        frame = b"x" * 1000
+        s.push(frame)
+        s.push(memoryview(b"y" * 500))
+        for _ in range(50):
+            await asyncio.sleep(0)
+            if len(fake.sent) == 3:
+                break
+        stats = s.stats()
+        await s.close()
+        return frame, stats
+
+    frame, stats = asyncio.run(scenario())
+    assert fake.sent[0].startswith("{")  # metadata first
+    assert fake.sent[1] is frame
+    assert bytes(fake.sent[2]) == b"y" * 500
+    assert stats["frames_sent"] == 2 and stats["bytes_sent"] == 1500
+    assert stats["bytes_per_s"] == 1500 and stats["dropped"] == 0 and stats["pending"] == 0
+
+
+# ─── shared-memory transport ──────────────────────────────────────────
+
+
+@needs_shm
+def test_shm_ring_round_trip_and_lapped_slot():
+    ring = ShmFrameRing.create(slots=2, slot_size=16)
+    reader = ShmFrameRing.attach(ring.descriptor())
+    try:
+        first = ring.write(b"frame-1")
+        assert reader.read(**first) == b"frame-1"
+        ring.write(memoryview(b"frame-2"))
+        ring.write(b"frame-3")  # reuses frame-1's slot
+        assert reader.read(**first) is None
+        assert ring.write(b"x" * 17) is None  # bigger than a slot
+    finally:
+        reader.close()
+        ring.close()
+
+
+@needs_shm
+def test_shm_attach_rejects_bad_descriptor():
+    with pytest.raises(ValueError):
+        ShmFrameRing.attach({"name": "x"})
+    with pytest.raises(OSError):
+        ShmFrameRing.attach({"name": "rlx_0000000000", "slots": 1, "slot_size": 1})
+
+
+@needs_shm
+def test_shm_attach_refuses_segments_it_did_not_name():
+    from multiprocessing import shared_memory
+    foreign = shared_memory.SharedMemory(create=True, size=64)
+    try:
+        with pytest.raises(ValueError):
+            ShmFrameRing.attach({"name": foreign.name, "slots": 1, "slot_size": 16})
+    finally:
+        foreign.close()
+        foreign.unlink()
+    ring = ShmFrameRing.create(slots=1, slot_size=16)
+    try:
+        assert ring.name.startswith(shm_ring.NAME_PREFIX)
+    finally:
+        ring.close()
+
+
+def test_shm_is_opt_in(monkeypatch):
+    monkeypatch.delenv("ROBOTLAB_X_STREAM_SHM", raising=False)
+    assert Stream("cam", "http://localhost:8000", "tok")._shm_wanted is False
+    monkeypatch.setenv("ROBOTLAB_X_STREAM_SHM", "1")
+    assert Stream("cam", "http://localhost:8000", "tok")._shm_wanted is shm_ring.available()
+
+
+@needs_shm
+def test_sender_uses_shm_when_runtime_accepts(monkeypatch):
+    fake = _FakeWS(reply=json.dumps({"shm": True}))
+    monkeypatch.setattr(streams_mod.websockets, "connect", lambda url, **kw: fake)
+
+    async def scenario():
+        s = _stream(shm=True)
+        s.start()
+        s.push(b"jpeg-bytes")
+        for _ in range(50):
+            await asyncio.sleep(0)
+            if len(fake.sent) == 2:
+                break
+        reader = ShmFrameRing.attach(json.loads(fake.sent[0])["shm"])
+        ctrl = json.loads(fake.sent[1])["shm_frame"]
+        data = reader.read(**ctrl)
+        reader.close()
+        transport = s.stats()["transport"]
+        await s.close()
+        return data, transport
+
+    data, transport = asyncio.run(scenario())
+    assert data == b"jpeg-bytes" and transport == "shm"
+
+
+@needs_shm
+def test_sender_falls_back_to_ws_without_answer(monkeypatch):
+    fake = _FakeWS(reply=None)
+    monkeypatch.setattr(streams_mod.websockets, "connect", lambda url, **kw: fake)
+    monkeypatch.setattr(streams_mod, "_SHM_ACK_TIMEOUT_S", 0.01)
+
+    async def scenario():
+        s = _stream(shm=True)
+        s.start()
+        s.push(b"jpeg-bytes")
+        for _ in range(100):
+            await asyncio.sleep(0.005)
+            if len(fake.sent) == 2:
+                break
+        await s.close()
+
+    asyncio.run(scenario())
+    assert "shm" in json.loads(fake.sent[0])
+    assert fake.sent[1] == b"jpeg-bytes"
@@ -0,0 +1,132 @@
+# unmanaged
+"""Persistent per-service log store (runtime/service_logs.py).
+
+Sequence numbering, time-range / substring / after_seq queries, the
+per-proxy disk bound, recovery across a restart (including a torn last
+line) and the backfill batches replayed on subscribe. Also the filters
+the runtime ring (log_bus.recent) gained for the same endpoint.
+"""
+from __future__ import annotations
+
+import logging
+
+import pytest
+
+from robotlab_x.runtime import log_bus, service_logs
+
+
+@pytest.fixture(autouse=True)
+def store(tmp_path):
+    service_logs.configure(tmp_path)
+    yield tmp_path
+    service_logs.configure(None)
+
+
+def _lines(*texts, ts=100.0, stream="stdout"):
+    return [{"stream": stream, "line": t, "ts": ts + i} for i, t in enumerate(texts)]
+
+
+def test_append_numbers_lines_and_queries_filter():
+    out = service_logs.append("video-1", _lines("boot", "camera ok", "camera lost", "shutdown"))
+    assert [l["seq"] for l in out] == [1, 2, 3, 4]
+
+    assert [r["line"] for r in service_logs.query("video-1")] == ["boot", "camera ok", "camera lost", "shutdown"]
+    assert [r["seq"] for r in service_logs.query("video-1", q="CAMERA")] == [2, 3]
+    assert [r["line"] for r in service_logs.query("video-1", since=101, until=102)] == ["camera ok", "camera lost"]
+    assert [r["seq"] for r in service_logs.query("video-1", limit=2)] == [3, 4]
+    assert [r["seq"] for r in service_logs.query("video-1", after_seq=1, limit=2)] == [2, 3]
+    assert service_logs.query("video-1")[0]["proxy_id"] == "video-1"
+    assert service_logs.query("nobody") == []
+
+
+def test_disk_is_bounded_per_proxy(store):
+    service_logs.configure(store, max_bytes=4 * 4096)
+    for i in range(200):
+        service_logs.append("chatty-1", _lines("x" * 200, ts=float(i)))
+
+    files = list((store / "service_logs" / "chatty-1").glob("*.jsonl"))
+    assert len(files) <= service_logs.SEGMENTS
+    assert sum(f.stat().st_size for f in files) < 4 * 4096 + 4096
+    kept = service_logs.query("chatty-1", limit=1000)
+    assert kept[-1]["seq"] == 200 and kept[0]["seq"] > 1
+    assert [r["seq"] for r in kept] == list(range(kept[0]["seq"], 201))
+
+
+def test_history_survives_restart_and_torn_tail(store):
+    service_logs.append("arm-1", _lines("one", "two"))
+    seg = next((store / "service_logs" / "arm-1").glob("*.jsonl"))
+    with open(seg, "a", encoding="utf-8") as f:
+        f.write('{"seq": 3, "ts": 1')  # crashed mid-append
+
+    service_logs.configure(store)
+    assert [r["line"] for r in service_logs.query("arm-1")] == ["one", "two"]
+    assert service_logs.append("arm-1", _lines("three"))[0]["seq"] == 3
+    assert [r["line"] for r in service_logs.query("arm-1")] == ["one", "two", "three"]
+
+
+def test_unconfigured_numbers_but_keeps_nothing():
+    service_logs.configure(None)
+    assert service_logs.append("a-1", _lines("x", "y"))[1]["seq"] == 2
+    assert service_logs.query("a-1") == []
+
+
+def test_backfill_batches_for_exact_and_wildcard_topics():
+    service_logs.append("a-1", _lines("a1", "a2"))
+    service_logs.append("b-1", _lines("oops", stream="stderr"))
+
+    (topic, payload), = service_logs.backfill("/service_proxy/a-1/log", 1)
+    assert topic == "/service_proxy/a-1/log" and payload["backfill"]
+    assert [(l["seq"], l["line"]) for l in payload["lines"]] == [(2, "a2")]
+    assert payload["line"] == "a2" and payload["proxy_id"] == "a-1"
+
+    wild = dict(service_logs.backfill("/service_proxy/+/log", 10))
+    assert set(wild) == {"/service_proxy/a-1/log", "/service_proxy/b-1/log"}
+    assert wild["/service_proxy/b-1/log"]["stream"] == "stderr"
+    assert service_logs.backfill("/service_proxy/a-1/lifecycle", 10) == []
+
+
+def test_backfill_gap_returns_tail_lines_numbered_after_the_read():
+    service_logs.append("a-1", _lines("a1", "a2"))
+    replayed = {"a-1": service_logs.backfill("/service_proxy/a-1/log", 10)[0][1]["lines"][-1]["seq"]}
+    service_logs.append("a-1", _lines("a3"))
+    service_logs.append("new-1", _lines("n1"))
+
+    (topic, payload), = service_logs.backfill_gap("/service_proxy/a-1/log", replayed)
+    assert topic == "/service_proxy/a-1/log" and payload["backfill"]
+    assert [(l["seq"], l["line"]) for l in payload["lines"]] == [(3, "a3")]
+    wild = dict(service_logs.backfill_gap("/service_proxy/+/log", replayed))
+    assert [l["line"] for l in wild["/service_proxy/new-1/log"]["lines"]] == ["n1"]
+    assert service_logs.backfill_gap("/service_proxy/gone-1/log", {}) == []
+
+
+def test_drop_removes_history(store):
+    service_logs.append("gone-1", _lines("bye"))
+    service_logs.drop("gone-1")
+    assert not (store / "service_logs" / "gone-1").exists()
+    assert service_logs.query("gone-1") == []
+
+
+def test_dot_ids_stay_inside_their_own_directory(store):
+    (store / "keep.txt").write_text("x")
+    service_logs.append("other-1", _lines("still here"))
+    for pid in ("..", ".", ""):
+        service_logs.append(pid, _lines("odd id"))
+        assert [r["line"] for r in service_logs.query(pid)] == ["odd id"]
+        service_logs.drop(pid)
+    assert (store / "keep.txt").exists()
+    assert [r["line"] for r in service_logs.query("other-1")] == ["still here"]
+
+
+def test_reads_of_unknown_ids_keep_no_state(store):
+    assert service_logs.query("never-seen") == []
+    assert service_logs.last_seq("never-seen") == 0
+    assert "never-seen" not in service_logs._logs
+    assert not (store / "service_logs" / "never-seen").exists()
+
+
+def test_runtime_ring_filters():
+    handler = log_bus.RingLogHandler()
+    for msg in ("alpha ready", "beta failed", "gamma ready"):
+        handler.emit(logging.LogRecord("t", logging.INFO, __file__, 1, msg, None, None))
+    assert [r["line"] for r in log_bus.recent(1000, q="READY")][-2:] == ["alpha ready", "gamma ready"]
+    assert log_bus.recent(1000, since=4e9) == []
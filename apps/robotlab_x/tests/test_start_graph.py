@@ -0,0 +1,116 @@
+# unmanaged
+"""Boot-time parallel starter (runtime/start_graph.py).
+
+Graph construction from runtime.yml ``depends_on`` + capability
+requires/implements, and the scheduler's ordering, concurrency limit,
+cycle breaking and retained timeline publish.
+"""
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from robotlab_x.runtime import start_graph
+
+
+class _Bus:
+    def __init__(self):
+        self.published = []
+
+    def publish_sync(self, topic, payload, retained=False):
+        self.published.append((topic, payload, retained))
+        return 1
+
+
+@pytest.fixture
+def bus(monkeypatch):
+    fake = _Bus()
+    monkeypatch.setattr(start_graph, "get_bus", lambda: fake)
+    return fake
+
+
+def test_graph_explicit_and_capability_edges():
+    metas = {
+        "arduino-1": {"implements": ["servo_controller"]},
+        "servo-1": {"requires": ["servo_controller"]},
+        "brain-1": {},
+        "clock-1": {},
+    }
+    graph = start_graph.dependency_graph(
+        ["clock-1", "servo-1", "brain-1", "arduino-1"],
+        metas,
+        depends_on={"brain-1": ["clock-1", "not-in-batch"]},
+        start_order=["arduino-1", "servo-1"],
+    )
+    assert graph == {
+        "arduino-1": set(),
+        "servo-1": {"arduino-1"},
+        "brain-1": {"clock-1"},
+        "clock-1": set(),
+    }
+
+
+def test_graph_prefers_earlier_implementer():
+    metas = {
+        "a": {"implements": ["cap"]},
+        "b": {"requires": ["cap"]},
+        "c": {"implements": ["cap"]},
+    }
+    assert start_graph.dependency_graph(["a", "b", "c"], metas)["b"] == {"a"}
+    # No earlier implementer: wait on the later ones instead.
+    assert start_graph.dependency_graph(["b", "c"], metas)["b"] == {"c"}
+
+
+def test_run_overlaps_independent_starts_and_orders_dependents(bus):
+    lock = threading.Lock()
+    active, peak, finished = [0], [0], []
+
+    def start(pid):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.05)
+        with lock:
+            active[0] -= 1
+            finished.append(pid)
+
+    order = ["a", "b", "c", "d"]
+    graph = {"a": set(), "b": set(), "c": set(), "d": {"a", "b"}}
+    report = start_graph.run(order, graph, start, max_concurrency=2)
+
+    assert peak[0] == 2
+    assert finished.index("d") > max(finished.index("a"), finished.index("b"))
+    assert report["done"] and [e["status"] for e in report["services"]] == ["running"] * 4
+    d = report["services"][3]
+    assert d["depends_on"] == ["a", "b"] and d["started_s"] >= d["ready_s"]
+    topic, payload, retained = bus.published[-1]
+    assert topic == start_graph.TIMELINE_TOPIC and retained and payload["done"]
+
+
+def test_run_records_failures_and_breaks_cycles(bus):
+    started = []
+
+    def start(pid):
+        started.append(pid)
+        if pid == "x":
+            raise RuntimeError("boom")
+
+    report = start_graph.run(
+        ["x", "y", "p", "q"],
+        {"y": {"x"}, "p": {"q"}, "q": {"p"}},
+        start,
+        max_concurrency=1,
+    )
+
+    by_id = {e["proxy_id"]: e for e in report["services"]}
+    assert by_id["x"]["status"] == "error" and "boom" in by_id["x"]["error"]
+    # Dependents of a failed start still get their attempt.
+    assert by_id["y"]["status"] == "running"
+    assert sorted(started) == ["p", "q", "x", "y"]
+    assert started.index("p") < started.index("q")
+
+
+def test_priority_order_follows_start_order():
+    assert start_graph.priority_order(["z", "b", "a"], ["a", "b"]) == ["a", "b", "z"]
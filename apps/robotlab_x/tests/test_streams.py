@@ -0,0 +1,250 @@
+# unmanaged
+"""Tests for the stream media plane — runtime/streams.py and the
+consumer routes in runtime/stream_routes.py.
+
+MJPEG consumers drive ``_mjpeg_generator`` directly (it's what
+StreamingResponse iterates); the WS consumer runs through TestClient
+with a real upload-WS producer. Fresh registry per test.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+import tracemalloc
+
+import jwt
+import pytest
+from fastapi import FastAPI, WebSocketDisconnect
+from fastapi.testclient import TestClient
+
+from rlx_bus import shm_ring
+from rlx_bus.shm_ring import ShmFrameRing
+
+from robotlab_x.runtime import stream_routes
+from robotlab_x.runtime import streams as streams_mod
+from robotlab_x.runtime.streams import (
+    StreamMetadata,
+    StreamRegistry,
+    StreamState,
+    WS_FRAME_HEADER,
+    encode_mjpeg_part,
+)
+
+
+# Roughly a 720p JPEG at default quality.
+_FRAME_720P = b"\xff\xd8" + bytes(150_000) + b"\xff\xd9"
+
+
+@pytest.fixture
+def registry(monkeypatch) -> StreamRegistry:
+    reg = StreamRegistry()
+    monkeypatch.setattr(streams_mod, "_registry", reg)
+    return reg
+
+
+def test_encode_mjpeg_part_envelope():
+    part = encode_mjpeg_part(b"JPEG")
+    assert part == (
+        b"--frame\r\nContent-Type: image/jpeg\r\nContent-Length: 4\r\n\r\nJPEG\r\n"
+    )
+
+
+def test_part_is_built_once_per_frame_and_invalidated_by_next():
+    async def scenario():
+        state = StreamState("cam", StreamMetadata(stream_id="cam"))
+        assert state.latest_part() is None
+        await state.set_frame(b"one")
+        first, seq1 = state.latest_part()
+        again, _ = await state.wait_for_part(0, timeout_s=0.1)
+        await state.set_frame(b"two")
+        second, seq2 = state.latest_part()
+        return first, again, seq1, second, seq2
+
+    first, again, seq1, second, seq2 = asyncio.run(scenario())
+    assert again is first
+    assert first.endswith(b"one\r\n") and second.endswith(b"two\r\n")
+    assert (seq1, seq2) == (1, 2)
+
+
+async def _fan_out(registry: StreamRegistry, consumers: int, frames: int, payload: bytes):
+    """Push ``frames`` frames to ``consumers`` MJPEG generators. Each
+    consumer keeps every part it receives, so retained memory shows
+    whether parts are shared or copied per consumer."""
+    state = await registry.register(StreamMetadata(stream_id="cam"))
+    received: list[list[bytes]] = [[] for _ in range(consumers)]
+    gens = [stream_routes._mjpeg_generator("cam") for _ in range(consumers)]
+
+    async def consume(gen, sink):
+        async for part in gen:
+            sink.append(part)
+            if len(sink) == frames:
+                return
+
+    tasks = [asyncio.create_task(consume(g, r)) for g, r in zip(gens, received)]
+    await asyncio.sleep(0)
+    for _ in range(frames):
+        await state.set_frame(payload)
+        # Let every consumer pull this frame before the next one lands.
+        for _ in range(3):
+            await asyncio.sleep(0)
+    await asyncio.wait_for(asyncio.gather(*tasks), timeout=5.0)
+    for g in gens:
+        await g.aclose()
+    return received
+
+
+def test_consumers_share_the_same_part_objects(registry):
+    received = asyncio.run(_fan_out(registry, consumers=3, frames=4, payload=b"jpeg"))
+    for i in range(4):
+        assert received[0][i] is received[1][i] is received[2][i]
+    assert registry.get("cam").snapshot()["consumers"] == 0
+
+
+@pytest.mark.parametrize("consumers", [1, 5, 20])
+def test_mjpeg_fan_out_benchmark(registry, consumers, record_property):
+    """720p frames, 30 of them (one second at 30 fps), to N consumers.
+    Records CPU time and traced memory as test properties (``--junitxml``)
+    and asserts the memory held for the delivered parts tracks the frame
+    count, not the consumer count."""
+    frames = 30
+    tracemalloc.start()
+    cpu0 = time.process_time()
+    try:
+        received = asyncio.run(_fan_out(registry, consumers, frames, _FRAME_720P))
+        cpu_ms = (time.process_time() - cpu0) * 1000
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    part_size = len(received[0][0])
+    record_property("cpu_ms", round(cpu_ms, 1))
+    record_property("held_bytes", current)
+    record_property("peak_bytes", peak)
+    record_property("copies_per_frame", round(peak / (frames * part_size), 2))
+    assert all(len(r) == frames for r in received)
+    # Every consumer holds all 30 parts. Shared parts: ~1x the frame
+    # bytes. One copy per consumer would be ``consumers``x.
+    assert current < 2 * frames * part_size
+    assert peak < 2 * frames * part_size
+    # A second of video must fan out in well under a second of CPU, even
+    # on a loaded CI box, or the route can't keep up with the camera.
+    assert cpu_ms < 1000
+
+
+# ─── WS consumer endpoint ─────────────────────────────────────────────
+
+
+def _token() -> str:
+    return jwt.encode({"sub": "subprocess"}, stream_routes._jwt_secret(), algorithm="HS256")
+
+
+@pytest.fixture
+def client(registry) -> TestClient:
+    app = FastAPI()
+    stream_routes.register_stream_routes(app)
+    return TestClient(app)
+
+
+def _wait_registered(registry: StreamRegistry, stream_id: str) -> StreamState:
+    deadline = time.monotonic() + 2.0
+    while registry.get(stream_id) is None:
+        assert time.monotonic() < deadline, "producer never registered"
+        time.sleep(0.005)
+    return registry.get(stream_id)
+
+
+def _wait_seq(state: StreamState, seq: int) -> None:
+    deadline = time.monotonic() + 2.0
+    while (state.latest_frame() or (None, 0))[1] < seq:
+        assert time.monotonic() < deadline, "frame never landed"
+        time.sleep(0.005)
+
+
+def test_ws_consumer_receives_header_and_jpeg(client, registry):
+    tok = _token()
+    with client.websocket_connect(f"/v1/stream/cam/upload?token={tok}") as producer:
+        producer.send_text(json.dumps({"producer_id": "cam-1"}))
+        state = _wait_registered(registry, "cam")
+        producer.send_bytes(b"first")
+        _wait_seq(state, 1)
+        with client.websocket_connect(f"/v1/stream/cam/ws?token={tok}") as viewer:
+            msg = viewer.receive_bytes()
+            seq, ts = WS_FRAME_HEADER.unpack_from(msg)
+            assert (seq, msg[WS_FRAME_HEADER.size:]) == (1, b"first")
+            assert abs(ts - time.time()) < 5
+            assert state.snapshot()["consumers"] == 1
+            producer.send_bytes(b"second")
+            msg = viewer.receive_bytes()
+            assert WS_FRAME_HEADER.unpack_from(msg)[0] == 2
+            assert msg[WS_FRAME_HEADER.size:] == b"second"
+
+
+def test_ws_consumer_max_fps_skips_to_latest(client, registry):
+    tok = _token()
+    with client.websocket_connect(f"/v1/stream/cam/upload?token={tok}") as producer:
+        producer.send_text("{}")
+        state = _wait_registered(registry, "cam")
+        producer.send_bytes(b"f1")
+        _wait_seq(state, 1)
+        with client.websocket_connect(f"/v1/stream/cam/ws?token={tok}&max_fps=4") as viewer:
+            assert WS_FRAME_HEADER.unpack_from(viewer.receive_bytes())[0] == 1
+            # Three frames inside one 250 ms slot: only the newest is sent.
+            for i in (2, 3, 4):
+                producer.send_bytes(f"f{i}".encode())
+            _wait_seq(state, 4)
+            msg = viewer.receive_bytes()
+            assert WS_FRAME_HEADER.unpack_from(msg)[0] == 4
+            assert msg[WS_FRAME_HEADER.size:] == b"f4"
+
+
+def test_ws_consumer_unknown_stream_closes_4404(client):
+    with pytest.raises(WebSocketDisconnect) as exc:
+        with client.websocket_connect(f"/v1/stream/nope/ws?token={_token()}") as viewer:
+            viewer.receive_bytes()
+    assert exc.value.code == 4404
+
+
+def test_viewer_pacing_interval():
+    pacing = stream_routes._ViewerPacing(max_fps=10)
+    assert pacing.min_interval() == pytest.approx(0.1)
+    # A slow link stretches the interval past the fps ceiling…
+    pacing.record_send(0.5)
+    assert pacing.min_interval() == pytest.approx(0.5)
+    # …unless latest_only is off, where only max_fps applies.
+    pacing.update({"latest_only": False})
+    assert pacing.min_interval() == pytest.approx(0.1)
+    pacing.update({"max_fps": "bogus"})
+    assert pacing.max_fps == 10
+    pacing.update({"max_fps": 0})
+    assert pacing.min_interval() == 0.0
+
+
+
+@pytest.mark.skipif(not shm_ring.available(), reason="no shared memory")
+def test_upload_accepts_shared_memory_frames(client, registry):
+    ring = ShmFrameRing.create(slots=2, slot_size=64)
+    try:
+        with client.websocket_connect(f"/v1/stream/cam/upload?token={_token()}") as producer:
+            producer.send_text(json.dumps({"producer_id": "cam-1", "shm": ring.descriptor()}))
+            assert json.loads(producer.receive_text()) == {"shm": True}
+            state = _wait_registered(registry, "cam")
+            producer.send_text(json.dumps({"shm_frame": ring.write(b"via-shm")}))
+            _wait_seq(state, 1)
+            assert state.latest_frame()[0] == b"via-shm"
+            assert state.snapshot()["transport"] == "shm"
+            # Oversized frames still arrive as binary on the same socket.
+            producer.send_bytes(b"via-ws")
+            _wait_seq(state, 2)
+            assert state.latest_frame()[0] == b"via-ws"
+    finally:
+        ring.close()
+
+
+def test_upload_refuses_unattachable_shared_memory(client, registry):
+    with client.websocket_connect(f"/v1/stream/cam/upload?token={_token()}") as producer:
+        producer.send_text(json.dumps(
+            {"shm": {"name": "rlx-does-not-exist", "slots": 1, "slot_size": 1}},
+        ))
+        assert json.loads(producer.receive_text()) == {"shm": False}
+        state = _wait_registered(registry, "cam")
+        assert state.transport == "ws"
@@ -0,0 +1,36 @@
+# unmanaged
+"""Tests for event_handlers._tuning — runtime knobs that live outside
+the generated Config model.
+
+Precedence: a settings field of the same name (once the model is
+regenerated with one), then the ROBOTLAB_X_<NAME> env var parsed as
+JSON, then the module default.
+"""
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+from robotlab_x.event_handlers import DB_CACHE_TABLES, _tuning
+
+
+def test_default_when_neither_settings_nor_env(monkeypatch):
+    monkeypatch.delenv("ROBOTLAB_X_DB_CACHE_TABLES", raising=False)
+    assert _tuning(SimpleNamespace(), "db_cache_tables", DB_CACHE_TABLES) == DB_CACHE_TABLES
+
+
+def test_env_is_parsed_as_json(monkeypatch):
+    monkeypatch.setenv("ROBOTLAB_X_DB_CACHE_TABLES", '["workspace"]')
+    monkeypatch.setenv("ROBOTLAB_X_DB_CACHE_TTL_S", "0")
+    assert _tuning(SimpleNamespace(), "db_cache_tables", DB_CACHE_TABLES) == ["workspace"]
+    assert _tuning(SimpleNamespace(), "db_cache_ttl_s", 30.0) == 0
+
+
+def test_settings_field_wins_over_env(monkeypatch):
+    monkeypatch.setenv("ROBOTLAB_X_DB_CACHE_TABLES", '["workspace"]')
+    settings = SimpleNamespace(db_cache_tables=[])
+    assert _tuning(settings, "db_cache_tables", DB_CACHE_TABLES) == []
+
+
+def test_unparseable_env_falls_back_to_default(monkeypatch):
+    monkeypatch.setenv("ROBOTLAB_X_DB_CACHE_TTL_S", "thirty")
+    assert _tuning(SimpleNamespace(), "db_cache_ttl_s", 30.0) == 30.0
@@ -0,0 +1,133 @@
+# unmanaged
+"""Unit tests for the video service's threaded frame pipeline.
+
+``video_service/pipeline.py`` has no cv2 dependency, so it's loaded
+straight from the package's source file — importing ``video_service``
+itself would pull in cv2, which the top-level test venv doesn't have.
+"""
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import threading
+import time
+from pathlib import Path
+
+_PIPELINE_PY = (
+    Path(__file__).resolve().parents[1]
+    / "repo" / "video" / "1.0.0" / "src" / "video_service" / "pipeline.py"
+)
+_spec = importlib.util.spec_from_file_location("video_service_pipeline", _PIPELINE_PY)
+pipeline = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(pipeline)
+
+
+def test_drop_oldest_queue_overwrites_and_closes():
+    q = pipeline.DropOldestQueue(2)
+    for i in range(4):
+        q.put(i)
+    assert q.dropped == 2
+    assert q.get() == 2 and q.get() == 3
+    q.close()
+    assert q.get() is pipeline._CLOSED
+
+
+def test_stages_run_off_loop_in_order():
+    loop_thread = threading.get_ident()
+    seen_threads = set()
+
+    def process(frame):
+        seen_threads.add(threading.get_ident())
+        return frame * 10, [("f1", {"n": frame})]
+
+    def encode(frame):
+        seen_threads.add(threading.get_ident())
+        return f"jpg{frame}"
+
+    async def scenario():
+        p = pipeline.FramePipeline(process, encode, depth=8)
+        p.start()
+        out = []
+        for i in range(5):
+            p.submit(i)
+
+        async def collect():
+            async for item in p.results():
+                out.append(item)
+                if len(out) == 5:
+                    return
+
+        await asyncio.wait_for(collect(), timeout=5.0)
+        await p.close()
+        return out
+
+    out = asyncio.run(scenario())
+    assert [buf for buf, _ in out] == [f"jpg{i * 10}" for i in range(5)]
+    assert out[2][1] == [("f1", {"n": 2})]
+    assert loop_thread not in seen_threads
+
+
+def test_slow_stage_drops_oldest_and_keeps_loop_free():
+    release = threading.Event()
+
+    def process(frame):
+        release.wait(timeout=5.0)
+        return frame, []
+
+    async def scenario():
+        p = pipeline.FramePipeline(process, lambda f: f, depth=1)
+        p.start()
+        p.submit(0)  # picked up by the blocked filter stage
+        await asyncio.sleep(0.05)
+        started = time.monotonic()
+        for i in range(1, 6):
+            p.submit(i)  # never blocks the loop
+        submit_s = time.monotonic() - started
+        got = []
+
+        async def collect():
+            async for buf, _ in p.results():
+                got.append(buf)
+                if buf == 5:
+                    return
+
+        collector = asyncio.create_task(collect())
+        await asyncio.sleep(0)
+        release.set()
+        await asyncio.wait_for(collector, timeout=5.0)
+        dropped = p.dropped
+        await p.close()
+        return submit_s, got, dropped
+
+    submit_s, got, dropped = asyncio.run(scenario())
+    assert submit_s < 0.05
+    # 1..4 are overwritten while the filter stage is busy; whatever else
+    # a depth-1 hand-off drops is counted, and the newest frame wins.
+    assert got[-1] == 5
+    assert dropped >= 4 and len(got) + dropped == 6
+
+
+def test_raising_stage_skips_frame():
+    def process(frame):
+        if frame == 1:
+            raise RuntimeError("bad frame")
+        return frame, []
+
+    async def scenario():
+        p = pipeline.FramePipeline(process, lambda f: f, depth=4)
+        p.start()
+        for i in range(3):
+            p.submit(i)
+        got = []
+
+        async def collect():
+            async for buf, _ in p.results():
+                got.append(buf)
+                if buf == 2:
+                    return
+
+        await asyncio.wait_for(collect(), timeout=5.0)
+        await p.close()
+        return got
+
+    assert asyncio.run(scenario()) == [0, 2]
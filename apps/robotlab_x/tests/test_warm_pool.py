@@ -0,0 +1,82 @@
+# unmanaged
+"""Warm interpreter pool (runtime/warm_pool.py + warm_bootstrap.py).
+
+Parks a real interpreter with a preload, hands it a ``-m`` start and
+checks the service sees the handed-over argv/env/cwd — plus the argv
+shapes that can't be handed off and the mismatch fallback.
+"""
+from __future__ import annotations
+
+import os
+import sys
+import time
+
+import pytest
+
+from robotlab_x.runtime import repo, warm_pool
+
+
+@pytest.fixture(autouse=True)
+def _pool():
+    warm_pool.configure(True)
+    yield
+    warm_pool.configure(False)
+
+
+def _wait_parked(key: str) -> int:
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        pid = warm_pool.parked().get(key)
+        if pid:
+            return pid
+        time.sleep(0.02)
+    raise AssertionError(f"{key} never parked")
+
+
+def test_handoff_args_shapes():
+    assert warm_pool.handoff_args(["python", "-m", "video_service", "--x"]) == ["-m", "video_service", "--x"]
+    assert warm_pool.handoff_args(["/v/bin/python3", "-u", "-m", "svc"]) == ["-m", "svc"]
+    assert warm_pool.handoff_args(["python", "main.py"]) == ["main.py"]
+    assert warm_pool.handoff_args(["node", "index.js"]) is None
+    assert warm_pool.handoff_args(["python", "-c", "print(1)"]) is None
+
+
+def test_parked_interpreter_becomes_the_service(tmp_path):
+    (tmp_path / "hello_mod.py").write_text(
+        "import os, sys\n"
+        "print('decimal' in sys.modules, os.environ['WARM_PROXY'], sys.argv[1:], os.getcwd())\n"
+    )
+    cwd = str(tmp_path)
+    env = dict(os.environ, WARM_PROXY="parked")
+    warm_pool.replenish("hello@1.0.0", sys.executable, cwd, ["decimal"], env)
+    parked_pid = _wait_parked("hello@1.0.0")
+
+    env["WARM_PROXY"] = "hello-1"
+    proc = warm_pool.acquire("hello@1.0.0", [sys.executable, "-m", "hello_mod", "--port", "4242"], env, cwd)
+    assert proc is not None and proc.pid == parked_pid
+    out, _ = proc.communicate(timeout=10)
+    assert proc.returncode == 0
+    assert out.strip() == f"True hello-1 ['--port', '4242'] {os.path.realpath(cwd)}"
+    assert "hello@1.0.0" not in warm_pool.parked()
+
+
+def test_mismatched_spare_is_retired_and_start_goes_cold(tmp_path):
+    warm_pool.replenish("x@1.0.0", sys.executable, str(tmp_path), ["decimal"], dict(os.environ))
+    _wait_parked("x@1.0.0")
+    assert warm_pool.acquire("x@1.0.0", [sys.executable, "-m", "x"], dict(os.environ), "/elsewhere") is None
+    assert warm_pool.parked() == {}
+
+
+def test_disabled_pool_never_parks(tmp_path):
+    warm_pool.configure(False)
+    warm_pool.replenish("y@1.0.0", sys.executable, str(tmp_path), ["decimal"], dict(os.environ))
+    assert warm_pool.acquire("y@1.0.0", [sys.executable, "-m", "y"], {}, str(tmp_path)) is None
+    assert warm_pool.parked() == {}
+
+
+def test_manifest_parses_entry_preload(tmp_path):
+    d = tmp_path / "video" / "1.0.0"
+    d.mkdir(parents=True)
+    (d / "package.yml").write_text("entry:\n  argv: [python, -m, video_service]\n  preload: [numpy, cv2]\n")
+    m = repo._parse_manifest(d / "package.yml", "video", "1.0.0")
+    assert m.entry.preload == ["numpy", "cv2"]
@@ -0,0 +1,287 @@
+# unmanaged
+"""Tests for runtime/ws_endpoint.py — the ``/v1/ws`` bus bridge.
+
+Drives the real endpoint through FastAPI's TestClient against a fresh
+per-test Bus, so the wire protocol (subscribe → ack → message frames)
+is exercised end-to-end without a running backend.
+"""
+from __future__ import annotations
+
+import jwt
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from robotlab_x.runtime import bus as bus_mod
+from robotlab_x.runtime import ws_endpoint
+from robotlab_x.runtime.bus import Bus, BusMessage
+
+
+@pytest.fixture
+def bus(monkeypatch) -> Bus:
+    b = Bus()
+    monkeypatch.setattr(bus_mod, "_default_bus", b)
+    monkeypatch.setattr(ws_endpoint, "get_bus", lambda: b)
+    return b
+
+
+@pytest.fixture
+def client(bus) -> TestClient:
+    app = FastAPI()
+    ws_endpoint.register_ws_routes(app)
+    return TestClient(app)
+
+
+def _token() -> str:
+    return jwt.encode({"sub": "tester"}, ws_endpoint._jwt_secret(), algorithm="HS256")
+
+
+def _subscribe(ws, topic: str) -> None:
+    ws.send_json({"id": "s1", "method": "subscribe", "data": {"topic": topic}})
+    ack = ws.receive_json()
+    assert ack["method"] == "ack" and ack["subscribed"] is True
+
+
+def test_ws_frame_is_encoded_once_and_cached():
+    msg = BusMessage(topic="/t", payload={"x": 1}, sender_id="s", timestamp=1.5)
+    first = msg.ws_frame()
+    assert msg.ws_frame() is first
+    assert first == (
+        '{"method": "message", "topic": "/t", "payload": {"x": 1}, '
+        '"sender_id": "s", "reply_to": null, "timestamp": 1.5}'
+    )
+
+
+def test_delivery_shares_one_encoding_across_connections(client, bus, monkeypatch):
+    encoded: list[str] = []
+    real = BusMessage.ws_frame
+
+    def counting(self, codec="json"):
+        if self._ws_frame is None:
+            encoded.append(self.topic)
+        return real(self, codec)
+
+    monkeypatch.setattr(BusMessage, "ws_frame", counting)
+    url = f"/v1/ws?token={_token()}"
+    with client.websocket_connect(url) as a, client.websocket_connect(url) as b:
+        _subscribe(a, "/telemetry")
+        _subscribe(b, "/telemetry")
+        bus.publish_sync("/telemetry", {"v": 42})
+        fa = a.receive_json()
+        fb = b.receive_json()
+    assert fa == fb
+    assert fa["method"] == "message" and fa["payload"] == {"v": 42}
+    assert encoded == ["/telemetry"]
+
+
+def test_acks_and_deliveries_keep_order(client, bus):
+    with client.websocket_connect(f"/v1/ws?token={_token()}") as ws:
+        _subscribe(ws, "/echo")
+        ws.send_json({"id": "p1", "method": "publish",
+                      "data": {"topic": "/echo", "payload": 1}})
+        frames = [ws.receive_json(), ws.receive_json()]
+    methods = sorted(f["method"] for f in frames)
+    assert methods == ["ack", "message"]
+    ack = next(f for f in frames if f["method"] == "ack")
+    assert ack["id"] == "p1" and ack["delivered"] == 1
+
+
+def test_many_subscriptions_share_one_pump(client, bus):
+    topics = [f"/svc/s{i}/state" for i in range(50)]
+    with client.websocket_connect(f"/v1/ws?token={_token()}") as ws:
+        for t in topics:
+            _subscribe(ws, t)
+        sid = bus.subscribers(topics[0])[0]["id"]
+        assert all(bus.subscribers(t)[0]["id"] == sid for t in topics)
+        bus.publish_sync(topics[-1], "x")
+        msg = ws.receive_json()
+        assert msg["topic"] == topics[-1]
+        ws.send_json({"id": "u", "method": "unsubscribe", "data": {"topic": topics[0]}})
+        assert ws.receive_json()["subscribed"] is False
+        assert bus.subscriber_count(topics[0]) == 0
+    assert all(bus.subscriber_count(t) == 0 for t in topics)
+
+
+def test_msgpack_codec_negotiated_with_native_bytes(client, bus):
+    msgpack = pytest.importorskip("msgpack")
+    token = _token()
+    with client.websocket_connect(f"/v1/ws?token={token}&codec=msgpack") as mp, \
+            client.websocket_connect(f"/v1/ws?token={token}") as js:
+        assert msgpack.unpackb(mp.receive_bytes()) == {"method": "codec", "codec": "msgpack"}
+        # Inbound may still be JSON text — decoded by frame type.
+        mp.send_json({"id": "s1", "method": "subscribe", "data": {"topic": "/cam"}})
+        assert msgpack.unpackb(mp.receive_bytes())["subscribed"] is True
+        _subscribe(js, "/cam")
+        # ...or MessagePack with a native bytes payload.
+        mp.send_bytes(msgpack.packb({"id": "p1", "method": "publish",
+                                     "data": {"topic": "/cam", "payload": {"jpg": b"\xff\xd8"}}}))
+        frames = [msgpack.unpackb(mp.receive_bytes()) for _ in range(2)]
+        as_json = js.receive_json()
+    msg = next(f for f in frames if f["method"] == "message")
+    assert msg["payload"] == {"jpg": b"\xff\xd8"}
+    # JSON clients get the same payload base64'd.
+    assert as_json["payload"] == {"jpg": "/9g="}
+
+
+def test_msgpack_payload_with_int_keys_round_trips(client, bus):
+    msgpack = pytest.importorskip("msgpack")
+    with client.websocket_connect(f"/v1/ws?token={_token()}&codec=msgpack") as mp:
+        msgpack.unpackb(mp.receive_bytes())  # codec greeting
+        mp.send_json({"id": "s1", "method": "subscribe", "data": {"topic": "/servo/pos"}})
+        assert msgpack.unpackb(mp.receive_bytes())["subscribed"] is True
+        mp.send_bytes(msgpack.packb({"id": "p1", "method": "publish",
+                                     "data": {"topic": "/servo/pos", "payload": {3: 90, 4: 45}}}))
+        frames = [msgpack.unpackb(mp.receive_bytes(), strict_map_key=False) for _ in range(2)]
+    msg = next(f for f in frames if f["method"] == "message")
+    assert msg["payload"] == {3: 90, 4: 45}
+
+
+def test_unknown_codec_falls_back_to_json(client, bus):
+    with client.websocket_connect(f"/v1/ws?token={_token()}&codec=cbor") as ws:
+        _subscribe(ws, "/t")
+
+
+def test_batch_frame_publishes_each_inner_frame_and_acks_once(client, bus):
+    with client.websocket_connect(f"/v1/ws?token={_token()}") as ws:
+        _subscribe(ws, "/servo/+/position")
+        ws.send_json({"id": "b1", "method": "batch", "data": {"frames": [
+            {"id": "p1", "method": "publish", "data": {"topic": "/servo/a/position", "payload": 10}},
+            {"id": "p2", "method": "subscribe", "data": {"topic": "/nope"}},
+            {"id": "p3", "method": "publish", "data": {"topic": "/servo/b/position", "payload": 20}},
+        ]}})
+        got = [ws.receive_json() for _ in range(3)]
+    deliveries = [f for f in got if f["method"] == "message"]
+    ack = next(f for f in got if f["method"] == "ack")
+    assert [(d["topic"], d["payload"]) for d in deliveries] == [
+        ("/servo/a/position", 10), ("/servo/b/position", 20),
+    ]
+    assert ack == {"method": "ack", "id": "b1", "delivered": [1, None, 1]}
+
+
+def test_batch_frame_without_frames_is_an_error(client, bus):
+    with client.websocket_connect(f"/v1/ws?token={_token()}") as ws:
+        ws.send_json({"id": "b2", "method": "batch", "data": {}})
+        assert ws.receive_json() == {"method": "error", "id": "b2", "error": "missing_frames"}
+
+
+def test_subscribe_backfill_replays_stored_log_lines_before_live(client, bus, tmp_path):
+    from robotlab_x.runtime import service_logs
+
+    service_logs.configure(tmp_path)
+    try:
+        service_logs.append("svc-1", [{"stream": "stdout", "line": f"l{i}", "ts": float(i)} for i in range(5)])
+        with client.websocket_connect(f"/v1/ws?token={_token()}") as ws:
+            ws.send_json({"id": "s1", "method": "subscribe",
+                          "data": {"topic": "/service_proxy/+/log", "backfill": 2}})
+            frames = [ws.receive_json(), ws.receive_json()]
+            bus.publish_sync("/service_proxy/svc-1/log", {"line": "live", "seq": 6})
+            live = ws.receive_json()
+        ack, = [f for f in frames if f["method"] == "ack"]
+        replay, = [f for f in frames if f["method"] == "message"]
+        assert ack["subscribed"] is True
+        assert replay["topic"] == "/service_proxy/svc-1/log" and replay["payload"]["backfill"]
+        assert [l["line"] for l in replay["payload"]["lines"]] == ["l3", "l4"]
+        assert live["payload"]["line"] == "live"
+    finally:
+        service_logs.configure(None)
+
+
+def test_backfill_is_read_off_the_loop_and_closes_the_gap_to_attach(client, bus, tmp_path, monkeypatch):
+    import asyncio
+
+    from robotlab_x.runtime import service_logs
+
+    real = service_logs.backfill
+
+    def reading(topic, limit):
+        with pytest.raises(RuntimeError):
+            asyncio.get_running_loop()
+        out = real(topic, limit)
+        # A line logged after the read, before the subscriber attached.
+        service_logs.append("svc-1", [{"stream": "stdout", "line": "late", "ts": 9.0}])
+        return out
+
+    monkeypatch.setattr(service_logs, "backfill", reading)
+    service_logs.configure(tmp_path)
+    try:
+        service_logs.append("svc-1", [{"stream": "stdout", "line": f"l{i}", "ts": float(i)} for i in range(3)])
+        with client.websocket_connect(f"/v1/ws?token={_token()}") as ws:
+            ws.send_json({"id": "s1", "method": "subscribe",
+                          "data": {"topic": "/service_proxy/svc-1/log", "backfill": 2}})
+            frames = [ws.receive_json() for _ in range(3)]
+        replays = [f["payload"]["lines"] for f in frames if f["method"] == "message"]
+        assert [[l["line"] for l in lines] for lines in replays] == [["l1", "l2"], ["late"]]
+    finally:
+        service_logs.configure(None)
+
+
+def _subscribe_with(ws, topic: str, **options) -> None:
+    ws.send_json({"id": "s1", "method": "subscribe", "data": {"topic": topic, **options}})
+    assert ws.receive_json()["subscribed"] is True
+
+
+def test_max_hz_decimates_per_topic(client, bus):
+    with client.websocket_connect(f"/v1/ws?token={_token()}") as ws:
+        _subscribe_with(ws, "/joy/+/input", max_hz=2)
+        _subscribe(ws, "/marker")
+        for i in range(5):
+            bus.publish_sync("/joy/js1/input", {"i": i})
+            bus.publish_sync("/joy/js2/input", {"i": i})
+        bus.publish_sync("/marker", "end")
+        got = [(f["topic"], f["payload"]) for f in (ws.receive_json() for _ in range(3))]
+    assert got == [("/joy/js1/input", {"i": 0}), ("/joy/js2/input", {"i": 0}), ("/marker", "end")]
+
+
+def test_latest_only_sends_newest_after_interval(client, bus):
+    with client.websocket_connect(f"/v1/ws?token={_token()}") as ws:
+        _subscribe_with(ws, "/arm/pose", max_hz=4, latest_only=True)
+        for i in range(4):
+            bus.publish_sync("/arm/pose", {"i": i})
+        first, last = ws.receive_json(), ws.receive_json()
+    assert first["payload"] == {"i": 0} and last["payload"] == {"i": 3}
+
+
+def test_fields_project_payload_for_this_connection_only(client, bus):
+    url = f"/v1/ws?token={_token()}"
+    with client.websocket_connect(url) as slim, client.websocket_connect(url) as full:
+        _subscribe_with(slim, "/state", fields=["a", "b.c"])
+        _subscribe(full, "/state")
+        payload = {"a": 1, "b": {"c": 2, "d": 3}, "e": 4}
+        bus.publish_sync("/state", payload)
+        assert slim.receive_json()["payload"] == {"a": 1, "b": {"c": 2}}
+        assert full.receive_json()["payload"] == payload
+        # Re-subscribing without options lifts the projection.
+        _subscribe(slim, "/state")
+        bus.publish_sync("/state", payload)
+        assert slim.receive_json()["payload"] == payload
+
+
+def test_message_matching_several_subscriptions_is_sent_once(client, bus):
+    with client.websocket_connect(f"/v1/ws?token={_token()}") as ws:
+        _subscribe(ws, "/arm/+")
+        _subscribe(ws, "/+/pose")
+        _subscribe(ws, "/marker")
+        bus.publish_sync("/arm/pose", {"x": 1})
+        bus.publish_sync("/marker", "end")
+        frames = [ws.receive_json(), ws.receive_json()]
+        assert [f["topic"] for f in frames] == ["/arm/pose", "/marker"]
+        # A retained value just sent still replays to a pattern added later.
+        bus.publish_sync("/arm/grip", {"open": True}, retained=True)
+        assert ws.receive_json()["topic"] == "/arm/grip"
+        ws.send_json({"id": "s2", "method": "subscribe", "data": {"topic": "/+/grip"}})
+        frames = [ws.receive_json(), ws.receive_json()]
+        assert sorted(f["method"] for f in frames) == ["ack", "message"]
+        assert next(f for f in frames if f["method"] == "message")["topic"] == "/arm/grip"
+
+
+def test_overlapping_projected_and_unprojected_subscriptions_each_get_their_payload(client, bus):
+    with client.websocket_connect(f"/v1/ws?token={_token()}") as ws:
+        _subscribe_with(ws, "/arm/+", fields=["x"])
+        _subscribe(ws, "/+/pose")
+        _subscribe(ws, "/arm/#")
+        _subscribe(ws, "/marker")
+        bus.publish_sync("/arm/pose", {"x": 1, "y": 2})
+        bus.publish_sync("/marker", "end")
+        got = [f["payload"] for f in (ws.receive_json() for _ in range(3))]
+    assert sorted(got[:2], key=len) == [{"x": 1}, {"x": 1, "y": 2}]
+    assert got[2] == "end"
@@ -2619,16 +2619,23 @@ function InspectorPanel({ proxy, busy, onAction, install, onRetryInstall, onDism
   useEffect(() => {
     if (!proxyId) return
     setLogTail([])
+    // Stored tail first (so an errored proxy shows why), then live; seq
+    // drops lines replayed again on reconnect.
+    let lastSeq = 0
     const off = wsClient.subscribe(`/service_proxy/${proxyId}/log`, (f: InboundFrame) => {
       if (f.method !== 'message') return
-      const p = f.payload as { line?: string; stream?: string } | undefined
-      if (!p?.line) return
-      const prefix = p.stream === 'stderr' ? '! ' : '  '
+      type Line = { line?: string; stream?: string; seq?: number }
+      const p = f.payload as (Line & { lines?: Line[] }) | undefined
+      if (!p) return
+      const fresh = (p.lines ?? [p]).filter((l) => l.line && !(typeof l.seq === 'number' && l.seq <= lastSeq))
+      for (const l of fresh) if (typeof l.seq === 'number') lastSeq = l.seq
+      const tail = fresh.map((l) => (l.stream === 'stderr' ? '! ' : '  ') + l.line)
+      if (!tail.length) return
       setLogTail((prev) => {
-        const next = prev.concat([prefix + p.line])
+        const next = prev.concat(tail)
         return next.length > 30 ? next.slice(-30) : next
       })
-    })
+    }, { backfill: 30 })
     return off
   }, [proxyId, wsClient])
 
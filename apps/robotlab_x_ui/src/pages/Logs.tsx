@@ -8,8 +8,9 @@ import { wsClient, type InboundFrame } from '../runtime/wsClient'
  *
  * The bus already publishes per-service log lines on
  *     /service_proxy/{id}/log
- * for every service (subprocess stdout/stderr → process_manager pumps;
- * in-process services → framework's emit_log()). This page subscribes
+ * for every service (subprocess stdout/stderr → process_manager's
+ * io_supervisor, batched per tick; in-process services → framework's
+ * emit_log()). This page subscribes
  * via the wildcard `/service_proxy/+/log` so a single view aggregates
  * every service's log stream with no per-service plumbing.
  *
@@ -18,10 +19,17 @@ import { wsClient, type InboundFrame } from '../runtime/wsClient'
  * don't currently emit structured levels.
  */
 
-interface LogPayload {
+interface LogLine {
   stream?: 'stdout' | 'stderr'
   line?: string
   ts?: number  // seconds since epoch
+  seq?: number // per-service sequence number (runtime/service_logs.py)
+}
+
+// Subprocess logs arrive batched: `lines` holds the batch, the top-level
+// fields a joined single-line view of it for older consumers.
+interface LogPayload extends LogLine {
+  lines?: LogLine[]
 }
 
 interface LogEntry {
@@ -30,11 +38,13 @@ interface LogEntry {
   stream: 'stdout' | 'stderr'
   line: string
   level: LogLevel  // derived
+  seq?: number     // service lines only
 }
 
 type LogLevel = 'error' | 'warn' | 'info' | 'debug'
 
 const MAX_HISTORY = 2000  // ring buffer cap
+const BACKFILL_LINES = 200  // stored lines replayed per service on subscribe
 
 // stderr defaults to error; otherwise classic level keywords win.
 function deriveLevel(line: string, stream: 'stdout' | 'stderr'): LogLevel {
@@ -100,7 +110,7 @@ function mapRuntime(d: RuntimeLog): LogEntry {
   }
 }
 
-const keyOf = (e: LogEntry) => `${e.ts}|${e.serviceId}|${e.line}`
+const keyOf = (e: LogEntry) => `${e.ts}|${e.serviceId}|${e.seq ?? e.line}`
 
 function mergeEntries(prev: LogEntry[], incoming: LogEntry[]): LogEntry[] {
   if (!incoming.length) return prev
@@ -125,27 +135,37 @@ export default function Logs() {
   const pausedRef = useRef(paused); pausedRef.current = paused
 
   // Subscribe to the wildcard log topic. One subscription, every service.
+  // The server replays each service's stored tail first (on every
+  // reconnect too); `seq` drops lines already shown across that seam.
   useEffect(() => {
+    const lastSeq = new Map<string, number>()
     const off = wsClient.subscribe('/service_proxy/+/log', (f: InboundFrame) => {
       if (f.method !== 'message') return
       if (pausedRef.current) return
       const topic = f.topic ?? ''
       const payload = f.payload as LogPayload | undefined
-      if (!payload || !payload.line) return
-      const stream: 'stdout' | 'stderr' = payload.stream === 'stderr' ? 'stderr' : 'stdout'
-      const tsMs = typeof payload.ts === 'number' ? payload.ts * 1000 : Date.now()
-      const entry: LogEntry = {
-        serviceId: extractServiceId(topic),
-        ts: tsMs,
-        stream,
-        line: payload.line,
-        level: deriveLevel(payload.line, stream),
+      if (!payload) return
+      const serviceId = extractServiceId(topic)
+      const batch: LogEntry[] = []
+      for (const l of payload.lines ?? [payload]) {
+        if (!l.line) continue
+        if (typeof l.seq === 'number') {
+          if (l.seq <= (lastSeq.get(serviceId) ?? 0)) continue
+          lastSeq.set(serviceId, l.seq)
+        }
+        const stream: 'stdout' | 'stderr' = l.stream === 'stderr' ? 'stderr' : 'stdout'
+        batch.push({
+          serviceId,
+          ts: typeof l.ts === 'number' ? l.ts * 1000 : Date.now(),
+          stream,
+          line: l.line,
+          level: deriveLevel(l.line, stream),
+          seq: l.seq,
+        })
       }
-      setEntries((prev) => {
-        const next = prev.concat([entry])
-        return next.length > MAX_HISTORY ? next.slice(-MAX_HISTORY) : next
-      })
-    })
+      if (!batch.length) return
+      setEntries((prev) => mergeEntries(prev, batch))
+    }, { backfill: BACKFILL_LINES })
     return off
   }, [])
 
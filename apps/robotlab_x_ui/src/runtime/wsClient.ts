@@ -52,6 +52,16 @@ function topicMatchesPattern(topic: string, pattern: string): boolean {
   return pSegs.length === tSegs.length
 }
 
+function subscribeData(sub: SubscriptionRecord): Record<string, unknown> {
+  const data: Record<string, unknown> = { topic: sub.topic }
+  const opts = sub.opts
+  if (opts?.backfill) data.backfill = opts.backfill
+  if (opts?.maxHz) data.max_hz = opts.maxHz
+  if (opts?.latestOnly) data.latest_only = true
+  if (opts?.fields?.length) data.fields = opts.fields
+  return data
+}
+
 interface SubscriptionRecord {
   topic: string
   handlers: Set<TopicHandler>
@@ -62,6 +72,23 @@ interface SubscriptionRecord {
   // without this guarantee, a fast responder (e.g. an instant in-process
   // method) can answer before the pump exists and the reply drops.
   readyResolvers: Array<() => void>
+  // Options sent with every (re)subscribe frame — those of the first
+  // handler on the topic.
+  opts?: SubscribeOptions
+}
+
+export interface SubscribeOptions {
+  // Stored log lines the server replays ahead of live messages —
+  // /service_proxy/{id|+}/log only. Handlers dedupe by each line's `seq`.
+  backfill?: number
+  // Server-side delivery limits for this subscription: at most `maxHz`
+  // messages per second per topic (`latestOnly` sends the newest at the
+  // end of each interval instead of dropping it), and only the listed
+  // payload `fields`. On a `topic@peer` address the remote runtime
+  // enforces them, so the peer link carries only what's asked for.
+  maxHz?: number
+  latestOnly?: boolean
+  fields?: string[]
 }
 
 // Pending one-shot request → response correlation. Resolved by frame id
@@ -281,7 +308,7 @@ class WsClient {
       this.setState('connected')
       // Re-subscribe every active topic.
       for (const sub of this.subscriptions.values()) {
-        this.send({ id: this.frameId(), method: 'subscribe', data: { topic: sub.topic } })
+        this.send({ id: this.frameId(), method: 'subscribe', data: subscribeData(sub) })
         sub.ackPending = true
       }
       // Flush any frames queued while disconnected.
@@ -385,16 +412,16 @@ class WsClient {
     this.setState('disconnected')
   }
 
-  subscribe(topic: string, handler: TopicHandler): () => void {
+  subscribe(topic: string, handler: TopicHandler, opts?: SubscribeOptions): () => void {
     let sub = this.subscriptions.get(topic)
     const first = !sub
     if (!sub) {
-      sub = { topic, handlers: new Set(), ackPending: false, readyResolvers: [] }
+      sub = { topic, handlers: new Set(), ackPending: false, readyResolvers: [], opts }
       this.subscriptions.set(topic, sub)
     }
     sub.handlers.add(handler)
     if (first && this.socket?.readyState === WebSocket.OPEN) {
-      this.send({ id: this.frameId(), method: 'subscribe', data: { topic } })
+      this.send({ id: this.frameId(), method: 'subscribe', data: subscribeData(sub) })
       sub.ackPending = true
     } else if (first) {
       // Will subscribe automatically on (re)connect.
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""Benchmark: TinyDB reads with and without the CachingDatabase wrapper.
+
+Mirrors the runtime's hot pattern — a ``service_proxy``-shaped table of
+a few dozen rows read with ``get_all_items`` (reconciler tick),
+``get_item`` and ``query_items`` (lifecycle / link handlers) — once
+against the bare TinyDB adapter and once through ``CachingDatabase``.
+
+Usage:
+    python scripts/bench_caching.py [--rows 40] [--iters 2000]
+
+Runs against a temp directory; nothing outside it is touched.
+"""
+from __future__ import annotations
+
+import argparse
+import shutil
+import tempfile
+import time
+
+from database.caching_database import CachingDatabase
+from database.tinydb import TinyDBDatabase
+from models.database_tinydb_config import DatabaseTinydbConfig
+
+
+def _row(i: int) -> dict:
+    return {
+        "name": f"svc-{i}", "type": "servo", "version": "1.0.0", "status": "running",
+        "pid": 1000 + i, "host": "127.0.0.1", "port": 9000 + i, "workspace_id": "ws-1",
+        "service_meta_id": "servo@1.0.0", "error": None,
+        "config": {"pin": i, "min": 0, "max": 180, "speed": None, "labels": ["arm", "left"]},
+    }
+
+
+def _bench(db, rows: int, iters: int) -> dict:
+    ops = {
+        "get_all_items": lambda i: db.get_all_items("service_proxy"),
+        "get_item": lambda i: db.get_item("service_proxy", f"svc-{i % rows}"),
+        "query_items": lambda i: db.query_items("service_proxy", {"name": f"svc-{i % rows}"}),
+    }
+    out = {}
+    for name, op in ops.items():
+        start = time.perf_counter()
+        for i in range(iters):
+            op(i)
+        out[name] = iters / (time.perf_counter() - start)
+    return out
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--rows", type=int, default=40)
+    ap.add_argument("--iters", type=int, default=2000)
+    args = ap.parse_args()
+
+    temp_dir = tempfile.mkdtemp()
+    try:
+        backend = TinyDBDatabase(DatabaseTinydbConfig(data_dir=temp_dir))
+        for i in range(args.rows):
+            backend.insert_item("service_proxy", f"svc-{i}", _row(i))
+        before = _bench(backend, args.rows, args.iters)
+        cached = CachingDatabase(backend, ["service_proxy"])
+        after = _bench(cached, args.rows, args.iters)
+    finally:
+        shutil.rmtree(temp_dir)
+
+    print(f"{'op':<14} {'tinydb ops/s':>13} {'cached ops/s':>13} {'speedup':>8}")
+    for name in before:
+        print(f"{name:<14} {before[name]:>13.0f} {after[name]:>13.0f} {after[name] / before[name]:>7.1f}x")
+    print(f"cache: {cached.stats()['hits']} hits, {cached.stats()['misses']} misses")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""Benchmark: SqliteDatabase ops/sec, per-call vs. thread-local connections.
+
+Mirrors the hot runtime pattern — a ``service_proxy``-shaped table of a
+few dozen rows hammered with ``get_item`` / ``get_all_items`` /
+``upsert_item`` — once with ``connection_mode="per_call"`` (a fresh
+connection per operation, the previous behaviour minus the PRAGMA per
+read) and once with the default ``thread_local`` + WAL.
+
+Usage:
+    python scripts/bench_sqlite.py [--rows 50] [--iters 2000]
+
+Runs against a temp file; nothing outside it is touched.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+from typing import Optional
+
+from pydantic import BaseModel
+
+from database.sqlite_database import SqliteDatabase
+from models.database_sqlite_config import DatabaseSqliteConfig
+
+
+class ServiceProxyRow(BaseModel):
+    id: str
+    name: Optional[str] = None
+    type: Optional[str] = None
+    workspace_id: Optional[str] = None
+    status: Optional[str] = None
+
+
+def _bench(mode: str, rows: int, iters: int) -> dict:
+    temp_dir = tempfile.mkdtemp()
+    SqliteDatabase._instance = None
+    try:
+        db = SqliteDatabase(DatabaseSqliteConfig(
+            sqlite_path=os.path.join(temp_dir, "bench.sqlite3"), connection_mode=mode,
+        ))
+        db.ensure_table(ServiceProxyRow, table_name="service_proxy")
+        for i in range(rows):
+            db.upsert_item("service_proxy", f"svc-{i}", {
+                "name": f"svc-{i}", "type": "servo", "workspace_id": "ws-1", "status": "running",
+            })
+        out = {}
+        ops = {
+            "get_item": lambda i: db.get_item("service_proxy", f"svc-{i % rows}"),
+            "get_all_items": lambda i: db.get_all_items("service_proxy"),
+            "upsert_item": lambda i: db.upsert_item("service_proxy", f"svc-{i % rows}", {
+                "name": f"svc-{i % rows}", "type": "servo", "workspace_id": "ws-1", "status": "running",
+            }),
+        }
+        for name, op in ops.items():
+            start = time.perf_counter()
+            for i in range(iters):
+                op(i)
+            out[name] = iters / (time.perf_counter() - start)
+        db.close()
+        return out
+    finally:
+        SqliteDatabase._instance = None
+        shutil.rmtree(temp_dir)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--rows", type=int, default=50)
+    ap.add_argument("--iters", type=int, default=2000)
+    args = ap.parse_args()
+
+    before = _bench("per_call", args.rows, args.iters)
+    after = _bench("thread_local", args.rows, args.iters)
+    print(f"{'op':<14} {'per_call ops/s':>15} {'thread_local ops/s':>19} {'speedup':>8}")
+    for name in before:
+        print(f"{name:<14} {before[name]:>15.0f} {after[name]:>19.0f} {after[name] / before[name]:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
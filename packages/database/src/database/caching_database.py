@@ -0,0 +1,335 @@
+import copy
+import logging
+import pickle
+import re
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Union
+
+from pydantic import BaseModel
+
+from .interface import DatabaseAdapter
+
+logger = logging.getLogger(__name__)
+
+
+_ATOMIC = frozenset((str, int, float, bool, type(None), bytes))
+
+
+def _copy(value: Any) -> Any:
+    """Deep copy for JSON-shaped rows. Several times faster than
+    ``copy.deepcopy`` (no memo, no reduce protocol, no call per leaf) —
+    which matters, as it runs on every read."""
+    if isinstance(value, dict):
+        return {k: v if type(v) in _ATOMIC else _copy(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [v if type(v) in _ATOMIC else _copy(v) for v in value]
+    if type(value) in _ATOMIC:
+        return value
+    return copy.deepcopy(value)
+
+
+class _TableCache:
+    __slots__ = ("rows", "snapshot", "loaded_at", "generation")
+
+    def __init__(self) -> None:
+        self.rows: Optional[Dict[str, dict]] = None  # None = not loaded
+        # Pickled list of every row, rebuilt lazily after a write.
+        # get_all_items is the hot read and pickle.loads is the cheapest
+        # way to hand out a private copy of a whole table.
+        self.snapshot: Optional[bytes] = None
+        self.loaded_at = 0.0
+        # Bumped by every write and invalidation; a load that started
+        # before a bump is discarded instead of installed, so a slow
+        # full-table read can't overwrite a newer write-through row.
+        self.generation = 0
+
+
+class CachingDatabase(DatabaseAdapter):
+    """Write-through in-memory table cache in front of another adapter.
+
+    Opted-in tables are read from the wrapped adapter once, in full, and
+    served from memory afterwards: ``get_all_items``, ``get_item``,
+    ``query_items`` and ``search_by_key_part`` on a loaded table never
+    touch the backend (except ``query_items`` with a dotted ``a.b``
+    key, whose meaning is the backend's own). Writes go to the backend first; the written row
+    is then re-read with ``get_item`` (adapters disagree on merge vs.
+    replace semantics, so the backend's answer is the truth) and
+    replaces the cached copy. ``delete_item`` drops it.
+
+    ``tables`` is either an iterable of table names sharing ``ttl_s``, or
+    a mapping ``{table: ttl_s}`` for per-table expiry. A TTL of None
+    keeps a table until it is invalidated — fine when this process is
+    the table's only writer. A TTL of 0 (or less) means "always re-read":
+    that table is not cached. Tables not listed pass straight through.
+
+    Rows are deep-copied on the way in and out, so callers may mutate
+    what they get back. ``query()``, ``copy_table``, ``insert_columns``,
+    ``ensure_table`` and the ``upsert_many``/``delete_many`` batches
+    bypass row tracking and invalidate instead.
+    ``stats()`` reports hit/miss counters per table.
+    """
+
+    def __init__(
+        self,
+        inner: DatabaseAdapter,
+        tables: Union[Iterable[str], Mapping[str, Optional[float]]],
+        ttl_s: Optional[float] = None,
+    ):
+        self.inner = inner
+        if isinstance(tables, Mapping):
+            ttls: Dict[str, Optional[float]] = dict(tables)
+        else:
+            ttls = {table: ttl_s for table in tables}
+        self._ttl = {table: ttl for table, ttl in ttls.items() if ttl is None or ttl > 0}
+        self._tables: Dict[str, _TableCache] = {table: _TableCache() for table in self._ttl}
+        self._counters: Dict[str, Dict[str, int]] = {
+            table: {"hits": 0, "misses": 0, "loads": 0} for table in self._ttl
+        }
+        self._lock = threading.RLock()
+        # Serialises backend write + row refresh on cached tables, so two
+        # racing writers can't install their re-reads out of order. Also
+        # held for a whole transaction() (re-entrant for the writes inside
+        # it), ahead of any lock the backend's transaction takes, so the
+        # two are always acquired in the same order.
+        self._write_lock = threading.RLock()
+        logger.info(f"CachingDatabase over {type(inner).__name__} caching tables: {sorted(self._ttl)}")
+
+    def __getattr__(self, name: str) -> Any:
+        # Adapter-specific extras (close, _get_connection, ...) pass through.
+        if name == "inner":
+            raise AttributeError(name)
+        return getattr(self.inner, name)
+
+    # cache bookkeeping
+
+    def cached_tables(self) -> List[str]:
+        return sorted(self._ttl)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss/load counters per cached table plus totals."""
+        with self._lock:
+            tables = {
+                table: dict(counters, rows=len(self._tables[table].rows or ()), loaded=self._tables[table].rows is not None)
+                for table, counters in self._counters.items()
+            }
+        hits = sum(t["hits"] for t in tables.values())
+        misses = sum(t["misses"] for t in tables.values())
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": hits / (hits + misses) if hits + misses else 0.0,
+            "tables": tables,
+        }
+
+    def invalidate(self, table: Optional[str] = None) -> None:
+        """Forget a cached table (all of them when ``table`` is None); the
+        next read reloads from the backend."""
+        with self._lock:
+            for name in ([table] if table is not None else list(self._tables)):
+                entry = self._tables.get(name)
+                if entry is not None:
+                    entry.rows = None
+                    entry.snapshot = None
+                    entry.generation += 1
+
+    def _rows(self, table: str) -> Optional[Dict[str, dict]]:
+        """The cached rows of ``table`` keyed by id, loading them on a
+        miss; None when the table isn't cached (or can't be)."""
+        entry = self._tables.get(table)
+        if entry is None:
+            return None
+        with self._lock:
+            rows = entry.rows
+            ttl = self._ttl[table]
+            if rows is not None and (ttl is None or time.monotonic() - entry.loaded_at < ttl):
+                self._counters[table]["hits"] += 1
+                return rows
+            self._counters[table]["misses"] += 1
+            generation = entry.generation
+        items = self.inner.get_all_items(table)
+        loaded: Dict[str, dict] = {}
+        for item in items:
+            key = item.get("id") if isinstance(item, dict) else None
+            if key is None:
+                # No way to address the row for write-through; serve
+                # this table uncached rather than risk stale rows.
+                logger.warning(f"CachingDatabase: row without 'id' in {table}; serving it uncached")
+                return None
+            loaded[str(key)] = _copy(item)
+        with self._lock:
+            self._counters[table]["loads"] += 1
+            if entry.generation == generation:
+                entry.rows = loaded
+                entry.loaded_at = time.monotonic()
+        return loaded
+
+    def _refresh_row(self, table: str, key: str) -> None:
+        entry = self._tables[table]
+        row = self.inner.get_item(table, key)
+        with self._lock:
+            entry.generation += 1
+            entry.snapshot = None
+            if entry.rows is not None:
+                if row:
+                    entry.rows[str(key)] = _copy(row)
+                else:
+                    entry.rows.pop(str(key), None)
+
+    def _drop_row(self, table: str, key: str) -> None:
+        entry = self._tables[table]
+        with self._lock:
+            entry.generation += 1
+            entry.snapshot = None
+            if entry.rows is not None:
+                entry.rows.pop(str(key), None)
+
+    # reads
+
+    def get_item(self, table: str, key: str) -> dict:
+        rows = self._rows(table)
+        if rows is None:
+            return self.inner.get_item(table, key)
+        row = rows.get(str(key))
+        return _copy(row) if row is not None else {}
+
+    def get_all_items(self, table: str) -> list:
+        rows = self._rows(table)
+        if rows is None:
+            return self.inner.get_all_items(table)
+        entry = self._tables[table]
+        with self._lock:
+            snapshot = entry.snapshot if entry.rows is rows else None
+            if snapshot is None:
+                snapshot = pickle.dumps(list(rows.values()), protocol=pickle.HIGHEST_PROTOCOL)
+                if entry.rows is rows:
+                    entry.snapshot = snapshot
+        return pickle.loads(snapshot)
+
+    def query_items(self, table_name: str, criteria: dict) -> list:
+        # Adapters disagree on dotted keys (sqlite and mongo descend into
+        # nested dicts, tinydb and filesystem match the literal key), so
+        # those queries get whatever the backend itself would answer.
+        if any("." in key for key in criteria):
+            return self.inner.query_items(table_name, criteria)
+        rows = self._rows(table_name)
+        if rows is None:
+            return self.inner.query_items(table_name, criteria)
+        return _copy([
+            row for row in list(rows.values())
+            if all(row.get(k) == v for k, v in criteria.items())
+        ])
+
+    def search_by_key_part(self, table: str, key_part: str, regex: bool = False) -> List[Dict[str, Any]]:
+        rows = self._rows(table)
+        if rows is None:
+            return self.inner.search_by_key_part(table, key_part, regex)
+        if regex:
+            pattern = re.compile(key_part)
+            matches = [row for key, row in list(rows.items()) if pattern.search(key)]
+        else:
+            matches = [row for key, row in list(rows.items()) if key.startswith(key_part)]
+        return _copy(matches)
+
+    def get_binary_item(self, table: str, key: str) -> bytes:
+        return self.inner.get_binary_item(table, key)
+
+    # writes — backend first, then the cached row
+
+    def upsert_item(self, table: str, key: str, item: dict) -> dict:
+        if table not in self._tables:
+            return self.inner.upsert_item(table, key, item)
+        with self._write_lock:
+            result = self.inner.upsert_item(table, key, item)
+            self._refresh_row(table, key)
+        return result
+
+    def insert_item(self, table: str, key: str, item: dict) -> dict:
+        if table not in self._tables:
+            return self.inner.insert_item(table, key, item)
+        with self._write_lock:
+            result = self.inner.insert_item(table, key, item)
+            self._refresh_row(table, key)
+        return result
+
+    def update_item(self, table: str, key: str, updates: dict, include_nulls: bool = False) -> dict:
+        if table not in self._tables:
+            return self.inner.update_item(table, key, updates, include_nulls=include_nulls)
+        with self._write_lock:
+            result = self.inner.update_item(table, key, updates, include_nulls=include_nulls)
+            self._refresh_row(table, key)
+        return result
+
+    def delete_item(self, table: str, key: str) -> None:
+        if table not in self._tables:
+            return self.inner.delete_item(table, key)
+        with self._write_lock:
+            self.inner.delete_item(table, key)
+            self._drop_row(table, key)
+
+    # bulk / schema — can touch any row, so invalidate
+
+    def upsert_many(self, table: str, items: Mapping[str, dict]) -> List[dict]:
+        if table not in self._tables:
+            return self.inner.upsert_many(table, items)
+        with self._write_lock:
+            try:
+                return self.inner.upsert_many(table, items)
+            finally:
+                self.invalidate(table)
+
+    def delete_many(self, table: str, keys: Iterable[str]) -> None:
+        if table not in self._tables:
+            return self.inner.delete_many(table, keys)
+        with self._write_lock:
+            try:
+                self.inner.delete_many(table, keys)
+            finally:
+                self.invalidate(table)
+
+    @contextmanager
+    def transaction(self) -> Iterator["CachingDatabase"]:
+        """The wrapped adapter's transaction, holding this cache's write
+        lock for the block. Write-through inside the block may cache rows
+        the backend then rolls back, so a failed block invalidates every
+        table."""
+        with self._write_lock:
+            try:
+                with self.inner.transaction():
+                    yield self
+            except BaseException:
+                self.invalidate()
+                raise
+
+    def copy_table(self, source_table: str, dest_table: str) -> None:
+        self.inner.copy_table(source_table, dest_table)
+        self.invalidate(dest_table)
+
+    def query(self, querystr: str) -> list:
+        try:
+            return self.inner.query(querystr)
+        finally:
+            self.invalidate()
+
+    def insert_columns(
+        self,
+        table: str,
+        columns: List[str],
+        values: List[Any],
+        conflict_strategy: str = "IGNORE"
+    ) -> None:
+        self.inner.insert_columns(table, columns, values, conflict_strategy)
+        self.invalidate(table)
+
+    def ensure_table(
+        self,
+        model: type[BaseModel],
+        table_name: str = None,
+        indexes: Optional[Sequence[Union[str, Sequence[str]]]] = None
+    ) -> None:
+        self.inner.ensure_table(model, table_name=table_name, indexes=indexes)
+        self.invalidate(table_name)
+
+    def list_tables(self) -> List[str]:
+        return self.inner.list_tables()
@@ -1,4 +1,4 @@
-from typing import Dict, Optional, List, Any
+from typing import Dict, Optional, List, Any, Sequence, Union
 import boto3
 import logging
 from botocore.exceptions import BotoCoreError, ClientError
@@ -231,7 +231,8 @@ class DynamoDBDatabase(DatabaseAdapter):
     def ensure_table(
         self,
         model: type[BaseModel],
-        table_name: str = None
+        table_name: str = None,
+        indexes: Optional[Sequence[Union[str, Sequence[str]]]] = None
     ) -> None:
         """
         Ensure that a DynamoDB table exists for the given Pydantic model.
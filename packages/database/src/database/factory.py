@@ -3,8 +3,9 @@ from typing import Dict
 from typing import Dict, Optional
 from .interface import DatabaseAdapter
 from .interface import DatabaseAdapter
-from typing import Callable, Dict
+from typing import Callable, Dict, Iterable, Mapping, Optional, Union
 from database.interface import DatabaseAdapter
+from database.caching_database import CachingDatabase
 from database.tinydb import TinyDBDatabase
 from database.dynamodb_database import DynamoDBDatabase
 from database.filesystem_database import FilesystemDatabase
@@ -23,7 +24,22 @@ from models.database_postgres_config import DatabasePostgresConfig
 # Singleton registry for database adapters
 _clients: Dict[str, DatabaseAdapter] = {}
 
-def create_database_client(cfg) -> None:
+CacheTables = Union[Iterable[str], Mapping[str, Optional[float]]]
+
+
+def _with_cache(client: DatabaseAdapter, cache_tables: Optional[CacheTables], cache_ttl_s: Optional[float]) -> DatabaseAdapter:
+    """Wrap ``client`` in a write-through ``CachingDatabase`` when any
+    tables opt in (see CachingDatabase for the ``cache_tables`` forms)."""
+    if client is None or not cache_tables:
+        return client
+    return CachingDatabase(client, cache_tables, ttl_s=cache_ttl_s)
+
+
+def create_database_client(
+    cfg,
+    cache_tables: Optional[CacheTables] = None,
+    cache_ttl_s: Optional[float] = None,
+) -> None:
     name = getattr(cfg, "name", None)
     if name is None:
         raise ValueError("Config must provide a name or id")
@@ -47,7 +63,7 @@ def create_database_client(cfg) -> None:
         client = PostgresDatabase(config=cfg)
     else:
         raise ValueError(f"Unsupported database config type: {type(cfg)}")
-    _clients[name] = client
+    _clients[name] = _with_cache(client, cache_tables, cache_ttl_s)
     return None
 
 def get_database_client(name: str = "default") -> Optional[DatabaseAdapter]:
@@ -57,7 +73,15 @@ def get_database_client(name: str = "default") -> Optional[DatabaseAdapter]:
 # DATABASE_TYPES = ["dynamodb", "tinydb", "s3", "filesystem", "sqlite", "mongodb"]
 # DATABASE_DIR
 
-def get_database(config_provider: Callable[[], Dict[str, str]]) -> DatabaseAdapter:
+def get_database(
+    config_provider: Callable[[], Dict[str, str]],
+    cache_tables: Optional[CacheTables] = None,
+    cache_ttl_s: Optional[float] = None,
+) -> DatabaseAdapter:
+    return _with_cache(_get_database(config_provider), cache_tables, cache_ttl_s)
+
+
+def _get_database(config_provider: Callable[[], Dict[str, str]]) -> DatabaseAdapter:
     config = config_provider()
     # If config is a dict, use legacy dispatch
     if isinstance(config, dict):
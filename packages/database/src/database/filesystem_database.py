@@ -2,17 +2,99 @@ import os
 import json
 import logging
 import re
-from typing import Dict, List, Any, Union
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Iterator, List, Any, Mapping, Optional, Sequence, Tuple, Union
 from pydantic import BaseModel
 
 from .interface import DatabaseAdapter
 
+try:  # optional: several times faster row encode/decode when installed
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
 
 from models.database_filesystem_config import DatabaseFilesystemConfig
 
+# Marks a row deleted inside a transaction() until the commit.
+_DELETED = object()
+
+# Per-table index: <base_dir>/<table>/.index.json. Dotfiles in a table
+# directory (index, .table_metadata.json, in-flight .<key>.<rand>.tmp)
+# are never rows.
+INDEX_FILE = ".index.json"
+_INDEX_VERSION = 1
+# The index is written behind: at most this often on single writes, and
+# always on transaction commit / close(). Every entry is validated
+# against its file's stat on read, so a lost flush only costs re-reads.
+_INDEX_FLUSH_S = 2.0
+
+# (st_ino, st_mtime_ns, st_size) — replace-on-write gives every version
+# of a row file a new inode, so this changes on every write we make and
+# on any normal external edit.
+_Stamp = Tuple[int, int, int]
+
+
+def _dumps(item: Any) -> bytes:
+    if orjson is not None:
+        try:
+            return orjson.dumps(item)
+        except TypeError:  # e.g. int beyond 64 bits — json copes
+            pass
+    return json.dumps(item).encode("utf-8")
+
+
+def _loads(data: bytes) -> Any:
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except ValueError:  # e.g. NaN written by json.dump — json copes
+            pass
+    return json.loads(data)
+
+
+def _stamp(st: os.stat_result) -> _Stamp:
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+class _TableState:
+    """Index + read cache for one table directory."""
+
+    __slots__ = ("fields", "entries", "raw", "dirty", "flushed_at")
+
+    def __init__(self, fields: Tuple[str, ...] = ("id",)) -> None:
+        # Row fields copied into the index ("id" always, plus whatever
+        # ensure_table(indexes=...) asked for).
+        self.fields = fields
+        # key -> {"stamp": [ino, mtime_ns, size], "fields": {field: value}}
+        self.entries: Dict[str, dict] = {}
+        # key -> (stamp, file bytes): the in-memory read cache.
+        self.raw: Dict[str, Tuple[_Stamp, bytes]] = {}
+        self.dirty = False
+        self.flushed_at = 0.0
+
+
 class FilesystemDatabase(DatabaseAdapter):
+    """One JSON file per row at ``<base_dir>/<table>/<key>``.
+
+    Writes go to a fresh ``.<key>.<random>.tmp``, are fsynced and
+    ``os.replace``d into place, so a reader (or a crash) never sees half
+    a row and concurrent writers of one key never share a temp file (the
+    last replace wins). Each table keeps an
+    index file mapping key -> file stamp + a few row fields, and this
+    process keeps the bytes of every row it has read, keyed by the same
+    stamp. A read stats the table's files and only opens those whose
+    stamp changed; ``query_items`` on indexed fields and
+    ``search_by_key_part`` (``id`` is always indexed) open only the
+    matching files even with a cold cache. Rows are encoded with orjson
+    when it is installed.
+    """
+
     def __init__(self, config: DatabaseFilesystemConfig):
         """
         Initialize the FilesystemDatabase implementation with strongly typed DatabaseFilesystemConfig.
@@ -23,6 +105,10 @@ class FilesystemDatabase(DatabaseAdapter):
             self.base_dir = os.path.join("data", "filesystem_db")
         if not os.path.exists(self.base_dir):
             os.makedirs(self.base_dir, exist_ok=True)
+        # Per-thread transaction() state: {(table, key): row | _DELETED}.
+        self._local = threading.local()
+        self._tables: Dict[str, _TableState] = {}
+        self._lock = threading.RLock()
         logger.info(f"FilesystemDatabase initialized with base directory: {self.base_dir}")
 
     def _get_table_dir(self, table: str) -> str:
@@ -40,7 +126,238 @@ class FilesystemDatabase(DatabaseAdapter):
         """
         table_dir = self._get_table_dir(table)
         return os.path.join(table_dir, key) 
-    
+
+    # index + read cache
+
+    def _state(self, table: str) -> _TableState:
+        state = self._tables.get(table)
+        if state is not None:
+            return state
+        with self._lock:
+            state = self._tables.get(table)
+            if state is None:
+                state = self._tables[table] = self._load_index(table)
+            return state
+
+    def _load_index(self, table: str) -> _TableState:
+        path = os.path.join(self._get_table_dir(table), INDEX_FILE)
+        try:
+            with open(path, "rb") as f:
+                data = _loads(f.read())
+            if data.get("version") != _INDEX_VERSION:
+                raise ValueError(f"index version {data.get('version')!r}")
+            state = _TableState(tuple(data["fields"]))
+            state.entries = {
+                key: {"stamp": tuple(entry["stamp"]), "fields": entry["fields"]}
+                for key, entry in data["entries"].items()
+            }
+            return state
+        except FileNotFoundError:
+            return _TableState()
+        except Exception as e:  # noqa: BLE001 — the index is only a hint
+            logger.warning(f"Ignoring unreadable index for table '{table}': {e}")
+            return _TableState()
+
+    def _flush_index(self, table: str, force: bool = False) -> None:
+        with self._lock:
+            state = self._tables.get(table)
+            if state is None or not state.dirty:
+                return
+            if not force and time.monotonic() - state.flushed_at < _INDEX_FLUSH_S:
+                return
+            data = _dumps({
+                "version": _INDEX_VERSION,
+                "fields": list(state.fields),
+                "entries": {
+                    key: {"stamp": list(entry["stamp"]), "fields": entry["fields"]}
+                    for key, entry in state.entries.items()
+                },
+            })
+            state.dirty = False
+            state.flushed_at = time.monotonic()
+        try:
+            self._replace_file(os.path.join(self._get_table_dir(table), INDEX_FILE), data)
+        except OSError as e:
+            logger.warning(f"Could not write index for table '{table}': {e}")
+            with self._lock:
+                state.dirty = True
+
+    def _remember(self, table: str, key: str, stamp: _Stamp, data: bytes, row: Any) -> None:
+        state = self._state(table)
+        fields = {f: row.get(f) for f in state.fields} if isinstance(row, dict) else {}
+        if any(isinstance(v, (dict, list)) for v in fields.values()):
+            fields = _loads(_dumps(fields))  # don't alias the caller's row
+        with self._lock:
+            state.raw[key] = (stamp, data)
+            entry = state.entries.get(key)
+            if entry is None or entry["stamp"] != stamp or entry["fields"] != fields:
+                state.entries[key] = {"stamp": stamp, "fields": fields}
+                state.dirty = True
+
+    def _forget(self, table: str, key: str) -> None:
+        state = self._state(table)
+        with self._lock:
+            state.raw.pop(key, None)
+            if state.entries.pop(key, None) is not None:
+                state.dirty = True
+
+    def _scan(self, table: str) -> List[Tuple[str, str, _Stamp]]:
+        """(key, path, stamp) for every row file; forgets rows whose file
+        is gone."""
+        table_dir = self._get_table_dir(table)
+        found: List[Tuple[str, str, _Stamp]] = []
+        with os.scandir(table_dir) as it:
+            for entry in it:
+                if entry.name.startswith("."):
+                    continue
+                try:
+                    if not entry.is_file():
+                        continue
+                    found.append((entry.name, entry.path, _stamp(entry.stat())))
+                except FileNotFoundError:  # removed while listing
+                    continue
+        state = self._state(table)
+        present = {key for key, _, _ in found}
+        with self._lock:
+            for key in [key for key in state.entries if key not in present]:
+                del state.entries[key]
+                state.dirty = True
+            for key in [key for key in state.raw if key not in present]:
+                del state.raw[key]
+        return found
+
+    def _read(self, table: str, key: str, path: str, stamp: Optional[_Stamp] = None) -> Any:
+        """Parsed row at ``path``: from the read cache when its stamp is
+        current, otherwise from disk. Raises FileNotFoundError."""
+        if stamp is None:
+            stamp = _stamp(os.stat(path))
+        cached = self._state(table).raw.get(key)
+        if cached is not None and cached[0] == stamp:
+            return _loads(cached[1])
+        # A replace between the stat and this read stores new bytes under
+        # the old stamp; the next stat no longer matches, so it's re-read.
+        with open(path, "rb") as f:
+            data = f.read()
+        row = _loads(data)
+        self._remember(table, key, stamp, data, row)
+        return row
+
+    def _select(self, table: str, match: Callable[[dict], bool], fields: Iterable[str]) -> List[Any]:
+        """Rows satisfying ``match``. When every field ``match`` looks at is
+        indexed, a current index entry that fails ``match`` skips opening
+        the file."""
+        state = self._state(table)
+        use_index = set(fields) <= set(state.fields)
+        rows = []
+        for key, path, stamp in self._scan(table):
+            entry = state.entries.get(key)
+            if use_index and entry is not None and entry["stamp"] == stamp and not match(entry["fields"]):
+                continue
+            try:
+                row = self._read(table, key, path, stamp)
+            except FileNotFoundError:
+                continue
+            if isinstance(row, dict) and match(row):
+                rows.append(row)
+        self._flush_index(table)
+        return rows
+
+    @staticmethod
+    def _replace_file(path: str, data: bytes) -> _Stamp:
+        """Atomically replace ``path`` with ``data``; returns the stamp of
+        the file written. The temp name is unique per call, so writers
+        racing on one path each replace a complete file of their own."""
+        fd, tmp_path = tempfile.mkstemp(
+            dir=os.path.dirname(path), prefix=f".{os.path.basename(path)}.", suffix=".tmp",
+        )
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+                # rename keeps inode, mtime and size: this is the stamp
+                # the live file will have, whoever replaces it next.
+                stamp = _stamp(os.fstat(f.fileno()))
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except FileNotFoundError:
+                pass
+            raise
+        return stamp
+
+    def _write_row(self, table: str, key: str, item: Any) -> None:
+        file_path = self._get_file_path(table, key)
+        data = _dumps(item)
+        stamp = self._replace_file(file_path, data)
+        self._remember(table, key, stamp, data, item)
+
+    def _remove_row(self, table: str, key: str) -> bool:
+        self._forget(table, key)
+        try:
+            os.remove(self._get_file_path(table, key))
+            return True
+        except FileNotFoundError:
+            return False
+
+    def close(self) -> None:
+        """Write out any index changes still pending."""
+        for table in list(self._tables):
+            self._flush_index(table, force=True)
+
+    # batches
+
+    def _pending(self) -> Optional[Dict[Tuple[str, str], Any]]:
+        return getattr(self._local, "pending", None)
+
+    @contextmanager
+    def transaction(self) -> Iterator["FilesystemDatabase"]:
+        """Stage this thread's writes and deletes in memory for the block
+        (reads in the block see them); on exit write each row to a temp
+        file and ``os.replace`` it into place. If the block raises nothing
+        touches disk. A crash in the middle of the commit itself can
+        leave only some of the rows replaced — each file is still whole.
+        Nested blocks join the outermost one."""
+        if self._pending() is not None:
+            yield self
+            return
+        self._local.pending = {}
+        try:
+            yield self
+            pending, self._local.pending = self._local.pending, None
+            self._commit(pending)
+        finally:
+            self._local.pending = None
+
+    def _commit(self, pending: Dict[Tuple[str, str], Any]) -> None:
+        tables = set()
+        for (table, key), item in pending.items():
+            tables.add(table)
+            if item is _DELETED:
+                self._remove_row(table, key)
+            else:
+                self._write_row(table, key, item)
+        for table in tables:
+            self._flush_index(table, force=True)
+        if pending:
+            logger.info(f"Committed {len(pending)} staged filesystem writes")
+
+    def _staged(self, table: str) -> Dict[str, Any]:
+        return {key: row for (t, key), row in (self._pending() or {}).items() if t == table}
+
+    def upsert_many(self, table: str, items: Mapping[str, dict]) -> List[dict]:
+        with self.transaction():
+            return [self.insert_item(table, key, item) for key, item in items.items()]
+
+    def delete_many(self, table: str, keys: Iterable[str]) -> None:
+        with self.transaction():
+            pending = self._pending()
+            for key in keys:
+                pending[(table, key)] = _DELETED
+
+    # rows
+
     def upsert_item(self, table: str, key: str, item: dict) -> dict:
         logger.debug(f"Upserting item into {table} with key {key}: {item}")
         # I believe file insert/upsert is the same
@@ -54,13 +371,16 @@ class FilesystemDatabase(DatabaseAdapter):
         logger.debug(f"Inserting item into table '{table}' with key '{key}': {item}")
         # item["id"] = key  # Ensure the key is included in the item.
         # Details on how to handle storage like identities "id" should not modify exising data
-        file_path = self._get_file_path(table, key)
+        pending = self._pending()
+        if pending is not None:
+            # Snapshot through JSON so a later caller-side mutation can't
+            # leak into the commit (and unserialisable rows fail here).
+            pending[(table, key)] = _loads(_dumps(item))
+            return item
         try:
-            # Ensure the parent directory exists
-            os.makedirs(os.path.dirname(file_path), exist_ok=True)
-            with open(file_path, "w", encoding="utf-8") as f:
-                json.dump(item, f)
-            logger.info(f"Item inserted successfully at {file_path}")
+            self._write_row(table, key, item)
+            self._flush_index(table)
+            logger.info(f"Item inserted successfully at {self._get_file_path(table, key)}")
         except Exception as e:
             logger.exception("Failed to insert item into filesystem")
             raise e
@@ -72,32 +392,25 @@ class FilesystemDatabase(DatabaseAdapter):
         
         Returns:
         - A dict if the file is recognized as JSON.
-        - Raw bytes if the file is binary or not recognized as JSON.
         - An empty dict if the file does not exist.
         """
         logger.info(f"Retrieving item from table '{table}' with key: {key}")
+        pending = self._pending()
+        if pending is not None and (table, key) in pending:
+            staged = pending[(table, key)]
+            return {} if staged is _DELETED else _loads(_dumps(staged))
         file_path = self._get_file_path(table, key)
-        
-        if not os.path.exists(file_path):
+        try:
+            item = self._read(table, key, file_path)
+        except FileNotFoundError:
+            self._forget(table, key)
             logger.warning(f"Item with key '{key}' not found in table '{table}'.")
             return {}
-
-        try:
-            # Check the file extension to decide if it is JSON.
-            # if file_path.lower().endswith(".json"):
-                with open(file_path, "r", encoding="utf-8") as f:
-                    item = json.load(f)
-                logger.info(f"JSON item retrieved: {item}")
-                return item
-            # else:
-            #     with open(file_path, "rb") as f:
-            #         data = f.read()
-            #     logger.info("Binary or non-JSON data retrieved.")
-            #     return data
-
         except Exception as e:
             logger.exception("Error reading item from filesystem")
             raise e
+        logger.info(f"JSON item retrieved: {item}")
+        return item
         
     def get_binary_item(self, table: str, key: str) -> dict:
         """
@@ -127,18 +440,24 @@ class FilesystemDatabase(DatabaseAdapter):
     def get_all_items(self, table: str) -> list:
         """
         Retrieve all items from the specified table.
-        Scans the table directory for all JSON files and returns their contents.
+        Stats every row file and re-reads only those changed since this
+        process last read them.
         """
         logger.info(f"Retrieving all items from table '{table}'")
-        table_dir = self._get_table_dir(table)
-        items = []
         try:
-            for filename in os.listdir(table_dir):
-                # if filename.endswith(".json"):
-                    file_path = os.path.join(table_dir, filename)
-                    with open(file_path, "r", encoding="utf-8") as f:
-                        item = json.load(f)
-                        items.append(item)
+            rows = {}
+            for key, path, stamp in self._scan(table):
+                try:
+                    rows[key] = self._read(table, key, path, stamp)
+                except FileNotFoundError:
+                    continue
+            self._flush_index(table)
+            for key, staged in self._staged(table).items():
+                if staged is _DELETED:
+                    rows.pop(key, None)
+                else:
+                    rows[key] = _loads(_dumps(staged))
+            items = list(rows.values())
             logger.info(f"Total items retrieved from '{table}': {len(items)}")
             return items
         except Exception as e:
@@ -163,10 +482,13 @@ class FilesystemDatabase(DatabaseAdapter):
             return item
 
         item.update(filtered_updates)
-        file_path = self._get_file_path(table, key)
+        pending = self._pending()
+        if pending is not None:
+            pending[(table, key)] = _loads(_dumps(item))
+            return item
         try:
-            with open(file_path, "w", encoding="utf-8") as f:
-                json.dump(item, f)
+            self._write_row(table, key, item)
+            self._flush_index(table)
             logger.info(f"Item updated successfully: {item}")
         except Exception as e:
             logger.exception("Failed to update item in filesystem")
@@ -178,13 +500,16 @@ class FilesystemDatabase(DatabaseAdapter):
         Delete an item from the specified table by removing its JSON file.
         """
         logger.info(f"Deleting item from table '{table}' with key: {key}")
-        file_path = self._get_file_path(table, key)
+        pending = self._pending()
+        if pending is not None:
+            pending[(table, key)] = _DELETED
+            return
         try:
-            if os.path.exists(file_path):
-                os.remove(file_path)
+            if self._remove_row(table, key):
                 logger.info(f"Item with key '{key}' deleted from table '{table}'")
             else:
                 logger.warning(f"Item with key '{key}' not found in table '{table}', nothing to delete.")
+            self._flush_index(table)
         except Exception as e:
             logger.exception("Failed to delete item from filesystem")
             raise e
@@ -193,20 +518,26 @@ class FilesystemDatabase(DatabaseAdapter):
         """
         Search for items in the specified table whose keys contain or match a part of the given key.
         If regex is True, treats key_part as a regular expression; otherwise, does a prefix search.
+        Matches on each row's ``id``, which the index always carries.
         """
         logger.info(f"Searching in table '{table}' for keys matching: {key_part} (regex={regex})")
-        items = self.get_all_items(table)
         if regex:
             pattern = re.compile(key_part)
-            matching_items = [item for item in items if "id" in item and pattern.search(item["id"])]
+            matches_id = lambda value: pattern.search(value) is not None
+        else:
+            matches_id = lambda value: value.startswith(key_part)
+        match = lambda row: isinstance(row.get("id"), str) and matches_id(row["id"])
+        if self._staged(table):
+            matching_items = [item for item in self.get_all_items(table) if match(item)]
         else:
-            matching_items = [item for item in items if "id" in item and item["id"].startswith(key_part)]
+            matching_items = self._select(table, match, ("id",))
         logger.info(f"Found {len(matching_items)} matching items in table '{table}'")
         return matching_items
     
     def query_items(self, table_name: str, criteria: dict) -> List[Dict[str, Any]]:
         """
         Query items in the specified table based on the provided criteria.
+        Files whose index entry already rules them out are not opened.
         
         Args:
         - table_name: The name of the table to query.
@@ -216,12 +547,11 @@ class FilesystemDatabase(DatabaseAdapter):
         - A list of items matching the criteria.
         """
         logger.info(f"Querying items in table '{table_name}' with criteria: {criteria}")
-        items = self.get_all_items(table_name)
-        matching_items = []
-
-        for item in items:
-            if all(item.get(key) == value for key, value in criteria.items()):
-                matching_items.append(item)
+        match = lambda item: all(item.get(key) == value for key, value in criteria.items())
+        if self._staged(table_name):
+            matching_items = [item for item in self.get_all_items(table_name) if match(item)]
+        else:
+            matching_items = self._select(table_name, match, criteria.keys())
 
         logger.info(f"Found {len(matching_items)} matching items in table '{table_name}'")
         return matching_items
@@ -239,6 +569,14 @@ class FilesystemDatabase(DatabaseAdapter):
         # if os.path.exists(dest_dir):
         #     raise FileExistsError(f"Destination table directory already exists: {dest_dir}")
         shutil.copytree(source_dir, dest_dir, dirs_exist_ok=True)
+        # The copied files are new inodes, so the source's index says
+        # nothing useful about them; rebuild the destination's lazily.
+        with self._lock:
+            self._tables.pop(dest_table, None)
+        try:
+            os.remove(os.path.join(dest_dir, INDEX_FILE))
+        except FileNotFoundError:
+            pass
         logger.info(f"Copied table '{source_table}' to '{dest_table}' ({source_dir} -> {dest_dir})")
 
     def query(self, querystr: str) -> list:
@@ -295,15 +633,30 @@ class FilesystemDatabase(DatabaseAdapter):
     def ensure_table(
         self,
         model: type[BaseModel],
-        table_name: str = None
+        table_name: str = None,
+        indexes: Optional[Sequence[Union[str, Sequence[str]]]] = None
     ) -> None:
         """
         Ensure that a filesystem "table" (directory) exists for the given Pydantic model.
         Creates the table directory and optionally a metadata file.
+        Fields named in ``indexes`` are added to the table's index file.
         """
         if table_name is None:
             # Convert CamelCase to snake_case
             table_name = re.sub(r'(?<!^)(?=[A-Z])', '_', model.__name__).lower()
+
+        if indexes:
+            wanted = [col for index in indexes for col in ([index] if isinstance(index, str) else index)]
+            state = self._state(table_name)
+            with self._lock:
+                missing = [col for col in wanted if col not in state.fields]
+                if missing:
+                    state.fields = state.fields + tuple(dict.fromkeys(missing))
+                    # Existing entries lack the new fields; drop them so the
+                    # next scan re-reads each row once and fills them in.
+                    state.entries.clear()
+                    state.raw.clear()
+                    state.dirty = True
         
         try:
             # Create the table directory
@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Union
+from contextlib import contextmanager
+from typing import List, Dict, Any, Iterable, Iterator, Mapping, Optional, Sequence, Union
 
 # For factory pattern (like MessageConfig)
 from pydantic import BaseModel
@@ -121,16 +122,58 @@ class DatabaseAdapter(ABC):
     def ensure_table(
         self,
         model: type[BaseModel],
-        table_name: str = None
+        table_name: str = None,
+        indexes: Optional[Sequence[Union[str, Sequence[str]]]] = None
     ) -> None:
         """
         Ensure that a table exists for the given Pydantic model.
 
         :param model: The Pydantic model class to create a table for.
         :param table_name: Optional table name. If None, will use the lowercase snake_case name of the model.
+        :param indexes: Optional secondary indexes to maintain — each a column name, or a sequence of
+                        column names for a composite index. SQL backends create them so
+                        ``query_items`` lookups on those columns avoid a table scan; backends
+                        without secondary indexes ignore the hint.
         """
         pass
 
+    def upsert_many(self, table: str, items: Mapping[str, dict]) -> List[dict]:
+        """
+        Insert or replace many rows at once — ``{key: item}`` — as one unit of work.
+        Pass complete rows: afterwards ``get_item(table, key)`` returns ``item``.
+
+        Non-abstract on purpose: this default loops ``upsert_item`` inside
+        ``transaction()``. Backends with a native bulk path (sqlite, postgres,
+        tinydb, filesystem, mongodb) override it so N rows cost one commit.
+        """
+        with self.transaction():
+            return [self.upsert_item(table, key, item) for key, item in items.items()]
+
+    def delete_many(self, table: str, keys: Iterable[str]) -> None:
+        """
+        Delete every row in ``keys`` as one unit of work; missing keys are ignored.
+        Default loops ``delete_item`` inside ``transaction()``.
+        """
+        with self.transaction():
+            for key in keys:
+                self.delete_item(table, key)
+
+    @contextmanager
+    def transaction(self) -> Iterator["DatabaseAdapter"]:
+        """
+        Group writes made by this thread into one commit::
+
+            with db.transaction():
+                db.upsert_many("service_meta", rows)
+                db.delete_many("service_meta", stale_ids)
+
+        Writes become visible/durable together when the block exits and are
+        discarded if it raises. Nested blocks join the outer one. This default
+        gives no atomicity (each write commits on its own) so adapters without
+        transactions keep working; see each adapter for its guarantees.
+        """
+        yield self
+
     def list_tables(self) -> List[str]:
         """
         Return the names of every table currently materialised in this backend.
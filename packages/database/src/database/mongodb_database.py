@@ -1,6 +1,6 @@
 import logging
-from typing import List, Dict, Any, Union, Optional
-from pymongo import MongoClient
+from typing import List, Dict, Any, Iterable, Mapping, Union, Optional, Sequence
+from pymongo import ASCENDING, MongoClient, ReplaceOne
 from pymongo.database import Database
 from pymongo.collection import Collection
 from pymongo.errors import PyMongoError
@@ -166,6 +166,46 @@ class MongoDBDatabase(DatabaseAdapter):
         except PyMongoError as e:
             logger.error(f"Error deleting item from {table}: {e}")
             raise
+
+    def upsert_many(self, table: str, items: Mapping[str, dict]) -> List[dict]:
+        """Replace/insert every row in one ``bulk_write`` round trip.
+
+        ``transaction()`` is the interface default here (no atomicity):
+        multi-document transactions need a replica set and a session on
+        every call, which this adapter doesn't thread through.
+        """
+        if not items:
+            return []
+        try:
+            collection = self._get_collection(table, for_write=True)
+            docs = []
+            for key, item in items.items():
+                doc = dict(item)
+                if '_id' not in doc:
+                    doc['_id'] = self._convert_id(key)
+                docs.append(doc)
+            collection.bulk_write(
+                [ReplaceOne({'_id': doc['_id']}, doc, upsert=True) for doc in docs],
+                ordered=False,
+            )
+            for doc in docs:
+                doc['_id'] = str(doc['_id'])
+            return docs
+        except PyMongoError as e:
+            logger.error(f"Error bulk upserting items in {table}: {e}")
+            raise
+
+    def delete_many(self, table: str, keys: Iterable[str]) -> None:
+        """Delete all ``keys`` with a single ``$in`` query."""
+        ids = [self._convert_id(key) for key in keys]
+        if not ids:
+            return
+        try:
+            collection = self._get_collection(table, for_write=True)
+            collection.delete_many({'_id': {'$in': ids}})
+        except PyMongoError as e:
+            logger.error(f"Error deleting items from {table}: {e}")
+            raise
     
     def query_items(self, table_name: str, criteria: dict) -> list:
         """Query the database for items matching the given criteria."""
@@ -283,7 +323,8 @@ class MongoDBDatabase(DatabaseAdapter):
     def ensure_table(
         self,
         model: type[BaseModel],
-        table_name: str = None
+        table_name: str = None,
+        indexes: Optional[Sequence[Union[str, Sequence[str]]]] = None
     ) -> None:
         """
         Ensure that a MongoDB collection exists for the given Pydantic model.
@@ -309,6 +350,10 @@ class MongoDBDatabase(DatabaseAdapter):
                 
             # Ensure _id index exists (MongoDB creates this automatically, but being explicit)
             collection.create_index("_id", unique=True)
+
+            for columns in indexes or ():
+                keys = [columns] if isinstance(columns, str) else list(columns)
+                collection.create_index([(key, ASCENDING) for key in keys])
             
         except PyMongoError as e:
             logger.error(f"Error ensuring collection for model {model.__name__}: {e}")
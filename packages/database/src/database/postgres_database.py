@@ -1,9 +1,9 @@
 import logging
 import datetime
-from typing import Dict, List, Any, Optional, Union
+from typing import Dict, Iterable, Iterator, List, Any, Mapping, Optional, Sequence, Tuple, Union
 import psycopg2
 from psycopg2 import sql
-from psycopg2.extras import RealDictCursor, register_default_jsonb
+from psycopg2.extras import RealDictCursor, execute_values, register_default_jsonb
 from psycopg2 import OperationalError, InterfaceError
 from psycopg2.pool import ThreadedConnectionPool, PoolError
 import threading
@@ -23,6 +23,8 @@ class PostgresDatabase(DatabaseAdapter):
         self.sslmode = config.sslmode if config.sslmode not in (None, "None", "") else "prefer"
         self._pool = None
         self._lock = threading.Lock()
+        # Per-thread transaction() state: the pinned connection + depth.
+        self._local = threading.local()
         self._connect()
         logger.info(f"PostgresDatabase initialized with connection pool (min={config.min_connections}, max={config.max_connections}) at {config.host}:{config.port}/{config.database}")
 
@@ -61,6 +63,14 @@ class PostgresDatabase(DatabaseAdapter):
     def _get_cursor(self, cursor_factory=None):
         """Context manager for database cursors with connection pooling and automatic retry"""
         # Validate pool exists
+        tx_conn = getattr(self._local, "tx_conn", None)
+        if tx_conn is not None:
+            # Inside transaction(): reuse its connection, no autocommit and
+            # no retry — a failed statement aborts the transaction anyway.
+            with tx_conn.cursor(cursor_factory=cursor_factory) as cursor:
+                yield cursor
+            return
+
         if not self._pool:
             logger.error("Connection pool not initialized")
             raise OperationalError("Database connection pool is not available")
@@ -144,6 +154,48 @@ class PostgresDatabase(DatabaseAdapter):
                 # Connection already returned to pool in finally block above
                 raise
 
+    @contextmanager
+    def transaction(self) -> Iterator["PostgresDatabase"]:
+        """Check one connection out of the pool for the block, with
+        autocommit off, and route every ``_get_cursor`` on this thread
+        through it: one COMMIT on exit, ROLLBACK if the block raises.
+        Nested blocks join the outermost one."""
+        depth = getattr(self._local, "tx_depth", 0)
+        if depth:
+            self._local.tx_depth = depth + 1
+            try:
+                yield self
+            finally:
+                self._local.tx_depth = depth
+            return
+        if not self._pool:
+            raise OperationalError("Database connection pool is not available")
+        conn = self._pool.getconn()
+        if not conn:
+            raise OperationalError("Failed to get connection from pool")
+        conn.autocommit = False
+        self._local.tx_conn = conn
+        self._local.tx_depth = 1
+        failed = False
+        try:
+            yield self
+            conn.commit()
+        except BaseException:
+            failed = True
+            try:
+                conn.rollback()
+            except Exception as rollback_error:
+                logger.error(f"Error rolling back transaction: {rollback_error}")
+            raise
+        finally:
+            self._local.tx_conn = None
+            self._local.tx_depth = 0
+            try:
+                conn.autocommit = True
+                self._pool.putconn(conn, close=failed)
+            except Exception as put_error:
+                logger.error(f"Error returning transaction connection to pool: {put_error}")
+
     def close(self) -> None:
         """Clean shutdown of database connection pool"""
         with self._lock:
@@ -290,6 +342,57 @@ class PostgresDatabase(DatabaseAdapter):
             logger.error(f"Item keys: {list(item.keys())}")
             raise
 
+    def upsert_many(self, table: str, items: Mapping[str, dict]) -> List[dict]:
+        """Upsert many rows in one transaction. Rows sharing a column set
+        go out as one multi-row ``INSERT … ON CONFLICT (id) DO UPDATE``
+        via ``execute_values``."""
+        self._validate_identifier(table, "table name")
+        batches: Dict[Tuple[str, ...], List[list]] = {}
+        for key, item in items.items():
+            row = dict(item)
+            row.setdefault("id", key)
+            for k in row.keys():
+                self._validate_identifier(k, f"column '{k}'")
+            batches.setdefault(tuple(row.keys()), []).append(self._prepare_values(row))
+
+        results: List[dict] = []
+        try:
+            with self.transaction(), self._get_cursor(cursor_factory=RealDictCursor) as cur:
+                for columns, rows in batches.items():
+                    stmt = sql.SQL(
+                        "INSERT INTO {table} ({cols}) VALUES %s "
+                        "ON CONFLICT (id) DO UPDATE SET {upd} RETURNING *"
+                    ).format(
+                        table=sql.Identifier(table),
+                        cols=sql.SQL(", ").join(sql.Identifier(k) for k in columns),
+                        upd=sql.SQL(", ").join(
+                            sql.SQL("{c}=EXCLUDED.{c}").format(c=sql.Identifier(k))
+                            for k in columns
+                        ),
+                    )
+                    fetched = execute_values(cur, stmt, rows, fetch=True)
+                    results.extend(dict(row) for row in fetched or [])
+            return results
+        except Exception as e:
+            logger.error(f"Error in upsert_many for table '{table}' ({len(items)} rows): {e}")
+            raise
+
+    def delete_many(self, table: str, keys: Iterable[str]) -> None:
+        """Delete many rows with one ``DELETE … WHERE id = ANY(%s)``."""
+        self._validate_identifier(table, "table name")
+        keys = list(keys)
+        if not keys:
+            return
+        try:
+            with self._get_cursor() as cur:
+                stmt = sql.SQL("DELETE FROM {table} WHERE id = ANY(%s)").format(
+                    table=sql.Identifier(table),
+                )
+                self._execute(cur, stmt, (keys,))
+        except Exception as e:
+            logger.error(f"Error in delete_many for table '{table}': {e}")
+            raise
+
     def get_item(self, table: str, key: str) -> Optional[dict]:
         """Get item with validation"""
         self._validate_identifier(table, "table name")
@@ -368,29 +471,40 @@ class PostgresDatabase(DatabaseAdapter):
             logger.error(f"Error in update_item: {e}")
             raise
 
-    def search_by_key_part(self, table: str, key_part: str) -> List[dict]:
-        """Search by key part with validation"""
+    def search_by_key_part(self, table: str, key_part: str, regex: bool = False) -> List[dict]:
+        """Search by key prefix (``id LIKE 'part%'``) or, with ``regex``,
+        POSIX regular expression (``id ~ pattern``) with validation"""
         self._validate_identifier(table, "table name")
 
         try:
             with self._get_cursor(cursor_factory=RealDictCursor) as cur:
-                stmt = sql.SQL("SELECT * FROM {table} WHERE id LIKE %s").format(
-                    table=sql.Identifier(table),
-                )
-                self._execute(cur, stmt, (f"%{key_part}%",))
+                if regex:
+                    stmt = sql.SQL("SELECT * FROM {table} WHERE id ~ %s")
+                    param = key_part
+                else:
+                    stmt = sql.SQL("SELECT * FROM {table} WHERE id LIKE %s ESCAPE '\\'")
+                    param = self._escape_like(key_part) + "%"
+                self._execute(cur, stmt.format(table=sql.Identifier(table)), (param,))
                 return [dict(row) for row in cur.fetchall()]
         except Exception as e:
             logger.error(f"Error in search_by_key_part: {e}")
             raise
 
+    @staticmethod
+    def _escape_like(value: str) -> str:
+        return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
     def query_items(self, table: str, query: dict) -> List[dict]:
-        """Query items with validation"""
+        """Query items with validation. Every criterion becomes part of the
+        WHERE clause: ``None`` matches SQL NULL, dicts/lists compare as
+        JSONB, and a dotted key (``"config.mode"``) compares the nested
+        JSONB value at that path."""
         self._validate_identifier(table, "table name")
         
         try:
             # Validate dynamic column identifiers before building SQL.
             for field_name in query.keys():
-                self._validate_identifier(field_name, f"field name '{field_name}'")
+                self._validate_identifier(field_name.partition(".")[0], f"field name '{field_name}'")
 
             with self._get_cursor(cursor_factory=RealDictCursor) as cur:
                 base_query = sql.SQL("SELECT * FROM {}")
@@ -398,15 +512,15 @@ class PostgresDatabase(DatabaseAdapter):
 
                 params: List[Any] = []
                 if query:
-                    conditions = [
-                        sql.SQL("{} = %s").format(sql.Identifier(field_name))
-                        for field_name in query.keys()
-                    ]
+                    conditions = []
+                    for field_name, value in query.items():
+                        condition, condition_params = self._criterion_sql(field_name, value)
+                        conditions.append(condition)
+                        params.extend(condition_params)
                     statement = sql.SQL("{} WHERE {}").format(
                         statement,
                         sql.SQL(" AND ").join(conditions)
                     )
-                    params = list(query.values())
 
                 self._execute(cur, statement, params or None)
                 return [dict(row) for row in cur.fetchall()]
@@ -414,6 +528,18 @@ class PostgresDatabase(DatabaseAdapter):
             logger.error(f"Error in query_items: {e}")
             raise
 
+    def _criterion_sql(self, field_name: str, value: Any) -> Tuple[sql.Composable, List[Any]]:
+        column, _, path = field_name.partition(".")
+        col = sql.Identifier(column)
+        if path:
+            # Path segments travel as a text[] parameter, never as SQL.
+            return sql.SQL("{} #> %s = %s::jsonb").format(col), [path.split("."), json.dumps(value)]
+        if value is None:
+            return sql.SQL("{} IS NULL").format(col), []
+        if isinstance(value, (dict, list)):
+            return sql.SQL("{} = %s::jsonb").format(col), [json.dumps(value)]
+        return sql.SQL("{} = %s").format(col), [value]
+
     def copy_table(self, source: str, dest: str) -> None:
         """Copy a table with transaction support"""
         # Validate table names to prevent SQL injection
@@ -491,11 +617,13 @@ class PostgresDatabase(DatabaseAdapter):
     def ensure_table(
         self,
         model: type[BaseModel],
-        table_name: str = None
+        table_name: str = None,
+        indexes: Optional[Sequence[Union[str, Sequence[str]]]] = None
     ) -> None:
         """
         Ensure that a table exists for the given Pydantic model.
-        Creates the table with columns based on the Pydantic model fields.
+        Creates the table with columns based on the Pydantic model fields,
+        adds any missing columns, and creates each index in ``indexes``.
         """
         if table_name is None:
             # Convert CamelCase to snake_case
@@ -592,11 +720,31 @@ class PostgresDatabase(DatabaseAdapter):
                         logger.info(
                             f"Widened column '{field_name}' on table '{table_name}' from INTEGER to BIGINT"
                         )
+
+                for columns in indexes or ():
+                    self._execute(cur, self._index_stmt(table_name, columns))
                 
         except Exception as e:
             logger.error(f"Error ensuring table for model {model.__name__}: {e}")
             raise
     
+    def _index_stmt(self, table_name: str, columns: Union[str, Sequence[str]]) -> sql.Composed:
+        """``CREATE INDEX IF NOT EXISTS ix_<table>_<cols>`` for one ``indexes`` entry."""
+        if isinstance(columns, str):
+            columns = [columns]
+        columns = list(columns)
+        if not columns:
+            raise ValueError(f"empty index definition for table {table_name!r}")
+        for column in columns:
+            self._validate_identifier(column, f"index column '{column}'")
+        index_name = f"ix_{table_name}_{'_'.join(columns)}"
+        self._validate_identifier(index_name, "index name")
+        return sql.SQL("CREATE INDEX IF NOT EXISTS {name} ON {table} ({cols})").format(
+            name=sql.Identifier(index_name),
+            table=sql.Identifier(table_name),
+            cols=sql.SQL(", ").join(sql.Identifier(c) for c in columns),
+        )
+
     def _get_postgres_type(self, python_type) -> str:
         """Convert Python/Pydantic type to PostgreSQL type."""
         type_mapping = {
@@ -1,7 +1,7 @@
 import json
 import logging
 import re
-from typing import Dict, List, Any, Union
+from typing import Dict, List, Any, Optional, Sequence, Union
 import boto3
 from botocore.exceptions import ClientError
 from pydantic import BaseModel
@@ -277,7 +277,8 @@ class S3Database(DatabaseAdapter):
     def ensure_table(
         self,
         model: type[BaseModel],
-        table_name: str = None
+        table_name: str = None,
+        indexes: Optional[Sequence[Union[str, Sequence[str]]]] = None
     ) -> None:
         """
         Ensure that an S3 "table" (prefix) exists for the given Pydantic model.
@@ -3,7 +3,8 @@ import os
 import logging
 import re
 import json
-from typing import Dict, List, Any, Union
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Any, Mapping, Optional, Sequence, Tuple, Union
 from .interface import DatabaseAdapter
 from .record_transformer import RecordTransformer
 import threading
@@ -22,9 +23,38 @@ logger = logging.getLogger(__name__)
 from models.database_sqlite_config import DatabaseSqliteConfig
 
 class SqliteDatabase(DatabaseAdapter):
+    """SQLite adapter.
+
+    Connections: by default each thread reuses one persistent connection
+    (``connection_mode="thread_local"``) opened in WAL journal mode, so
+    readers never block the writer and a hot path like
+    ``get_item("service_proxy", ...)`` costs one SELECT instead of
+    connect + PRAGMA + SELECT + close. ``connection_mode="per_call"``
+    restores the old open-per-operation behaviour.
+
+    Columns: row reads take column names from ``cursor.description``;
+    paths that need a table's columns *before* querying go through
+    ``_table_columns``, a per-table cache dropped by ``ensure_table``,
+    ``insert_columns`` and any non-SELECT ``query()``.
+
+    Filters: ``query_items`` and ``search_by_key_part`` push their
+    predicates into the WHERE clause (``"col" = ?``, ``json_extract`` for
+    dotted nested keys, an ``id`` range for prefixes, a registered
+    ``REGEXP`` function for patterns) so SQLite only returns candidate
+    rows — and can use the secondary indexes declared through
+    ``ensure_table(..., indexes=...)``. Whatever SQL can't express
+    exactly is still checked in Python on the narrowed result.
+
+    Batches: ``transaction()`` pins this thread's connection and turns
+    every write in the block into one ``BEGIN IMMEDIATE … COMMIT``;
+    ``upsert_many`` / ``delete_many`` use it with ``executemany``.
+    """
+
     _instance = None
     _lock = threading.Lock()
 
+    CONNECTION_MODES = ("thread_local", "per_call")
+
     def __new__(cls, config: DatabaseSqliteConfig):
         if not cls._instance:
             with cls._lock:
@@ -38,20 +68,154 @@ class SqliteDatabase(DatabaseAdapter):
             return
         self._initialized = True
         self.config = config
+        self.connection_mode = getattr(config, "connection_mode", None) or "thread_local"
+        if self.connection_mode not in self.CONNECTION_MODES:
+            raise ValueError(f"invalid sqlite connection_mode: {self.connection_mode!r}")
+        self.journal_mode = (getattr(config, "journal_mode", None) or "WAL").upper()
+        if not self._IDENT_RE.match(self.journal_mode):
+            raise ValueError(f"invalid sqlite journal_mode: {self.journal_mode!r}")
         dirpath = os.path.dirname(self.config.sqlite_path)
         if dirpath:
             os.makedirs(dirpath, exist_ok=True)
-        self.conn = sqlite3.connect(self.config.sqlite_path, check_same_thread=False)
-        self.conn.row_factory = sqlite3.Row
+        self._local = threading.local()
+        # Every persistent connection handed out, so close() can reach
+        # the ones owned by other threads too.
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        self._columns: Dict[str, List[str]] = {}
+        self.conn = self._open_connection()
         self.transformer = RecordTransformer()
-        logger.info(f"SqliteDatabase initialized at {self.config.sqlite_path}")
+        logger.info(
+            f"SqliteDatabase initialized at {self.config.sqlite_path} "
+            f"(connections={self.connection_mode}, journal={self.journal_mode})"
+        )
 
-    def _get_connection(self):
-        """Get a new SQLite connection for each operation (thread-safe)."""
-        conn = sqlite3.connect(self.config.sqlite_path, check_same_thread=False)
+    def _open_connection(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.config.sqlite_path, check_same_thread=False, timeout=30.0)
         conn.row_factory = sqlite3.Row
+        # journal_mode is persistent on the database file; WAL lets
+        # readers proceed while a write is in flight. synchronous=NORMAL
+        # is the recommended pairing (durable across app crashes; only an
+        # OS crash can lose the last commits).
+        conn.execute(f"PRAGMA journal_mode={self.journal_mode}")
+        if self.journal_mode == "WAL":
+            conn.execute("PRAGMA synchronous=NORMAL")
+        # ``x REGEXP y`` is sugar for regexp(y, x); SQLite ships no
+        # implementation of its own.
+        conn.create_function("REGEXP", 2, _sql_regexp, deterministic=True)
         return conn
 
+    def _get_connection(self) -> sqlite3.Connection:
+        """This thread's persistent connection (opened on first use), or
+        a fresh one in ``per_call`` mode. Prefer ``_connection()``."""
+        tx_conn = getattr(self._local, "tx_conn", None)
+        if tx_conn is not None:
+            return tx_conn
+        if self.connection_mode == "per_call":
+            return self._open_connection()
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._open_connection()
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        """Scope one operation. Rolls back an unfinished transaction on
+        error so a persistent connection is never left mid-transaction;
+        closes the connection afterwards only in ``per_call`` mode.
+        Inside ``transaction()`` it hands out the transaction's
+        connection and leaves commit/rollback/close to the block."""
+        if getattr(self._local, "tx_conn", None) is not None:
+            yield self._local.tx_conn
+            return
+        conn = self._get_connection()
+        try:
+            yield conn
+        except BaseException:
+            if conn.in_transaction:
+                conn.rollback()
+            raise
+        finally:
+            if self.connection_mode == "per_call":
+                conn.close()
+
+    def _commit(self, conn: sqlite3.Connection) -> None:
+        """Commit, unless a ``transaction()`` block owns the commit."""
+        if getattr(self._local, "tx_conn", None) is None:
+            conn.commit()
+
+    @contextmanager
+    def transaction(self) -> Iterator["SqliteDatabase"]:
+        """One SQLite transaction for every write this thread makes in the
+        block: ``BEGIN IMMEDIATE`` (takes the write lock up front, so a
+        concurrent writer waits instead of failing mid-block), a single
+        COMMIT on exit, ROLLBACK if the block raises. Nested blocks join
+        the outermost one."""
+        depth = getattr(self._local, "tx_depth", 0)
+        if depth:
+            self._local.tx_depth = depth + 1
+            try:
+                yield self
+            finally:
+                self._local.tx_depth = depth
+            return
+        conn = self._get_connection()
+        if conn.in_transaction:  # left open by a raw query(); don't fold it in silently
+            conn.commit()
+        conn.execute("BEGIN IMMEDIATE")
+        self._local.tx_conn = conn
+        self._local.tx_depth = 1
+        try:
+            yield self
+        except BaseException:
+            conn.rollback()
+            # DDL inside the block may have been rolled back with it.
+            self._invalidate_columns()
+            raise
+        else:
+            conn.commit()
+        finally:
+            self._local.tx_conn = None
+            self._local.tx_depth = 0
+            if self.connection_mode == "per_call":
+                conn.close()
+
+    def close(self) -> None:
+        """Close every persistent connection (all threads). Safe to call
+        more than once; a thread that uses the adapter afterwards opens a
+        fresh connection."""
+        with self._connections_lock:
+            conns, self._connections = self._connections, []
+        for conn in conns + [self.conn]:
+            try:
+                conn.close()
+            except sqlite3.Error:  # pragma: no cover
+                pass
+        self._local = threading.local()
+
+    def _table_columns(self, conn: sqlite3.Connection, table: str) -> List[str]:
+        """Column names of ``table`` (empty if it doesn't exist), cached."""
+        cols = self._columns.get(table)
+        if cols is None:
+            t = self._safe_ident(table, "table name")
+            cols = [row[1] for row in conn.execute(f"PRAGMA table_info({t})").fetchall()]
+            if cols:
+                self._columns[table] = cols
+        return cols
+
+    def _invalidate_columns(self, table: str = None) -> None:
+        if table is None:
+            self._columns.clear()
+        else:
+            self._columns.pop(table, None)
+
+    def _rows_to_items(self, cur: sqlite3.Cursor) -> List[dict]:
+        columns = [d[0] for d in cur.description]
+        return [self.transformer.unflatten(dict(zip(columns, row))) for row in cur.fetchall()]
+
     _IDENT_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
 
     @classmethod
@@ -76,73 +240,72 @@ class SqliteDatabase(DatabaseAdapter):
             values = [key] + values
         cols_sql = ', '.join(self._safe_ident(c, f"column '{c}'") for c in columns)
         placeholders = ', '.join(['?'] * len(values))
-        conn = self._get_connection()
-        cur = conn.cursor()
-        cur.execute(f"INSERT OR REPLACE INTO {t} ({cols_sql}) VALUES ({placeholders})", values)
-        conn.commit()
-        conn.close()
+        with self._connection() as conn:
+            conn.execute(f"INSERT OR REPLACE INTO {t} ({cols_sql}) VALUES ({placeholders})", values)
+            self._commit(conn)
         return item
 
     def insert_item(self, table: str, key: str, item: dict) -> dict:
         return self.upsert_item(table, key, item)
 
+    def upsert_many(self, table: str, items: Mapping[str, dict]) -> List[dict]:
+        """All rows in one transaction; rows sharing a column set go
+        through a single ``executemany``."""
+        t = self._safe_ident(table, "table name")
+        batches: Dict[Tuple[str, ...], List[list]] = {}
+        for key, item in items.items():
+            flat_item = self.transformer.flatten(item)
+            columns = list(flat_item.keys())
+            values = [flat_item[col] for col in columns]
+            if 'id' not in columns:
+                columns = ['id'] + columns
+                values = [key] + values
+            batches.setdefault(tuple(columns), []).append(values)
+        with self.transaction(), self._connection() as conn:
+            for columns, rows in batches.items():
+                cols_sql = ', '.join(self._safe_ident(c, f"column '{c}'") for c in columns)
+                placeholders = ', '.join(['?'] * len(columns))
+                conn.executemany(f"INSERT OR REPLACE INTO {t} ({cols_sql}) VALUES ({placeholders})", rows)
+        return list(items.values())
+
     def get_item(self, table: str, key: str) -> dict:
         t = self._safe_ident(table, "table name")
-        conn = self._get_connection()
-        cur = conn.cursor()
-        cur.execute(f"PRAGMA table_info({t})")
-        columns = [row[1] for row in cur.fetchall()]
-        cur.execute(f"SELECT * FROM {t} WHERE id = ?", (key,))
-        row = cur.fetchone()
-        conn.close()
-        if row:
-            row_dict = dict(zip(columns, row))
-            return self.transformer.unflatten(row_dict)
-        return {}
+        with self._connection() as conn:
+            cur = conn.execute(f"SELECT * FROM {t} WHERE id = ?", (key,))
+            items = self._rows_to_items(cur)
+        return items[0] if items else {}
 
     def get_binary_item(self, table: str, key: str) -> bytes:
         t = self._safe_ident(table, "table name")
-        conn = self._get_connection()
-        try:
-            cur = conn.cursor()
-            cur.execute(f"PRAGMA table_info({t})")
-            columns = [row[1] for row in cur.fetchall()]
+        with self._connection() as conn:
+            columns = self._table_columns(conn, table)
             if not columns:
                 raise ValueError(f"Table {table} does not exist")
 
             if "json" in columns:
-                cur.execute(f"SELECT json FROM {t} WHERE id = ?", (key,))
-                row = cur.fetchone()
+                row = conn.execute(f"SELECT json FROM {t} WHERE id = ?", (key,)).fetchone()
                 if row and row[0] is not None:
                     data = row[0]
                     if isinstance(data, (bytes, bytearray)):
                         return bytes(data)
                     return str(data).encode("utf-8")
             else:
-                cur.execute(f"SELECT * FROM {t} WHERE id = ?", (key,))
+                cur = conn.execute(f"SELECT * FROM {t} WHERE id = ?", (key,))
                 row = cur.fetchone()
                 if row:
-                    record = dict(zip(columns, row))
+                    record = dict(zip([d[0] for d in cur.description], row))
                     payload = json.dumps(
                         record,
                         default=lambda obj: obj.decode("utf-8") if isinstance(obj, (bytes, bytearray)) else str(obj)
                     )
                     return payload.encode("utf-8")
             raise ValueError(f"Item with key {key} not found in {table}")
-        finally:
-            conn.close()
 
     def get_all_items(self, table: str) -> list:
         try:
             t = self._safe_ident(table, "table name")
-            conn = self._get_connection()
-            cur = conn.cursor()
-            cur.execute(f"PRAGMA table_info({t})")
-            columns = [row[1] for row in cur.fetchall()]
-            cur.execute(f"SELECT * FROM {t}")
-            rows = cur.fetchall()
-            conn.close()
-            return [self.transformer.unflatten(dict(zip(columns, row))) for row in rows]
+            with self._connection() as conn:
+                return self._rows_to_items(conn.execute(f"SELECT * FROM {t}"))
         except Exception as e:
             logger.error(f"Error retrieving all items from {table}: {e}")
             return []
@@ -162,79 +325,88 @@ class SqliteDatabase(DatabaseAdapter):
 
     def delete_item(self, table: str, key: str) -> None:
         t = self._safe_ident(table, "table name")
-        conn = self._get_connection()
-        cur = conn.cursor()
-        cur.execute(f"DELETE FROM {t} WHERE id = ?", (key,))
-        conn.commit()
-        conn.close()
+        with self._connection() as conn:
+            conn.execute(f"DELETE FROM {t} WHERE id = ?", (key,))
+            self._commit(conn)
+
+    def delete_many(self, table: str, keys: Iterable[str]) -> None:
+        t = self._safe_ident(table, "table name")
+        with self.transaction(), self._connection() as conn:
+            conn.executemany(f"DELETE FROM {t} WHERE id = ?", [(key,) for key in keys])
 
     def query_items(self, table_name: str, criteria: dict) -> list:
         t = self._safe_ident(table_name, "table name")
-        conn = self._get_connection()
-        cur = conn.cursor()
-        cur.execute(f"PRAGMA table_info({t})")
-        columns = [row[1] for row in cur.fetchall()]
-        cur.execute(f"SELECT * FROM {t}")
-        rows = cur.fetchall()
-        conn.close()
-        results = []
-        for row in rows:
-            row_dict = dict(zip(columns, row))
-            item = self.transformer.unflatten(row_dict)
-            if all(item.get(k) == v for k, v in criteria.items()):
-                results.append(item)
-        return results
+        with self._connection() as conn:
+            where, params = self._criteria_sql(conn, table_name, criteria)
+            stmt = f"SELECT * FROM {t}" + (f" WHERE {where}" if where else "")
+            items = self._rows_to_items(conn.execute(stmt, params))
+        return [item for item in items if _matches(item, criteria)]
+
+    def _criteria_sql(self, conn: sqlite3.Connection, table: str, criteria: dict) -> Tuple[str, list]:
+        """WHERE clause + params narrowing ``table`` to rows that can match
+        ``criteria``. Only predicates that are exact against the
+        flattened storage are emitted: str values (stored verbatim) and
+        None (NULL or the typed-none marker). Numbers, bools and
+        containers have more than one stored spelling, so those keys are
+        left to the Python check."""
+        columns = self._table_columns(conn, table)
+        clauses: List[str] = []
+        params: List[Any] = []
+        for key, value in criteria.items():
+            column, _, path = key.partition(".")
+            if column not in columns:
+                continue
+            col = self._safe_ident(column, f"column '{column}'")
+            if path:
+                if not isinstance(value, str):
+                    continue
+                clauses.append(f"(CASE WHEN json_valid({col}) THEN json_extract({col}, ?) END) = ?")
+                params.extend([_json_path(path), value])
+            elif isinstance(value, str):
+                clauses.append(f"{col} = ?")
+                params.append(value)
+            elif value is None:
+                clauses.append(f"({col} IS NULL OR {col} = ?)")
+                params.append(self.transformer.flatten({key: None})[key])
+        return " AND ".join(clauses), params
 
     def search_by_key_part(self, table: str, key_part: str, regex: bool = False) -> List[Dict[str, Any]]:
         t = self._safe_ident(table, "table name")
-        conn = self._get_connection()
-        cur = conn.cursor()
-        cur.execute(f"PRAGMA table_info({t})")
-        columns = [row[1] for row in cur.fetchall()]
-        cur.execute(f"SELECT * FROM {t}")
-        rows = cur.fetchall()
-        conn.close()
-        results = []
-        for row in rows:
-            row_dict = dict(zip(columns, row))
-            item = self.transformer.unflatten(row_dict)
-            id_val = row_dict.get('id', '')
-            if regex:
-                if re.search(key_part, id_val):
-                    results.append(item)
-            else:
-                if id_val.startswith(key_part):
-                    results.append(item)
-        return results
+        if regex:
+            re.compile(key_part)  # surface re.error here, not as an opaque sqlite error
+            stmt, params = f"SELECT * FROM {t} WHERE id REGEXP ?", [key_part]
+        else:
+            # Half-open range on the primary key: an index seek, and
+            # case-sensitive like str.startswith (LIKE is not).
+            stmt, params = f"SELECT * FROM {t} WHERE id >= ?", [key_part]
+            upper = _prefix_upper_bound(key_part)
+            if upper is not None:
+                stmt += " AND id < ?"
+                params.append(upper)
+        with self._connection() as conn:
+            return self._rows_to_items(conn.execute(stmt, params))
 
     def copy_table(self, source_table: str, dest_table: str) -> None:
         src = self._safe_ident(source_table, "source table")
         # dest_table is validated inside the subsequent insert_item → upsert_item path.
-        conn = self._get_connection()
-        cur = conn.cursor()
-        cur.execute(f"PRAGMA table_info({src})")
-        columns = [row[1] for row in cur.fetchall()]
-        cur.execute(f"SELECT * FROM {src}")
-        rows = cur.fetchall()
-        conn.close()
+        with self._connection() as conn:
+            cur = conn.execute(f"SELECT * FROM {src}")
+            columns = [d[0] for d in cur.description]
+            rows = cur.fetchall()
         for row in rows:
             row_dict = dict(zip(columns, row))
             item = self.transformer.unflatten(row_dict)
             self.insert_item(dest_table, row_dict['id'], item)
 
     def query(self, querystr: str) -> list:
-        conn = self._get_connection()
-        cur = conn.cursor()
-        cur.execute(querystr)
-        if cur.description:  # SELECT or similar
-            columns = [desc[0] for desc in cur.description]
-            rows = cur.fetchall()
-            conn.close()
-            # Always unflatten rows before returning
-            return [self.transformer.unflatten(dict(zip(columns, row))) for row in rows]
-        else:  # INSERT, UPDATE, DELETE, etc.
-            conn.commit()
-            conn.close()
+        with self._connection() as conn:
+            cur = conn.execute(querystr)
+            if cur.description:  # SELECT or similar
+                # Always unflatten rows before returning
+                return self._rows_to_items(cur)
+            # INSERT, UPDATE, DELETE, DDL, etc. — may have changed a schema.
+            self._commit(conn)
+            self._invalidate_columns()
             return []
 
     def insert_columns(
@@ -256,29 +428,30 @@ class SqliteDatabase(DatabaseAdapter):
         t = self._safe_ident(table, "table name")
         cols_sql = ', '.join(self._safe_ident(c, f"column '{c}'") for c in columns)
         placeholders = ', '.join(['?'] * len(values))
-        conn = self._get_connection()
-        cur = conn.cursor()
+        self._invalidate_columns(table)
         try:
-            cur.execute(
-                f"INSERT OR {conflict_strategy} INTO {t} ({cols_sql}) VALUES ({placeholders})",
-                values,
-            )
-            conn.commit()
-            conn.close()
+            with self._connection() as conn:
+                conn.execute(
+                    f"INSERT OR {conflict_strategy} INTO {t} ({cols_sql}) VALUES ({placeholders})",
+                    values,
+                )
+                self._commit(conn)
             logger.debug(f"Inserted row into {table} with columns {columns}")
         except Exception as e:
             logger.error(f"Failed to insert into {table}: {e}")
-            conn.close()
             raise
     
     def ensure_table(
         self,
         model: type[BaseModel],
-        table_name: str = None
+        table_name: str = None,
+        indexes: Optional[Sequence[Union[str, Sequence[str]]]] = None
     ) -> None:
         """
         Ensure that a table exists for the given Pydantic model.
-        Creates the table with columns based on the Pydantic model fields.
+        Creates the table with columns based on the Pydantic model fields,
+        plus a ``CREATE INDEX IF NOT EXISTS`` per entry of ``indexes`` (a
+        column name, or a sequence of names for a composite index).
         """
         if table_name is None:
             # Convert CamelCase to snake_case
@@ -335,17 +508,30 @@ class SqliteDatabase(DatabaseAdapter):
             columns_sql = ",\n    ".join(columns)
             create_sql = f"CREATE TABLE IF NOT EXISTS {t} (\n    {columns_sql}\n)"
 
-            conn = self._get_connection()
-            cur = conn.cursor()
-            cur.execute(create_sql)
-            conn.commit()
-            conn.close()
+            index_sql = [self._index_sql(table_name, cols) for cols in (indexes or ())]
+
+            with self._connection() as conn:
+                conn.execute(create_sql)
+                for stmt in index_sql:
+                    conn.execute(stmt)
+                self._commit(conn)
+            self._invalidate_columns(table_name)
             logger.info(f"Ensured table '{table_name}' exists for model {model.__name__}")
                 
         except Exception as e:
             logger.error(f"Error ensuring table for model {model.__name__}: {e}")
             raise
     
+    def _index_sql(self, table: str, columns: Union[str, Sequence[str]]) -> str:
+        if isinstance(columns, str):
+            columns = [columns]
+        columns = list(columns)
+        if not columns:
+            raise ValueError(f"empty index definition for table {table!r}")
+        cols_sql = ", ".join(self._safe_ident(c, f"index column '{c}'") for c in columns)
+        name = self._safe_ident(f"ix_{table}_{'_'.join(columns)}", "index name")
+        return f"CREATE INDEX IF NOT EXISTS {name} ON {self._safe_ident(table, 'table name')} ({cols_sql})"
+
     def _get_sqlite_type(self, python_type) -> str:
         """Convert Python/Pydantic type to SQLite type."""
         type_mapping = {
@@ -376,3 +562,40 @@ class SqliteDatabase(DatabaseAdapter):
         
         # Default to TEXT for unknown types
         return "TEXT"
+
+
+# Filter helpers for query_items / search_by_key_part.
+
+
+def _sql_regexp(pattern: str, value: Any) -> bool:
+    return value is not None and re.search(pattern, str(value)) is not None
+
+
+def _prefix_upper_bound(prefix: str) -> Optional[str]:
+    """Smallest string greater than every string starting with ``prefix``
+    (None if there is none, i.e. the prefix is all U+10FFFF)."""
+    for i in range(len(prefix) - 1, -1, -1):
+        if ord(prefix[i]) < 0x10FFFF:
+            return prefix[:i] + chr(ord(prefix[i]) + 1)
+    return None
+
+
+def _json_path(dotted: str) -> str:
+    return "$" + "".join(f'."{part}"' for part in dotted.split("."))
+
+
+def _lookup(item: dict, key: str) -> Any:
+    """``item[key]``, descending into nested dicts for a dotted key whose
+    literal form isn't present."""
+    if key in item or "." not in key:
+        return item.get(key)
+    value: Any = item
+    for part in key.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value
+
+
+def _matches(item: dict, criteria: dict) -> bool:
+    return all(_lookup(item, k) == v for k, v in criteria.items())
@@ -1,4 +1,6 @@
-from typing import List, Dict, Any
+import functools
+from contextlib import contextmanager
+from typing import Iterable, Iterator, List, Dict, Any, Mapping, Optional, Sequence, Union
 import logging
 from tinydb import TinyDB, Query
 from tinydb.storages import JSONStorage
@@ -9,6 +11,8 @@ from .interface import DatabaseAdapter
 import os
 import re
 import json
+import sys
+import threading
 from pydantic import BaseModel
 
 logger = logging.getLogger(__name__)
@@ -20,18 +24,109 @@ class CustomDB(TinyDB):
     table_class = CustomTable  # Use CustomTable with string-based doc_id
 
 
+def _locked(method):
+    """Run an adapter method holding the adapter's lock."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
 class TinyDBDatabase(DatabaseAdapter):
+    """One TinyDB JSON file per table under ``data_dir``.
+
+    TinyDB itself has no locking: every write rewrites the whole table
+    file, so two threads updating one table at once can interleave their
+    read-modify-writes, or truncate the file under each other's reader.
+    Every method here holds one re-entrant adapter lock, so operations
+    through an adapter instance run one at a time. That covers threads
+    sharing the adapter (the factory hands out one per name), not other
+    processes or other instances on the same files.
+    """
+
     def __init__(self, config: DatabaseTinydbConfig):
         self.config = config
         self.base_dir = config.data_dir
         os.makedirs(self.base_dir, exist_ok=True)
+        self._lock = threading.RLock()
+        # Per-thread transaction() state: table -> buffered CustomDB.
+        self._local = threading.local()
         logger.debug(f"TinyDB base directory set to: {self.base_dir}")
 
     def _get_db(self, table: str) -> CustomDB:
         file_path = os.path.join(self.base_dir, f"{table}.json")
-        # return CustomDB(file_path, storage=CachingMiddleware(JSONStorage))
-        return CustomDB(file_path)
+        tx_dbs = getattr(self._local, "tx_dbs", None)
+        if tx_dbs is None:
+            return CustomDB(file_path)
+        db = tx_dbs.get(table)
+        if db is None:
+            # Inside transaction(): every write to this table lands in the
+            # middleware's in-memory copy; the file is rewritten once, at
+            # commit.
+            db = CustomDB(file_path, storage=CachingMiddleware(JSONStorage))
+            db.storage.WRITE_CACHE_SIZE = sys.maxsize
+            tx_dbs[table] = db
+        return db
+
+    @contextmanager
+    def transaction(self) -> Iterator["TinyDBDatabase"]:
+        """Buffer this thread's writes in memory for the block and write
+        each touched table file once on exit. If the block raises, nothing
+        is written. Nested blocks join the outermost one.
+
+        The block holds the adapter lock from start to commit, so it is
+        serializable against every other thread using this adapter: their
+        reads and writes wait until the commit, and none of them can land
+        between the block's first read of a table and the rewrite of that
+        table from its buffered copy. Rows read before the block and
+        written back inside it get no such protection — do the read
+        inside. Other processes, or another adapter instance on the same
+        files, are not locked out at all. Keep blocks short; every other
+        database call in the process waits on them.
+        """
+        if getattr(self._local, "tx_dbs", None) is not None:
+            yield self
+            return
+        with self._lock:
+            self._local.tx_dbs = {}
+            try:
+                yield self
+            except BaseException:
+                for db in self._local.tx_dbs.values():
+                    db.storage.storage.close()  # drop the buffer, don't flush
+                raise
+            else:
+                for db in self._local.tx_dbs.values():
+                    db.close()  # CachingMiddleware.close() flushes
+            finally:
+                self._local.tx_dbs = None
+
+    @_locked
+    def upsert_many(self, table: str, items: Mapping[str, dict]) -> List[dict]:
+        """Insert or replace every row, rewriting the table file once.
+        Unlike ``upsert_item`` (which merges into an existing row and
+        skips None values), each row is written whole."""
+        results = []
+        with self.transaction():
+            db = self._get_db(table)
+            for key, item in items.items():
+                row = dict(item, id=key)
+                if db.contains(doc_id=key):
+                    db.remove(doc_ids=[key])
+                db.insert(Document(row, doc_id=key))
+                results.append(row)
+        return results
+
+    @_locked
+    def delete_many(self, table: str, keys: Iterable[str]) -> None:
+        with self.transaction():
+            db = self._get_db(table)
+            present = [key for key in keys if db.contains(doc_id=key)]
+            if present:
+                db.remove(doc_ids=present)
     
+    @_locked
     def upsert_item(self, table: str, key: str, item: dict) -> dict:
         logger.debug(f"Upserting item into {table} with key {key}: {item}")
         item_exists = self.get_item(table, key)
@@ -41,6 +136,7 @@ class TinyDBDatabase(DatabaseAdapter):
         else:
             return self.insert_item(table, key, item)
 
+    @_locked
     def insert_item(self, table: str, key: str, item: dict) -> dict:
         logger.debug(f"Inserting item into {table} with key {key}: {item}")
         db = self._get_db(table)
@@ -57,6 +153,7 @@ class TinyDBDatabase(DatabaseAdapter):
         logger.debug(f"Item inserted successfully with doc_id={inserted_id}: {item}")
         return item
 
+    @_locked
     def get_item(self, table: str, key: str) -> dict:
         logger.debug(f"Retrieving item from {table} with id: {key}")
         db = self._get_db(table)
@@ -67,6 +164,7 @@ class TinyDBDatabase(DatabaseAdapter):
             logger.warning(f"Item with id {key} not found in {table}")
         return result if result else {}
 
+    @_locked
     def get_all_items(self, table: str) -> list:
         logger.debug(f"Retrieving all items from {table}")
         db = self._get_db(table)
@@ -74,6 +172,7 @@ class TinyDBDatabase(DatabaseAdapter):
         logger.debug(f"Total items retrieved from {table}: {len(items)}")
         return items
 
+    @_locked
     def update_item(self, table: str, key: str, updates: dict, include_nulls: bool = False) -> dict:
         logger.info(f"Updating item in {table} with id {key}: {updates}")
         db = self._get_db(table)
@@ -92,6 +191,7 @@ class TinyDBDatabase(DatabaseAdapter):
             logger.warning(f"Item with id {key} not found in {table}, update skipped")
         return self.get_item(table, key)
 
+    @_locked
     def delete_item(self, table: str, key: str) -> None:
         db = self._get_db(table)
         try:
@@ -99,6 +199,7 @@ class TinyDBDatabase(DatabaseAdapter):
         except KeyError:
             pass  # Ignore if key does not exist
 
+    @_locked
     def search_by_key_part(self, table: str, key_part: str, regex: bool = False) -> List[Dict[str, Any]]:
         """
         Search for items whose keys contain or match a part of the given key.
@@ -123,6 +224,7 @@ class TinyDBDatabase(DatabaseAdapter):
         logger.debug(f"Found {len(matching_items)} matching items in {table}")
         return matching_items
     
+    @_locked
     def query_items(self, table_name: str, criteria: dict):
         table = self._get_db(table_name)
         if not criteria:
@@ -136,6 +238,7 @@ class TinyDBDatabase(DatabaseAdapter):
 
         return table.search(condition)
     
+    @_locked
     def get_binary_item(self, table_name: str, key: str) -> bytes:
         table = self._get_db(table_name)
         item = table.get(doc_id=key)
@@ -144,6 +247,7 @@ class TinyDBDatabase(DatabaseAdapter):
         else:
             raise ValueError(f"Item with key {key} not found in {table_name}")
 
+    @_locked
     def copy_table(self, source_table: str, dest_table: str) -> None:
         source_db = self._get_db(source_table)
         dest_db = self._get_db(dest_table)
@@ -155,6 +259,7 @@ class TinyDBDatabase(DatabaseAdapter):
     def query(self, querystr: str) -> list:
         raise NotImplementedError("Arbitrary query strings are not supported for TinyDBDatabase. Use query_items or other methods.")
     
+    @_locked
     def insert_columns(
         self,
         table: str,
@@ -174,10 +279,12 @@ class TinyDBDatabase(DatabaseAdapter):
         db.insert(item)
         logger.debug(f"Inserted row into {table} with columns {columns}")
     
+    @_locked
     def ensure_table(
         self,
         model: type[BaseModel],
-        table_name: str = None
+        table_name: str = None,
+        indexes: Optional[Sequence[Union[str, Sequence[str]]]] = None
     ) -> None:
         """
         Ensure that a table exists for the given Pydantic model.
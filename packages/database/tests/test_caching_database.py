@@ -0,0 +1,175 @@
+import threading
+
+import pytest
+
+from database.caching_database import CachingDatabase
+from database.tinydb import TinyDBDatabase
+from models.database_tinydb_config import DatabaseTinydbConfig
+
+
+class CountingTinyDB(TinyDBDatabase):
+    """TinyDB that counts full-table reads, so tests can tell a cache hit
+    from a backend round trip."""
+
+    def __init__(self, config):
+        super().__init__(config)
+        self.full_reads = 0
+
+    def get_all_items(self, table):
+        self.full_reads += 1
+        return super().get_all_items(table)
+
+
+@pytest.fixture
+def backend(tmp_path):
+    return CountingTinyDB(DatabaseTinydbConfig(data_dir=str(tmp_path)))
+
+
+@pytest.fixture
+def cached(backend):
+    backend.insert_item("hot", "a", {"name": "a", "type": "servo"})
+    backend.insert_item("hot", "b", {"name": "b", "type": "camera"})
+    return CachingDatabase(backend, ["hot"])
+
+
+def test_reads_hit_memory_after_first_load(cached, backend):
+    assert {row["id"] for row in cached.get_all_items("hot")} == {"a", "b"}
+    assert cached.get_item("hot", "a")["name"] == "a"
+    assert cached.get_item("hot", "missing") == {}
+    assert [row["id"] for row in cached.query_items("hot", {"type": "camera"})] == ["b"]
+    assert [row["id"] for row in cached.search_by_key_part("hot", "^b$", regex=True)] == ["b"]
+    assert backend.full_reads == 1
+    stats = cached.stats()
+    assert stats["misses"] == 1
+    assert stats["hits"] == 4
+    assert stats["tables"]["hot"]["rows"] == 2
+
+
+def test_writes_go_through_and_update_cached_rows(cached, backend):
+    cached.get_all_items("hot")
+    cached.upsert_item("hot", "c", {"name": "c", "type": "servo"})
+    cached.update_item("hot", "a", {"type": "camera"})
+    cached.delete_item("hot", "b")
+
+    assert {row["id"]: row["type"] for row in cached.get_all_items("hot")} == {"a": "camera", "c": "servo"}
+    assert backend.full_reads == 1
+    # ...and the backend has the same rows.
+    assert {row["id"]: row["type"] for row in backend.get_all_items("hot")} == {"a": "camera", "c": "servo"}
+
+
+def test_returned_rows_are_copies(cached):
+    cached.get_item("hot", "a")["name"] = "mutated"
+    cached.get_all_items("hot")[0]["type"] = "mutated"
+    assert cached.get_item("hot", "a")["name"] == "a"
+    assert {row["type"] for row in cached.get_all_items("hot")} == {"servo", "camera"}
+
+
+def test_ttl_expiry_reloads(backend, monkeypatch):
+    backend.insert_item("hot", "a", {"name": "a"})
+    cached = CachingDatabase(backend, {"hot": 10.0})
+    now = [1000.0]
+    monkeypatch.setattr("database.caching_database.time.monotonic", lambda: now[0])
+    cached.get_all_items("hot")
+    now[0] += 5
+    cached.get_all_items("hot")
+    assert backend.full_reads == 1
+    now[0] += 6
+    cached.get_all_items("hot")
+    assert backend.full_reads == 2
+
+
+def test_zero_ttl_means_always_reread(backend):
+    backend.insert_item("hot", "a", {"name": "a"})
+    cached = CachingDatabase(backend, ["hot"], ttl_s=0)
+    assert cached.cached_tables() == []
+    cached.get_all_items("hot")
+    backend.update_item("hot", "a", {"name": "changed"})
+    assert cached.get_all_items("hot")[0]["name"] == "changed"
+    assert backend.full_reads == 2
+    assert CachingDatabase(backend, {"hot": 0, "warm": None}).cached_tables() == ["warm"]
+
+
+def test_dotted_criteria_match_like_the_backend(tmp_path):
+    from database.sqlite_database import SqliteDatabase
+    from models.database_sqlite_config import DatabaseSqliteConfig
+
+    SqliteDatabase._instance = None
+    inner = SqliteDatabase(DatabaseSqliteConfig(sqlite_path=str(tmp_path / "t.sqlite3")))
+    try:
+        inner.query("CREATE TABLE hot (id TEXT PRIMARY KEY, config TEXT)")
+        inner.insert_item("hot", "a", {"config": {"mode": "fast"}})
+        inner.insert_item("hot", "b", {"config": {"mode": "slow"}})
+        cached = CachingDatabase(inner, ["hot"])
+        cached.get_all_items("hot")
+        assert [r["id"] for r in cached.query_items("hot", {"config.mode": "fast"})] == ["a"]
+    finally:
+        inner.close()
+        SqliteDatabase._instance = None
+
+
+def test_uncached_tables_pass_through(cached, backend):
+    cached.insert_item("cold", "x", {"name": "x"})
+    cached.get_all_items("cold")
+    cached.get_all_items("cold")
+    assert backend.full_reads == 2
+    assert "cold" not in cached.stats()["tables"]
+
+
+def test_write_during_load_is_not_overwritten_by_stale_snapshot(backend):
+    backend.insert_item("hot", "a", {"v": 1})
+    cached = CachingDatabase(backend, ["hot"])
+    release = threading.Event()
+    loading = threading.Event()
+    original = backend.get_all_items
+
+    def slow_get_all(table):
+        rows = original(table)
+        loading.set()
+        release.wait(5)
+        return rows
+
+    backend.get_all_items = slow_get_all
+    reader = threading.Thread(target=cached.get_all_items, args=("hot",))
+    reader.start()
+    loading.wait(5)
+    cached.update_item("hot", "a", {"v": 2})
+    release.set()
+    reader.join(5)
+    backend.get_all_items = original
+
+    assert cached.get_item("hot", "a")["v"] == 2
+
+
+def test_batch_writes_invalidate_and_failed_transaction_drops_cache(cached, backend):
+    cached.get_all_items("hot")
+    cached.upsert_many("hot", {"c": {"name": "c", "type": "servo"}})
+    cached.delete_many("hot", ["a"])
+    assert {row["id"] for row in cached.get_all_items("hot")} == {"b", "c"}
+
+    with pytest.raises(RuntimeError):
+        with cached.transaction():
+            cached.update_item("hot", "b", {"name": "renamed"})
+            raise RuntimeError("boom")
+    assert cached.get_item("hot", "b")["name"] == "b"
+
+
+def test_transaction_and_concurrent_cached_write_do_not_deadlock(cached):
+    # The transaction takes the cache's write lock before the backend's
+    # lock, the same order a plain cached write does.
+    entered = threading.Event()
+    done = threading.Event()
+
+    def writer():
+        entered.wait()
+        cached.update_item("hot", "b", {"name": "b2"})
+        done.set()
+
+    th = threading.Thread(target=writer, daemon=True)
+    th.start()
+    with cached.transaction():
+        cached.update_item("hot", "a", {"name": "a1"})
+        entered.set()
+        assert not done.wait(0.1)
+        cached.upsert_many("hot", {"c": {"name": "c"}})
+    assert done.wait(5)
+    assert {row["id"]: row["name"] for row in cached.get_all_items("hot")} == {"a": "a1", "b": "b2", "c": "c"}
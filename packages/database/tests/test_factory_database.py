@@ -66,6 +66,13 @@ def test_get_database_unsupported():
     with pytest.raises(ValueError):
         get_database(lambda: UnsupportedConfig())
 
+def test_get_database_with_cache_tables(tmp_path):
+    from database.caching_database import CachingDatabase
+    db = get_database(lambda: DatabaseTinydbConfig(data_dir=str(tmp_path)), cache_tables={"hot": 5.0})
+    assert isinstance(db, CachingDatabase)
+    assert isinstance(db.inner, TinyDBDatabase)
+    assert db.cached_tables() == ["hot"]
+
 def test_get_db_alias():
     db = get_db(make_config("tinydb"))
     assert isinstance(db, TinyDBDatabase)
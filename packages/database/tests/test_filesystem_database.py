@@ -1,7 +1,10 @@
+import json
 import os
 import shutil
 import tempfile
+from types import SimpleNamespace
 import pytest
+from pydantic import BaseModel
 from database.filesystem_database import FilesystemDatabase
 
 def make_temp_db():
@@ -66,3 +69,104 @@ def test_copy_table(fs_db):
     assert len(dest_items) == 3
     dest_uuids = {item["uuid"] for item in dest_items}
     assert dest_uuids == {"1", "2", "3"}
+
+@pytest.fixture
+def isolated_fs_db(tmp_path):
+    # the dict config above is ignored (base_dir falls back to ./data), so
+    # these tests point ``database_dir`` at a private directory instead
+    return FilesystemDatabase(SimpleNamespace(database_dir=str(tmp_path)))
+
+def test_transaction_stages_writes_until_commit(isolated_fs_db):
+    fs_db = isolated_fs_db
+    fs_db.insert_item("test", "a", {"id": "a", "value": 1})
+    with fs_db.transaction():
+        fs_db.upsert_many("test", {"b": {"id": "b", "value": 2}})
+        fs_db.delete_many("test", ["a"])
+        # visible to reads in the block, not yet on disk
+        assert [row["id"] for row in fs_db.get_all_items("test")] == ["b"]
+        assert fs_db.get_item("test", "a") == {}
+        assert os.path.exists(os.path.join(fs_db.base_dir, "test", "a"))
+    assert [row["id"] for row in fs_db.get_all_items("test")] == ["b"]
+    assert sorted(os.listdir(os.path.join(fs_db.base_dir, "test"))) == [".index.json", "b"]
+
+def test_transaction_discards_writes_on_error(isolated_fs_db):
+    fs_db = isolated_fs_db
+    fs_db.insert_item("test", "a", {"id": "a", "value": 1})
+    with pytest.raises(RuntimeError):
+        with fs_db.transaction():
+            fs_db.update_item("test", "a", {"value": 9})
+            fs_db.insert_item("test", "b", {"id": "b"})
+            raise RuntimeError("boom")
+    assert fs_db.get_item("test", "a")["value"] == 1
+    assert fs_db.get_item("test", "b") == {}
+
+def test_reads_reuse_unchanged_files_and_see_external_edits(isolated_fs_db, monkeypatch):
+    db = isolated_fs_db
+    for i in range(5):
+        db.insert_item("t", f"k{i}", {"id": f"k{i}", "n": i})
+    opened = []
+    real_open = open
+    monkeypatch.setattr("builtins.open", lambda path, *a, **kw: (opened.append(path), real_open(path, *a, **kw))[1])
+    assert sorted(row["n"] for row in db.get_all_items("t")) == [0, 1, 2, 3, 4]
+    assert opened == []  # every row came from the read cache
+
+    # another writer replaces one file behind our back
+    path = os.path.join(db.base_dir, "t", "k3")
+    with real_open(path + ".new", "w") as f:
+        json.dump({"id": "k3", "n": 33}, f)
+    os.replace(path + ".new", path)
+    assert sorted(row["n"] for row in db.get_all_items("t")) == [0, 1, 2, 4, 33]
+    assert opened == [path]
+
+def test_index_lets_cold_queries_skip_files(tmp_path, monkeypatch):
+    writer = FilesystemDatabase(SimpleNamespace(database_dir=str(tmp_path)))
+    writer.ensure_table(BaseModel, table_name="svc", indexes=["type"])
+    for i in range(6):
+        writer.insert_item("svc", f"svc-{i}", {"id": f"svc-{i}", "type": "camera" if i % 3 == 0 else "servo"})
+    writer.close()
+
+    reader = FilesystemDatabase(SimpleNamespace(database_dir=str(tmp_path)))  # cold cache
+    opened = []
+    real_open = open
+    monkeypatch.setattr("builtins.open", lambda path, *a, **kw: (opened.append(os.path.basename(path)), real_open(path, *a, **kw))[1])
+    assert sorted(row["id"] for row in reader.query_items("svc", {"type": "camera"})) == ["svc-0", "svc-3"]
+    assert sorted(row["id"] for row in reader.search_by_key_part("svc", "svc-5")) == ["svc-5"]
+    assert sorted(opened) == [".index.json", "svc-0", "svc-3", "svc-5"]
+
+def test_writes_are_atomic_replacements(isolated_fs_db, monkeypatch):
+    db = isolated_fs_db
+    db.insert_item("t", "a", {"id": "a", "v": 1})
+
+    def boom(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(os, "replace", boom)
+    with pytest.raises(OSError):
+        db.update_item("t", "a", {"v": 2})
+    monkeypatch.undo()
+    # the live file was never opened for writing, so it still holds v=1
+    with open(os.path.join(db.base_dir, "t", "a")) as f:
+        assert json.load(f) == {"id": "a", "v": 1}
+
+def test_concurrent_writers_of_one_key_do_not_collide(isolated_fs_db):
+    import threading
+    db = isolated_fs_db
+    db.insert_item("t", "a", {"id": "a", "v": 0})
+    errors = []
+
+    def writer(n):
+        try:
+            for i in range(25):
+                db.update_item("t", "a", {"v": n * 100 + i})
+                db._flush_index("t", force=True)
+        except Exception as e:  # noqa: BLE001
+            errors.append(e)
+
+    threads = [threading.Thread(target=writer, args=(n,)) for n in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert errors == []
+    assert db.get_item("t", "a")["id"] == "a"
+    assert [n for n in os.listdir(os.path.join(db.base_dir, "t")) if n.endswith(".tmp")] == []
@@ -247,6 +247,45 @@ def test_query_items_rejects_sql_injection_field_name(postgres_db):
     postgres_db._mock_cursor.execute.assert_not_called()
 
 
+def test_query_items_builds_null_json_and_nested_predicates(postgres_db):
+    postgres_db.query_items("test", {"status": "active", "revoked_at": None, "tags": ["a"], "config.mode": "fast"})
+
+    stmt, params = postgres_db._mock_cursor.execute.call_args.args
+    rendered = _render(stmt)
+    assert '"status" = %s' in rendered
+    assert '"revoked_at" IS NULL' in rendered
+    assert '"tags" = %s::jsonb' in rendered
+    assert '"config" #> %s = %s::jsonb' in rendered
+    assert params == ["active", '["a"]', ["mode"], '"fast"']
+
+
+def test_search_by_key_part_prefix_and_regex(postgres_db):
+    postgres_db.search_by_key_part("test", "svc_1%")
+    stmt, params = postgres_db._mock_cursor.execute.call_args.args
+    assert "LIKE %s ESCAPE" in _render(stmt)
+    assert params == ("svc\\_1\\%%",)
+
+    postgres_db.search_by_key_part("test", "^svc-[0-9]+$", regex=True)
+    stmt, params = postgres_db._mock_cursor.execute.call_args.args
+    assert "id ~ %s" in _render(stmt)
+    assert params == ("^svc-[0-9]+$",)
+
+
+def test_ensure_table_creates_indexes(postgres_db):
+    class SessionModel(BaseModel):
+        id: str
+        user_id: str
+        status: str
+
+    postgres_db._mock_cursor.fetchall.return_value = [
+        {"column_name": c, "data_type": "text", "udt_name": "text"} for c in ("id", "user_id", "status")
+    ]
+    postgres_db.ensure_table(SessionModel, "session", indexes=[("user_id", "status")])
+
+    rendered = [_render(call.args[0]) for call in postgres_db._mock_cursor.execute.call_args_list]
+    assert 'CREATE INDEX IF NOT EXISTS "ix_session_user_id_status" ON "session" ("user_id", "status")' in rendered
+
+
 def test_query_logs_rendered_sql_when_debug_enabled(postgres_db):
     postgres_db._mock_cursor.mogrify.return_value = b'SELECT * FROM "test" WHERE id = \'1\''
 
@@ -259,3 +298,37 @@ def test_query_logs_rendered_sql_when_debug_enabled(postgres_db):
         call.args == ("SQL: %s", 'SELECT * FROM "test" WHERE id = \'1\'')
         for call in mock_debug.call_args_list
     )
+
+
+def _render(node) -> str:
+    from psycopg2 import sql as _pgsql
+    if isinstance(node, _pgsql.Identifier):
+        return '"' + '"."'.join(node.strings) + '"'
+    if isinstance(node, _pgsql.SQL):
+        return node.string
+    if isinstance(node, _pgsql.Composed):
+        return "".join(_render(c) for c in node.seq)
+    return str(node)
+
+
+def test_upsert_many_batches_rows_in_one_transaction(postgres_db):
+    with patch("database.postgres_database.execute_values") as mock_values:
+        mock_values.return_value = [{"id": "a"}, {"id": "b"}]
+        rows = postgres_db.upsert_many("test", {"a": {"value": 1}, "b": {"value": 2}})
+
+    assert rows == [{"id": "a"}, {"id": "b"}]
+    assert mock_values.call_count == 1  # same column set -> one statement
+    stmt, values = mock_values.call_args.args[1:3]
+    assert "ON CONFLICT (id) DO UPDATE" in _render(stmt)
+    assert [v[-1] for v in values] == ["a", "b"]
+    postgres_db._mock_conn.commit.assert_called_once()
+
+
+def test_transaction_rolls_back_on_error(postgres_db):
+    with pytest.raises(RuntimeError):
+        with postgres_db.transaction():
+            postgres_db.delete_many("test", ["a", "b"])
+            raise RuntimeError("boom")
+    postgres_db._mock_conn.rollback.assert_called_once()
+    postgres_db._mock_conn.commit.assert_not_called()
+    postgres_db._mock_pool.putconn.assert_called_with(postgres_db._mock_conn, close=True)
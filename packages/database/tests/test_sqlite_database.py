@@ -1,4 +1,5 @@
 import os
+import re
 import tempfile
 import shutil
 import pytest
@@ -27,6 +28,7 @@ def sqlite_db():
     db = SqliteDatabase(config)
     ensure_table(db, "test")
     yield db
+    db.close()
     shutil.rmtree(temp_dir)
     SqliteDatabase._instance = None
 
@@ -72,6 +74,51 @@ def test_query_items(sqlite_db):
     assert len(results) == 1
     assert results[0]["uuid"] == "1"
 
+def test_query_items_pushes_criteria_into_sql(sqlite_db):
+    sqlite_db.insert_item("test", "1", {"uuid": "1", "type": "A", "name": None})
+    sqlite_db.insert_item("test", "2", {"uuid": "2", "type": "A", "name": "n"})
+    sqlite_db.insert_item("test", "3", {"uuid": "3", "type": "B"})
+    statements = []
+    sqlite_db._get_connection().set_trace_callback(statements.append)
+    try:
+        results = sqlite_db.query_items("test", {"type": "A", "name": None})
+    finally:
+        sqlite_db._get_connection().set_trace_callback(None)
+    assert [r["uuid"] for r in results] == ["1"]
+    assert any('WHERE "type" = ' in s and '"name" IS NULL' in s for s in statements)
+
+def test_query_items_nested_and_non_column_criteria(sqlite_db):
+    table = "nested"
+    sqlite_db.query(f'CREATE TABLE {table} (id TEXT PRIMARY KEY, config TEXT, count TEXT)')
+    sqlite_db.insert_item(table, "a", {"config": {"mode": "fast", "level": 2}, "count": 3})
+    sqlite_db.insert_item(table, "b", {"config": {"mode": "slow", "level": 2}, "count": 3})
+    sqlite_db.insert_item(table, "c", {"config": "not json", "count": 4})
+    assert [r["id"] for r in sqlite_db.query_items(table, {"config.mode": "fast"})] == ["a"]
+    # Non-str values and unknown keys are checked in Python.
+    assert {r["id"] for r in sqlite_db.query_items(table, {"config.level": 2, "count": 3})} == {"a", "b"}
+    assert sqlite_db.query_items(table, {"missing": "x"}) == []
+
+def test_search_by_key_part_prefix_is_case_sensitive_and_literal(sqlite_db):
+    for key in ("ab_1", "abc", "AB_2", "xab_"):
+        sqlite_db.insert_item("test", key, {"uuid": key})
+    assert {r["id"] for r in sqlite_db.search_by_key_part("test", "ab")} == {"ab_1", "abc"}
+    assert {r["id"] for r in sqlite_db.search_by_key_part("test", "ab_")} == {"ab_1"}
+    assert {r["id"] for r in sqlite_db.search_by_key_part("test", "_\\d$", regex=True)} == {"ab_1", "AB_2"}
+    with pytest.raises(re.error):
+        sqlite_db.search_by_key_part("test", "(", regex=True)
+
+def test_ensure_table_creates_secondary_indexes(sqlite_db):
+    sqlite_db.ensure_table(SqliteTestItemModel, table_name="indexed", indexes=["type", ("name", "value")])
+    # Idempotent.
+    sqlite_db.ensure_table(SqliteTestItemModel, table_name="indexed", indexes=["type", ("name", "value")])
+    conn = sqlite_db._get_connection()
+    names = {row[1] for row in conn.execute('PRAGMA index_list("indexed")').fetchall()}
+    assert {"ix_indexed_type", "ix_indexed_name_value"} <= names
+    plan = conn.execute('EXPLAIN QUERY PLAN SELECT * FROM "indexed" WHERE "type" = ?', ("A",)).fetchall()
+    assert any("ix_indexed_type" in row[-1] for row in plan)
+    with pytest.raises(ValueError):
+        sqlite_db.ensure_table(SqliteTestItemModel, table_name="indexed", indexes=["bad col"])
+
 def test_copy_table(sqlite_db):
     ensure_table(sqlite_db, "source")
     ensure_table(sqlite_db, "dest")
@@ -141,3 +188,107 @@ def test_query_sqlite_query(sqlite_db):
     results = sqlite_db.query("SELECT * FROM test WHERE id = '1'")
     assert len(results) == 1
     assert results[0]["id"] == "1"
+
+
+def test_thread_local_connection_is_reused(sqlite_db):
+    assert sqlite_db.connection_mode == "thread_local"
+    assert sqlite_db._get_connection() is sqlite_db._get_connection()
+    mode = sqlite_db._get_connection().execute("PRAGMA journal_mode").fetchone()[0]
+    assert mode.lower() == "wal"
+
+
+def test_connections_are_per_thread_and_see_each_others_writes(sqlite_db):
+    import threading
+
+    seen = {}
+
+    def worker():
+        seen["conn"] = sqlite_db._get_connection()
+        sqlite_db.insert_item("test", "from-thread", {"uuid": "t"})
+
+    t = threading.Thread(target=worker)
+    t.start()
+    t.join()
+    assert seen["conn"] is not sqlite_db._get_connection()
+    assert sqlite_db.get_item("test", "from-thread")["uuid"] == "t"
+
+
+def test_failed_write_does_not_poison_persistent_connection(sqlite_db):
+    with pytest.raises(Exception):
+        sqlite_db.insert_item("test", "bad", {"no_such_column": 1})
+    assert not sqlite_db._get_connection().in_transaction
+    sqlite_db.insert_item("test", "good", {"uuid": "g"})
+    assert sqlite_db.get_item("test", "good")["uuid"] == "g"
+
+
+def test_column_cache_invalidation(sqlite_db):
+    conn = sqlite_db._get_connection()
+    assert sqlite_db._table_columns(conn, "wide") == []  # missing → not cached
+    sqlite_db.query('CREATE TABLE wide ("id" TEXT PRIMARY KEY, "json" TEXT)')
+    assert sqlite_db._table_columns(conn, "wide") == ["id", "json"]
+    assert "wide" in sqlite_db._columns
+    ensure_table(sqlite_db, "wide")
+    assert "wide" not in sqlite_db._columns
+    sqlite_db._table_columns(conn, "wide")
+    sqlite_db.insert_columns("wide", ["id", "json"], ["k", '{"a": 1}'])
+    assert "wide" not in sqlite_db._columns
+    assert sqlite_db.get_binary_item("wide", "k") == b'{"a": 1}'
+
+
+def test_per_call_mode_and_close():
+    temp_dir = tempfile.mkdtemp()
+    SqliteDatabase._instance = None
+    try:
+        db = SqliteDatabase(DatabaseSqliteConfig(
+            sqlite_path=os.path.join(temp_dir, "per_call.sqlite3"), connection_mode="per_call",
+        ))
+        ensure_table(db, "test")
+        assert db._get_connection() is not db._get_connection()
+        db.insert_item("test", "1", {"uuid": "1"})
+        assert db.get_item("test", "1")["uuid"] == "1"
+        db.close()
+    finally:
+        SqliteDatabase._instance = None
+        shutil.rmtree(temp_dir)
+
+
+def test_rejects_unknown_connection_mode():
+    SqliteDatabase._instance = None
+    try:
+        with pytest.raises(ValueError):
+            SqliteDatabase(DatabaseSqliteConfig(sqlite_path=":memory:", connection_mode="pool"))
+    finally:
+        SqliteDatabase._instance = None
+
+
+def test_upsert_many_and_delete_many(sqlite_db):
+    sqlite_db.insert_item("test", "1", {"uuid": "1", "value": "old", "name": "n1"})
+    sqlite_db.upsert_many("test", {
+        "1": {"uuid": "1", "value": "new"},
+        "2": {"uuid": "2", "value": "b", "type": "t"},
+        "3": {"uuid": "3", "value": "c"},
+    })
+    assert sorted(row["id"] for row in sqlite_db.get_all_items("test")) == ["1", "2", "3"]
+    # replace, not merge
+    assert sqlite_db.get_item("test", "1")["value"] == "new"
+    assert sqlite_db.get_item("test", "1")["name"] is None
+    assert sqlite_db.get_item("test", "2")["type"] == "t"
+
+    sqlite_db.delete_many("test", ["1", "3", "missing"])
+    assert [row["id"] for row in sqlite_db.get_all_items("test")] == ["2"]
+
+
+def test_transaction_commits_once_and_rolls_back_on_error(sqlite_db):
+    with sqlite_db.transaction():
+        sqlite_db.insert_item("test", "1", {"uuid": "1"})
+        with sqlite_db.transaction():  # nested joins the outer block
+            sqlite_db.upsert_many("test", {"2": {"uuid": "2"}})
+        assert sqlite_db.get_item("test", "2")["uuid"] == "2"
+    assert {row["id"] for row in sqlite_db.get_all_items("test")} == {"1", "2"}
+
+    with pytest.raises(RuntimeError):
+        with sqlite_db.transaction():
+            sqlite_db.delete_item("test", "1")
+            sqlite_db.insert_item("test", "3", {"uuid": "3"})
+            raise RuntimeError("boom")
+    assert {row["id"] for row in sqlite_db.get_all_items("test")} == {"1", "2"}
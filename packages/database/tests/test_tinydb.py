@@ -112,3 +112,79 @@ def test_copy_table(temp_db):
     assert len(dest_items) == 3
     dest_uuids = {item["uuid"] for item in dest_items}
     assert dest_uuids == {"1", "2", "3"}
+
+def test_upsert_many_replaces_rows_in_one_write(temp_db, monkeypatch):
+    temp_db.insert_item("test", "a", {"name": "old", "extra": 1})
+    from tinydb.storages import JSONStorage
+    writes = []
+    original = JSONStorage.write
+    monkeypatch.setattr(JSONStorage, "write", lambda self, data: (writes.append(1), original(self, data)))
+
+    temp_db.upsert_many("test", {"a": {"name": "A"}, "b": {"name": "B"}, "c": {"name": "C"}})
+    assert len(writes) == 1
+    assert temp_db.get_item("test", "a") == {"id": "a", "name": "A"}
+    assert {row["id"] for row in temp_db.get_all_items("test")} == {"a", "b", "c"}
+
+    temp_db.delete_many("test", ["a", "b", "zzz"])
+    assert [row["id"] for row in temp_db.get_all_items("test")] == ["c"]
+
+def test_transaction_rollback_leaves_file_untouched(temp_db):
+    temp_db.insert_item("test", "a", {"name": "A"})
+    with pytest.raises(RuntimeError):
+        with temp_db.transaction():
+            temp_db.upsert_many("test", {"b": {"name": "B"}})
+            temp_db.delete_item("test", "a")
+            raise RuntimeError("boom")
+    assert [row["id"] for row in temp_db.get_all_items("test")] == ["a"]
+
+def test_concurrent_updates_from_threads_are_all_kept(temp_db):
+    # Boot starts services on a thread pool; each start updates its own
+    # service_proxy row in the same table file.
+    import threading
+    keys = [f"svc-{n}" for n in range(8)]
+    for key in keys:
+        temp_db.insert_item("service_proxy", key, {"status": "stopped", "n": 0})
+    errors = []
+
+    def worker(key):
+        try:
+            for i in range(1, 21):
+                temp_db.update_item("service_proxy", key, {"status": "running", "n": i})
+        except Exception as e:  # noqa: BLE001
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(key,)) for key in keys]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert errors == []
+    rows = {row["id"]: row for row in temp_db.get_all_items("service_proxy")}
+    assert all(rows[key]["n"] == 20 and rows[key]["status"] == "running" for key in keys)
+
+def test_transaction_holds_off_other_threads_until_commit(temp_db):
+    # Without the lock, the other thread's update lands mid-block and the
+    # commit rewrites the table from the block's older copy, losing it.
+    import threading
+    import time
+    temp_db.insert_item("t", "a", {"v": 0})
+    temp_db.insert_item("t", "b", {"v": 0})
+    entered = threading.Event()
+    done = threading.Event()
+
+    def other():
+        entered.wait()
+        temp_db.update_item("t", "b", {"v": 2})
+        done.set()
+
+    th = threading.Thread(target=other)
+    th.start()
+    with temp_db.transaction():
+        temp_db.get_all_items("t")
+        entered.set()
+        assert not done.wait(0.1)
+        temp_db.update_item("t", "a", {"v": 1})
+    th.join(5)
+    assert done.is_set()
+    assert temp_db.get_item("t", "a")["v"] == 1
+    assert temp_db.get_item("t", "b")["v"] == 2
@@ -1 +1 @@
-from .invoker import invoker, module_function_exists, safe_invoke
+from .invoker import invalidate, invoker, module_function_exists, reload, resolve, safe_invoke
@@ -1,5 +1,13 @@
 import importlib
 import importlib.util
+import sys
+import threading
+
+# (module_name, function_name) -> resolved attribute, or None when the
+# module or function is missing. Filled by resolve(), dropped by
+# invalidate() / reload().
+_resolved = {}
+_resolved_lock = threading.Lock()
 
 def invoker(module_name, function_name, parameters=None):
     """
@@ -37,9 +45,66 @@ def module_function_exists(module_name, function_name):
     module = importlib.import_module(module_name)
     return hasattr(module, function_name)
 
+def resolve(module_name, function_name):
+    """
+    Look up ``module_name.function_name`` once and cache the result.
+
+    The first call goes through ``find_spec`` / ``import_module``; later
+    calls are a dict lookup. A missing module or function resolves to
+    None and is cached too, unless the module is still mid-import (a
+    circular import can't see functions defined further down yet).
+    Import errors raised by the module itself propagate and are not cached.
+
+    Args:
+        module_name (str): The name of the module.
+        function_name (str): The name of the function.
+
+    Returns:
+        The function, or None if the module or function does not exist.
+    """
+    key = (module_name, function_name)
+    try:
+        return _resolved[key]
+    except KeyError:
+        pass
+    func = None
+    if module_function_exists(module_name, function_name):
+        func = getattr(importlib.import_module(module_name), function_name)
+    module = sys.modules.get(module_name)
+    if func is None and getattr(getattr(module, "__spec__", None), "_initializing", False):
+        return None
+    with _resolved_lock:
+        _resolved[key] = func
+    return func
+
+def invalidate(module_name=None):
+    """
+    Drop cached resolve() results for one module, or all of them when
+    ``module_name`` is None. The next call resolves again.
+    """
+    with _resolved_lock:
+        if module_name is None:
+            _resolved.clear()
+            return
+        for key in [key for key in _resolved if key[0] == module_name]:
+            del _resolved[key]
+
+def reload(module_name):
+    """
+    Re-execute a module with ``importlib.reload`` and invalidate its cached
+    functions, so safe_invoke() picks up the new definitions.
+
+    Returns:
+        The reloaded module.
+    """
+    module = importlib.reload(importlib.import_module(module_name))
+    invalidate(module_name)
+    return module
+
 def safe_invoke(module_name, function_name, parameters=None):
     """
     Safely invoke a function by checking if the module and function exist.
+    The lookup is cached by resolve(); see reload() to pick up changes.
 
     Args:
         module_name (str): The name of the module.
@@ -49,7 +114,10 @@ def safe_invoke(module_name, function_name, parameters=None):
     Returns:
         The result of the function call if successful, or None if the module or function does not exist.
     """
-    if not module_function_exists(module_name, function_name):
+    func = resolve(module_name, function_name)
+    if func is None:
         print(f"Module '{module_name}' or function '{function_name}' not found.")
         return None
-    return invoker(module_name, function_name, parameters)
+    if parameters is None:
+        return func()
+    return func(*parameters)
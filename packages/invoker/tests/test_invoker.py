@@ -1,5 +1,11 @@
+import importlib
+import sys
+
 import pytest
-from invoker import invoker, module_function_exists, safe_invoke
+from invoker import invalidate, invoker, module_function_exists, reload, resolve, safe_invoke
+
+# the module, not the same-named function the package re-exports
+invoker_module = importlib.import_module("invoker.invoker")
 
 
 def test_invoker_with_parameters():
@@ -54,3 +60,37 @@ def test_safe_invoke_without_parameters():
     result = safe_invoke("random", "random")
     assert isinstance(result, float)
     assert 0.0 <= result <= 1.0
+
+
+@pytest.fixture
+def hook_module(tmp_path, monkeypatch):
+    monkeypatch.syspath_prepend(str(tmp_path))
+    (tmp_path / "invoker_hook_mod.py").write_text("def hook(x):\n    return x + 1\n")
+    yield tmp_path / "invoker_hook_mod.py"
+    invalidate("invoker_hook_mod")
+    sys.modules.pop("invoker_hook_mod", None)
+
+
+def test_resolve_caches_lookup(hook_module, monkeypatch):
+    func = resolve("invoker_hook_mod", "hook")
+    assert func(1) == 2
+    calls = []
+    monkeypatch.setattr(invoker_module, "module_function_exists", lambda *a: calls.append(a))
+    assert resolve("invoker_hook_mod", "hook") is func
+    assert safe_invoke("invoker_hook_mod", "hook", [2]) == 3
+    assert calls == []
+
+
+def test_resolve_caches_missing_function(hook_module):
+    assert resolve("invoker_hook_mod", "absent") is None
+    assert ("invoker_hook_mod", "absent") in invoker_module._resolved
+
+
+def test_reload_invalidates_cached_function(hook_module):
+    assert safe_invoke("invoker_hook_mod", "hook", [1]) == 2
+    hook_module.write_text("def hook(x):\n    return x * 10\n\ndef added():\n    return 'new'\n")
+    importlib.invalidate_caches()
+    assert safe_invoke("invoker_hook_mod", "hook", [1]) == 2  # still cached
+    reload("invoker_hook_mod")
+    assert safe_invoke("invoker_hook_mod", "hook", [1]) == 10
+    assert safe_invoke("invoker_hook_mod", "added") == "new"
@@ -10,6 +10,8 @@ class DatabaseSqliteConfig(BaseModel):
     id: Optional[str] = Field("default", json_schema_extra={"example":"default"})
     name: Optional[str] = Field("default", description="The default name of this client", json_schema_extra={"example":"database"})
     sqlite_path: Optional[str] = Field("data/sqlite_db.sqlite3", description="Database Directory", json_schema_extra={"example":"data/sqlite_db.sqlite3"})
+    connection_mode: Optional[str] = Field("thread_local", description="thread_local reuses one connection per thread; per_call opens one per operation", json_schema_extra={"example":"thread_local"})
+    journal_mode: Optional[str] = Field("WAL", description="SQLite journal_mode pragma applied to each connection", json_schema_extra={"example":"WAL"})
 
 # managed
     @classmethod
@@ -13,6 +13,11 @@ text, recorder, level meter) reads one format regardless of source:
       "data":        str,        # base64 of the raw PCM bytes
     }
 
+``data`` may instead be raw ``bytes`` (``encode_frame(..., binary=True)``)
+for producers on a MessagePack bus connection; JSON consumers still see
+base64 because the bus JSON codec base64s ``bytes`` on the way out, and
+``decode_frame`` accepts either form.
+
 Keeping the encode/decode + level math in ONE module is what guarantees
 the two service types can't drift apart. PCM is ``s16le`` because it's the
 lowest-common-denominator both a PortAudio RawInputStream and a browser
@@ -29,21 +34,28 @@ from typing import Any, Dict, Tuple
 FORMAT = "pcm_s16le"
 
 
-def encode_frame(seq: int, ts: float, sample_rate: int, channels: int, pcm: bytes) -> Dict[str, Any]:
-    """Build a wire frame from raw ``s16le`` PCM bytes."""
+def encode_frame(
+    seq: int, ts: float, sample_rate: int, channels: int, pcm: bytes,
+    *, binary: bool = False,
+) -> Dict[str, Any]:
+    """Build a wire frame from raw ``s16le`` PCM bytes. ``binary=True``
+    keeps ``data`` as bytes instead of base64 text."""
     return {
         "seq": int(seq),
         "ts": float(ts),
         "sample_rate": int(sample_rate),
         "channels": int(channels),
         "format": FORMAT,
-        "data": base64.b64encode(pcm).decode("ascii"),
+        "data": bytes(pcm) if binary else base64.b64encode(pcm).decode("ascii"),
     }
 
 
 def decode_frame(frame: Dict[str, Any]) -> bytes:
-    """Raw PCM bytes back out of a wire frame."""
-    return base64.b64decode(frame.get("data") or "")
+    """Raw PCM bytes back out of a wire frame (base64 or native bytes)."""
+    data = frame.get("data") or ""
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        return bytes(data)
+    return base64.b64decode(data)
 
 
 def level_rms(pcm: bytes) -> float:
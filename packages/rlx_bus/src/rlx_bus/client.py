@@ -14,11 +14,23 @@ at boot and passes it via ROBOTLAB_X_SUBPROCESS_TOKEN. The /v1/ws
 endpoint decodes it through the same path it uses for browser user
 tokens, so no server-side auth changes are needed to add subprocess
 clients.
+
+Frames are JSON text by default. ``codec="msgpack"`` (or
+ROBOTLAB_X_BUS_CODEC=msgpack for ``from_env``) asks the backend for
+binary MessagePack frames so ``bytes`` payloads travel without base64 —
+see ``rlx_bus.codec`` for the negotiation.
+
+Batching (opt-in, ``batch_window_s > 0``): publishes are held for up to
+the window (or until ``batch_max_frames`` are pending) and sent as one
+``{method: "batch", data: {frames: [...]}}`` frame, which ``/v1/ws``
+unpacks into the same individual publishes. ``publish(..., coalesce=True)``
+marks a state topic as latest-value-wins: a newer pending publish on the
+same topic replaces the older one in the batch instead of queuing behind
+it.
 """
 from __future__ import annotations
 
 import asyncio
-import json
 import logging
 import os
 import sys
@@ -27,6 +39,8 @@ from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple,
 
 import websockets
 
+from . import codec as wire
+
 
 logger = logging.getLogger(__name__)
 
@@ -41,12 +55,19 @@ Handler = Callable[[Any], Union[None, Awaitable[None]]]
 # outage. Override per-instance with ``outbound_queue_size``.
 _DEFAULT_OUTBOUND_QUEUE = 256
 
+# Batch size cap when batching is enabled. A full batch flushes
+# immediately rather than waiting out the window.
+_DEFAULT_BATCH_MAX_FRAMES = 64
+
 
-def _to_ws_url(http_url: str, token: str) -> str:
+def _to_ws_url(http_url: str, token: str, codec: str = wire.JSON) -> str:
     """Turn http(s)://host:port → ws(s)://host:port/v1/ws?token=…"""
     base = http_url.rstrip("/")
     base = base.replace("http://", "ws://").replace("https://", "wss://")
-    return f"{base}/v1/ws?token={token}"
+    url = f"{base}/v1/ws?token={token}"
+    if codec != wire.JSON:
+        url += f"&codec={codec}"
+    return url
 
 
 class BusClient:
@@ -58,8 +79,17 @@ class BusClient:
         token: str,
         *,
         outbound_queue_size: int = _DEFAULT_OUTBOUND_QUEUE,
+        codec: str = wire.JSON,
+        batch_window_s: float = 0.0,
+        batch_max_frames: int = _DEFAULT_BATCH_MAX_FRAMES,
     ) -> None:
-        self._url = _to_ws_url(backend_url, token)
+        # Requested codec, downgraded to JSON if msgpack isn't installed.
+        self._codec = wire.resolve_codec(codec)
+        # Codec actually used for outbound frames on the current
+        # connection. Starts as JSON and flips once the server proves it
+        # speaks the requested codec (first binary frame) — see _on_frame.
+        self._wire_codec = wire.JSON
+        self._url = _to_ws_url(backend_url, token, self._codec)
         self._ws: Optional[websockets.WebSocketClientProtocol] = None
         self._handlers: Dict[str, Handler] = {}
         self._next_id = 1
@@ -67,7 +97,7 @@ class BusClient:
         self._closed = asyncio.Event()
         self._send_lock = asyncio.Lock()
         # Outbound buffer for publishes made while disconnected. Each
-        # entry is the already-constructed frame dict ready for json.dumps.
+        # entry is the already-constructed frame dict ready for encoding.
         # We use deque(maxlen=...) so oldest publishes drop on overflow —
         # newer state usually matters more, especially for retained
         # messages where the latest value supersedes the rest.
@@ -92,15 +122,27 @@ class BusClient:
         # hit (board reply published before subscribe ack landed, so
         # delivery to zero subscribers).
         self._pending_subscribe_acks: Dict[str, asyncio.Future] = {}
+        # Publish batching. ``_batch`` holds publish frames waiting for
+        # the window to close; ``_batch_slots`` maps a coalesced topic to
+        # its frame's index in ``_batch`` so a newer value overwrites it.
+        # 0 disables batching — every publish is its own WS frame.
+        self._batch_window_s = max(0.0, float(batch_window_s))
+        self._batch_max_frames = max(1, int(batch_max_frames))
+        self._batch: List[dict] = []
+        self._batch_slots: Dict[str, int] = {}
+        self._batch_timer: Optional[asyncio.Task] = None
 
     # ─── lifecycle ───────────────────────────────────────────────────
     async def connect(self) -> None:
         """Open the WebSocket. Raises on failure — the caller decides
         whether to retry. ``consume_forever`` handles retries for you."""
         logger.info("rlx_bus.connect %s", self._url.split("?", 1)[0])
+        self._wire_codec = wire.JSON
         self._ws = await websockets.connect(self._url, ping_interval=20, ping_timeout=20)
 
     async def close(self) -> None:
+        # Don't strand publishes sitting in an open batch window.
+        await self.flush()
         ws = self._ws
         self._ws = None
         self.ready.clear()
@@ -112,6 +154,9 @@ class BusClient:
         self._closed.set()
 
     # ─── outbound ────────────────────────────────────────────────────
+    def _encode(self, frame: dict) -> Union[str, bytes]:
+        return wire.encode(frame, self._wire_codec)
+
     def _frame_id(self) -> str:
         self._next_id += 1
         return f"sub-{self._next_id}"
@@ -124,23 +169,80 @@ class BusClient:
             return False
         try:
             async with self._send_lock:
-                await self._ws.send(json.dumps(frame))
+                await self._ws.send(self._encode(frame))
             return True
         except Exception:  # noqa: BLE001
             # Connection just died under us — preserve the frame.
             self._outbound.append(frame)
             return False
 
-    async def publish(self, topic: str, payload: Any, *, retained: bool = False) -> None:
+    async def publish(
+        self,
+        topic: str,
+        payload: Any,
+        *,
+        retained: bool = False,
+        coalesce: bool = False,
+    ) -> None:
         """Publish a message. If disconnected, the frame is queued and
-        flushed on the next successful connect."""
-        await self._send(
-            {
-                "id": self._frame_id(),
-                "method": "publish",
-                "data": {"topic": topic, "payload": payload, "retained": retained},
-            }
-        )
+        flushed on the next successful connect.
+
+        With batching enabled the frame joins the current batch and this
+        returns without touching the socket. ``coalesce=True`` makes the
+        publish latest-value-wins within that batch — use it for state
+        topics where an intermediate value is worthless once a newer one
+        exists (servo position, pin levels). Ignored without batching.
+        """
+        frame = {
+            "id": self._frame_id(),
+            "method": "publish",
+            "data": {"topic": topic, "payload": payload, "retained": retained},
+        }
+        if self._batch_window_s <= 0:
+            await self._send(frame)
+            return
+        slot = self._batch_slots.get(topic) if coalesce else None
+        if slot is not None:
+            self._batch[slot] = frame
+        else:
+            if coalesce:
+                self._batch_slots[topic] = len(self._batch)
+            self._batch.append(frame)
+        if len(self._batch) >= self._batch_max_frames:
+            await self.flush()
+        elif self._batch_timer is None:
+            self._batch_timer = asyncio.create_task(
+                self._flush_after_window(), name="rlx_bus_batch",
+            )
+
+    async def _flush_after_window(self) -> None:
+        try:
+            await asyncio.sleep(self._batch_window_s)
+        except asyncio.CancelledError:
+            return
+        self._batch_timer = None
+        await self.flush()
+
+    async def flush(self) -> None:
+        """Send any publishes held by the batch window now. A batch of
+        one goes out as a plain publish frame."""
+        timer = self._batch_timer
+        self._batch_timer = None
+        if timer is not None and timer is not asyncio.current_task():
+            timer.cancel()
+        if not self._batch:
+            return
+        frames = self._batch
+        self._batch = []
+        self._batch_slots = {}
+        if len(frames) == 1:
+            await self._send(frames[0])
+            return
+        await self._send({
+            "id": self._frame_id(),
+            "method": "batch",
+            "data": {"frames": frames},
+        })
 
     async def subscribe(self, topic: str, handler: Handler, *, ack_timeout: float = 4.0) -> None:
         """Register a handler + tell the server we want this topic,
@@ -231,7 +333,7 @@ class BusClient:
             try:
                 async with self._send_lock:
                     assert self._ws is not None
-                    await self._ws.send(json.dumps({
+                    await self._ws.send(self._encode({
                         "id": self._frame_id(),
                         "method": "publish",
                         "data": {"topic": topic, "payload": payload, "retained": retained},
@@ -244,7 +346,7 @@ class BusClient:
             try:
                 async with self._send_lock:
                     assert self._ws is not None
-                    await self._ws.send(json.dumps({
+                    await self._ws.send(self._encode({
                         "id": self._frame_id(),
                         "method": "subscribe",
                         "data": {"topic": topic},
@@ -266,7 +368,7 @@ class BusClient:
             try:
                 async with self._send_lock:
                     assert self._ws is not None
-                    await self._ws.send(json.dumps(frame))
+                    await self._ws.send(self._encode(frame))
             except Exception:  # noqa: BLE001
                 # Socket died mid-flush — requeue the rest and let the
                 # next reconnect try again.
@@ -312,10 +414,14 @@ class BusClient:
 
     async def _on_frame(self, raw: Union[str, bytes]) -> None:
         try:
-            frame = json.loads(raw)
-        except json.JSONDecodeError:
-            logger.warning("rlx_bus got non-JSON frame: %r", raw[:120])
+            frame = wire.decode(raw)
+        except ValueError:
+            logger.warning("rlx_bus got undecodable frame: %r", raw[:120])
             return
+        if isinstance(raw, (bytes, bytearray)) and self._codec != wire.JSON:
+            # The server answers in binary only after agreeing to our
+            # codec, so from here on we can send binary too.
+            self._wire_codec = self._codec
         method = frame.get("method")
         if method == "error":
             logger.warning("rlx_bus server error: %s", frame.get("error"))
@@ -413,6 +519,11 @@ def from_env() -> Optional[BusClient]:
     """
     token = os.environ.get("ROBOTLAB_X_SUBPROCESS_TOKEN")
     backend = os.environ.get("ROBOTLAB_X_BACKEND_URL")
+    codec = os.environ.get("ROBOTLAB_X_BUS_CODEC", wire.JSON)
+    try:
+        batch_window_s = float(os.environ.get("ROBOTLAB_X_BUS_BATCH_MS", "0")) / 1000.0
+    except ValueError:
+        batch_window_s = 0.0
     if not token or not backend:
         print(
             "[rlx_bus] missing ROBOTLAB_X_SUBPROCESS_TOKEN / ROBOTLAB_X_BACKEND_URL "
@@ -420,4 +531,4 @@ def from_env() -> Optional[BusClient]:
             file=sys.stderr,
         )
         return None
-    return BusClient(backend, token)
+    return BusClient(backend, token, codec=codec, batch_window_s=batch_window_s)
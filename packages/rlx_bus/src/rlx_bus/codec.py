@@ -0,0 +1,97 @@
+"""Wire codecs for the ``/v1/ws`` bus protocol.
+
+Two encodings of the same frame dicts:
+
+    json      text WebSocket frames. The default, and the only one the
+              browser UI speaks. ``bytes`` values (audio PCM, JPEG
+              thumbnails) are emitted as base64 strings so a payload
+              published by a binary client still reaches JSON clients.
+    msgpack   binary WebSocket frames via MessagePack. ``bytes`` values
+              travel natively — no base64 inflation, no text encode.
+
+Negotiation is opt-in per connection: the client adds ``codec=msgpack``
+to the ``/v1/ws`` query string. A server that honours it greets with a
+binary ``{"method": "codec", "codec": "msgpack"}`` frame and sends every
+subsequent frame as MessagePack; clients keep sending JSON until they
+have seen a binary frame, so an older server that ignores the query
+parameter keeps working. Decoding never needs to know what was
+negotiated — text frames are JSON, binary frames are MessagePack.
+
+``msgpack`` is an optional dependency (``pip install rlx_bus[msgpack]``).
+Without it ``resolve_codec`` falls back to JSON.
+"""
+from __future__ import annotations
+
+import base64
+import json
+from typing import Any, Dict, Union
+
+try:  # optional: binary codec
+    import msgpack  # type: ignore
+except ImportError:  # pragma: no cover — exercised when msgpack is absent
+    msgpack = None  # type: ignore[assignment]
+
+
+JSON = "json"
+MSGPACK = "msgpack"
+
+# Method of the greeting frame a server sends after agreeing to a
+# binary codec.
+CODEC_METHOD = "codec"
+
+
+def msgpack_available() -> bool:
+    return msgpack is not None
+
+
+def resolve_codec(requested: Any) -> str:
+    """Map a requested codec name to one this process can speak.
+    Anything unknown or unavailable falls back to JSON."""
+    if requested == MSGPACK and msgpack is not None:
+        return MSGPACK
+    return JSON
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return base64.b64encode(value).decode("ascii")
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _msgpack_default(value: Any) -> Any:
+    if isinstance(value, memoryview):
+        return value.tobytes()
+    if isinstance(value, (tuple, set, frozenset)):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not MessagePack serializable")
+
+
+def encode(frame: Dict[str, Any], codec: str = JSON) -> Union[str, bytes]:
+    """Encode one frame. ``str`` for JSON, ``bytes`` for MessagePack."""
+    if codec == MSGPACK:
+        return msgpack.packb(frame, use_bin_type=True, default=_msgpack_default)
+    return json.dumps(frame, default=_json_default)
+
+
+def decode(raw: Union[str, bytes, bytearray]) -> Dict[str, Any]:
+    """Decode one frame. Raises ``ValueError`` on anything unparseable
+    (``json.JSONDecodeError`` is a subclass) — including a binary frame
+    when msgpack isn't installed."""
+    if isinstance(raw, str):
+        return json.loads(raw)
+    if msgpack is None:
+        raise ValueError("binary frame received but msgpack is not installed")
+    try:
+        # strict_map_key=False: payload maps may have int keys (a
+        # JSON client sees the same map with string keys).
+        frame = msgpack.unpackb(raw, raw=False, strict_map_key=False)
+    except Exception as exc:  # noqa: BLE001 — msgpack raises several types
+        raise ValueError(f"invalid msgpack frame: {exc}") from exc
+    if not isinstance(frame, dict):
+        raise ValueError("msgpack frame is not a map")
+    return frame
+
+
+def greeting(codec: str) -> Union[str, bytes]:
+    """The first frame a server sends after agreeing to ``codec``."""
+    return encode({"method": CODEC_METHOD, "codec": codec}, codec)
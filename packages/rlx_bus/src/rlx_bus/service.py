@@ -151,8 +151,18 @@ class SubprocessService:
             return topic
         return remap.get(topic, topic)
 
-    async def publish(self, suffix: str, payload: Any, *, retained: bool = False) -> None:
-        await self.bus.publish(self.resolve_topic(self.topic(suffix)), payload, retained=retained)
+    async def publish(
+        self, suffix: str, payload: Any, *, retained: bool = False, coalesce: bool = False,
+    ) -> None:
+        """``coalesce=True`` marks a latest-value-wins state topic — see
+        ``BusClient.publish``. Only forwarded when set, so bus stand-ins
+        with the plain ``publish(topic, payload, retained=)`` shape keep
+        working."""
+        topic = self.resolve_topic(self.topic(suffix))
+        if coalesce:
+            await self.bus.publish(topic, payload, retained=retained, coalesce=True)
+        else:
+            await self.bus.publish(topic, payload, retained=retained)
 
     async def subscribe(
         self, suffix: str, handler: Callable[[Any], Union[None, Awaitable[None]]]
@@ -0,0 +1,189 @@
+"""Shared-memory frame ring — same-host transport for ``Stream`` frames.
+
+A stream producer and the runtime nearly always share a machine, so
+pushing every JPEG through the upload WebSocket costs a kernel socket
+copy plus WS framing per frame for nothing. With this transport the
+producer writes each frame into a slot of a ``multiprocessing``
+shared-memory segment and sends only a small control message on the
+existing upload WS::
+
+    {"shm_frame": {"slot": 2, "seq": 1041, "size": 183220}}
+
+The runtime copies the slot out and hands the bytes to ``StreamState``
+exactly like a binary upload frame.
+
+Segment layout — ``slots`` fixed-size slots, each::
+
+    [ seq: u64 | size: u32 | pad: u32 | payload: slot_size bytes ]
+
+Slot reuse is guarded seqlock-style: the writer zeroes ``seq`` before
+touching the payload and stores it last, and the reader checks ``seq``
+both before and after its copy. A reader that was lapped by the writer
+sees a mismatch and drops that frame instead of serving a torn one —
+the same freshness-over-completeness trade as the rest of the media
+plane.
+
+Negotiation (see ``Stream`` / ``/v1/stream/<id>/upload``): the producer
+adds ``"shm": ring.descriptor()`` to its first metadata frame; a runtime
+that can attach answers ``{"shm": true}``. No answer, or ``false``
+(different host, no /dev/shm, older runtime), and the producer keeps
+sending binary WS frames. Frames larger than a slot always go over WS.
+
+Segments are always named ``rlx_<10 hex digits>`` (``NAME_PREFIX``) and
+``attach`` refuses any other name, so an upload socket can only point the
+runtime at a ring some producer created for the purpose — not at an
+arbitrary segment another process on the host happens to own.
+"""
+from __future__ import annotations
+
+import re
+import secrets
+import struct
+from typing import Any, Dict, Optional
+
+try:  # not every platform/container has a usable /dev/shm
+    from multiprocessing import shared_memory
+except ImportError:  # pragma: no cover
+    shared_memory = None  # type: ignore[assignment]
+
+
+SLOT_HEADER = struct.Struct("<QII")  # seq, size, pad — 16 bytes
+DEFAULT_SLOTS = 4
+# Comfortably above a 1080p JPEG at default quality.
+DEFAULT_SLOT_SIZE = 2 * 1024 * 1024
+# 14 characters in all — the portable POSIX shm name limit (macOS).
+NAME_PREFIX = "rlx_"
+_NAME_RE = re.compile(r"^rlx_[0-9a-f]{10}$")
+
+
+def available() -> bool:
+    return shared_memory is not None
+
+
+class ShmFrameRing:
+    """One shared-memory segment of frame slots.
+
+    The producer ``create()``s (and owns — ``close()`` unlinks) the
+    segment and calls ``write``; the runtime ``attach()``es by
+    descriptor and calls ``read``.
+    """
+
+    def __init__(self, shm: Any, slots: int, slot_size: int, *, owner: bool) -> None:
+        self._shm = shm
+        self.slots = slots
+        self.slot_size = slot_size
+        self._stride = SLOT_HEADER.size + slot_size
+        self._owner = owner
+        self._seq = 0
+
+    @classmethod
+    def create(cls, slots: int = DEFAULT_SLOTS, slot_size: int = DEFAULT_SLOT_SIZE) -> "ShmFrameRing":
+        """Allocate a new zeroed segment. Raises ``OSError`` when shared
+        memory isn't usable here."""
+        if shared_memory is None:
+            raise OSError("multiprocessing.shared_memory unavailable")
+        size = slots * (SLOT_HEADER.size + slot_size)
+        while True:
+            name = NAME_PREFIX + secrets.token_hex(5)
+            try:
+                shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+            except FileExistsError:
+                continue
+            return cls(shm, slots, slot_size, owner=True)
+
+    @classmethod
+    def attach(cls, descriptor: Dict[str, Any]) -> "ShmFrameRing":
+        """Open a producer's segment from its ``descriptor()``. Raises
+        ``OSError`` if it can't be opened (not on this host) and
+        ``ValueError`` if the descriptor doesn't fit the segment or names
+        a segment ``create()`` wouldn't have made."""
+        if shared_memory is None:
+            raise OSError("multiprocessing.shared_memory unavailable")
+        try:
+            name = str(descriptor["name"])
+            slots = int(descriptor["slots"])
+            slot_size = int(descriptor["slot_size"])
+        except (KeyError, TypeError, ValueError) as exc:
+            raise ValueError(f"bad shm descriptor: {descriptor!r}") from exc
+        if not _NAME_RE.match(name):
+            raise ValueError(f"shm segment {name!r} is not a stream ring")
+        shm = _attach_untracked(name)
+        if slots <= 0 or slot_size <= 0 or shm.size < slots * (SLOT_HEADER.size + slot_size):
+            shm.close()
+            raise ValueError(f"shm segment {name!r} smaller than its descriptor")
+        return cls(shm, slots, slot_size, owner=False)
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    def descriptor(self) -> Dict[str, Any]:
+        return {"name": self.name, "slots": self.slots, "slot_size": self.slot_size}
+
+    # ─── producer side ─────────────────────────────────────────────────
+
+    def write(self, frame: Any) -> Optional[Dict[str, int]]:
+        """Copy ``frame`` (bytes-like, flat) into the next slot and return
+        the control message body, or None if it doesn't fit a slot."""
+        size = len(frame)
+        if size > self.slot_size:
+            return None
+        self._seq += 1
+        seq = self._seq
+        slot = seq % self.slots
+        off = slot * self._stride
+        buf = self._shm.buf
+        start = off + SLOT_HEADER.size
+        SLOT_HEADER.pack_into(buf, off, 0, 0, 0)  # slot is being rewritten
+        buf[start:start + size] = frame
+        SLOT_HEADER.pack_into(buf, off, seq, size, 0)
+        return {"slot": slot, "seq": seq, "size": size}
+
+    # ─── runtime side ──────────────────────────────────────────────────
+
+    def read(self, slot: int, seq: int, size: int) -> Optional[bytes]:
+        """Copy a frame out of ``slot``. None if the slot no longer holds
+        frame ``seq`` (overwritten before or during the copy) or the
+        control message is out of range."""
+        if not (0 <= slot < self.slots) or not (0 <= size <= self.slot_size):
+            return None
+        off = slot * self._stride
+        buf = self._shm.buf
+        before, stored_size, _ = SLOT_HEADER.unpack_from(buf, off)
+        if before != seq or stored_size != size:
+            return None
+        start = off + SLOT_HEADER.size
+        data = bytes(buf[start:start + size])
+        after, _, _ = SLOT_HEADER.unpack_from(buf, off)
+        if after != seq:
+            return None
+        return data
+
+    def close(self) -> None:
+        """Detach; the owning producer also unlinks the segment."""
+        try:
+            self._shm.close()
+        except BufferError:  # pragma: no cover — a view is still exported
+            return
+        if self._owner:
+            try:
+                self._shm.unlink()
+            except FileNotFoundError:
+                pass
+
+
+def _attach_untracked(name: str) -> Any:
+    """Attach without registering with this process's resource tracker —
+    otherwise the runtime would unlink the producer's segment when it
+    exits (and warn about a "leak" it never owned)."""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)  # 3.13+
+    except TypeError:
+        pass
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        from multiprocessing import resource_tracker
+        resource_tracker.unregister(shm._name, "shared_memory")  # type: ignore[attr-defined]
+    except Exception:  # noqa: BLE001 — best-effort; Windows has no tracker
+        pass
+    return shm
@@ -2,6 +2,11 @@
 
 Phase 1 transports:
   * MJPEG (binary JPEG bytes pushed to ``/v1/stream/<id>/upload``)
+  * Same-host shared memory — frames written into a ``ShmFrameRing``
+    with only a small control message on the upload WS. Negotiated on
+    connect, off by default (``shm=True`` or ``ROBOTLAB_X_STREAM_SHM=1``
+    to opt in); falls back to the WS path whenever the runtime can't
+    attach. See ``rlx_bus/shm_ring.py``.
   * Low-rate sample frames on the bus (``/<type>/<id>/frame_sample``)
 
 Author API::
@@ -19,9 +24,17 @@ Author API::
         if not ok: continue
         stream.push(encode_jpeg(frame))
 
-Backpressure: ``push()`` is fire-and-forget into a bounded asyncio.Queue.
-When the queue is full (sender can't keep up with the WS), oldest
-frames drop — better fresh-stale than blocking the producer's loop.
+Backpressure: ``push()`` is fire-and-forget into a fixed ring of frame
+slots. When every slot is full (sender can't keep up with the WS), the
+oldest frame is overwritten — better fresh-stale than blocking the
+producer's loop.
+
+Zero-copy: ``push()`` accepts any buffer-protocol object — ``bytes``,
+``bytearray``, a ``memoryview``, or the NumPy array ``cv2.imencode``
+returns — and holds a reference to it until it has been sent. Nothing
+is copied on the producer side, so don't mutate a buffer after pushing
+it. ``drop_count``, ``send_latency_s`` and ``bytes_per_s`` (or
+``stats()`` for all of them) are meant for the service's ``/state``.
 
 Reconnect: the underlying WS auto-reconnects with exponential backoff.
 Frames pushed while disconnected drop on the floor (live media — replay
@@ -34,20 +47,34 @@ import asyncio
 import json
 import logging
 import os
-from typing import Any, List, Optional, Sequence, Tuple
+import time
+from collections import deque
+from typing import Any, Deque, List, Optional, Sequence, Tuple, Union
 
 import websockets
 
+from . import shm_ring
+from .shm_ring import ShmFrameRing
+
 
 logger = logging.getLogger(__name__)
 
 
-# How many frames the sender queue holds before dropping. 30fps ~= 1
+# How many frames the ring holds before dropping. 30fps ~= 1
 # second of frames — long enough to ride out a brief send stall, short
 # enough that consumers don't see stale frames if the sender unwedges.
 _DEFAULT_QUEUE_DEPTH = 30
+# Window for the bytes/s counter.
+_RATE_WINDOW_S = 1.0
+# Weight of the newest sample in the send-latency EWMA.
+_LATENCY_ALPHA = 0.2
+
+Frame = Union[bytes, memoryview]
 _RECONNECT_BASE_S = 1.0
 _RECONNECT_MAX_S = 30.0
+# How long to wait for the runtime's answer to a shared-memory offer.
+# An older runtime never answers; this is the one-off cost per connect.
+_SHM_ACK_TIMEOUT_S = 1.0
 
 
 def _upload_ws_url(backend_url: str, stream_id: str, token: str) -> str:
@@ -62,7 +89,9 @@ class Stream:
     Internally owns:
       * an asyncio task running ``_sender_loop`` — opens the upload WS,
         sends metadata, drains the frame queue
-      * an asyncio.Queue[bytes] of pending JPEG frames
+      * a fixed ring of ``queue_depth`` slots holding pending JPEG
+        frames (references, not copies), plus an event that wakes the
+        sender when a slot fills
 
     Construction is cheap; the WS doesn't open until ``start()`` is
     called. ``SubprocessService.register_stream`` calls start() for the
@@ -81,6 +110,7 @@ class Stream:
         resolution: Optional[Tuple[int, int]] = None,
         fps: Optional[float] = None,
         queue_depth: int = _DEFAULT_QUEUE_DEPTH,
+        shm: Optional[bool] = None,
     ) -> None:
         self.stream_id = stream_id
         self._backend_url = backend_url
@@ -92,10 +122,28 @@ class Stream:
             "resolution": list(resolution) if resolution else None,
             "fps": fps,
         }
-        self._queue: asyncio.Queue[bytes] = asyncio.Queue(maxsize=queue_depth)
+        # Ring: ``_read`` is the oldest pending slot, ``_pending`` how
+        # many follow it. A full ring overwrites the oldest in place.
+        self._slots: List[Optional[Frame]] = [None] * max(1, queue_depth)
+        self._read = 0
+        self._pending = 0
+        self._ready = asyncio.Event()
         self._sender_task: Optional[asyncio.Task[None]] = None
         self._stop = asyncio.Event()
         self._drop_count = 0
+        # Sender counters.
+        self._frames_sent = 0
+        self._bytes_sent = 0
+        self._send_latency_s = 0.0
+        self._rate_window: Deque[Tuple[float, int]] = deque()
+        self._rate_bytes = 0
+        # Same-host transport. The ring is created on first connect and
+        # kept across reconnects; ``_shm_active`` is per connection.
+        if shm is None:
+            shm = os.environ.get("ROBOTLAB_X_STREAM_SHM", "").lower() in ("1", "true", "yes", "on")
+        self._shm_wanted = bool(shm) and shm_ring.available()
+        self._shm_ring: Optional[ShmFrameRing] = None
+        self._shm_active = False
 
     # ─── lifecycle ─────────────────────────────────────────────────────
 
@@ -118,31 +166,78 @@ class Stream:
             except (asyncio.CancelledError, Exception):  # noqa: BLE001
                 pass
             self._sender_task = None
+        self._shm_active = False
+        if self._shm_ring is not None:
+            self._shm_ring.close()
+            self._shm_ring = None
 
     # ─── producer API ──────────────────────────────────────────────────
 
-    def push(self, frame: bytes) -> None:
+    def push(self, frame: Any) -> None:
         """Enqueue a JPEG-encoded frame for upload. Non-blocking.
 
-        When the queue is full (sender stalled or disconnected), the
-        oldest frame is dropped to make room. Drop count is exposed via
+        ``frame`` may be any buffer-protocol object; it is held by
+        reference until sent, never copied. ``bytes`` goes through
+        untouched, anything else as a flat byte ``memoryview`` over the
+        caller's buffer.
+
+        When every slot is full (sender stalled or disconnected), the
+        oldest frame is overwritten. Drop count is exposed via
         ``drop_count`` so the service can publish it on its /state.
         """
-        if not isinstance(frame, (bytes, bytearray, memoryview)):
-            raise TypeError("Stream.push expects bytes-like (JPEG-encoded)")
-        try:
-            self._queue.put_nowait(bytes(frame))
-        except asyncio.QueueFull:
-            # Drop oldest, push new — favours freshness over completeness.
+        if not isinstance(frame, bytes):
             try:
-                self._queue.get_nowait()
-                self._drop_count += 1
-            except asyncio.QueueEmpty:  # pragma: no cover
-                pass
-            try:
-                self._queue.put_nowait(bytes(frame))
-            except asyncio.QueueFull:  # pragma: no cover
-                pass
+                view = memoryview(frame)
+            except TypeError:
+                raise TypeError("Stream.push expects bytes-like (JPEG-encoded)") from None
+            if view.ndim != 1 or view.format != "B":
+                # e.g. cv2.imencode's (N, 1) uint8 array — same bytes,
+                # flat view; no copy.
+                view = view.cast("B")
+            frame = view
+        size = len(self._slots)
+        if self._pending == size:
+            # Drop oldest, keep new — favours freshness over completeness.
+            self._slots[self._read] = frame
+            self._read = (self._read + 1) % size
+            self._drop_count += 1
+        else:
+            self._slots[(self._read + self._pending) % size] = frame
+            self._pending += 1
+        self._ready.set()
+
+    def _pop(self) -> Optional[Frame]:
+        """Oldest pending frame, releasing its slot; None when empty."""
+        if self._pending == 0:
+            return None
+        frame = self._slots[self._read]
+        self._slots[self._read] = None
+        self._read = (self._read + 1) % len(self._slots)
+        self._pending -= 1
+        if self._pending == 0:
+            self._ready.clear()
+        return frame
+
+    async def _next_frame(self, timeout: float) -> Optional[Frame]:
+        """Wait up to ``timeout`` for a pending frame."""
+        frame = self._pop()
+        if frame is not None:
+            return frame
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return None
+        return self._pop()
+
+    def _record_send(self, nbytes: int, seconds: float) -> None:
+        self._frames_sent += 1
+        self._bytes_sent += nbytes
+        if self._frames_sent == 1:
+            self._send_latency_s = seconds
+        else:
+            self._send_latency_s += _LATENCY_ALPHA * (seconds - self._send_latency_s)
+        self._rate_window.append((time.monotonic(), nbytes))
+        self._rate_bytes += nbytes
 
     def update_metadata(
         self,
@@ -165,12 +260,76 @@ class Stream:
     def drop_count(self) -> int:
         return self._drop_count
 
+    @property
+    def pending(self) -> int:
+        """Frames waiting in the ring."""
+        return self._pending
+
+    @property
+    def send_latency_s(self) -> float:
+        """Smoothed (EWMA) time one ``ws.send`` of a frame takes. Rising
+        toward 1/fps means the link is the bottleneck."""
+        return self._send_latency_s
+
+    @property
+    def bytes_per_s(self) -> float:
+        """Upload rate over the last second."""
+        cutoff = time.monotonic() - _RATE_WINDOW_S
+        while self._rate_window and self._rate_window[0][0] < cutoff:
+            self._rate_bytes -= self._rate_window.popleft()[1]
+        return self._rate_bytes / _RATE_WINDOW_S
+
+    def stats(self) -> dict:
+        """Sender counters in one dict, ready to merge into /state."""
+        return {
+            "dropped": self._drop_count,
+            "pending": self._pending,
+            "frames_sent": self._frames_sent,
+            "bytes_sent": self._bytes_sent,
+            "send_latency_ms": round(self._send_latency_s * 1000.0, 2),
+            "bytes_per_s": round(self.bytes_per_s),
+            "transport": "shm" if self._shm_active else "ws",
+        }
+
     @property
     def metadata(self) -> dict:
         return dict(self._metadata)
 
     # ─── internal — sender coroutine ───────────────────────────────────
 
+    def _ensure_shm_ring(self) -> Optional[ShmFrameRing]:
+        if self._shm_ring is None and self._shm_wanted:
+            try:
+                self._shm_ring = ShmFrameRing.create()
+            except (OSError, ValueError) as exc:
+                logger.info("stream.shm unavailable id=%s reason=%s", self.stream_id, exc)
+                self._shm_wanted = False
+        return self._shm_ring
+
+    async def _send_metadata(self, ws: Any) -> bool:
+        """Send the connect-time metadata frame, offering the shared-
+        memory ring when we have one. Returns True when the runtime
+        accepted it."""
+        ring = self._ensure_shm_ring()
+        if ring is None:
+            await ws.send(json.dumps(self._metadata))
+            return False
+        await ws.send(json.dumps({**self._metadata, "shm": ring.descriptor()}))
+        try:
+            reply = json.loads(await asyncio.wait_for(ws.recv(), timeout=_SHM_ACK_TIMEOUT_S))
+        except (asyncio.TimeoutError, TypeError, ValueError):
+            return False
+        return isinstance(reply, dict) and reply.get("shm") is True
+
+    async def _send_frame(self, ws: Any, frame: Frame) -> None:
+        if self._shm_active:
+            ctrl = self._shm_ring.write(frame)
+            if ctrl is not None:
+                await ws.send(json.dumps({"shm_frame": ctrl}))
+                return
+            # Bigger than a slot — this one goes over the socket.
+        await ws.send(frame)
+
     async def _sender_loop(self) -> None:
         """Main sender loop. Connects, sends metadata, drains the queue.
 
@@ -183,20 +342,22 @@ class Stream:
             try:
                 async with websockets.connect(url, max_size=None) as ws:
                     delay = _RECONNECT_BASE_S
-                    logger.info("stream.sender connected id=%s", self.stream_id)
-                    # 1. Metadata first.
-                    await ws.send(json.dumps(self._metadata))
-                    # 2. Frame loop. Drain the queue, send each as binary.
+                    # 1. Metadata first (+ shared-memory negotiation).
+                    self._shm_active = await self._send_metadata(ws)
+                    logger.info("stream.sender connected id=%s transport=%s", self.stream_id,
+                                "shm" if self._shm_active else "ws")
+                    # 2. Frame loop. Drain the ring, send each as binary.
                     while not self._stop.is_set():
-                        try:
-                            frame = await asyncio.wait_for(self._queue.get(), timeout=5.0)
-                        except asyncio.TimeoutError:
+                        frame = await self._next_frame(timeout=5.0)
+                        if frame is None:
                             # No frames in 5s — keep the connection warm
                             # by sending an empty metadata-only update so
                             # the runtime's stale detector resets.
                             await ws.send(json.dumps(self._metadata))
                             continue
-                        await ws.send(frame)
+                        started = time.monotonic()
+                        await self._send_frame(ws, frame)
+                        self._record_send(len(frame), time.monotonic() - started)
             except asyncio.CancelledError:
                 return
             except (websockets.WebSocketException, OSError) as exc:
@@ -204,6 +365,7 @@ class Stream:
                             self.stream_id, exc.__class__.__name__)
             except Exception:  # noqa: BLE001
                 logger.exception("stream.sender unexpected error id=%s", self.stream_id)
+            self._shm_active = False
             if self._stop.is_set():
                 return
             # Backoff before reconnect attempt.
@@ -226,6 +388,7 @@ def from_env(
     format: Optional[str] = None,
     resolution: Optional[Tuple[int, int]] = None,
     fps: Optional[float] = None,
+    shm: Optional[bool] = None,
 ) -> Optional[Stream]:
     """Construct a Stream from ``ROBOTLAB_X_BACKEND_URL`` +
     ``ROBOTLAB_X_SUBPROCESS_TOKEN`` env vars — the same ones BusClient
@@ -243,4 +406,5 @@ def from_env(
         format=format,
         resolution=resolution,
         fps=fps,
+        shm=shm,
     )